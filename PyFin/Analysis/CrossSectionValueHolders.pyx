@@ -33,6 +33,7 @@ cdef class CrossSectionValueHolder(SecurityValueHolder):
             self._dependency = copy.deepcopy(self._inner.fields)
         self.updated = 0
         self.cached = None
+        self.share_universe()
 
     @property
     def symbolList(self):
@@ -44,6 +45,12 @@ cdef class CrossSectionValueHolder(SecurityValueHolder):
             self._group.push(data)
         self.updated = 0
 
+    cpdef push_columns(self, list names, dict columns, size_t offset=0):
+        self._inner.push_columns(names, columns, offset)
+        if self._group:
+            self._group.push_columns(names, columns, offset)
+        self.updated = 0
+
 
 cdef class CSTopNSecurityValueHolder(CrossSectionValueHolder):
 
@@ -504,6 +511,7 @@ cdef class CSResidueSecurityValueHolder(SecurityValueHolder):
         self._dependency = list(set(self._left.fields + self._right.fields))
         self.updated = 0
         self.cached = None
+        self.share_universe()
 
     @property
     def symbolList(self):
@@ -514,6 +522,11 @@ cdef class CSResidueSecurityValueHolder(SecurityValueHolder):
         self._right.push(data)
         self.updated = 0
 
+    cpdef push_columns(self, list names, dict columns, size_t offset=0):
+        self._left.push_columns(names, columns, offset)
+        self._right.push_columns(names, columns, offset)
+        self.updated = 0
+
     cpdef value_all(self):
 
         cdef SeriesValues left_raw_values
@@ -0,0 +1,565 @@
+# -*- coding: utf-8 -*-
+u"""
+Created on 2026-10-18
+"""
+
+import copy
+import numpy as np
+cimport numpy as np
+cimport cython
+from libc.math cimport isfinite
+from PyFin.Analysis.SeriesValues cimport SeriesValues
+from PyFin.Analysis.SeriesValues cimport Universe
+from PyFin.Analysis.SecurityValueHolders cimport SecurityValueHolder
+from PyFin.Analysis.SecurityValueHolders import _CHILD_ATTRIBUTES
+from PyFin.Analysis.SecurityValueHolders import SecurityAddedValueHolder
+from PyFin.Analysis.SecurityValueHolders import SecuritySubbedValueHolder
+from PyFin.Analysis.SecurityValueHolders import SecurityMultipliedValueHolder
+from PyFin.Analysis.SecurityValueHolders import SecurityDividedValueHolder
+from PyFin.Analysis.SecurityValueHolders import SecurityLtOperatorValueHolder
+from PyFin.Analysis.SecurityValueHolders import SecurityLeOperatorValueHolder
+from PyFin.Analysis.SecurityValueHolders import SecurityGtOperatorValueHolder
+from PyFin.Analysis.SecurityValueHolders import SecurityGeOperatorValueHolder
+from PyFin.Analysis.SecurityValueHolders import SecurityEqOperatorValueHolder
+from PyFin.Analysis.SecurityValueHolders import SecurityNeOperatorValueHolder
+from PyFin.Analysis.SecurityValueHolders import SecurityAndOperatorValueHolder
+from PyFin.Analysis.SecurityValueHolders import SecurityOrOperatorValueHolder
+from PyFin.Analysis.SecurityValueHolders import SecurityNegValueHolder
+from PyFin.Analysis.SecurityValueHolders import SecurityIIFValueHolder
+from PyFin.Analysis.SecurityValueHolders import IdentitySecurityValueHolder
+from PyFin.Math.Accumulators.FusedAccumulators cimport apply_op
+from PyFin.Math.Accumulators.FusedAccumulators cimport _OP_ADD
+from PyFin.Math.Accumulators.FusedAccumulators cimport _OP_SUB
+from PyFin.Math.Accumulators.FusedAccumulators cimport _OP_MUL
+from PyFin.Math.Accumulators.FusedAccumulators cimport _OP_DIV
+from PyFin.Math.Accumulators.FusedAccumulators cimport _OP_LT
+from PyFin.Math.Accumulators.FusedAccumulators cimport _OP_LE
+from PyFin.Math.Accumulators.FusedAccumulators cimport _OP_GT
+from PyFin.Math.Accumulators.FusedAccumulators cimport _OP_GE
+from PyFin.Math.Accumulators.FusedAccumulators cimport _OP_EQ
+from PyFin.Math.Accumulators.FusedAccumulators cimport _OP_NE
+from PyFin.Math.Accumulators.FusedAccumulators cimport _OP_AND
+from PyFin.Math.Accumulators.FusedAccumulators cimport _OP_OR
+from PyFin.Math.Accumulators.FusedAccumulators cimport _OP_NEG
+from PyFin.Math.Accumulators.FusedAccumulators cimport _OP_SELECT
+from PyFin.Math.Accumulators.FusedAccumulators import compile_program
+from PyFin.Math.MathConstants cimport NAN
+from PyFin.Utilities.Asserts cimport require
+
+
+cdef class SecuritySharedValueHolder(SecurityValueHolder):
+    u"""
+    Read only view on a node owned by an ``ExpressionGraph``. Pushing it is a
+    no-op: the graph pushes the underlying node exactly once per snapshot.
+    """
+
+    cdef public SecurityValueHolder _target
+
+    def __init__(self, target):
+        super(SecuritySharedValueHolder, self).__init__()
+        self._target = target
+        self._window = target.window
+        self._dependency = target.fields
+
+    def isFullByName(self, name):
+        return self._target.isFullByName(name)
+
+    @property
+    def isFull(self):
+        return self._target.isFull
+
+    @property
+    def symbolList(self):
+        return self._target.symbolList
+
+    @property
+    def holders(self):
+        return self._target.holders
+
+    cpdef share_universe(self, Universe universe=None):
+        self._target.share_universe(universe)
+
+    cpdef push(self, dict data):
+        pass
+
+    cpdef push_columns(self, list names, dict columns, size_t offset=0):
+        pass
+
+    cpdef value_all(self):
+        return self._target.value_all()
+
+    cpdef SeriesValues value_by_names(self, list names):
+        return self._target.value_by_names(names)
+
+    cpdef double value_by_name(self, name):
+        return self._target.value_by_name(name)
+
+    def __str__(self):
+        return str(self._target)
+
+
+_OPERATORS = {SecurityAddedValueHolder: _OP_ADD,
+              SecuritySubbedValueHolder: _OP_SUB,
+              SecurityMultipliedValueHolder: _OP_MUL,
+              SecurityDividedValueHolder: _OP_DIV,
+              SecurityLtOperatorValueHolder: _OP_LT,
+              SecurityLeOperatorValueHolder: _OP_LE,
+              SecurityGtOperatorValueHolder: _OP_GT,
+              SecurityGeOperatorValueHolder: _OP_GE,
+              SecurityEqOperatorValueHolder: _OP_EQ,
+              SecurityNeOperatorValueHolder: _OP_NE,
+              SecurityAndOperatorValueHolder: _OP_AND,
+              SecurityOrOperatorValueHolder: _OP_OR}
+
+
+def _describe(node):
+    cls = type(node)
+    if cls in _OPERATORS:
+        return _OPERATORS[cls], [node._left, node._right], None
+    elif cls is SecurityNegValueHolder:
+        return _OP_NEG, [node._right], None
+    elif cls is SecurityIIFValueHolder:
+        return _OP_SELECT, [node._flag, node._left, node._right], None
+    elif cls is IdentitySecurityValueHolder:
+        return float(node._value)
+    return None
+
+
+def _symbol_sources(node, dict positions):
+    # leaves whose symbols make up symbolList: both sides of an operator,
+    # only the flag of an IIF
+    if id(node) in positions:
+        return [positions[id(node)]]
+    description = _describe(node)
+    if description is None or isinstance(description, float):
+        return []
+    op, children, _ = description
+    if op == _OP_SELECT:
+        children = children[:1]
+    return [i for child in children for i in _symbol_sources(child, positions)]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void _run_columns(const int[:, ::1] code, double[:, ::1] registers) nogil:
+    cdef Py_ssize_t i
+    cdef Py_ssize_t j
+    cdef int op
+    cdef double res
+
+    for i in range(code.shape[0]):
+        op = code[i, 0]
+        for j in range(registers.shape[1]):
+            res = apply_op(op, registers[code[i, 2], j], registers[code[i, 3], j], registers[code[i, 4], j])
+            if op == _OP_DIV and not isfinite(res):
+                res = NAN
+            registers[code[i, 1], j] = res
+
+
+cdef class SecurityFusedValueHolder(SecurityValueHolder):
+    u"""
+    Operator holders (arithmetic, comparisons, logical operators, negation and
+    IIF) flattened into register code by ``fuse``. A snapshot is evaluated in
+    one register matrix instead of one SeriesValues per operator; divisions
+    behave as in SecurityDividedValueHolder.
+    """
+
+    cdef public list _leaves
+    cdef public list _symbol_sources
+    cdef int[:, ::1] _code
+    cdef double[::1] _constants
+    cdef Py_ssize_t _output
+    cdef Py_ssize_t _first
+    cdef str _expression
+
+    def __init__(self, leaves, constants, code, output, first, symbol_sources, expression, window, dependency):
+        super(SecurityFusedValueHolder, self).__init__()
+        self._leaves = list(leaves)
+        self._constants = np.array(constants, dtype=float)
+        self._code = np.ascontiguousarray(code, dtype=np.intc)
+        self._output = output
+        self._first = first
+        self._symbol_sources = list(symbol_sources)
+        self._expression = expression
+        self._window = window
+        self._dependency = list(dependency)
+        self.updated = 0
+        self.cached = None
+        self.share_universe()
+
+    cpdef share_universe(self, Universe universe=None):
+        if universe is None:
+            universe = Universe()
+        elif universe is self._universe:
+            return
+        SecurityValueHolder.share_universe(self, universe)
+        for leaf in self._leaves:
+            leaf.share_universe(universe)
+
+    def isFullByName(self, name):
+        return all(leaf.isFullByName(name) for leaf in self._leaves)
+
+    @property
+    def isFull(self):
+        return all(leaf.isFull for leaf in self._leaves)
+
+    @property
+    def symbolList(self):
+        if len(self._symbol_sources) == 1:
+            return self._leaves[self._symbol_sources[0]].symbolList
+        return list(set(s for i in self._symbol_sources for s in self._leaves[i].symbolList))
+
+    cpdef push(self, dict data):
+        for leaf in self._leaves:
+            leaf.push(data)
+        self.updated = 0
+
+    cpdef push_columns(self, list names, dict columns, size_t offset=0):
+        for leaf in self._leaves:
+            leaf.push_columns(names, columns, offset)
+        self.updated = 0
+
+    cdef SeriesValues _evaluate(self, list operands):
+        cdef Py_ssize_t i
+        cdef Py_ssize_t n_leaves = len(operands)
+        cdef Py_ssize_t n_constants = self._constants.shape[0]
+        cdef SeriesValues first = operands[self._first]
+        cdef Py_ssize_t n = len(first.values)
+        cdef np.ndarray[double, ndim=2] registers = np.empty((n_leaves + n_constants + self._code.shape[0], n))
+        cdef np.ndarray values
+
+        for i in range(n_leaves):
+            values = first._aligned(operands[i])
+            require(len(values) == n, ValueError, "operands of a fused expression have different lengths")
+            registers[i] = values
+        for i in range(n_constants):
+            registers[n_leaves + i] = self._constants[i]
+
+        _run_columns(self._code, registers)
+        return first._with_values(registers[self._output])
+
+    cpdef SeriesValues value_all(self):
+        if self.updated:
+            return self.cached
+        else:
+            self.cached = self._evaluate([leaf.value_all() for leaf in self._leaves])
+            self.updated = 1
+            return self.cached
+
+    cpdef SeriesValues value_by_names(self, list names):
+        if self.updated:
+            return self.cached[names]
+        else:
+            return self._evaluate([leaf.value_by_names(names) for leaf in self._leaves])
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef double value_by_name(self, name):
+        cdef Py_ssize_t i
+        cdef Py_ssize_t n_leaves = len(self._leaves)
+        cdef Py_ssize_t n_constants = self._constants.shape[0]
+        cdef int op
+        cdef double[::1] registers
+        cdef unsigned char[::1] failed
+        cdef SecurityValueHolder leaf
+
+        if self.updated:
+            return self.cached[name]
+
+        registers = np.empty(n_leaves + n_constants + self._code.shape[0])
+        failed = np.zeros(registers.shape[0], dtype=np.uint8)
+        for i in range(n_leaves):
+            leaf = self._leaves[i]
+            registers[i] = leaf.value_by_name(name)
+        for i in range(n_constants):
+            registers[n_leaves + i] = self._constants[i]
+
+        # a division by zero only raises if its branch is selected, as the
+        # IIF holder evaluates one side only
+        for i in range(self._code.shape[0]):
+            op = self._code[i, 0]
+            registers[self._code[i, 1]] = apply_op(op,
+                                                   registers[self._code[i, 2]],
+                                                   registers[self._code[i, 3]],
+                                                   registers[self._code[i, 4]])
+            if op == _OP_SELECT:
+                failed[self._code[i, 1]] = failed[self._code[i, 2]] or \
+                                           (failed[self._code[i, 3]] if registers[self._code[i, 2]] != 0. else failed[self._code[i, 4]])
+            elif op == _OP_NEG:
+                failed[self._code[i, 1]] = failed[self._code[i, 2]]
+            else:
+                failed[self._code[i, 1]] = failed[self._code[i, 2]] or failed[self._code[i, 3]] or \
+                                           (op == _OP_DIV and registers[self._code[i, 3]] == 0.)
+
+        if failed[self._output]:
+            raise ZeroDivisionError("float division by zero")
+        return registers[self._output]
+
+    def _program_key(self):
+        return np.asarray(self._code).tobytes() + np.asarray(self._constants).tobytes()
+
+    def __str__(self):
+        return self._expression
+
+    def __reduce__(self):
+        return SecurityFusedValueHolder, (self._leaves,
+                                          np.asarray(self._constants).copy(),
+                                          np.asarray(self._code).copy(),
+                                          self._output,
+                                          self._first,
+                                          self._symbol_sources,
+                                          self._expression,
+                                          self._window,
+                                          self._dependency)
+
+
+def _fuse(node, list edits=None):
+    # edits collects (owner, attribute, former child) for every child swapped
+    leaves, constants, _, code, output, first = compile_program(node, _describe)
+    if len(code) >= 2 and leaves:
+        sources = _symbol_sources(node, {id(leaf): i for i, leaf in enumerate(leaves)})
+        return SecurityFusedValueHolder([_fuse(leaf, edits) for leaf in leaves],
+                                        constants,
+                                        code,
+                                        output,
+                                        first,
+                                        sources,
+                                        str(node),
+                                        node.window,
+                                        node.fields)
+
+    for attr in _CHILD_ATTRIBUTES:
+        child = getattr(node, attr, None)
+        if isinstance(child, SecurityValueHolder):
+            if edits is not None:
+                edits.append((node, attr, child))
+            setattr(node, attr, _fuse(child, edits))
+    return node
+
+
+def _reset_operators(node, set seen):
+    # a fused graph evaluates the operator holders without pushing them, so
+    # they still cache the value of their last own push
+    if id(node) in seen:
+        return
+    seen.add(id(node))
+    if isinstance(_describe(node), tuple):
+        node.updated = 0
+    for attr in _CHILD_ATTRIBUTES:
+        child = getattr(node, attr, None)
+        if isinstance(child, SecurityValueHolder):
+            _reset_operators(child, seen)
+    for leaf in getattr(node, '_leaves', []):
+        _reset_operators(leaf, seen)
+
+
+def fuse(SecurityValueHolder holder):
+    u"""
+    Collapse every run of two or more operator holders in holder into a
+    SecurityFusedValueHolder, the other nodes are kept and fused below.
+    """
+    cdef SecurityValueHolder fused = _fuse(copy.deepcopy(holder))
+    fused.share_universe()
+    return fused
+
+
+cdef class ExpressionGraph(object):
+    u"""
+    Compile a list of security value holders into a DAG where every distinct
+    sub-expression appears once. Nodes are identified by their class, their
+    ``__str__`` and the keys of their children, so ``(a + b) * c`` and
+    ``a + b * c`` are kept apart even though they print the same. With
+    ``fuse_operators`` the operator holders are collapsed by ``fuse`` first
+    and the leaves of the fused nodes are shared like any other child.
+
+    Without ``copy_expressions`` the graph is built over the given holders,
+    which carry its state from one run to the next: ``release`` puts back
+    the children the graph swapped in them, and a child shared with an equal
+    node is replaced by a copy of that node, which holds the same state. The
+    given expressions themselves are never merged into other nodes.
+    """
+
+    cdef public list nodes
+    cdef public list outputs
+    cdef public int deduplicated
+    cdef dict _registry
+    cdef dict _keys
+    cdef list _expressions
+    cdef list _edits
+    cdef dict _merged
+
+    def __init__(self, list expressions, bint copy_expressions=True, bint fuse_operators=False):
+        cdef SecurityValueHolder e
+
+        self.nodes = []
+        self.outputs = []
+        self.deduplicated = 0
+        self._registry = {}
+        self._keys = {}
+        self._expressions = None
+        self._edits = None
+        self._merged = {}
+
+        if copy_expressions:
+            expressions = copy.deepcopy(expressions)
+        else:
+            self._expressions = list(expressions)
+            self._edits = []
+        if fuse_operators:
+            expressions = [_fuse(e, self._edits) for e in expressions]
+
+        for e in expressions:
+            self.outputs.append(self._intern(e)[1])
+
+        # one universe for the whole graph, so shared nodes align with every
+        # expression reading them by integer indexing
+        universe = Universe()
+        for e in self.nodes:
+            e.share_universe(universe)
+
+    def _intern(self, SecurityValueHolder node):
+        cdef list child_keys = []
+        cdef str attr
+
+        if isinstance(node, SecuritySharedValueHolder):
+            node = (<SecuritySharedValueHolder>node)._target
+
+        if id(node) in self._keys:
+            self.deduplicated += 1
+            return self._keys[id(node)], node
+
+        for attr in _CHILD_ATTRIBUTES:
+            child = getattr(node, attr, None)
+            if isinstance(child, SecurityValueHolder):
+                child_key, canonical = self._intern(child)
+                child_keys.append((attr, child_key))
+                if self._edits is not None:
+                    self._edits.append((node, attr, child))
+                setattr(node, attr, SecuritySharedValueHolder(canonical))
+
+        if isinstance(node, SecurityFusedValueHolder):
+            leaves = (<SecurityFusedValueHolder>node)._leaves
+            for i, child in enumerate(leaves):
+                child_key, canonical = self._intern(child)
+                child_keys.append(('_leaves', child_key))
+                if self._edits is not None:
+                    self._edits.append((leaves, i, child))
+                leaves[i] = SecuritySharedValueHolder(canonical)
+            child_keys.append(('_code', node._program_key()))
+
+        key = (type(node).__name__, str(node), tuple(child_keys))
+        if self._expressions is not None and any(node is e for e in self._expressions):
+            key += (id(node),)
+        try:
+            canonical = self._registry[key]
+            self._merged[id(node)] = canonical
+            self.deduplicated += 1
+        except KeyError:
+            canonical = node
+            self._registry[key] = node
+            self._keys[id(node)] = key
+            self.nodes.append(node)
+        return key, canonical
+
+    def release(self):
+        u"""
+        Put the children swapped by the graph back into the holders it was
+        built over, so they can be pushed on their own again with the state
+        the graph left them in. The graph is not usable afterwards.
+        """
+        if self._edits is None:
+            return
+        for owner, attr, child in reversed(self._edits):
+            if isinstance(attr, str):
+                setattr(owner, attr, child)
+            else:
+                owner[attr] = child
+        self._edits = None
+
+        repaired = {}
+        seen = set()
+        for e in self._expressions:
+            self._repair(e, repaired)
+            _reset_operators(e, seen)
+            e.share_universe()
+        self._expressions = None
+        self._merged = {}
+
+    def _repair(self, node, dict repaired):
+        # a child the graph merged into an equal node was never pushed, it
+        # takes a copy of that node instead, repaired first
+        cdef str attr
+
+        if id(node) in repaired:
+            return
+        repaired[id(node)] = node
+        for attr in _CHILD_ATTRIBUTES:
+            child = getattr(node, attr, None)
+            if isinstance(child, SecurityValueHolder):
+                setattr(node, attr, self._repaired(child, repaired))
+        leaves = getattr(node, '_leaves', None)
+        if leaves:
+            for i, leaf in enumerate(leaves):
+                leaves[i] = self._repaired(leaf, repaired)
+
+    def _repaired(self, node, dict repaired):
+        canonical = self._merged.get(id(node))
+        if canonical is None:
+            self._repair(node, repaired)
+            return node
+        self._repair(canonical, repaired)
+        return copy.deepcopy(canonical)
+
+    @property
+    def fields(self):
+        cdef set dependency = set()
+        for node in self.outputs:
+            dependency.update(node.fields)
+        return list(dependency)
+
+    cpdef push(self, dict data):
+        for node in self.nodes:
+            node.push(data)
+
+    cpdef push_columns(self, list names, dict columns, size_t offset=0):
+        for node in self.nodes:
+            node.push_columns(names, columns, offset)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef batch_transform(self,
+                          long long[:] boundaries,
+                          list total_category,
+                          dict columns,
+                          bint dummy_category,
+                          double[:, :] output_values):
+
+        cdef size_t j
+        cdef size_t k
+        cdef size_t start
+        cdef size_t end
+        cdef list names
+        cdef double[:] values
+        cdef SecurityValueHolder holder
+
+        for j in range(boundaries.shape[0] - 1):
+            start = boundaries[j]
+            end = boundaries[j + 1]
+            names = total_category[start:end]
+            if not dummy_category:
+                require(len(set(names)) == len(names),
+                        ValueError,
+                        "There is duplicated category value in the snapshot ({0}, {1}, {2})".format(start,
+                                                                                                   len(set(names)),
+                                                                                                   len(names)))
+            self.push_columns(names, columns, start)
+            for k, holder in enumerate(self.outputs):
+                if not dummy_category:
+                    values = holder.value_by_names(names).values.astype(float)
+                    output_values[start:end, k] = values
+                else:
+                    output_values[start, k] = holder.value_by_name(names[0])
+
+    def __len__(self):
+        return len(self.nodes)
@@ -5,8 +5,12 @@ Created on 2017-2-11
 @author: cheng.li
 """
 
+cimport numpy as np
 from PyFin.Math.Accumulators.IAccumulators cimport Accumulator
+from PyFin.Math.Accumulators.IAccumulators cimport RowBinding
+from PyFin.Math.Accumulators.PanelAccumulators cimport PanelStatefulValueHolder
 from PyFin.Analysis.SeriesValues cimport SeriesValues
+from PyFin.Analysis.SeriesValues cimport Universe
 
 
 cdef class SecurityValueHolder(object):
@@ -17,12 +21,30 @@ cdef class SecurityValueHolder(object):
     cdef public int updated
     cdef public dict _innerHolders
     cdef public SeriesValues cached
-
+    cdef list _keys
+    cdef np.ndarray _codes
+    cdef Universe _universe
+    cdef RowBinding _binding
+    cdef public PanelStatefulValueHolder _panel
+    cdef public dict _panelColumns
+    cdef np.ndarray _panelOrder
+
+    cpdef share_universe(self, Universe universe=*)
+    cdef Universe _symbol_universe(self)
+    cdef list _sorted_symbols(self, dict symbols)
+    cdef dict _inner_symbols(self)
+    cdef _init_panel(self, window, list names)
+    cdef _push_panel(self, list names, list values)
+    cdef RowBinding _bind_inner_holders(self, list columns)
+    cdef _unbind_inner_holders(self)
+    cdef np.ndarray _inner_rows(self, list computed_names, list computed_values, size_t n, dict columns, size_t offset)
+    cdef _push_inner_rows(self, list names, const double[:, ::1] rows)
     cpdef value_all(self)
     cpdef SeriesValues value_by_names(self, list names)
     cpdef double value_by_name(self, name)
     cpdef shift(self, int n)
-    cpdef transform(self, data, str name=*, str category_field=*, bint dropna=*)
+    cpdef push_columns(self, list names, dict columns, size_t offset=*)
+    cpdef transform(self, data, str name=*, str category_field=*, bint dropna=*, bint batch=*, int n_jobs=*)
 
 
 cdef class SecuritySingleValueHolder(SecurityValueHolder):
@@ -30,6 +52,7 @@ cdef class SecuritySingleValueHolder(SecurityValueHolder):
     cdef public SecurityValueHolder _compHolder
     cdef public str _holderName
     cpdef push(self, dict data)
+    cpdef push_columns(self, list names, dict columns, size_t offset=*)
 
 
 cdef class SecurityBinaryValueHolder(SecurityValueHolder):
@@ -38,6 +61,7 @@ cdef class SecurityBinaryValueHolder(SecurityValueHolder):
     cdef public SecurityValueHolder _compHolder2
     cdef public str _holderName2
     cpdef push(self, dict data)
+    cpdef push_columns(self, list names, dict columns, size_t offset=*)
 
 
 cdef class SecurityStatelessSingleValueHolder(SecurityValueHolder):
@@ -45,6 +69,7 @@ cdef class SecurityStatelessSingleValueHolder(SecurityValueHolder):
     cdef public SecurityValueHolder _compHolder
     cdef public str _holderName
     cpdef push(self, dict data)
+    cpdef push_columns(self, list names, dict columns, size_t offset=*)
 
 
 cdef class FilteredSecurityValueHolder(SecurityValueHolder):
@@ -55,6 +80,7 @@ cdef class FilteredSecurityValueHolder(SecurityValueHolder):
     cpdef double value_by_name(self, name)
     cpdef SeriesValues value_by_names(self, list names)
     cpdef push(self, dict data)
+    cpdef push_columns(self, list names, dict columns, size_t offset=*)
 
 
 cdef class IdentitySecurityValueHolder(SecurityValueHolder):
@@ -63,6 +89,7 @@ cdef class IdentitySecurityValueHolder(SecurityValueHolder):
     cdef set _symbols
 
     cpdef push(self, dict data)
+    cpdef push_columns(self, list names, dict columns, size_t offset=*)
     cpdef double value_by_name(self, name)
     cpdef SeriesValues value_all(self)
     cpdef SeriesValues value_by_names(self, list names)
@@ -72,6 +99,7 @@ cdef class SecurityConstArrayValueHolder(SecurityValueHolder):
     cdef SeriesValues _values
 
     cpdef push(self, dict data)
+    cpdef push_columns(self, list names, dict columns, size_t offset=*)
     cpdef double value_by_name(self, name)
     cpdef SeriesValues value_all(self)
     cpdef SeriesValues value_by_names(self, list names)
@@ -86,6 +114,7 @@ cdef class SecurityUnitoryValueHolder(SecurityValueHolder):
     cpdef SeriesValues value_all(self)
     cpdef SeriesValues value_by_names(self, list names)
     cpdef push(self, dict data)
+    cpdef push_columns(self, list names, dict columns, size_t offset=*)
 
 
 cdef class SecurityNegValueHolder(SecurityUnitoryValueHolder):
@@ -100,6 +129,7 @@ cdef class SecurityCurrentValueHolder(SecurityValueHolder):
     cdef dict _symbol_values
 
     cpdef push(self, dict data)
+    cpdef push_columns(self, list names, dict columns, size_t offset=*)
     cpdef SeriesValues value_all(self)
     cpdef SeriesValues value_by_names(self, list names)
     cpdef double value_by_name(self, name)
@@ -109,12 +139,19 @@ cdef class SecurityLatestValueHolder(SecurityValueHolder):
     cdef dict _symbol_values
 
     cpdef push(self, dict data)
+    cpdef push_columns(self, list names, dict columns, size_t offset=*)
     cpdef SeriesValues value_all(self)
     cpdef SeriesValues value_by_names(self, list names)
     cpdef double value_by_name(self, name)
 
 
 cpdef SecurityValueHolder build_holder(name)
+cpdef batch_transform(SecurityValueHolder holder,
+                      long long[:] boundaries,
+                      list total_category,
+                      dict columns,
+                      bint dummy_category,
+                      double[:] output_values)
 
 
 cdef class SecurityCombinedValueHolder(SecurityValueHolder):
@@ -127,6 +164,7 @@ cdef class SecurityCombinedValueHolder(SecurityValueHolder):
     cpdef SeriesValues value_all(self)
     cpdef SeriesValues value_by_names(self, list names)
     cpdef push(self, dict data)
+    cpdef push_columns(self, list names, dict columns, size_t offset=*)
 
 cdef class SecurityXorValueHolder(SecurityCombinedValueHolder):
 
@@ -197,4 +235,5 @@ cdef class SecurityIIFValueHolder(SecurityValueHolder):
     cpdef double value_by_name(self, name)
     cpdef SeriesValues value_all(self)
     cpdef SeriesValues value_by_names(self, list names)
-    cpdef push(self, dict data)
\ No newline at end of file
+    cpdef push(self, dict data)
+    cpdef push_columns(self, list names, dict columns, size_t offset=*)
\ No newline at end of file
@@ -15,10 +15,28 @@ import pandas as pd
 cimport cython
 from libc.math cimport isnan
 from PyFin.Analysis.SeriesValues cimport SeriesValues
+from PyFin.Analysis.SeriesValues cimport Universe
 from PyFin.Utilities.Tools import to_dict
+from PyFin.Utilities.Tools import to_columns
+from PyFin.Utilities.Tools import index_boundaries
+from PyFin.Utilities.Asserts cimport require
 from PyFin.Math.Accumulators.StatefulAccumulators import _parse
 from PyFin.Math.Accumulators.StatefulAccumulators cimport Shift
 from PyFin.Math.Accumulators.StatefulAccumulators cimport Delta
+from PyFin.Math.Accumulators.StatefulAccumulators import MovingSum
+from PyFin.Math.Accumulators.StatefulAccumulators import MovingAverage
+from PyFin.Math.Accumulators.StatefulAccumulators import MovingVariance
+from PyFin.Math.Accumulators.StatefulAccumulators import MovingStandardDeviation
+from PyFin.Math.Accumulators.StatefulAccumulators import MovingMax
+from PyFin.Math.Accumulators.StatefulAccumulators import MovingMin
+from PyFin.Math.Accumulators.StatefulAccumulators import MovingCorrelation
+from PyFin.Math.Accumulators.PanelAccumulators import PanelMovingSum
+from PyFin.Math.Accumulators.PanelAccumulators import PanelMovingAverage
+from PyFin.Math.Accumulators.PanelAccumulators import PanelMovingVariance
+from PyFin.Math.Accumulators.PanelAccumulators import PanelMovingStandardDeviation
+from PyFin.Math.Accumulators.PanelAccumulators import PanelMovingMax
+from PyFin.Math.Accumulators.PanelAccumulators import PanelMovingMin
+from PyFin.Math.Accumulators.PanelAccumulators import PanelMovingCorrelation
 from PyFin.Math.Accumulators.IAccumulators cimport Current
 from PyFin.Math.Accumulators.IAccumulators cimport Latest
 from PyFin.Math.Accumulators.IAccumulators cimport isanumber
@@ -30,6 +48,42 @@ else:
     div_attr = "div"
 
 
+# attributes holding the sub-holders of a holder
+_CHILD_ATTRIBUTES = ('_compHolder',
+                     '_compHolder1',
+                     '_compHolder2',
+                     '_computer',
+                     '_filter',
+                     '_flag',
+                     '_left',
+                     '_right',
+                     '_inner',
+                     '_group')
+
+
+# accumulators whose per symbol copies are replaced by one panel accumulator
+_PANEL_TYPES = {MovingSum: PanelMovingSum,
+                MovingAverage: PanelMovingAverage,
+                MovingVariance: PanelMovingVariance,
+                MovingStandardDeviation: PanelMovingStandardDeviation,
+                MovingMax: PanelMovingMax,
+                MovingMin: PanelMovingMin,
+                MovingCorrelation: PanelMovingCorrelation}
+
+
+cdef PanelStatefulValueHolder _panel_of(Accumulator template, window):
+    u"""
+    Panel accumulator doing the work of the per symbol copies of template, or
+    None when there is no panel variant of it.
+    """
+    panel_type = _PANEL_TYPES.get(type(template))
+    if panel_type is None or not isinstance(window, int):
+        return None
+    if panel_type in (PanelMovingVariance, PanelMovingStandardDeviation):
+        return panel_type(window, isPopulation=template._isPop)
+    return panel_type(window)
+
+
 cdef class SecurityValueHolder(object):
 
     def __init__(self):
@@ -38,10 +92,12 @@ cdef class SecurityValueHolder(object):
         self.updated = 0
         self.cached = None
         self._innerHolders = {}
+        self._panel = None
+        self._panelColumns = {}
 
     @property
     def symbolList(self):
-        return list(self._innerHolders.keys())
+        return list(self._inner_symbols().keys())
 
     @property
     def fields(self):
@@ -55,6 +111,140 @@ cdef class SecurityValueHolder(object):
     def value(self):
         return self.value_all()
 
+    cpdef share_universe(self, Universe universe=None):
+        u"""
+        Encode the symbols of this holder and of all the holders below it with
+        universe, a new one by default, so that their series are aligned by
+        integer indexing.
+        """
+        cdef str attr
+        if universe is None:
+            universe = Universe()
+        elif universe is self._universe:
+            return
+        self._universe = universe
+        self._keys = None
+        self._codes = None
+        if self.cached is not None and self.cached.universe is not None:
+            self.cached = SeriesValues(self.cached.values, self.cached.index(), universe)
+        for attr in _CHILD_ATTRIBUTES:
+            child = getattr(self, attr, None)
+            if isinstance(child, SecurityValueHolder):
+                (<SecurityValueHolder>child).share_universe(universe)
+
+    cdef Universe _symbol_universe(self):
+        if self._universe is None:
+            self._universe = Universe()
+        return self._universe
+
+    cdef list _sorted_symbols(self, dict symbols):
+        # symbols are never removed, so the sorted keys and their codes only
+        # change when new symbols come in
+        if self._keys is None or len(self._keys) != len(symbols):
+            self._keys = sorted(symbols.keys())
+            self._codes = self._symbol_universe().encode(self._keys)
+            if self._panel is not None:
+                self._panelOrder = np.array([symbols[name] for name in self._keys], dtype=np.int64)
+        return self._keys
+
+    cdef dict _inner_symbols(self):
+        return self._panelColumns if self._panel is not None else self._innerHolders
+
+    cdef _init_panel(self, window, list names):
+        # with a panel variant of the template, symbol i owns column i of
+        # the panel instead of a copy of the template
+        self._panel = _panel_of(self._holderTemplate, window)
+        if self._panel is not None:
+            self._panelColumns = {name: i for i, name in enumerate(names)}
+            self._panel.resize(len(names))
+
+    cdef _push_panel(self, list names, list values):
+        u"""
+        Push the values of the named symbols, one array per input of the
+        panel. Symbols not in names get nan, which the panel skips.
+        """
+        cdef dict columns = self._panelColumns
+        cdef size_t n = len(columns)
+        cdef np.ndarray[np.int64_t, ndim=1] positions = np.empty(len(names), dtype=np.int64)
+        cdef np.ndarray full
+        cdef list inputs = []
+        cdef Py_ssize_t i
+
+        for i, name in enumerate(names):
+            try:
+                positions[i] = columns[name]
+            except KeyError:
+                columns[name] = n
+                positions[i] = n
+                n += 1
+
+        if n > self._panel.n_symbols():
+            self._panel.resize(n)
+
+        for v in values:
+            full = np.full(n, NAN)
+            full[positions] = v
+            inputs.append(full)
+        self._panel.push(*inputs)
+
+    cdef RowBinding _bind_inner_holders(self, list columns):
+        # the inner holders stay bound between snapshots, pushing a dict
+        # unbinds them
+        cdef Accumulator holder
+        if self._binding is None:
+            self._binding = RowBinding(columns)
+            for holder in self._innerHolders.values():
+                holder.bind(self._binding)
+        return self._binding
+
+    cdef _unbind_inner_holders(self):
+        cdef Accumulator holder
+        if self._binding is not None:
+            for holder in self._innerHolders.values():
+                holder.bind(None)
+            self._binding = None
+
+    cdef np.ndarray _inner_rows(self, list computed_names, list computed_values, size_t n, dict columns, size_t offset):
+        u"""
+        Rows pushed into the inner holders: the values computed by the
+        sub-holders, then the raw fields the template also reads.
+        """
+        cdef RowBinding binding = self._binding
+        cdef np.ndarray[double, ndim=2] rows
+        cdef Py_ssize_t j
+
+        if binding is None:
+            binding = self._bind_inner_holders(
+                computed_names + [f for f in self._holderTemplate.dependency if f not in computed_names])
+
+        rows = np.empty((n, len(binding.columns)))
+        for j, values in enumerate(computed_values):
+            rows[:, j] = values
+        for j in range(len(computed_values), len(binding.columns)):
+            f = binding.columns[j]
+            rows[:, j] = columns[f][offset:offset + n] if f in columns else NAN
+        return rows
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef _push_inner_rows(self, list names, const double[:, ::1] rows):
+        cdef RowBinding binding = self._binding
+        cdef Accumulator holder
+        cdef Py_ssize_t i
+
+        try:
+            for i, name in enumerate(names):
+                binding.row = &rows[i, 0]
+                try:
+                    holder = self._innerHolders[name]
+                except KeyError:
+                    holder = copy.deepcopy(self._holderTemplate)
+                    holder.bind(binding)
+                    self._innerHolders[name] = holder
+                holder.push(None)
+        finally:
+            binding.row = NULL
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     cpdef value_all(self):
@@ -66,9 +256,14 @@ cdef class SecurityValueHolder(object):
         cdef int i
 
         if self.updated:
-            return SeriesValues(self.cached.values, self.cached.name_mapping)
+            return self.cached._with_values(self.cached.values)
+        elif self._panel is not None:
+            self._sorted_symbols(self._panelColumns)
+            self.cached = SeriesValues(self._panel.result()[self._panelOrder], self._codes, self._universe)
+            self.updated = 1
+            return self.cached
         else:
-            keys = sorted(self._innerHolders.keys())
+            keys = self._sorted_symbols(self._innerHolders)
             n = len(keys)
             values = np.zeros(n)
             for i, name in enumerate(keys):
@@ -77,7 +272,7 @@ cdef class SecurityValueHolder(object):
                     values[i] = holder.result()
                 except ArithmeticError:
                     values[i] = NAN
-            self.cached = SeriesValues(values, index=keys)
+            self.cached = SeriesValues(values, self._codes, self._universe)
             self.updated = 1
             return self.cached
 
@@ -91,6 +286,9 @@ cdef class SecurityValueHolder(object):
 
         if self.updated:
             return self.cached[names]
+        elif self._panel is not None:
+            res = self._panel.result()[[self._panelColumns[name] for name in names]]
+            return SeriesValues(res, names, self._symbol_universe())
         else:
             n = len(names)
             res = np.zeros(n)
@@ -100,12 +298,14 @@ cdef class SecurityValueHolder(object):
                     res[i] = holder.result()
                 except ArithmeticError:
                     res[i] = NAN
-            return SeriesValues(res, index=names)
+            return SeriesValues(res, names, self._symbol_universe())
 
     cpdef double value_by_name(self, name):
         cdef Accumulator holder
         if self.updated:
             return self.cached[name]
+        elif self._panel is not None:
+            return self._panel.result()[self._panelColumns[name]]
         else:
             try:
                 holder = self._innerHolders[name]
@@ -115,13 +315,17 @@ cdef class SecurityValueHolder(object):
 
     @property
     def holders(self):
-        return self._innerHolders
+        return self._panel if self._panel is not None else self._innerHolders
 
     def isFullByName(self, name):
+        if self._panel is not None:
+            return bool(self._panel.isFull()[self._panelColumns[name]])
         return self._innerHolders[name].isFull()
 
     @property
     def isFull(self):
+        if self._panel is not None:
+            return bool(self._panel.isFull().all())
         for name in self._innerHolders:
             if not self._innerHolders[name].isFull():
                 return False
@@ -208,7 +412,27 @@ cdef class SecurityValueHolder(object):
     cpdef shift(self, int n):
         return SecurityShiftedValueHolder(n, self)
 
-    cpdef transform(self, data, str name=None, str category_field=None, bint dropna=True):
+    cpdef push_columns(self, list names, dict columns, size_t offset=0):
+        # holders only known to push(dict) get one dict per symbol, holding
+        # the fields they depend on
+        cdef list fields = [f for f in (self._dependency if self._dependency is not None else columns) if f in columns]
+        cdef size_t n = len(names)
+        cdef list rows
+
+        if fields:
+            rows = np.column_stack([columns[f][offset:offset + n] for f in fields]).tolist()
+        else:
+            rows = [[]] * n
+        self.push({name: dict(zip(fields, row)) for name, row in zip(names, rows)})
+
+    cpdef transform(self, data, str name=None, str category_field=None, bint dropna=True, bint batch=True, int n_jobs=1):
+        u"""
+        Push data snapshot by snapshot and return the values of this holder
+        for every row. The serial transform leaves this holder with the state
+        of the last snapshot. With n_jobs > 1 the symbols are computed by
+        worker processes on copies of this holder, starting from its current
+        state, and this holder is left unchanged.
+        """
 
         cdef str f
         cdef int dummy_category
@@ -228,6 +452,31 @@ cdef class SecurityValueHolder(object):
             if f not in data:
                 raise ValueError('({0}) dependency is not in input data'.format(f))
 
+        if n_jobs != 1:
+            from PyFin.Analysis.parallel import can_shard
+            from PyFin.Analysis.parallel import is_cross_sectional
+            from PyFin.Analysis.parallel import staged_transform
+            from PyFin.Analysis.parallel import sharded_transform
+            from PyFin.Analysis.parallel import _holder_shard
+            if can_shard([self], category_field, n_jobs):
+                if is_cross_sectional(self):
+                    return staged_transform(data,
+                                            [self],
+                                            [name if name else 'transformed'],
+                                            category_field,
+                                            n_jobs,
+                                            dropna,
+                                            batch)
+                return sharded_transform(_holder_shard,
+                                         data,
+                                         category_field,
+                                         n_jobs,
+                                         dropna,
+                                         self,
+                                         name if name else 'transformed',
+                                         category_field,
+                                         batch)
+
         dummy_category = 0
         if not category_field:
             category_field = 'dummy'
@@ -242,24 +491,32 @@ cdef class SecurityValueHolder(object):
 
         total_category = data[category_field].values
         data = data.select_dtypes([np.number])
-        matrix_values = data.values.astype(float)
         columns = data.columns.tolist()
-        split_category, split_values = to_dict(total_index, total_category.tolist(), matrix_values, columns)
-
         output_values = np.zeros(len(data))
 
-        start_count = 0
-        if not dummy_category:
-            for j, dict_data in enumerate(split_values):
-                self.push(dict_data)
-                end_count = start_count + len(dict_data)
-                narr_view = self.value_by_names(split_category[j]).values.astype(float)
-                output_values[start_count:end_count]  = narr_view
-                start_count = end_count
+        if batch:
+            batch_transform(self,
+                            index_boundaries(total_index),
+                            total_category.tolist(),
+                            to_columns(data.values, columns),
+                            dummy_category,
+                            output_values)
         else:
-            for j, dict_data in enumerate(split_values):
-                self.push(dict_data)
-                output_values[j] = float(self.value_by_name(split_category[j][0]))
+            matrix_values = data.values.astype(float)
+            split_category, split_values = to_dict(total_index, total_category.tolist(), matrix_values, columns)
+
+            start_count = 0
+            if not dummy_category:
+                for j, dict_data in enumerate(split_values):
+                    self.push(dict_data)
+                    end_count = start_count + len(dict_data)
+                    narr_view = self.value_by_names(split_category[j]).values.astype(float)
+                    output_values[start_count:end_count]  = narr_view
+                    start_count = end_count
+            else:
+                for j, dict_data in enumerate(split_values):
+                    self.push(dict_data)
+                    output_values[j] = float(self.value_by_name(split_category[j][0]))
 
         df = pd.DataFrame(np.array(output_values), index=data.index, columns=[name])
         if not dummy_category:
@@ -279,9 +536,12 @@ cdef class SecuritySingleValueHolder(SecurityValueHolder):
         self._dependency = self._compHolder.fields
         self._window = _parse(window)+ self._compHolder.window
         self._holderTemplate = holderType(window=window, x=str(self._compHolder), **kwargs)
-        self._innerHolders = {
-            name: copy.deepcopy(self._holderTemplate) for name in self._compHolder.symbolList
-        }
+        self._init_panel(window, self._compHolder.symbolList)
+        if self._panel is None:
+            self._innerHolders = {
+                name: copy.deepcopy(self._holderTemplate) for name in self._compHolder.symbolList
+            }
+        self.share_universe()
 
     cpdef push(self, dict data):
         cdef SeriesValues sec_values
@@ -289,10 +549,15 @@ cdef class SecuritySingleValueHolder(SecurityValueHolder):
         cdef dict sample
         cdef list names
         self.updated = 0
+        self._unbind_inner_holders()
         self._compHolder.push(data)
         names = list(data.keys())
         sec_values = self._compHolder.value_by_names(names)
 
+        if self._panel is not None:
+            self._push_panel(names, [sec_values.values])
+            return
+
         for name in sec_values.index():
             sample = data[name]
             sample[self._holderName] = sec_values[name]
@@ -304,6 +569,16 @@ cdef class SecuritySingleValueHolder(SecurityValueHolder):
                 holder.push(sample)
                 self._innerHolders[name] = holder
 
+    cpdef push_columns(self, list names, dict columns, size_t offset=0):
+        cdef np.ndarray sec_values
+        self.updated = 0
+        self._compHolder.push_columns(names, columns, offset)
+        sec_values = self._compHolder.value_by_names(names).values
+        if self._panel is not None:
+            self._push_panel(names, [sec_values])
+        else:
+            self._push_inner_rows(names, self._inner_rows([self._holderName], [sec_values], len(names), columns, offset))
+
     def __str__(self):
         return str(self._holderTemplate)
 
@@ -318,9 +593,12 @@ cdef class SecurityBinaryValueHolder(SecurityValueHolder):
         self._dependency = list(set(self._compHolder1.fields + self._compHolder2.fields))
         self._window = window + max(self._compHolder1.window, self._compHolder2.window)
         self._holderTemplate = holderType(window=window, x=str(self._compHolder1), y=str(self._compHolder2))
-        self._innerHolders = {
-            name: copy.deepcopy(self._holderTemplate) for name in self._compHolder1.symbolList
-            }
+        self._init_panel(window, self._compHolder1.symbolList)
+        if self._panel is None:
+            self._innerHolders = {
+                name: copy.deepcopy(self._holderTemplate) for name in self._compHolder1.symbolList
+                }
+        self.share_universe()
 
     cpdef push(self, dict data):
 
@@ -330,6 +608,7 @@ cdef class SecurityBinaryValueHolder(SecurityValueHolder):
         cdef dict sample
         cdef list names
         self.updated = 0
+        self._unbind_inner_holders()
         self._compHolder1.push(data)
         self._compHolder2.push(data)
 
@@ -337,6 +616,10 @@ cdef class SecurityBinaryValueHolder(SecurityValueHolder):
         sec_values1 = self._compHolder1.value_by_names(names)
         sec_values2 = self._compHolder2.value_by_names(names)
 
+        if self._panel is not None:
+            self._push_panel(names, [sec_values1.values, sec_values2.values])
+            return
+
         for name in sec_values1.index():
             sample = data[name]
             sample[self._holderName1] = sec_values1[name]
@@ -349,6 +632,23 @@ cdef class SecurityBinaryValueHolder(SecurityValueHolder):
                 holder.push(sample)
                 self._innerHolders[name] = holder
 
+    cpdef push_columns(self, list names, dict columns, size_t offset=0):
+        cdef np.ndarray sec_values1
+        cdef np.ndarray sec_values2
+        self.updated = 0
+        self._compHolder1.push_columns(names, columns, offset)
+        self._compHolder2.push_columns(names, columns, offset)
+        sec_values1 = self._compHolder1.value_by_names(names).values
+        sec_values2 = self._compHolder2.value_by_names(names).values
+        if self._panel is not None:
+            self._push_panel(names, [sec_values1, sec_values2])
+        else:
+            self._push_inner_rows(names, self._inner_rows([self._holderName1, self._holderName2],
+                                                          [sec_values1, sec_values2],
+                                                          len(names),
+                                                          columns,
+                                                          offset))
+
     def __str__(self):
         return str(self._holderTemplate)
 
@@ -362,6 +662,7 @@ cdef class SecurityStatelessSingleValueHolder(SecurityValueHolder):
         self._holderTemplate = holderType(x=str(self._compHolder), **kwargs)
         self._innerHolders = {name: copy.deepcopy(self._holderTemplate) for name in self._compHolder.symbolList}
         self._dependency = self._compHolder.fields
+        self.share_universe()
 
     cpdef push(self, dict data):
         cdef SeriesValues sec_values
@@ -369,6 +670,7 @@ cdef class SecurityStatelessSingleValueHolder(SecurityValueHolder):
         cdef dict sample
         cdef list names
         self.updated = 0
+        self._unbind_inner_holders()
         self._compHolder.push(data)
         names = list(data.keys())
         sec_values = self._compHolder.value_by_names(names)
@@ -384,6 +686,13 @@ cdef class SecurityStatelessSingleValueHolder(SecurityValueHolder):
                 holder.push(sample)
                 self._innerHolders[name] = holder
 
+    cpdef push_columns(self, list names, dict columns, size_t offset=0):
+        cdef np.ndarray sec_values
+        self.updated = 0
+        self._compHolder.push_columns(names, columns, offset)
+        sec_values = self._compHolder.value_by_names(names).values
+        self._push_inner_rows(names, self._inner_rows([self._holderName], [sec_values], len(names), columns, offset))
+
     def __str__(self):
         return str(self._holderTemplate)
 
@@ -398,6 +707,7 @@ cdef class FilteredSecurityValueHolder(SecurityValueHolder):
         self._dependency = list(set(self._computer.fields + self._filter.fields))
         self.updated = 0
         self.cached = None
+        self.share_universe()
 
     def isFullByName(self, name):
         return self._computer.isFullByName(name)
@@ -448,13 +758,18 @@ cdef class FilteredSecurityValueHolder(SecurityValueHolder):
         else:
             filter_value = self._filter.value_by_names(names)
             orig_values = self._computer.value_by_names(names)
-            return SeriesValues(np.where(filter_value.values, orig_values.values, NAN), filter_value.name_mapping)
+            return filter_value._with_values(np.where(filter_value.values, filter_value._aligned(orig_values), NAN))
 
     cpdef push(self, dict data):
         self._computer.push(data)
         self._filter.push(data)
         self.updated = 0
 
+    cpdef push_columns(self, list names, dict columns, size_t offset=0):
+        self._computer.push_columns(names, columns, offset)
+        self._filter.push_columns(names, columns, offset)
+        self.updated = 0
+
     def __str__(self):
         return "\\mathrm{{Filter}}({0}, {1})".format(str(self._filter), str(self._computer))
 
@@ -483,6 +798,10 @@ cdef class IdentitySecurityValueHolder(SecurityValueHolder):
         self._symbols = self._symbols.union(data.keys())
         self.updated = 0
 
+    cpdef push_columns(self, list names, dict columns, size_t offset=0):
+        self._symbols = self._symbols.union(names)
+        self.updated = 0
+
     cpdef SeriesValues value_all(self):
         return SeriesValues({n: self._value for n in self._symbols})
 
@@ -517,6 +836,9 @@ cdef class SecurityConstArrayValueHolder(SecurityValueHolder):
     cpdef push(self, dict data):
         pass
 
+    cpdef push_columns(self, list names, dict columns, size_t offset=0):
+        pass
+
     cpdef double value_by_name(self, name):
         if name in self._values:
             return self._values[name]
@@ -541,6 +863,7 @@ cdef class SecurityUnitoryValueHolder(SecurityValueHolder):
         self._op = op
         self.updated = 0
         self.cached = None
+        self.share_universe()
 
     def isFullByName(self, name):
         return self._right.isFullByName(name)
@@ -557,6 +880,10 @@ cdef class SecurityUnitoryValueHolder(SecurityValueHolder):
         self._right.push(data)
         self.updated = 0
 
+    cpdef push_columns(self, list names, dict columns, size_t offset=0):
+        self._right.push_columns(names, columns, offset)
+        self.updated = 0
+
     cpdef SeriesValues value_all(self):
         if self.updated:
             return self.cached
@@ -619,6 +946,23 @@ cdef class SecurityCurrentValueHolder(SecurityValueHolder):
             if name not in self._symbol_values:
                 self._symbol_values[name] = NAN
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef push_columns(self, list names, dict columns, size_t offset=0):
+        cdef double[:] values
+        cdef size_t i
+        field = self._dependency[0]
+        self.updated = 0
+
+        if field in columns:
+            values = columns[field]
+            for i, name in enumerate(names):
+                self._symbol_values[name] = values[offset + i]
+        else:
+            for name in names:
+                if name not in self._symbol_values:
+                    self._symbol_values[name] = NAN
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     cpdef SeriesValues value_all(self):
@@ -630,12 +974,12 @@ cdef class SecurityCurrentValueHolder(SecurityValueHolder):
         if self.updated:
             return self.cached
         else:
-            keys = sorted(self._symbol_values.keys())
+            keys = self._sorted_symbols(self._symbol_values)
             n = len(keys)
             values = np.zeros(n)
             for i, name in enumerate(keys):
                 values[i] = self._symbol_values[name]
-            self.cached = SeriesValues(values, index=keys)
+            self.cached = SeriesValues(values, self._codes, self._universe)
             self.updated = 1
             return self.cached
 
@@ -654,7 +998,7 @@ cdef class SecurityCurrentValueHolder(SecurityValueHolder):
             res = np.zeros(n)
             for i, name in enumerate(names):
                 res[i] = self._symbol_values[name]
-            return SeriesValues(res, index=names)
+            return SeriesValues(res, names, self._symbol_universe())
 
     cpdef double value_by_name(self, name):
         cdef Accumulator holder
@@ -701,6 +1045,28 @@ cdef class SecurityLatestValueHolder(SecurityValueHolder):
             if name not in self._symbol_values:
                 self._symbol_values[name] = NAN
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef push_columns(self, list names, dict columns, size_t offset=0):
+        cdef double[:] values
+        cdef double value
+        cdef size_t i
+        field = self._dependency[0]
+        self.updated = 0
+
+        if field in columns:
+            values = columns[field]
+            for i, name in enumerate(names):
+                value = values[offset + i]
+                if not isnan(value):
+                    self._symbol_values[name] = value
+                elif name not in self._symbol_values:
+                    self._symbol_values[name] = NAN
+        else:
+            for name in names:
+                if name not in self._symbol_values:
+                    self._symbol_values[name] = NAN
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     cpdef SeriesValues value_all(self):
@@ -712,12 +1078,12 @@ cdef class SecurityLatestValueHolder(SecurityValueHolder):
         if self.updated:
             return self.cached
         else:
-            keys = sorted(self._symbol_values.keys())
+            keys = self._sorted_symbols(self._symbol_values)
             n = len(keys)
             values = np.zeros(n)
             for i, name in enumerate(keys):
                 values[i] = self._symbol_values[name]
-            self.cached = SeriesValues(values, index=keys)
+            self.cached = SeriesValues(values, self._codes, self._universe)
             self.updated = 1
             return self.cached
 
@@ -736,7 +1102,7 @@ cdef class SecurityLatestValueHolder(SecurityValueHolder):
             res = np.zeros(n)
             for i, name in enumerate(names):
                 res[i] = self._symbol_values[name]
-            return SeriesValues(res, index=names)
+            return SeriesValues(res, names, self._symbol_universe())
 
     cpdef double value_by_name(self, name):
         cdef Accumulator holder
@@ -769,6 +1135,39 @@ cpdef SecurityValueHolder build_holder(name):
         raise ValueError("{0} is not recognized as valid holder or name".format(name))
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef batch_transform(SecurityValueHolder holder,
+                      long long[:] boundaries,
+                      list total_category,
+                      dict columns,
+                      bint dummy_category,
+                      double[:] output_values):
+
+    cdef size_t j
+    cdef size_t start
+    cdef size_t end
+    cdef list names
+    cdef double[:] values
+
+    for j in range(boundaries.shape[0] - 1):
+        start = boundaries[j]
+        end = boundaries[j + 1]
+        names = total_category[start:end]
+        if not dummy_category:
+            require(len(set(names)) == len(names),
+                    ValueError,
+                    "There is duplicated category value in the snapshot ({0}, {1}, {2})".format(start,
+                                                                                               len(set(names)),
+                                                                                               len(names)))
+        holder.push_columns(names, columns, start)
+        if not dummy_category:
+            values = holder.value_by_names(names).values.astype(float)
+            output_values[start:end] = values
+        else:
+            output_values[start] = holder.value_by_name(names[0])
+
+
 cdef class SecurityCombinedValueHolder(SecurityValueHolder):
 
     def __init__(self, left, right, op):
@@ -780,6 +1179,7 @@ cdef class SecurityCombinedValueHolder(SecurityValueHolder):
         self._op = op
         self.updated = 0
         self.cached = None
+        self.share_universe()
 
     def isFullByName(self, name):
         return self._left.isFullByName(name) and self._right.isFullByName(name)
@@ -797,6 +1197,11 @@ cdef class SecurityCombinedValueHolder(SecurityValueHolder):
         self._right.push(data)
         self.updated = 0
 
+    cpdef push_columns(self, list names, dict columns, size_t offset=0):
+        self._left.push_columns(names, columns, offset)
+        self._right.push_columns(names, columns, offset)
+        self.updated = 0
+
     cpdef SeriesValues value_all(self):
         if self.updated:
             return self.cached
@@ -967,6 +1372,7 @@ cdef class SecurityIIFValueHolder(SecurityValueHolder):
         self._dependency = list(set(self._flag.fields + self._left.fields + self._right.fields))
         self.updated = 0
         self.cached = None
+        self.share_universe()
 
     def isFullByName(self, name):
         return self._flag.isFullByName(name) and self._left.isFullByName(name) and self._right.isFullByName(name)
@@ -985,6 +1391,12 @@ cdef class SecurityIIFValueHolder(SecurityValueHolder):
         self._right.push(data)
         self.updated = 0
 
+    cpdef push_columns(self, list names, dict columns, size_t offset=0):
+        self._flag.push_columns(names, columns, offset)
+        self._left.push_columns(names, columns, offset)
+        self._right.push_columns(names, columns, offset)
+        self.updated = 0
+
     cpdef SeriesValues value_all(self):
 
         cdef SeriesValues flag_value
@@ -996,13 +1408,12 @@ cdef class SecurityIIFValueHolder(SecurityValueHolder):
         else:
             flag_value = self._flag.value_all()
 
-            left_value = self._left.value_all().values
-            right_value = self._right.value_all().values
+            left_value = flag_value._aligned(self._left.value_all())
+            right_value = flag_value._aligned(self._right.value_all())
 
-            self.cached = SeriesValues(np.where(flag_value.values,
-                                                left_value,
-                                                right_value),
-                                       flag_value.name_mapping)
+            self.cached = flag_value._with_values(np.where(flag_value.values,
+                                                           left_value,
+                                                           right_value))
             self.updated = 1
             return self.cached
 
@@ -1026,13 +1437,12 @@ cdef class SecurityIIFValueHolder(SecurityValueHolder):
         else:
             flag_value = self._flag.value_by_names(names)
 
-            left_value = self._left.value_by_names(names).values
-            right_value = self._right.value_by_names(names).values
+            left_value = flag_value._aligned(self._left.value_by_names(names))
+            right_value = flag_value._aligned(self._right.value_by_names(names))
 
-            return SeriesValues(np.where(flag_value.values,
-                                         left_value,
-                                         right_value),
-                                flag_value.name_mapping)
+            return flag_value._with_values(np.where(flag_value.values,
+                                                    left_value,
+                                                    right_value))
 
     def __str__(self):
         return "\\mathrm{{IIF}}({0}, {1}, {2})".format(str(self._flag), str(self._left), str(self._right))
\ No newline at end of file
@@ -7,11 +7,30 @@ Created on 2017-2-11
 
 cimport numpy as np
 
+cdef class Universe(object):
+
+    cdef readonly list symbols
+    cdef dict _codes
+
+    cpdef Py_ssize_t code(self, symbol)
+    cpdef np.ndarray encode(self, list names)
+    cpdef np.ndarray lookup(self, list names)
+    cpdef list decode(self, codes)
+
+
 cdef class SeriesValues(object):
 
-    cdef public dict name_mapping
+    cdef dict _name_mapping
     cdef public np.ndarray values
     cdef public np.ndarray name_array
+    cdef readonly Universe universe
+    cdef readonly np.ndarray codes
+    cdef np.ndarray _position_index
+
+    cdef SeriesValues _with_values(self, values)
+    cdef np.ndarray _positions(self)
+    cdef np.ndarray _take(self, np.ndarray codes)
+    cdef np.ndarray _aligned(self, SeriesValues other)
 
     cpdef SeriesValues mask(self, np.ndarray flags)
     cpdef list index(self)
@@ -29,37 +29,167 @@ cdef groupby(groups):
 @cython.cdivision(True)
 cdef SeriesValues residue(SeriesValues left, SeriesValues right):
     cdef np.ndarray[double, ndim=1] y = left.values
-    cdef np.ndarray[double, ndim=1] x = right.values
+    cdef np.ndarray[double, ndim=1] x = left._aligned(right)
 
     cdef double beta = nansum(x * y) / nansum(x * x)
-    return SeriesValues(y - beta * x, left.name_mapping)
+    return left._with_values(y - beta * x)
+
+
+cdef class Universe(object):
+    u"""
+    Append-only table giving every symbol a dense integer code. A code never
+    changes once given, so series sharing a universe are aligned by integer
+    indexing instead of by name. The holders of an expression share one
+    universe, which goes away with the expression.
+    """
+
+    def __init__(self, symbols=None):
+        self.symbols = []
+        self._codes = {}
+        if symbols is not None:
+            self.encode(list(symbols))
+
+    cpdef Py_ssize_t code(self, symbol):
+        cdef Py_ssize_t c
+        try:
+            return self._codes[symbol]
+        except KeyError:
+            c = len(self.symbols)
+            self._codes[symbol] = c
+            self.symbols.append(symbol)
+            return c
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef np.ndarray encode(self, list names):
+        cdef Py_ssize_t i
+        cdef np.ndarray[long long, ndim=1] codes = np.empty(len(names), dtype=np.int64)
+        for i, name in enumerate(names):
+            codes[i] = self.code(name)
+        return codes
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef np.ndarray lookup(self, list names):
+        u"""
+        Codes of names, -1 for the ones not in the universe, which is left
+        unchanged.
+        """
+        cdef Py_ssize_t i
+        cdef dict table = self._codes
+        cdef np.ndarray[long long, ndim=1] codes = np.empty(len(names), dtype=np.int64)
+        for i, name in enumerate(names):
+            codes[i] = table.get(name, -1)
+        return codes
+
+    cpdef list decode(self, codes):
+        cdef list symbols = self.symbols
+        return [symbols[c] for c in codes]
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self._codes
+
+    def __reduce__(self):
+        return Universe, (self.symbols,)
 
 
 cdef class SeriesValues(object):
 
-    def __init__(self, data, index=None):
+    def __init__(self, data, index=None, Universe universe=None):
         if isinstance(data, dict):
             keys = sorted(data.keys())
-            index = dict(zip(keys, range(len(data))))
+            index = keys if universe is not None else dict(zip(keys, range(len(data))))
             data = np.array([data[k] for k in keys], dtype=float)
 
         self.values = data.astype(float)
+        self.name_array = None
 
-        if isinstance(index, dict):
-            self.name_mapping = index
+        if universe is not None:
+            self.universe = universe
+            if isinstance(index, np.ndarray) and index.dtype.kind in 'iu':
+                self.codes = index.astype(np.int64, copy=False)
+            elif isinstance(index, dict):
+                self.codes = universe.encode(sorted(index, key=index.get))
+            else:
+                self.codes = universe.encode(list(index))
+        elif isinstance(index, dict):
+            self._name_mapping = index
         else:
-            self.name_mapping = dict(zip(index, range(len(index))))
+            self._name_mapping = dict(zip(index, range(len(index))))
+
+    @property
+    def name_mapping(self):
+        if self._name_mapping is None:
+            self._name_mapping = dict(zip(self.universe.decode(self.codes), range(len(self.codes))))
+        return self._name_mapping
+
+    @name_mapping.setter
+    def name_mapping(self, dict value):
+        self._name_mapping = value
+        self.universe = None
+        self.codes = None
+        self._position_index = None
         self.name_array = None
 
+    cdef SeriesValues _with_values(self, values):
+        cdef SeriesValues res = SeriesValues.__new__(SeriesValues)
+        res.values = values.astype(float)
+        res._name_mapping = self._name_mapping
+        res.name_array = self.name_array
+        res.universe = self.universe
+        res.codes = self.codes
+        res._position_index = self._position_index
+        return res
+
+    cdef np.ndarray _positions(self):
+        # positions of the codes in ascending code order and the sorted codes,
+        # both of the length of the series whatever the size of the universe
+        cdef np.ndarray order
+        if self._position_index is None:
+            order = np.argsort(self.codes, kind='stable')
+            self._position_index = np.vstack([order, self.codes[order]])
+        return self._position_index
+
+    cdef np.ndarray _take(self, np.ndarray codes):
+        cdef np.ndarray positions = self._positions()
+        cdef np.ndarray sorted_codes = positions[1]
+        cdef np.ndarray values = np.full((len(codes),) + np.shape(self.values)[1:], NAN)
+        cdef np.ndarray located
+        cdef np.ndarray found
+
+        if len(sorted_codes) == 0:
+            return values
+        located = np.minimum(np.searchsorted(sorted_codes, codes), len(sorted_codes) - 1)
+        found = sorted_codes[located] == codes
+        values[found] = self.values[positions[0, located[found]]]
+        return values
+
+    cdef np.ndarray _aligned(self, SeriesValues other):
+        if self.universe is None or other.universe is None or other.codes is self.codes:
+            return other.values
+        elif other.universe is not self.universe:
+            # e.g. a series restored from another pickle: go through the symbols
+            return other._take(other.universe.lookup(self.universe.decode(self.codes)))
+        elif len(other.codes) == len(self.codes) and np.array_equal(other.codes, self.codes):
+            return other.values
+        return other._take(self.codes)
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     def __getitem__(self, name):
 
         cdef np.ndarray data
         cdef np.ndarray values
+        cdef np.ndarray codes
 
         if not isinstance(name, list):
             return self.values[self.name_mapping[name]]
+        elif self.universe is not None:
+            codes = self.universe.encode(name)
+            return SeriesValues(self._take(codes), codes, self.universe)
         else:
 
             values = self.values
@@ -71,6 +201,9 @@ cdef class SeriesValues(object):
     @cython.wraparound(False)
     cpdef SeriesValues mask(self, np.ndarray flags):
         cdef np.ndarray filtered_names
+        if self.universe is not None:
+            return SeriesValues(self.values[flags], self.codes[flags], self.universe)
+
         if not self.name_array:
             self.name_array = np.array(sorted(self.name_mapping.keys()), dtype=str)
 
@@ -78,212 +211,214 @@ cdef class SeriesValues(object):
         return SeriesValues(self.values[flags], dict(zip(filtered_names, range(len(filtered_names)))))
 
     def __invert__(self):
-        return SeriesValues(~self.values, self.name_mapping)
+        return self._with_values(~self.values)
 
     def __neg__(self):
-        return SeriesValues(-self.values, self.name_mapping)
+        return self._with_values(-self.values)
 
     def __add__(self, right):
         if isinstance(right, SeriesValues):
             if isinstance(self, SeriesValues):
-                return SeriesValues(self.values + right.values, self.name_mapping)
+                return self._with_values(self.values + self._aligned(right))
             else:
-                return SeriesValues(self + right.values, right.name_mapping)
+                return (<SeriesValues>right)._with_values(self + right.values)
         else:
-            return SeriesValues(self.values + right, self.name_mapping)
+            return self._with_values(self.values + right)
 
     def __radd__(self, left):
         if isinstance(left, SeriesValues):
             if isinstance(self, SeriesValues):
-                return SeriesValues(left.values + self.values, self.name_mapping)
+                return self._with_values(self._aligned(left) + self.values)
             else:
-                return SeriesValues(left.values + self, left.name_mapping)
+                return (<SeriesValues>left)._with_values(left.values + self)
         else:
-            return SeriesValues(left + self.values, self.name_mapping)
+            return self._with_values(left + self.values)
 
     def __sub__(self, right):
         if isinstance(right, SeriesValues):
             if isinstance(self, SeriesValues):
-                return SeriesValues(self.values - right.values, self.name_mapping)
+                return self._with_values(self.values - self._aligned(right))
             else:
-                return SeriesValues(self - right.values, right.name_mapping)
+                return (<SeriesValues>right)._with_values(self - right.values)
         else:
-            return SeriesValues(self.values - right, self.name_mapping)
+            return self._with_values(self.values - right)
 
     def __rsub__(self, left):
         if isinstance(left, SeriesValues):
             if isinstance(self, SeriesValues):
-                return SeriesValues(left.values - self.values, self.name_mapping)
+                return self._with_values(self._aligned(left) - self.values)
             else:
-                return SeriesValues(left.values - self, left.name_mapping)
+                return (<SeriesValues>left)._with_values(left.values - self)
         else:
-            return SeriesValues(left - self.values, self.name_mapping)
+            return self._with_values(left - self.values)
 
     def __mul__(self, right):
         if isinstance(right, SeriesValues):
             if isinstance(self, SeriesValues):
-                return SeriesValues(self.values * right.values, self.name_mapping)
+                return self._with_values(self.values * self._aligned(right))
             else:
-                return SeriesValues(self * right.values, right.name_mapping)
+                return (<SeriesValues>right)._with_values(self * right.values)
         else:
-            return SeriesValues(self.values * right, self.name_mapping)
+            return self._with_values(self.values * right)
 
     def __rmul__(self, left):
         if isinstance(left, SeriesValues):
             if isinstance(self, SeriesValues):
-                return SeriesValues(left.values * self.values, self.name_mapping)
+                return self._with_values(self._aligned(left) * self.values)
             else:
-                return SeriesValues(left.values * self, left.name_mapping)
+                return (<SeriesValues>left)._with_values(left.values * self)
         else:
-            return SeriesValues(left * self.values, self.name_mapping)
+            return self._with_values(left * self.values)
 
     @cython.cdivision(True)
     def __truediv__(self, right):
         cdef np.ndarray[double, ndim=1] values
-        cdef dict name_mapping
+        cdef SeriesValues source
         if isinstance(right, SeriesValues):
             if isinstance(self, SeriesValues):
-                values = self.values / right.values
-                name_mapping = self.name_mapping
+                values = self.values / self._aligned(right)
+                source = self
             else:
                 values = self / right.values
-                name_mapping = right.name_mapping
+                source = right
         else:
             values = self.values / right
-            name_mapping = self.name_mapping
+            source = self
 
         values[~np.isfinite(values)] = NAN
-        return SeriesValues(values, name_mapping)
+        return source._with_values(values)
 
     @cython.cdivision(True)
     def __rtruediv__(self, left):
         cdef np.ndarray[double, ndim=1] values
-        cdef dict name_mapping
+        cdef SeriesValues source
         if isinstance(left, SeriesValues):
             if isinstance(self, SeriesValues):
-                values = left.values / self.values
-                name_mapping = self.name_mapping
+                values = self._aligned(left) / self.values
+                source = self
             else:
                 values = left.values / self
-                name_mapping = left.name_mapping
+                source = left
         else:
             values = left / self.values
-            name_mapping = self.name_mapping
+            source = self
 
         values[~np.isfinite(values)] = NAN
-        return SeriesValues(values, name_mapping)
+        return source._with_values(values)
 
     @cython.cdivision(True)
     def __div__(self, right):
         cdef np.ndarray[double, ndim=1] values
-        cdef dict name_mapping
+        cdef SeriesValues source
         if isinstance(right, SeriesValues):
             if isinstance(self, SeriesValues):
-                values = self.values / right.values
-                name_mapping = self.name_mapping
+                values = self.values / self._aligned(right)
+                source = self
             else:
                 values = self / right.values
-                name_mapping = right.name_mapping
+                source = right
         else:
             values = self.values / right
-            name_mapping = self.name_mapping
+            source = self
 
         values[~np.isfinite(values)] = NAN
-        return SeriesValues(values, name_mapping)
+        return source._with_values(values)
 
     @cython.cdivision(True)
     def __rdiv__(self, left):
         cdef np.ndarray[double, ndim=1] values
-        cdef dict name_mapping
+        cdef SeriesValues source
         if isinstance(left, SeriesValues):
             if isinstance(self, SeriesValues):
-                values = left.values / self.values
-                name_mapping = self.name_mapping
+                values = self._aligned(left) / self.values
+                source = self
             else:
                 values = left.values / self
-                name_mapping = left.name_mapping
+                source = left
         else:
             values = left / self.values
-            name_mapping = self.name_mapping
+            source = self
 
         values[~np.isfinite(values)] = NAN
-        return SeriesValues(values, name_mapping)
+        return source._with_values(values)
 
     def __and__(self, right):
         if isinstance(right, SeriesValues):
             if isinstance(self, SeriesValues):
-                return SeriesValues(self.values.astype(bool) & right.values.astype(bool), self.name_mapping)
+                return self._with_values(self.values.astype(bool) & self._aligned(right).astype(bool))
             else:
-                return SeriesValues(self & right.values.astype(bool), right.name_mapping)
+                return (<SeriesValues>right)._with_values(self & right.values.astype(bool))
         else:
-            return SeriesValues(self.values.astype(bool) & right, self.name_mapping)
+            return self._with_values(self.values.astype(bool) & right)
 
     def __rand__(self, left):
         if isinstance(left, SeriesValues):
             if isinstance(self, SeriesValues):
-                return SeriesValues(left.values.astype(bool) & self.values.astype(bool), self.name_mapping)
+                return self._with_values(self._aligned(left).astype(bool) & self.values.astype(bool))
             else:
-                return SeriesValues(left.values.astype(bool) & self, left.name_mapping)
+                return (<SeriesValues>left)._with_values(left.values.astype(bool) & self)
         else:
-            return SeriesValues(left & self.values.astype(bool), self.name_mapping)
+            return self._with_values(left & self.values.astype(bool))
 
     def __or__(self, right):
         if isinstance(right, SeriesValues):
             if isinstance(self, SeriesValues):
-                return SeriesValues(self.values.astype(bool) | right.values.astype(bool), self.name_mapping)
+                return self._with_values(self.values.astype(bool) | self._aligned(right).astype(bool))
             else:
-                return SeriesValues(self | right.values.astype(bool), right.name_mapping)
+                return (<SeriesValues>right)._with_values(self | right.values.astype(bool))
         else:
-            return SeriesValues(self.values.astype(bool) | right, self.name_mapping)
+            return self._with_values(self.values.astype(bool) | right)
 
     def __ror__(self, left):
         if isinstance(left, SeriesValues):
             if isinstance(self, SeriesValues):
-                return SeriesValues(left.values.astype(bool) | self.values.astype(bool), self.name_mapping)
+                return self._with_values(self._aligned(left).astype(bool) | self.values.astype(bool))
             else:
-                return SeriesValues(left.values.astype(bool) | self, left.name_mapping)
+                return (<SeriesValues>left)._with_values(left.values.astype(bool) | self)
         else:
-            return SeriesValues(left | self.values.astype(bool), self.name_mapping)
+            return self._with_values(left | self.values.astype(bool))
 
     def __xor__(self, right):
         if isinstance(right, SeriesValues):
             if isinstance(self, SeriesValues):
-                return SeriesValues(np.array([self.values, right.values]).T, self.name_mapping)
+                return self._with_values(np.array([self.values, self._aligned(right)]).T)
             else:
-                return SeriesValues(np.array([np.ones(len(right.values)) * self, right.values]).T, self.name_mapping)
+                return self._with_values(np.array([np.ones(len(right.values)) * self, right.values]).T)
         else:
-            return SeriesValues(np.array([self.values, np.ones(len(self.values)) * right]).T, self.name_mapping)
+            return self._with_values(np.array([self.values, np.ones(len(self.values)) * right]).T)
 
     def __richcmp__(self, right, int op):
 
         if isinstance(right, SeriesValues):
             if op == 0:
-                return SeriesValues(self.values < right.values, self.name_mapping)
+                return self._with_values(self.values < self._aligned(right))
             elif op == 1:
-                return SeriesValues(self.values <= right.values, self.name_mapping)
+                return self._with_values(self.values <= self._aligned(right))
             elif op == 2:
-                return SeriesValues(self.values == right.values, self.name_mapping)
+                return self._with_values(self.values == self._aligned(right))
             elif op == 3:
-                return SeriesValues(self.values != right.values, self.name_mapping)
+                return self._with_values(self.values != self._aligned(right))
             elif op == 4:
-                return SeriesValues(self.values > right.values, self.name_mapping)
+                return self._with_values(self.values > self._aligned(right))
             elif op == 5:
-                return SeriesValues(self.values >= right.values, self.name_mapping)
+                return self._with_values(self.values >= self._aligned(right))
         else:
             if op == 0:
-                return SeriesValues(self.values < right, self.name_mapping)
+                return self._with_values(self.values < right)
             elif op == 1:
-                return SeriesValues(self.values <= right, self.name_mapping)
+                return self._with_values(self.values <= right)
             elif op == 2:
-                return SeriesValues(self.values == right, self.name_mapping)
+                return self._with_values(self.values == right)
             elif op == 3:
-                return SeriesValues(self.values != right, self.name_mapping)
+                return self._with_values(self.values != right)
             elif op == 4:
-                return SeriesValues(self.values > right, self.name_mapping)
+                return self._with_values(self.values > right)
             elif op == 5:
-                return SeriesValues(self.values >= right, self.name_mapping)
+                return self._with_values(self.values >= right)
 
     cpdef list index(self):
+        if self.universe is not None:
+            return self.universe.decode(self.codes)
         return list(self.name_mapping.keys())
 
     def __contains__(self, key):
@@ -304,7 +439,7 @@ cdef class SeriesValues(object):
 
         if groups:
             data = self.values.copy()
-            index_diff, order = groupby(groups.values)
+            index_diff, order = groupby(self._aligned(groups))
             start = 0
             for diff_loc in index_diff:
                 curr_idx = order[start:diff_loc + 1]
@@ -314,7 +449,7 @@ cdef class SeriesValues(object):
         else:
             data = rankdata(self.values, nan_policy="omit").astype(float)
             data[isnan(self.values)] = NAN
-        return SeriesValues(data, self.name_mapping)
+        return self._with_values(data)
 
     cpdef SeriesValues top_n(self, int n, SeriesValues groups=None):
         cdef SeriesValues reversed_rank = (-self).rank(groups)
@@ -347,7 +482,7 @@ cdef class SeriesValues(object):
 
         if groups:
             data = values.copy()
-            index_diff, order = groupby(groups.values)
+            index_diff, order = groupby(self._aligned(groups))
             start = 0
             for diff_loc in index_diff:
                 curr_idx = order[start:diff_loc + 1]
@@ -358,7 +493,7 @@ cdef class SeriesValues(object):
         else:
             data = (values - nanmean(values)) / nanstd(values)
             data[isnan(values)] = NAN
-        return SeriesValues(data, self.name_mapping)
+        return self._with_values(data)
 
     cpdef SeriesValues fillna(self, SeriesValues groups=None):
         cdef np.ndarray[double, ndim=1] data
@@ -372,7 +507,7 @@ cdef class SeriesValues(object):
 
         if groups:
             data = values.copy()
-            index_diff, order = groupby(groups.values)
+            index_diff, order = groupby(self._aligned(groups))
             start = 0
             for diff_loc in index_diff:
                 curr_idx = order[start:diff_loc + 1]
@@ -383,11 +518,11 @@ cdef class SeriesValues(object):
         else:
             data = values.copy()
             data[isnan(data)] = nanmean(data)
-        return SeriesValues(data, self.name_mapping)
+        return self._with_values(data)
 
     cpdef SeriesValues unit(self):
         cdef np.ndarray[double, ndim=1] data = self.values
-        return SeriesValues(data / nansum(np.abs(data)), self.name_mapping)
+        return self._with_values(data / nansum(np.abs(data)))
 
     cpdef SeriesValues mean(self, SeriesValues groups=None):
         cdef np.ndarray[double, ndim=1] data
@@ -400,7 +535,7 @@ cdef class SeriesValues(object):
 
         if groups:
             data = values.copy()
-            index_diff, order = groupby(groups.values)
+            index_diff, order = groupby(self._aligned(groups))
             start = 0
             for diff_loc in index_diff:
                 curr_idx = order[start:diff_loc + 1]
@@ -410,7 +545,7 @@ cdef class SeriesValues(object):
         else:
             data = np.ones_like(values) * nanmean(values)
             data[np.isnan(values)] = NAN
-        return SeriesValues(data, self.name_mapping)
+        return self._with_values(data)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -427,7 +562,7 @@ cdef class SeriesValues(object):
 
         if groups:
             data = self.values.copy()
-            index_diff, order = groupby(groups.values)
+            index_diff, order = groupby(self._aligned(groups))
             start = 0
             for diff_loc in index_diff:
                 curr_idx = order[start:diff_loc + 1]
@@ -440,21 +575,21 @@ cdef class SeriesValues(object):
             size = len(self.values)
             data = rankdata(self.values).astype(float) / size
             data[np.isnan(self.values)] = NAN
-        return SeriesValues(data, self.name_mapping)
+        return self._with_values(data)
 
     cpdef double dot(self, SeriesValues right):
-        return np.dot(self.values, right.values)
+        return np.dot(self.values, self._aligned(right))
 
     cpdef SeriesValues res(self, SeriesValues right):
         cdef np.ndarray[double, ndim=1] y = self.values
-        cdef np.ndarray[double, ndim=1] x = right.values
+        cdef np.ndarray[double, ndim=1] x = self._aligned(right)
         cdef y_bar = nanmean(y)
         cdef x_bar = nanmean(x)
         y -= y_bar
         x -= x_bar
 
         cdef double beta = nansum(x * y) / nansum(x * x)
-        return SeriesValues(y - beta * x, self.name_mapping)
+        return self._with_values(y - beta * x)
 
     cpdef dict to_dict(self):
         keys = self.name_mapping.keys()
@@ -473,11 +608,11 @@ cdef class SeriesValues(object):
 
 cpdef SeriesValues s_maximum(SeriesValues left, SeriesValues right):
     cdef np.ndarray[double, ndim=1] x = left.values
-    cdef np.ndarray[double, ndim=1] y = right.values
-    return SeriesValues(maximum(x, y), left.name_mapping)
+    cdef np.ndarray[double, ndim=1] y = left._aligned(right)
+    return left._with_values(maximum(x, y))
 
 
 cpdef SeriesValues s_minimum(SeriesValues left, SeriesValues right):
     cdef np.ndarray[double, ndim=1] x = left.values
-    cdef np.ndarray[double, ndim=1] y = right.values
-    return SeriesValues(minimum(x, y), left.name_mapping)
\ No newline at end of file
+    cdef np.ndarray[double, ndim=1] y = left._aligned(right)
+    return left._with_values(minimum(x, y))
\ No newline at end of file
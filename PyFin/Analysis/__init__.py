@@ -22,7 +22,11 @@ from PyFin.Analysis.CrossSectionValueHolders import CSResidueSecurityValueHolder
 from PyFin.Analysis.SecurityValueHolders import SecurityCurrentValueHolder
 from PyFin.Analysis.SecurityValueHolders import SecurityLatestValueHolder
 from PyFin.Analysis import TechnicalAnalysis
+from PyFin.Analysis.ExpressionGraph import ExpressionGraph
+from PyFin.Analysis.ExpressionGraph import SecurityFusedValueHolder
+from PyFin.Analysis.ExpressionGraph import fuse
 from PyFin.Analysis.transformer import transform
+from PyFin.Analysis.transformer import transform_stream
 
 __all__ = ['DataProvider',
            'SecurityShiftedValueHolder',
@@ -41,4 +45,8 @@ __all__ = ['DataProvider',
            'SecurityCurrentValueHolder',
            'SecurityLatestValueHolder',
            'TechnicalAnalysis',
-           'transform']
+           'ExpressionGraph',
+           'SecurityFusedValueHolder',
+           'fuse',
+           'transform',
+           'transform_stream']
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+u"""
+Created on 2026-10-18
+"""
+
+import copy
+import functools
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from PyFin.Analysis.SecurityValueHolders import SecurityValueHolder
+from PyFin.Analysis.SecurityValueHolders import SecurityCurrentValueHolder
+from PyFin.Analysis.CrossSectionValueHolders import CrossSectionValueHolder
+from PyFin.Analysis.CrossSectionValueHolders import CSResidueSecurityValueHolder
+from PyFin.Analysis.ExpressionGraph import _CHILD_ATTRIBUTES as _GRAPH_CHILD_ATTRIBUTES
+from PyFin.Utilities.Tools import resolve_n_jobs
+
+_CHILD_ATTRIBUTES = _GRAPH_CHILD_ATTRIBUTES + ('_target',)
+# children of a cross-sectional node, evaluated per symbol
+_CROSS_SECTION_INPUTS = ('_inner', '_group', '_left', '_right')
+
+
+def _is_cross_section_node(holder):
+    return isinstance(holder, (CrossSectionValueHolder, CSResidueSecurityValueHolder))
+
+
+def _children(holder):
+    u"""
+    ``(setter, child)`` for every direct child of ``holder``, ``setter(other)``
+    puts ``other`` in place of ``child``.
+    """
+    for attr in _CHILD_ATTRIBUTES:
+        child = getattr(holder, attr, None)
+        if isinstance(child, SecurityValueHolder):
+            yield functools.partial(setattr, holder, attr), child
+    leaves = getattr(holder, '_leaves', None)
+    if leaves:
+        for i, leaf in enumerate(leaves):
+            yield functools.partial(leaves.__setitem__, i), leaf
+
+
+def is_cross_sectional(holder):
+    u"""
+    Whether the value of any symbol in ``holder`` depends on the other symbols
+    of the same snapshot, i.e. whether its tree contains a cross-sectional node.
+    """
+    if _is_cross_section_node(holder):
+        return True
+    return any(is_cross_sectional(child) for _, child in _children(holder))
+
+
+def can_shard(expressions, category_field, n_jobs):
+    return resolve_n_jobs(n_jobs) > 1 and bool(category_field)
+
+
+def _holder_shard(data, holder, name, category_field, batch):
+    return holder.transform(data, name=name, category_field=category_field, dropna=False, batch=batch)
+
+
+def _transformer_shard(data, expressions, cols, category_field, batch):
+    from PyFin.Analysis.transformer import transform
+    return transform(data, expressions, cols, category_field=category_field, dropna=False, batch=batch)
+
+
+def _lowest_cross_sections(holder, setter, ancestors, found):
+    u"""
+    Append ``(node, setter, ancestors)`` to ``found`` for every cross-sectional
+    node of ``holder`` with no other cross-sectional node below it. Return
+    whether ``holder`` contains a cross-sectional node at all.
+    """
+    below = False
+    for child_setter, child in _children(holder):
+        below = _lowest_cross_sections(child, child_setter, ancestors + [holder], found) or below
+    if not below and _is_cross_section_node(holder):
+        found.append((holder, setter, ancestors))
+        return True
+    return below
+
+
+def staged_transform(data, expressions, cols, category_field, n_jobs, dropna, batch):
+    u"""
+    Sharded transform of ``expressions`` which may contain cross-sectional
+    nodes.
+
+    The expressions are cut at their cross-sectional nodes, lowest ones first.
+    The per symbol inputs of those nodes are computed by the shards; the
+    parent then gathers the inputs of every symbol and runs the nodes
+    snapshot by snapshot, as the barrier every shard would have to wait on,
+    and hands their values back to the shards as a column read by a
+    ``SecurityCurrentValueHolder`` in place of the node. A cross-sectional
+    node only reads its inputs at the current snapshot, so running each cut
+    over the whole history at once gives the same values as a barrier per
+    timestamp. Without cross-sectional nodes this is ``sharded_transform``.
+    """
+    names = itertools.count()
+
+    def fresh_column():
+        while True:
+            column = '__cross_section_{0}'.format(next(names))
+            if column not in data:
+                return column
+
+    if any(isinstance(e, SecurityValueHolder) and is_cross_sectional(e) for e in expressions):
+        data = data.copy()
+        expressions = copy.deepcopy(expressions)
+
+    while True:
+        found = []
+        for i, e in enumerate(expressions):
+            if isinstance(e, SecurityValueHolder):
+                _lowest_cross_sections(e, functools.partial(expressions.__setitem__, i), [], found)
+        if not found:
+            break
+
+        # a node shared between expressions is cut once
+        nodes = {}
+        for node, _, _ in found:
+            nodes.setdefault(id(node), node)
+
+        inputs = []
+        input_cols = []
+        node_inputs = {}
+        for key, node in nodes.items():
+            node_inputs[key] = []
+            for attr in _CROSS_SECTION_INPUTS:
+                child = getattr(node, attr, None)
+                if isinstance(child, SecurityValueHolder):
+                    column = fresh_column()
+                    inputs.append(child)
+                    input_cols.append(column)
+                    node_inputs[key].append((attr, column))
+
+        frame = sharded_transform(_transformer_shard,
+                                  data,
+                                  category_field,
+                                  n_jobs,
+                                  False,
+                                  inputs,
+                                  input_cols,
+                                  category_field,
+                                  batch)
+        for column in input_cols:
+            data[column] = frame[column].values
+
+        outputs = {}
+        for key, node in nodes.items():
+            for attr, column in node_inputs[key]:
+                setattr(node, attr, SecurityCurrentValueHolder(column))
+            node._dependency = [column for _, column in node_inputs[key]]
+            node.share_universe()
+            column = fresh_column()
+            values = node.transform(data[[category_field] + node._dependency],
+                                    name=column,
+                                    category_field=category_field,
+                                    dropna=False,
+                                    batch=batch)
+            data[column] = values[column].values
+            outputs[key] = column
+
+        for node, setter, ancestors in found:
+            column = outputs[id(node)]
+            setter(SecurityCurrentValueHolder(column))
+            for holder in ancestors:
+                if column not in holder._dependency:
+                    holder._dependency = holder._dependency + [column]
+
+        for e in expressions:
+            if isinstance(e, SecurityValueHolder):
+                e.share_universe()
+
+    return sharded_transform(_transformer_shard,
+                             data,
+                             category_field,
+                             n_jobs,
+                             dropna,
+                             expressions,
+                             cols,
+                             category_field,
+                             batch)
+
+
+def sharded_transform(worker, data, category_field, n_jobs, dropna, *args):
+    u"""
+    Partition ``data`` by the symbols in ``category_field``, run
+    ``worker(shard, *args)`` for every partition in a process pool and stitch
+    the results back in the original row order.
+
+    Every symbol lands in exactly one shard, so any expression whose state is
+    kept per symbol gives the same result as the serial transform.
+    """
+    n_jobs = resolve_n_jobs(n_jobs)
+    codes, _ = pd.factorize(data[category_field])
+    shard_ids = codes % n_jobs
+    positions = [np.flatnonzero(shard_ids == k) for k in range(n_jobs)]
+    positions = [p for p in positions if len(p)]
+
+    with ProcessPoolExecutor(max_workers=len(positions)) as executor:
+        futures = [executor.submit(worker, data.iloc[p].copy(), *args) for p in positions]
+        frames = [f.result() for f in futures]
+
+    merged = pd.concat(frames)
+    merged = merged.iloc[np.argsort(np.concatenate(positions), kind='stable')]
+
+    if dropna:
+        merged.dropna(inplace=True)
+    return merged
@@ -5,17 +5,60 @@ Created on 2017-2-15
 @author: cheng.li
 """
 
+import os
 import numpy as np
 cimport numpy as np
 import pandas as pd
 cimport cython
 from PyFin.Utilities.Tools import to_dict
+from PyFin.Utilities.Tools import to_columns
+from PyFin.Utilities.Tools import index_boundaries
 from PyFin.Analysis.SecurityValueHolders cimport SecurityValueHolder
+from PyFin.Analysis.ExpressionGraph import ExpressionGraph
+from PyFin.Analysis.parallel import can_shard
+from PyFin.Analysis.parallel import staged_transform
+from PyFin.Utilities.Asserts cimport require
+
+_PARQUET_SUFFIXES = ('.parquet', '.pq')
+_HDF_SUFFIXES = ('.h5', '.hdf', '.hdf5')
+
+
+cdef _graph_values(graph, total_index, np.ndarray total_category, numeric_data, int dummy_category):
+    cdef np.ndarray boundaries = index_boundaries(total_index)
+    cdef dict column_data = to_columns(numeric_data.values, numeric_data.columns.tolist())
+    holder_values = np.zeros((len(numeric_data), len(graph.outputs)))
+    graph.batch_transform(boundaries, total_category.tolist(), column_data, dummy_category, holder_values)
+    return holder_values
+
+
+cdef _to_frame(data, list expressions, list cols, list flags, output_values, np.ndarray total_category, str category_field, int dummy_category, bint dropna):
+    cdef int i
+
+    df = pd.DataFrame(np.array(output_values), index=data.index, columns=cols)
+
+    for i, e in enumerate(expressions):
+        if not flags[i]:
+            df[cols[i]] = data[e].values
+
+    if not dummy_category:
+        df[category_field] = total_category
+
+    if dropna:
+        df = df.dropna()
+
+    return df
 
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cpdef transform(data, list expressions, list cols, str category_field=None, bint to_sort=False, bint dropna=True):
+cpdef transform(data, list expressions, list cols, str category_field=None, bint to_sort=False, bint dropna=True, bint batch=True, int n_jobs=1):
+    u"""
+    Values of expressions for every row of data, in the columns cols. The
+    serial transform leaves the given holders with the state of the last
+    snapshot. With n_jobs > 1 the symbols are computed by worker processes on
+    copies of the holders, starting from their current state, and the given
+    holders are left unchanged.
+    """
 
     cdef int dummy_category
     cdef int i
@@ -31,10 +74,14 @@ cpdef transform(data, list expressions, list cols, str category_field=None, bint
     cdef list split_values
     cdef SecurityValueHolder exp
     cdef dict dict_data
+    cdef list holder_index
 
     if to_sort:
         data.sort_index(inplace=True)
 
+    if n_jobs != 1 and can_shard(expressions, category_field, n_jobs):
+        return staged_transform(data, expressions, cols, category_field, n_jobs, dropna, batch)
+
     dummy_category = 0
     if not category_field:
         category_field = 'dummy'
@@ -46,41 +93,131 @@ cpdef transform(data, list expressions, list cols, str category_field=None, bint
 
     total_category = data[category_field].values
     numeric_data = data.select_dtypes([np.number])
-    matrix_values = numeric_data.values.astype(float)
-    columns = numeric_data.columns.tolist()
-
-    split_category, split_values = to_dict(total_index, total_category.tolist(), matrix_values, columns)
 
     flags = [isinstance(e, SecurityValueHolder) for e in expressions]
     output_values = np.zeros((len(numeric_data), len(expressions)))
 
-    for i, e in enumerate(expressions):
-        if flags[i]:
-            if not dummy_category:
-                start_count = 0
-                for j, dict_data in enumerate(split_values):
-                    exp = e
-                    exp.push(dict_data)
-                    end_count = start_count + len(dict_data)
-                    narr_view = exp.value_by_names(split_category[j]).values.astype(float)
-                    output_values[start_count:end_count, i] = narr_view
-                    start_count = end_count
-            else:
-                for j, dict_data in enumerate(split_values):
-                    exp = e
-                    exp.push(dict_data)
-                    output_values[j, i] = exp.value_by_name(split_category[j][0])
+    if batch:
+        holder_index = [i for i, flag in enumerate(flags) if flag]
+        # built over the given holders, so they carry their state to the next call
+        graph = ExpressionGraph([expressions[i] for i in holder_index], copy_expressions=False, fuse_operators=True)
+        try:
+            holder_values = _graph_values(graph, total_index, total_category, numeric_data, dummy_category)
+        finally:
+            graph.release()
+        np.asarray(output_values)[:, holder_index] = holder_values
+    else:
+        matrix_values = numeric_data.values.astype(float)
+        columns = numeric_data.columns.tolist()
+        split_category, split_values = to_dict(total_index, total_category.tolist(), matrix_values, columns)
+
+        for i, e in enumerate(expressions):
+            if flags[i]:
+                if not dummy_category:
+                    start_count = 0
+                    for j, dict_data in enumerate(split_values):
+                        exp = e
+                        exp.push(dict_data)
+                        end_count = start_count + len(dict_data)
+                        narr_view = exp.value_by_names(split_category[j]).values.astype(float)
+                        output_values[start_count:end_count, i] = narr_view
+                        start_count = end_count
+                else:
+                    for j, dict_data in enumerate(split_values):
+                        exp = e
+                        exp.push(dict_data)
+                        output_values[j, i] = exp.value_by_name(split_category[j][0])
+
+    return _to_frame(data, expressions, cols, flags, output_values, total_category, category_field, dummy_category, dropna)
+
+
+def _read_file(str path, chunksize, key):
+    lower = path.lower()
+    if lower.endswith(_PARQUET_SUFFIXES):
+        if chunksize:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+                yield pa.Table.from_batches([batch]).to_pandas()
+        else:
+            yield pd.read_parquet(path)
+    elif lower.endswith(_HDF_SUFFIXES):
+        if chunksize:
+            for chunk in pd.read_hdf(path, key, chunksize=chunksize):
+                yield chunk
+        else:
+            yield pd.read_hdf(path, key)
+    else:
+        require(False, ValueError, "{0} is not a parquet or hdf file".format(path))
+
+
+def _iter_chunks(source, chunksize, key):
+    if isinstance(source, pd.DataFrame):
+        yield source
+    elif isinstance(source, str):
+        if os.path.isdir(source):
+            files = sorted(f for f in os.listdir(source) if f.lower().endswith(_PARQUET_SUFFIXES + _HDF_SUFFIXES))
+            for f in files:
+                for chunk in _read_file(os.path.join(source, f), chunksize, key):
+                    yield chunk
+        else:
+            for chunk in _read_file(source, chunksize, key):
+                yield chunk
+    else:
+        for chunk in source:
+            yield chunk
 
-    df = pd.DataFrame(np.array(output_values), index=data.index, columns=cols)
 
-    for i, e in enumerate(expressions):
-        if not flags[i]:
-            df[cols[i]] = data[e].values
+cdef _stream_chunk(graph, data, list expressions, list cols, list flags, list holder_index, str category_field, int dummy_category, bint dropna):
+    cdef np.ndarray total_category
 
-    if not dummy_category:
-        df[category_field] = total_category
+    if dummy_category:
+        total_category = np.ones(len(data), dtype=int)
+        total_index = np.arange(len(data))
+    else:
+        total_category = data[category_field].values
+        total_index = data.index
 
-    if dropna:
-        df.dropna(inplace=True)
+    numeric_data = data.select_dtypes([np.number])
+    output_values = np.zeros((len(data), len(expressions)))
+    output_values[:, holder_index] = _graph_values(graph, total_index, total_category, numeric_data, dummy_category)
+    return _to_frame(data, expressions, cols, flags, output_values, total_category, category_field, dummy_category, dropna)
+
+
+def transform_stream(source, list expressions, list cols, str category_field=None, bint dropna=True, chunksize=None, key=None):
+    u"""
+    Transform a panel that is delivered in pieces and yield one result frame
+    per piece.
+
+    ``source`` is an iterable of data frames, a parquet/hdf file or a directory
+    of such files read in file name order. Chunks must come in time order; the
+    expressions are compiled once and keep their state from one chunk to the
+    next, so the concatenated output equals ``transform`` on the whole panel.
+    The last snapshot of every chunk is held back and pushed with the next one,
+    so a timestamp split between two chunks is still pushed as one snapshot.
+    """
+
+    cdef int dummy_category = 0 if category_field else 1
+    cdef list flags = [isinstance(e, SecurityValueHolder) for e in expressions]
+    cdef list holder_index = [i for i, flag in enumerate(flags) if flag]
+    cdef np.ndarray boundaries
+
+    graph = ExpressionGraph([expressions[i] for i in holder_index], fuse_operators=True)
+    pending = None
+
+    for chunk in _iter_chunks(source, chunksize, key):
+        if pending is not None:
+            chunk = pd.concat([pending, chunk])
+            pending = None
+
+        if not dummy_category and len(chunk):
+            boundaries = index_boundaries(chunk.index)
+            pending = chunk.iloc[boundaries[-2]:]
+            chunk = chunk.iloc[:boundaries[-2]]
+
+        if len(chunk):
+            yield _stream_chunk(graph, chunk, expressions, cols, flags, holder_index, category_field, dummy_category, dropna)
+
+    if pending is not None and len(pending):
+        yield _stream_chunk(graph, pending, expressions, cols, flags, holder_index, category_field, dummy_category, dropna)
 
-    return df
@@ -111,9 +111,15 @@ class Coupon(CashFlow):
         if not self.refPeriodEnd_:
             self.refPeriodEnd_ = self.accrualEndDate_
 
+    def date(self):
+        return self.paymentDate_
+
     def dayCounter(self):
         pass
 
+    def exCouponDate(self):
+        return self.exCouponDate_
+
     def accrualPeriod(self):
         if not self.accrualPeriod_:
             self.accrualPeriod_ = self.dayCounter().yearFraction(self.accrualStartDate_,
@@ -5,8 +5,11 @@ Created on 2017-6-8
 @author: cheng.li
 """
 
+import numpy as np
+from PyFin.CashFlows.ColumnarLeg import ColumnarLeg
+from PyFin.Enums.Compoundings import Compounding
+from PyFin.Enums.Durations import Duration
 from PyFin.Env.Settings import Settings
-from PyFin.Math.udfs import sign
 from PyFin.Utilities.Asserts import require
 
 
@@ -22,6 +25,7 @@ class IrrFinder(object):
                  settlementDate=None,
                  npvDate=None):
         self._leg = leg
+        self._columns = ColumnarLeg.fromLeg(leg)
         self._npv = npv
         self._dayCounter = dayCounter
         self._compounding = comp
@@ -41,13 +45,13 @@ class IrrFinder(object):
         self._checkSign()
 
     def _checkSign(self):
-        last_sign = sign(-self._npv)
+        last_sign = np.sign(-self._npv)
         sign_changes = 0
 
         for cf in self._leg:
             if (not cf.hasOccurred(self._settlementDate, self._includeSettlementDateFlows)) \
                     and (not cf.tradingExCoupon(self._settlementDate)):
-                this_sign = sign(cf.amount())
+                this_sign = np.sign(cf.amount())
                 if last_sign * this_sign < 0.:
                     sign_changes += 1
                     break
@@ -55,16 +59,277 @@ class IrrFinder(object):
                 if this_sign != 0:
                     last_sign = this_sign
 
-        require(sign_changes == 0,
+        require(sign_changes > 0,
                 ValueError,
                 'given cash flows cannot result in the given market due to sign change')
 
+    def __call__(self, y):
+        npv = CashFlows.npv(self._columns,
+                            y,
+                            self._dayCounter,
+                            self._compounding,
+                            self._frequency,
+                            self._includeSettlementDateFlows,
+                            self._settlementDate,
+                            self._npvDate)
+        return self._npv - npv[0]
+
+    def derivative(self, y):
+        return CashFlows.modifiedDuration(self._columns,
+                                          y,
+                                          self._dayCounter,
+                                          self._compounding,
+                                          self._frequency,
+                                          self._includeSettlementDateFlows,
+                                          self._settlementDate,
+                                          self._npvDate)[1][0]
+
+
+def _legDates(leg, dates):
+    if dates is None:
+        dates = Settings.evaluationDate
+    if hasattr(dates, 'serialNumber'):
+        dates = dates.serialNumber
+    return np.broadcast_to(np.asarray(dates, dtype=np.int64), (leg.size(),))
+
+
+def _discounts(r, t, comp, freq):
+    # discount factors with their first and second derivatives in the yield
+    if comp == Compounding.Simple:
+        b = 1. / (1. + r * t)
+        return b, -t * b * b, 2. * t * t * b * b * b
+    elif comp == Compounding.Compounded:
+        base = 1. + r / freq
+        b = base ** (-freq * t)
+        return b, -t * b / base, t * (t + 1. / freq) * b / (base * base)
+    elif comp == Compounding.Continuous:
+        b = np.exp(-r * t)
+        return b, -t * b, t * t * b
+    elif comp == Compounding.SimpleThenCompounded or comp == Compounding.CompoundedThenSimple:
+        simple = _discounts(r, t, Compounding.Simple, freq)
+        compounded = _discounts(r, t, Compounding.Compounded, freq)
+        isSimple = t <= 1. / freq if comp == Compounding.SimpleThenCompounded else t > 1. / freq
+        return tuple(np.where(isSimple, s, c) for s, c in zip(simple, compounded))
+    else:
+        raise ValueError('unknown compounding convention')
+
 
 class CashFlows(object):
 
+    u"""
+    Valuation of ColumnarLeg batches. Every function takes one yield (or one
+    settlement date) per leg or a scalar shared by all of them and returns one
+    value per leg. Flows are discounted with the time to payment accumulated
+    period by period from the npv date with the yield day counter.
+    """
+
     @staticmethod
     def startDate(leg):
         return
 
+    @staticmethod
+    def _flows(leg, dayCounter, includeSettlementDateFlows, settlementDates, npvDates):
+        settlement = _legDates(leg, settlementDates)[leg.legIds]
+        npvDates = _legDates(leg, settlementDates if npvDates is None else npvDates)[leg.legIds]
+
+        if includeSettlementDateFlows:
+            alive = leg.paymentDates >= settlement
+        else:
+            alive = leg.paymentDates > settlement
+        exCoupon = (leg.exCouponDates != 0) & (leg.exCouponDates <= settlement)
+        amounts = np.where(alive & ~exCoupon, leg.amounts, 0.)
+
+        # flows are sorted by date, so the alive ones of a leg are its last rows
+        previousAlive = np.zeros(len(leg), dtype=bool)
+        previousAlive[1:] = alive[:-1]
+        previousAlive[leg.offsets[:-1][np.diff(leg.offsets) > 0]] = False
+        previousDates = np.empty(len(leg), dtype=np.int64)
+        previousDates[1:] = leg.paymentDates[:-1]
+        lastDates = np.where(previousAlive, previousDates, npvDates)
+
+        rows = np.flatnonzero(alive)
+        steps = np.zeros(len(leg))
+        steps[rows] = dayCounter.yearFractionArray(lastDates[rows],
+                                                   leg.paymentDates[rows],
+                                                   leg.refPeriodStarts[rows],
+                                                   leg.refPeriodEnds[rows])
+        cumulated = np.cumsum(steps)
+        starts = np.concatenate([[0.], cumulated])[leg.offsets[:-1]]
+        times = cumulated - starts[leg.legIds]
+        return alive, exCoupon, amounts, times
+
+    @staticmethod
+    def _valuation(leg, y, dayCounter, comp, freq, includeSettlementDateFlows, settlementDates, npvDates):
+        alive, exCoupon, amounts, times = CashFlows._flows(leg,
+                                                           dayCounter,
+                                                           includeSettlementDateFlows,
+                                                           settlementDates,
+                                                           npvDates)
+        r = np.broadcast_to(np.asarray(y, dtype=float), (leg.size(),))[leg.legIds]
+        b, db, d2b = _discounts(r, times, comp, float(freq))
+        return alive, exCoupon, amounts, times, b, db, d2b
+
+    @staticmethod
+    def npv(leg,
+            y,
+            dayCounter,
+            comp,
+            freq,
+            includeSettlementDateFlows=False,
+            settlementDates=None,
+            npvDates=None):
+        _, _, amounts, _, b, _, _ = CashFlows._valuation(leg, y, dayCounter, comp, freq,
+                                                        includeSettlementDateFlows, settlementDates, npvDates)
+        return leg.sumByLeg(amounts * b)
+
+    @staticmethod
+    def bps(leg,
+            y,
+            dayCounter,
+            comp,
+            freq,
+            includeSettlementDateFlows=False,
+            settlementDates=None,
+            npvDates=None):
+        u"""
+        Change of the npv for a one basis point parallel shift of the coupon
+        rates.
+        """
+        alive, exCoupon, _, _, b, _, _ = CashFlows._valuation(leg, y, dayCounter, comp, freq,
+                                                             includeSettlementDateFlows, settlementDates, npvDates)
+        sensitivities = np.where(alive & ~exCoupon, leg.nominals * leg.accrualPeriods * b, 0.)
+        return leg.sumByLeg(sensitivities) * 1e-4
+
+    @staticmethod
+    def accruedAmount(leg, settlementDates=None):
+        settlement = _legDates(leg, settlementDates)
+        accrued = leg.accruedAmounts(settlement)
+        return leg.sumByLeg(np.where(leg.paymentDates > settlement[leg.legIds], accrued, 0.))
+
+    @staticmethod
+    def modifiedDuration(leg,
+                         y,
+                         dayCounter,
+                         comp,
+                         freq,
+                         includeSettlementDateFlows=False,
+                         settlementDates=None,
+                         npvDates=None):
+        u"""
+        :return: tuple of (npv, d npv / d y) of every leg
+        """
+        _, _, amounts, _, b, db, _ = CashFlows._valuation(leg, y, dayCounter, comp, freq,
+                                                         includeSettlementDateFlows, settlementDates, npvDates)
+        return leg.sumByLeg(amounts * b), leg.sumByLeg(amounts * db)
+
+    @staticmethod
+    def duration(leg,
+                 y,
+                 dayCounter,
+                 comp,
+                 freq,
+                 durationType=Duration.Modified,
+                 includeSettlementDateFlows=False,
+                 settlementDates=None,
+                 npvDates=None):
+        _, _, amounts, times, b, db, _ = CashFlows._valuation(leg, y, dayCounter, comp, freq,
+                                                             includeSettlementDateFlows, settlementDates, npvDates)
+        npv = leg.sumByLeg(amounts * b)
+        if durationType == Duration.Simple:
+            return leg.sumByLeg(times * amounts * b) / npv
+
+        modified = -leg.sumByLeg(amounts * db) / npv
+        if durationType == Duration.Modified:
+            return modified
+        elif durationType == Duration.Macaulay:
+            require(comp == Compounding.Compounded or comp == Compounding.Continuous,
+                    ValueError,
+                    "compounded or continuous rate required for Macaulay duration")
+            if comp == Compounding.Continuous:
+                return modified
+            return modified * (1. + np.asarray(y, dtype=float) / float(freq))
+        else:
+            raise ValueError('unknown duration type')
+
+    @staticmethod
+    def convexity(leg,
+                  y,
+                  dayCounter,
+                  comp,
+                  freq,
+                  includeSettlementDateFlows=False,
+                  settlementDates=None,
+                  npvDates=None):
+        _, _, amounts, _, b, _, d2b = CashFlows._valuation(leg, y, dayCounter, comp, freq,
+                                                          includeSettlementDateFlows, settlementDates, npvDates)
+        return leg.sumByLeg(amounts * d2b) / leg.sumByLeg(amounts * b)
+
+    @staticmethod
+    def yieldRate(leg,
+                  npv,
+                  dayCounter,
+                  comp,
+                  freq,
+                  includeSettlementDateFlows=False,
+                  settlementDates=None,
+                  npvDates=None,
+                  accuracy=1e-10,
+                  maxIterations=100,
+                  guess=0.05):
+        u"""
+        Yield of every leg matching the given npv. All the legs are solved
+        together with Newton steps that fall back to bisection whenever they
+        leave the bracket of the root; legs whose root can't be bracketed or
+        with no flows left get nan.
+        """
+        targets = np.broadcast_to(np.asarray(npv, dtype=float), (leg.size(),))
+
+        def evaluate(y):
+            return CashFlows.modifiedDuration(leg, y, dayCounter, comp, freq,
+                                              includeSettlementDateFlows, settlementDates, npvDates)
+
+        # keep 1 + y * t positive for the whole life of the legs
+        alive, exCoupon, _, times = CashFlows._flows(leg,
+                                                     dayCounter,
+                                                     includeSettlementDateFlows,
+                                                     settlementDates,
+                                                     npvDates)
+        remaining = np.bincount(leg.legIds[alive & ~exCoupon], minlength=leg.size()) > 0
+        horizons = np.ones(leg.size())
+        nonEmpty = np.diff(leg.offsets) > 0
+        horizons[nonEmpty] = np.maximum(times[leg.offsets[1:][nonEmpty] - 1], 1.)
+        low = -0.99 / horizons
+        high = np.ones(leg.size())
+        lowValues = evaluate(low)[0] - targets
+        highValues = evaluate(high)[0] - targets
+        for _ in range(20):
+            expand = lowValues * highValues > 0.
+            if not expand.any():
+                break
+            high = np.where(expand, 2. * high, high)
+            highValues = evaluate(high)[0] - targets
+        # the npv of a leg with no flows left doesn't depend on the yield
+        bracketed = (lowValues * highValues <= 0.) & remaining
+
+        y = np.clip(np.full(leg.size(), guess), low, high)
+        for _ in range(maxIterations):
+            values, derivatives = evaluate(y)
+            errors = values - targets
+            converged = np.abs(errors) <= accuracy * np.maximum(np.abs(targets), 1.)
+            if (converged | ~bracketed).all():
+                break
+            below = errors * lowValues > 0.
+            low = np.where(below, y, low)
+            lowValues = np.where(below, errors, lowValues)
+            high = np.where(below, high, y)
+            highValues = np.where(below, highValues, errors)
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                newton = y - errors / derivatives
+            bisect = ~((newton > low) & (newton < high)) | ~np.isfinite(newton)
+            y = np.where(converged, y, np.where(bisect, 0.5 * (low + high), newton))
+
+        return np.where(bracketed, y, np.nan)
+
 
 
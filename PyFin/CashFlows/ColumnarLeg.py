@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+u"""
+Created on 2026-10-18
+"""
+
+import numpy as np
+from PyFin.CashFlows.CashFlow import Coupon
+from PyFin.Utilities.Asserts import require
+
+
+def _serial(d):
+    return d.serialNumber if d else 0
+
+
+class ColumnarLeg(object):
+    u"""
+    Cash flows of a batch of legs stored column by column. The flows of leg i
+    are the rows offsets[i]:offsets[i + 1], sorted by payment date. Dates are
+    serial numbers; missing reference or ex-coupon dates are 0 and non coupon
+    flows have a zero nominal and accrual period.
+    """
+
+    def __init__(self,
+                 offsets,
+                 paymentDates,
+                 amounts,
+                 isCoupon,
+                 nominals,
+                 accrualStartDates,
+                 accrualEndDates,
+                 refPeriodStarts,
+                 refPeriodEnds,
+                 exCouponDates,
+                 accrualPeriods,
+                 rateCodes,
+                 rates):
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.paymentDates = np.asarray(paymentDates, dtype=np.int32)
+        self.amounts = np.asarray(amounts, dtype=float)
+        self.isCoupon = np.asarray(isCoupon, dtype=bool)
+        self.nominals = np.asarray(nominals, dtype=float)
+        self.accrualStartDates = np.asarray(accrualStartDates, dtype=np.int32)
+        self.accrualEndDates = np.asarray(accrualEndDates, dtype=np.int32)
+        self.refPeriodStarts = np.asarray(refPeriodStarts, dtype=np.int32)
+        self.refPeriodEnds = np.asarray(refPeriodEnds, dtype=np.int32)
+        self.exCouponDates = np.asarray(exCouponDates, dtype=np.int32)
+        self.accrualPeriods = np.asarray(accrualPeriods, dtype=float)
+        # index in rates of the interest rate of every coupon, -1 otherwise
+        self.rateCodes = np.asarray(rateCodes, dtype=np.int64)
+        self.rates = list(rates)
+        self.legIds = np.repeat(np.arange(len(self.offsets) - 1), np.diff(self.offsets))
+
+        require(len(self.offsets) >= 1 and self.offsets[0] == 0 and self.offsets[-1] == len(self.paymentDates),
+                ValueError,
+                "offsets do not match the number of cash flows")
+
+    @classmethod
+    def fromLegs(cls, legs):
+        u"""
+        Build the columns from lists of cash flow objects, e.g. the output of
+        FixedRateLeg.toLeg() with the redemption appended.
+        """
+        flows = []
+        lengths = []
+        for leg in legs:
+            leg = sorted(leg, key=lambda cf: cf.date())
+            flows.extend(leg)
+            lengths.append(len(leg))
+
+        n = len(flows)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(lengths)
+        paymentDates = np.array([cf.date().serialNumber for cf in flows], dtype=np.int32)
+        isCoupon = np.array([isinstance(cf, Coupon) for cf in flows], dtype=bool)
+
+        amounts = np.zeros(n)
+        nominals = np.zeros(n)
+        accrualStartDates = np.zeros(n, dtype=np.int32)
+        accrualEndDates = np.zeros(n, dtype=np.int32)
+        refPeriodStarts = np.zeros(n, dtype=np.int32)
+        refPeriodEnds = np.zeros(n, dtype=np.int32)
+        exCouponDates = np.zeros(n, dtype=np.int32)
+        accrualPeriods = np.zeros(n)
+        rateCodes = np.full(n, -1, dtype=np.int64)
+
+        rates = []
+        codes = {}
+        for i, cf in enumerate(flows):
+            if isCoupon[i]:
+                nominals[i] = cf.norminal_
+                accrualStartDates[i] = cf.accrualStartDate_.serialNumber
+                accrualEndDates[i] = cf.accrualEndDate_.serialNumber
+                refPeriodStarts[i] = _serial(cf.refPeriodStart_)
+                refPeriodEnds[i] = _serial(cf.refPeriodEnd_)
+                exCouponDates[i] = _serial(cf.exCouponDate())
+                rate = getattr(cf, 'rate_', None)
+                require(rate is not None, ValueError, "only fixed rate coupons are supported")
+                try:
+                    rateCodes[i] = codes[id(rate)]
+                except KeyError:
+                    codes[id(rate)] = rateCodes[i] = len(rates)
+                    rates.append(rate)
+            else:
+                amounts[i] = cf.amount()
+
+        leg = cls(offsets,
+                  paymentDates,
+                  amounts,
+                  isCoupon,
+                  nominals,
+                  accrualStartDates,
+                  accrualEndDates,
+                  refPeriodStarts,
+                  refPeriodEnds,
+                  exCouponDates,
+                  accrualPeriods,
+                  rateCodes,
+                  rates)
+
+        # coupon amounts and accrual periods, one call per interest rate
+        for code, rate in enumerate(rates):
+            rows = np.flatnonzero(rateCodes == code)
+            t = rate.dayCounter_.yearFractionArray(accrualStartDates[rows],
+                                                   accrualEndDates[rows],
+                                                   refPeriodStarts[rows],
+                                                   refPeriodEnds[rows])
+            leg.accrualPeriods[rows] = t
+            leg.amounts[rows] = nominals[rows] * (rate.compoundFactorImplArray(t) - 1.0)
+        return leg
+
+    @classmethod
+    def fromLeg(cls, leg):
+        return cls.fromLegs([leg])
+
+    def size(self):
+        u"""
+        Number of legs.
+        """
+        return len(self.offsets) - 1
+
+    def __len__(self):
+        return len(self.paymentDates)
+
+    def sumByLeg(self, values):
+        return np.bincount(self.legIds, weights=values, minlength=self.size())
+
+    def accruedAmounts(self, dates):
+        u"""
+        Accrued amount of every flow at the given date of its leg (one serial
+        number per leg or a scalar), as FixedRateCoupon.accruedAmount.
+        """
+        d = np.broadcast_to(np.asarray(dates), (self.size(),))[self.legIds]
+        result = np.zeros(len(self))
+        accruing = self.isCoupon & (d > self.accrualStartDates) & (d <= self.paymentDates)
+        exCoupon = accruing & (self.exCouponDates != 0) & (self.exCouponDates <= d)
+        accruing &= ~exCoupon
+
+        for code, rate in enumerate(self.rates):
+            rows = np.flatnonzero(accruing & (self.rateCodes == code))
+            result[rows] = self.nominals[rows] * (rate.compoundFactorArray(self.accrualStartDates[rows],
+                                                                           np.minimum(d[rows], self.accrualEndDates[rows]),
+                                                                           self.refPeriodStarts[rows],
+                                                                           self.refPeriodEnds[rows]) - 1.0)
+            rows = np.flatnonzero(exCoupon & (self.rateCodes == code))
+            result[rows] = -self.nominals[rows] * (rate.compoundFactorArray(d[rows],
+                                                                            self.accrualEndDates[rows],
+                                                                            self.refPeriodStarts[rows],
+                                                                            self.refPeriodEnds[rows]) - 1.0)
+        return result
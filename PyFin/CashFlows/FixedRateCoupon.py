@@ -5,7 +5,9 @@ Created on 2017-6-12
 @author: cheng.li
 """
 
+import numpy as np
 from PyFin.CashFlows.CashFlow import Coupon
+from PyFin.CashFlows.ColumnarLeg import ColumnarLeg
 from PyFin.CashFlows.InterestRate import InterestRate
 from PyFin.Enums.Compoundings import Compounding
 from PyFin.Enums.Frequencies import Frequency
@@ -32,6 +34,9 @@ class FixedRateCoupon(Coupon):
                                               exCouponDate)
         self.rate_ = interestRate
 
+    def dayCounter(self):
+        return self.rate_.dayCounter_
+
     def amount(self):
         return self.norminal_ * (self.rate_.compoundFactor(self.accrualStartDate_,
                                                            self.accrualEndDate_,
@@ -52,6 +57,49 @@ class FixedRateCoupon(Coupon):
                                                                self.refPeriodStart_,
                                                                self.refPeriodEnd_) - 1.0)
 
+    def accruedAmountArray(self, dates):
+        u"""
+        Vectorized accruedAmount over an array of date serial numbers.
+        """
+        d = np.asarray(dates)
+        start = self.accrualStartDate_.serialNumber
+        end = self.accrualEndDate_.serialNumber
+        refStart = self.refPeriodStart_.serialNumber
+        refEnd = self.refPeriodEnd_.serialNumber
+
+        accruing = (d > start) & (d <= self.paymentDate_.serialNumber)
+        if self.exCouponDate_:
+            exCoupon = accruing & (d >= self.exCouponDate_.serialNumber)
+        else:
+            exCoupon = np.zeros(d.shape, dtype=bool)
+        accruing &= ~exCoupon
+
+        result = np.zeros(d.shape)
+        result[accruing] = self.norminal_ * (self.rate_.compoundFactorArray(start,
+                                                                           np.minimum(d[accruing], end),
+                                                                           refStart,
+                                                                           refEnd) - 1.0)
+        result[exCoupon] = -self.norminal_ * (self.rate_.compoundFactorArray(d[exCoupon],
+                                                                            end,
+                                                                            refStart,
+                                                                            refEnd) - 1.0)
+        return result
+
+
+def _fillAccrualPeriods(leg):
+    # one day counter call per distinct day counter instead of one per coupon
+    groups = {}
+    for coupon in leg:
+        groups.setdefault(id(coupon.dayCounter()), []).append(coupon)
+
+    for coupons in groups.values():
+        periods = coupons[0].dayCounter().yearFractionArray([c.accrualStartDate_.serialNumber for c in coupons],
+                                                            [c.accrualEndDate_.serialNumber for c in coupons],
+                                                            [c.refPeriodStart_.serialNumber for c in coupons],
+                                                            [c.refPeriodEnd_.serialNumber for c in coupons])
+        for coupon, period in zip(coupons, periods):
+            coupon.accrualPeriod_ = float(period)
+
 
 class FixedRateLeg(object):
 
@@ -194,10 +242,10 @@ class FixedRateLeg(object):
                                            end,
                                            exCouponDate))
             else:
-                ref = self.schedule_.calendar().advance(start,
-                                                        self.schedule_.tenor(),
-                                                        self.schedule_._convention,
-                                                        self.schedule_.endOfMonth())
+                ref = self.schedule_.calendar().advanceDate(start,
+                                                            self.schedule_.tenor(),
+                                                            self.schedule_._convention,
+                                                            self.schedule_.endOfMonth())
                 leg.append(FixedRateCoupon(paymentDate,
                                            nominal,
                                            rate,
@@ -207,4 +255,8 @@ class FixedRateLeg(object):
                                            ref,
                                            exCouponDate))
 
+        _fillAccrualPeriods(leg)
         return leg
+
+    def toColumnarLeg(self):
+        return ColumnarLeg.fromLeg(self.toLeg())
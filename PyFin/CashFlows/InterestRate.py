@@ -7,6 +7,7 @@ Created on 2017-6-11
 
 from math import exp
 from math import log
+import numpy as np
 from PyFin.Enums.Compoundings import Compounding
 from PyFin.Enums.Frequencies import Frequency
 from PyFin.Utilities.Asserts import require
@@ -52,6 +53,25 @@ class InterestRate(object):
     def discountFactorImpl(self, t):
         return 1. / self.compoundFactorImpl(t)
 
+    def compoundFactorImplArray(self, t):
+        t = np.asarray(t, dtype=float)
+        if self.comp_ == Compounding.Simple:
+            return 1. + self.r_ * t
+        elif self.comp_ == Compounding.Compounded:
+            return (1. + self.r_ / self.freq_) ** (self.freq_ * t)
+        elif self.comp_ == Compounding.Continuous:
+            return np.exp(self.r_ * t)
+        elif self.comp_ == Compounding.SimpleThenCompounded:
+            return np.where(t <= 1.0 / self.freq_,
+                            1.0 + self.r_ * t,
+                            (1.0 + self.r_ / self.freq_) ** (self.freq_ * t))
+        elif self.comp_ == Compounding.CompoundedThenSimple:
+            return np.where(t > 1.0 / self.freq_,
+                            1.0 + self.r_ * t,
+                            (1.0 + self.r_ / self.freq_) ** (self.freq_ * t))
+        else:
+            raise ValueError('unknown compounding convention')
+
     def compoundFactor(self, d1, d2, refStart=None, refEnd=None):
         t = self.dayCounter_.yearFraction(d1, d2, refStart, refEnd)
         return self.compoundFactorImpl(t)
@@ -59,6 +79,16 @@ class InterestRate(object):
     def discountFactor(self, d1, d2, refStart=None, refEnd=None):
         return 1. / self.compoundFactor(d1, d2, refStart, refEnd)
 
+    def compoundFactorArray(self, d1, d2, refStart=None, refEnd=None):
+        u"""
+        Vectorized compoundFactor over arrays of date serial numbers.
+        """
+        t = self.dayCounter_.yearFractionArray(d1, d2, refStart, refEnd)
+        return self.compoundFactorImplArray(t)
+
+    def discountFactorArray(self, d1, d2, refStart=None, refEnd=None):
+        return 1. / self.compoundFactorArray(d1, d2, refStart, refEnd)
+
     @staticmethod
     def impliedRate(compound, resultDC, comp, freq, t):
         if compound == 1.0:
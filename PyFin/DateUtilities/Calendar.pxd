@@ -15,10 +15,24 @@ cdef class CalendarImpl(object):
     cdef bint isWeekEnd(self, int weekDay)
 
 
+cdef class BizDayIndex(object):
+
+    cdef int* counts
+    cdef int* serials
+    cdef public int size
+
+    cdef inline bint inRange(self, int serial) noexcept nogil
+    cdef inline int countBefore(self, int serial) noexcept nogil
+    cdef inline bint isBizDay(self, int serial) noexcept nogil
+
+
 cdef class Calendar(object):
 
     cdef public CalendarImpl _impl
     cdef public str name
+    cdef BizDayIndex _index
+
+    cdef BizDayIndex _bizDayIndex(self)
 
     cpdef isBizDay(self, Date d)
     cpdef isHoliday(self, Date d)
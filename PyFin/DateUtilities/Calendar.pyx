@@ -5,12 +5,68 @@ Created on 2017-2-1
 @author: cheng.li
 """
 
+import datetime as dt
+import numpy as np
+cimport cython
+from cpython.mem cimport PyMem_Malloc, PyMem_Free
+from libc.string cimport memcpy
+from libc.string cimport memset
 from PyFin.Enums._Weekdays cimport Weekdays
 from PyFin.Enums._TimeUnits cimport TimeUnits
 from PyFin.Enums._Months cimport Months
 from PyFin.Enums._BizDayConventions cimport BizDayConventions
 from PyFin.DateUtilities.Date cimport Date
 from PyFin.DateUtilities.Period cimport Period
+from PyFin.Utilities.Asserts cimport require
+
+cdef int _MIN_SERIAL = Date.minDate().serialNumber
+cdef int _MAX_SERIAL = Date.maxDate().serialNumber
+cdef int _EXCEL_BASE = dt.date(1899, 12, 30).toordinal()
+
+
+cdef class BizDayIndex(object):
+    u"""
+    Cumulative business day counts of a calendar over the whole supported date
+    range (Date.minDate() to Date.maxDate()). ``counts[i]`` is the number of
+    business days strictly before serial number ``_MIN_SERIAL + i`` and
+    ``serials`` lists the business days in order.
+    """
+
+    def __cinit__(self, CalendarImpl impl):
+        cdef int n = _MAX_SERIAL - _MIN_SERIAL + 1
+        cdef int i
+        cdef int total = 0
+
+        self.counts = <int*> PyMem_Malloc((n + 1) * sizeof(int))
+        self.serials = <int*> PyMem_Malloc(n * sizeof(int))
+        if not self.counts or not self.serials:
+            raise MemoryError()
+
+        self.counts[0] = 0
+        for i in range(n):
+            if impl.isBizDay(Date(serialNumber=_MIN_SERIAL + i)):
+                self.serials[total] = _MIN_SERIAL + i
+                total += 1
+            self.counts[i + 1] = total
+        self.size = total
+
+    def __dealloc__(self):
+        PyMem_Free(self.counts)
+        PyMem_Free(self.serials)
+
+    cdef inline bint inRange(self, int serial) noexcept nogil:
+        return _MIN_SERIAL <= serial <= _MAX_SERIAL
+
+    cdef inline int countBefore(self, int serial) noexcept nogil:
+        return self.counts[serial - _MIN_SERIAL]
+
+    cdef inline bint isBizDay(self, int serial) noexcept nogil:
+        return self.counts[serial - _MIN_SERIAL + 1] != self.counts[serial - _MIN_SERIAL]
+
+
+# indices are shared by all the calendars of the same holiday center
+cdef dict _bizDayIndices = {}
+
 
 cdef class Calendar(object):
     def __init__(self, str holCenter):
@@ -20,12 +76,49 @@ cdef class Calendar(object):
         except KeyError:
             raise ValueError("{0} is not a valid description of a holiday center".format(holCenter))
         self.name = holCenter
+        self._index = None
+
+    cdef BizDayIndex _bizDayIndex(self):
+        if self._index is None:
+            try:
+                self._index = _bizDayIndices[type(self._impl)]
+            except KeyError:
+                self._index = BizDayIndex(self._impl)
+                _bizDayIndices[type(self._impl)] = self._index
+        return self._index
 
     cpdef isBizDay(self, Date d):
+        cdef BizDayIndex index = self._bizDayIndex()
+        if index.inRange(d.__serialNumber__):
+            return index.isBizDay(d.__serialNumber__)
         return self._impl.isBizDay(d)
 
     cpdef isHoliday(self, Date d):
-        return not self._impl.isBizDay(d)
+        return not self.isBizDay(d)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def isBizDayArray(self, serialNumbers):
+        u"""
+        Vectorized isBizDay over an array of date serial numbers.
+        """
+        np_serials = np.asarray(serialNumbers, dtype=np.intc)
+        cdef const int[:] serials = np_serials.ravel()
+        cdef unsigned char[:] flags
+        cdef Py_ssize_t i
+        cdef BizDayIndex index = self._bizDayIndex()
+
+        result = np.empty(serials.shape[0], dtype=np.uint8)
+        flags = result
+        if serials.shape[0]:
+            require(_MIN_SERIAL <= np_serials.min() and np_serials.max() <= _MAX_SERIAL,
+                    ValueError,
+                    "serial numbers should be in [{0}, {1}]".format(_MIN_SERIAL, _MAX_SERIAL))
+
+        with nogil:
+            for i in range(serials.shape[0]):
+                flags[i] = index.isBizDay(serials[i])
+        return result.view(bool).reshape(np_serials.shape)
 
     cpdef isWeekEnd(self, int weekday):
         return self._impl.isWeekEnd(weekday)
@@ -39,8 +132,17 @@ cdef class Calendar(object):
     cpdef bizDaysBetween(self, Date fromDate, Date toDate, bint includeFirst=True, bint includeLast=False):
         cdef int wd = 0
         cdef Date d
+        cdef int first = min(fromDate.__serialNumber__, toDate.__serialNumber__)
+        cdef int last = max(fromDate.__serialNumber__, toDate.__serialNumber__)
+        cdef BizDayIndex index = self._bizDayIndex()
 
-        if fromDate != toDate:
+        if fromDate != toDate and index.inRange(first) and index.inRange(last):
+            wd = index.countBefore(last + 1) - index.countBefore(first)
+            if index.isBizDay(fromDate.__serialNumber__) and not includeFirst:
+                wd -= 1
+            if index.isBizDay(toDate.__serialNumber__) and not includeLast:
+                wd -= 1
+        elif fromDate != toDate:
             if fromDate < toDate:
                 d = fromDate
                 while d < toDate:
@@ -105,7 +207,9 @@ cdef class Calendar(object):
 
         cdef int n
         cdef int units
+        cdef int j
         cdef Date d1
+        cdef BizDayIndex index
 
         n = period.length()
         units = period.units()
@@ -113,6 +217,15 @@ cdef class Calendar(object):
         if n == 0:
             return self.adjustDate(d, c)
         elif units == TimeUnits.BDays:
+            index = self._bizDayIndex()
+            if index.inRange(d.__serialNumber__):
+                # position of the target in the ordered business days
+                if n > 0:
+                    j = index.countBefore(d.__serialNumber__ + 1) + n - 1
+                else:
+                    j = index.countBefore(d.__serialNumber__) + n
+                if 0 <= j < index.size:
+                    return Date(serialNumber=index.serials[j])
             d1 = d
             if n > 0:
                 while n > 0:
@@ -139,6 +252,16 @@ cdef class Calendar(object):
     cpdef holDatesList(self, Date fromDate, Date toDate, bint includeWeekEnds=True):
         cdef list result = []
         cdef Date d = fromDate
+        cdef int serial
+        cdef BizDayIndex index = self._bizDayIndex()
+
+        if index.inRange(fromDate.__serialNumber__) and index.inRange(toDate.__serialNumber__):
+            for serial in range(fromDate.__serialNumber__, toDate.__serialNumber__ + 1):
+                if not index.isBizDay(serial):
+                    d = Date(serialNumber=serial)
+                    if includeWeekEnds or not self.isWeekEnd(d.weekday()):
+                        result.append(d)
+            return result
 
         while d <= toDate:
             if self.isHoliday(d) and (includeWeekEnds or not self.isWeekEnd(d.weekday())):
@@ -149,6 +272,13 @@ cdef class Calendar(object):
     cpdef bizDatesList(self, Date fromDate, Date toDate):
         cdef list result = []
         cdef Date d = fromDate
+        cdef int j
+        cdef BizDayIndex index = self._bizDayIndex()
+
+        if index.inRange(fromDate.__serialNumber__) and index.inRange(toDate.__serialNumber__):
+            for j in range(index.countBefore(fromDate.__serialNumber__), index.countBefore(toDate.__serialNumber__ + 1)):
+                result.append(Date(serialNumber=index.serials[j]))
+            return result
 
         while d <= toDate:
             if self.isBizDay(d):
@@ -178,583 +308,583 @@ cdef class CalendarImpl(object):
     cdef bint isWeekEnd(self, int weekDay):
         pass
 
-cdef set sse_holDays = {
-    Date(1991, 1, 1),
-    Date(1991, 2, 15),
-    Date(1991, 2, 18),
-    Date(1991, 5, 1),
-    Date(1991, 10, 1),
-    Date(1991, 10, 2),
-    Date(1992, 1, 1),
-    Date(1992, 2, 4),
-    Date(1992, 2, 5),
-    Date(1992, 2, 6),
-    Date(1992, 5, 1),
-    Date(1992, 10, 1),
-    Date(1992, 10, 2),
-    Date(1993, 1, 1),
-    Date(1993, 1, 25),
-    Date(1993, 1, 26),
-    Date(1993, 10, 1),
-    Date(1994, 2, 7),
-    Date(1994, 2, 8),
-    Date(1994, 2, 9),
-    Date(1994, 2, 10),
-    Date(1994, 2, 11),
-    Date(1994, 5, 2),
-    Date(1994, 10, 3),
-    Date(1994, 10, 4),
-    Date(1995, 1, 2),
-    Date(1995, 1, 30),
-    Date(1995, 1, 31),
-    Date(1995, 2, 1),
-    Date(1995, 2, 2),
-    Date(1995, 2, 3),
-    Date(1995, 5, 1),
-    Date(1995, 10, 2),
-    Date(1995, 10, 3),
-    Date(1996, 1, 1),
-    Date(1996, 2, 19),
-    Date(1996, 2, 20),
-    Date(1996, 2, 21),
-    Date(1996, 2, 22),
-    Date(1996, 2, 23),
-    Date(1996, 2, 26),
-    Date(1996, 2, 27),
-    Date(1996, 2, 28),
-    Date(1996, 2, 29),
-    Date(1996, 3, 1),
-    Date(1996, 5, 1),
-    Date(1996, 9, 30),
-    Date(1996, 10, 1),
-    Date(1996, 10, 2),
-    Date(1997, 1, 1),
-    Date(1997, 2, 3),
-    Date(1997, 2, 4),
-    Date(1997, 2, 5),
-    Date(1997, 2, 6),
-    Date(1997, 2, 7),
-    Date(1997, 2, 10),
-    Date(1997, 2, 11),
-    Date(1997, 2, 12),
-    Date(1997, 2, 13),
-    Date(1997, 2, 14),
-    Date(1997, 5, 1),
-    Date(1997, 5, 2),
-    Date(1997, 6, 30),
-    Date(1997, 7, 1),
-    Date(1997, 10, 1),
-    Date(1997, 10, 2),
-    Date(1997, 10, 3),
-    Date(1998, 1, 1),
-    Date(1998, 1, 2),
-    Date(1998, 1, 26),
-    Date(1998, 1, 27),
-    Date(1998, 1, 28),
-    Date(1998, 1, 29),
-    Date(1998, 1, 30),
-    Date(1998, 2, 2),
-    Date(1998, 2, 3),
-    Date(1998, 2, 4),
-    Date(1998, 2, 5),
-    Date(1998, 2, 6),
-    Date(1998, 5, 1),
-    Date(1998, 10, 1),
-    Date(1998, 10, 2),
-    Date(1999, 1, 1),
-    Date(1999, 2, 10),
-    Date(1999, 2, 11),
-    Date(1999, 2, 12),
-    Date(1999, 2, 15),
-    Date(1999, 2, 16),
-    Date(1999, 2, 17),
-    Date(1999, 2, 18),
-    Date(1999, 2, 19),
-    Date(1999, 2, 22),
-    Date(1999, 2, 23),
-    Date(1999, 2, 24),
-    Date(1999, 2, 25),
-    Date(1999, 2, 26),
-    Date(1999, 5, 3),
-    Date(1999, 10, 1),
-    Date(1999, 10, 4),
-    Date(1999, 10, 5),
-    Date(1999, 10, 6),
-    Date(1999, 10, 7),
-    Date(1999, 12, 20),
-    Date(1999, 12, 31),
-    Date(2000, 1, 3),
-    Date(2000, 1, 31),
-    Date(2000, 2, 1),
-    Date(2000, 2, 2),
-    Date(2000, 2, 3),
-    Date(2000, 2, 4),
-    Date(2000, 2, 7),
-    Date(2000, 2, 8),
-    Date(2000, 2, 9),
-    Date(2000, 2, 10),
-    Date(2000, 2, 11),
-    Date(2000, 5, 1),
-    Date(2000, 5, 2),
-    Date(2000, 5, 3),
-    Date(2000, 5, 4),
-    Date(2000, 5, 5),
-    Date(2000, 10, 2),
-    Date(2000, 10, 3),
-    Date(2000, 10, 4),
-    Date(2000, 10, 5),
-    Date(2000, 10, 6),
-    Date(2001, 1, 1),
-    Date(2001, 1, 22),
-    Date(2001, 1, 23),
-    Date(2001, 1, 24),
-    Date(2001, 1, 25),
-    Date(2001, 1, 26),
-    Date(2001, 1, 29),
-    Date(2001, 1, 30),
-    Date(2001, 1, 31),
-    Date(2001, 2, 1),
-    Date(2001, 2, 2),
-    Date(2001, 5, 1),
-    Date(2001, 5, 2),
-    Date(2001, 5, 3),
-    Date(2001, 5, 4),
-    Date(2001, 5, 7),
-    Date(2001, 10, 1),
-    Date(2001, 10, 2),
-    Date(2001, 10, 3),
-    Date(2001, 10, 4),
-    Date(2001, 10, 5),
-    Date(2002, 1, 1),
-    Date(2002, 1, 2),
-    Date(2002, 1, 3),
-    Date(2002, 2, 11),
-    Date(2002, 2, 12),
-    Date(2002, 2, 13),
-    Date(2002, 2, 14),
-    Date(2002, 2, 15),
-    Date(2002, 2, 18),
-    Date(2002, 2, 19),
-    Date(2002, 2, 20),
-    Date(2002, 2, 21),
-    Date(2002, 2, 22),
-    Date(2002, 5, 1),
-    Date(2002, 5, 2),
-    Date(2002, 5, 3),
-    Date(2002, 5, 6),
-    Date(2002, 5, 7),
-    Date(2002, 9, 30),
-    Date(2002, 10, 1),
-    Date(2002, 10, 2),
-    Date(2002, 10, 3),
-    Date(2002, 10, 4),
-    Date(2002, 10, 7),
-    Date(2003, 1, 1),
-    Date(2003, 1, 30),
-    Date(2003, 1, 31),
-    Date(2003, 2, 3),
-    Date(2003, 2, 4),
-    Date(2003, 2, 5),
-    Date(2003, 2, 6),
-    Date(2003, 2, 7),
-    Date(2003, 5, 1),
-    Date(2003, 5, 2),
-    Date(2003, 5, 5),
-    Date(2003, 5, 6),
-    Date(2003, 5, 7),
-    Date(2003, 5, 8),
-    Date(2003, 5, 9),
-    Date(2003, 10, 1),
-    Date(2003, 10, 2),
-    Date(2003, 10, 3),
-    Date(2003, 10, 6),
-    Date(2003, 10, 7),
-    Date(2004, 1, 1),
-    Date(2004, 1, 19),
-    Date(2004, 1, 20),
-    Date(2004, 1, 21),
-    Date(2004, 1, 22),
-    Date(2004, 1, 23),
-    Date(2004, 1, 26),
-    Date(2004, 1, 27),
-    Date(2004, 1, 28),
-    Date(2004, 5, 3),
-    Date(2004, 5, 4),
-    Date(2004, 5, 5),
-    Date(2004, 5, 6),
-    Date(2004, 5, 7),
-    Date(2004, 10, 1),
-    Date(2004, 10, 4),
-    Date(2004, 10, 5),
-    Date(2004, 10, 6),
-    Date(2004, 10, 7),
-    Date(2005, 1, 3),
-    Date(2005, 2, 7),
-    Date(2005, 2, 8),
-    Date(2005, 2, 9),
-    Date(2005, 2, 10),
-    Date(2005, 2, 11),
-    Date(2005, 2, 14),
-    Date(2005, 2, 15),
-    Date(2005, 5, 2),
-    Date(2005, 5, 3),
-    Date(2005, 5, 4),
-    Date(2005, 5, 5),
-    Date(2005, 5, 6),
-    Date(2005, 10, 3),
-    Date(2005, 10, 4),
-    Date(2005, 10, 5),
-    Date(2005, 10, 6),
-    Date(2005, 10, 7),
-    Date(2006, 1, 2),
-    Date(2006, 1, 3),
-    Date(2006, 1, 26),
-    Date(2006, 1, 27),
-    Date(2006, 1, 30),
-    Date(2006, 1, 31),
-    Date(2006, 2, 1),
-    Date(2006, 2, 2),
-    Date(2006, 2, 3),
-    Date(2006, 5, 1),
-    Date(2006, 5, 2),
-    Date(2006, 5, 3),
-    Date(2006, 5, 4),
-    Date(2006, 5, 5),
-    Date(2006, 10, 2),
-    Date(2006, 10, 3),
-    Date(2006, 10, 4),
-    Date(2006, 10, 5),
-    Date(2006, 10, 6),
-    Date(2007, 1, 1),
-    Date(2007, 1, 2),
-    Date(2007, 1, 3),
-    Date(2007, 2, 19),
-    Date(2007, 2, 20),
-    Date(2007, 2, 21),
-    Date(2007, 2, 22),
-    Date(2007, 2, 23),
-    Date(2007, 5, 1),
-    Date(2007, 5, 2),
-    Date(2007, 5, 3),
-    Date(2007, 5, 4),
-    Date(2007, 5, 7),
-    Date(2007, 10, 1),
-    Date(2007, 10, 2),
-    Date(2007, 10, 3),
-    Date(2007, 10, 4),
-    Date(2007, 10, 5),
-    Date(2007, 12, 31),
-    Date(2008, 1, 1),
-    Date(2008, 2, 6),
-    Date(2008, 2, 7),
-    Date(2008, 2, 8),
-    Date(2008, 2, 11),
-    Date(2008, 2, 12),
-    Date(2008, 4, 4),
-    Date(2008, 5, 1),
-    Date(2008, 5, 2),
-    Date(2008, 6, 9),
-    Date(2008, 9, 15),
-    Date(2008, 9, 29),
-    Date(2008, 9, 30),
-    Date(2008, 10, 1),
-    Date(2008, 10, 2),
-    Date(2008, 10, 3),
-    Date(2009, 1, 1),
-    Date(2009, 1, 2),
-    Date(2009, 1, 26),
-    Date(2009, 1, 27),
-    Date(2009, 1, 28),
-    Date(2009, 1, 29),
-    Date(2009, 1, 30),
-    Date(2009, 4, 6),
-    Date(2009, 5, 1),
-    Date(2009, 5, 28),
-    Date(2009, 5, 29),
-    Date(2009, 10, 1),
-    Date(2009, 10, 2),
-    Date(2009, 10, 5),
-    Date(2009, 10, 6),
-    Date(2009, 10, 7),
-    Date(2009, 10, 8),
-    Date(2010, 1, 1),
-    Date(2010, 2, 15),
-    Date(2010, 2, 16),
-    Date(2010, 2, 17),
-    Date(2010, 2, 18),
-    Date(2010, 2, 19),
-    Date(2010, 4, 5),
-    Date(2010, 5, 3),
-    Date(2010, 6, 14),
-    Date(2010, 6, 15),
-    Date(2010, 6, 16),
-    Date(2010, 9, 22),
-    Date(2010, 9, 23),
-    Date(2010, 9, 24),
-    Date(2010, 10, 1),
-    Date(2010, 10, 4),
-    Date(2010, 10, 5),
-    Date(2010, 10, 6),
-    Date(2010, 10, 7),
-    Date(2011, 1, 3),
-    Date(2011, 2, 2),
-    Date(2011, 2, 3),
-    Date(2011, 2, 4),
-    Date(2011, 2, 7),
-    Date(2011, 2, 8),
-    Date(2011, 4, 4),
-    Date(2011, 4, 5),
-    Date(2011, 5, 2),
-    Date(2011, 6, 6),
-    Date(2011, 9, 12),
-    Date(2011, 10, 3),
-    Date(2011, 10, 4),
-    Date(2011, 10, 5),
-    Date(2011, 10, 6),
-    Date(2011, 10, 7),
-    Date(2012, 1, 2),
-    Date(2012, 1, 3),
-    Date(2012, 1, 23),
-    Date(2012, 1, 24),
-    Date(2012, 1, 25),
-    Date(2012, 1, 26),
-    Date(2012, 1, 27),
-    Date(2012, 4, 2),
-    Date(2012, 4, 3),
-    Date(2012, 4, 4),
-    Date(2012, 4, 30),
-    Date(2012, 5, 1),
-    Date(2012, 6, 22),
-    Date(2012, 10, 1),
-    Date(2012, 10, 2),
-    Date(2012, 10, 3),
-    Date(2012, 10, 4),
-    Date(2012, 10, 5),
-    Date(2013, 1, 1),
-    Date(2013, 1, 2),
-    Date(2013, 1, 3),
-    Date(2013, 2, 11),
-    Date(2013, 2, 12),
-    Date(2013, 2, 13),
-    Date(2013, 2, 14),
-    Date(2013, 2, 15),
-    Date(2013, 4, 4),
-    Date(2013, 4, 5),
-    Date(2013, 4, 29),
-    Date(2013, 4, 30),
-    Date(2013, 5, 1),
-    Date(2013, 6, 10),
-    Date(2013, 6, 11),
-    Date(2013, 6, 12),
-    Date(2013, 9, 19),
-    Date(2013, 9, 20),
-    Date(2013, 10, 1),
-    Date(2013, 10, 2),
-    Date(2013, 10, 3),
-    Date(2013, 10, 4),
-    Date(2013, 10, 7),
-    Date(2014, 1, 1),
-    Date(2014, 1, 31),
-    Date(2014, 2, 3),
-    Date(2014, 2, 4),
-    Date(2014, 2, 5),
-    Date(2014, 2, 6),
-    Date(2014, 4, 7),
-    Date(2014, 5, 1),
-    Date(2014, 5, 2),
-    Date(2014, 6, 2),
-    Date(2014, 9, 8),
-    Date(2014, 10, 1),
-    Date(2014, 10, 2),
-    Date(2014, 10, 3),
-    Date(2014, 10, 6),
-    Date(2014, 10, 7),
-    Date(2015, 1, 1),
-    Date(2015, 1, 2),
-    Date(2015, 2, 18),
-    Date(2015, 2, 19),
-    Date(2015, 2, 20),
-    Date(2015, 2, 23),
-    Date(2015, 2, 24),
-    Date(2015, 4, 6),
-    Date(2015, 5, 1),
-    Date(2015, 6, 22),
-    Date(2015, 9, 3),
-    Date(2015, 9, 4),
-    Date(2015, 10, 1),
-    Date(2015, 10, 2),
-    Date(2015, 10, 5),
-    Date(2015, 10, 6),
-    Date(2015, 10, 7),
-    Date(2016, 1, 1),
-    Date(2016, 2, 8),
-    Date(2016, 2, 9),
-    Date(2016, 2, 10),
-    Date(2016, 2, 11),
-    Date(2016, 2, 12),
-    Date(2016, 4, 4),
-    Date(2016, 5, 1),
-    Date(2016, 5, 2),
-    Date(2016, 6, 9),
-    Date(2016, 6, 10),
-    Date(2016, 9, 15),
-    Date(2016, 9, 16),
-    Date(2016, 10, 3),
-    Date(2016, 10, 4),
-    Date(2016, 10, 5),
-    Date(2016, 10, 6),
-    Date(2016, 10, 7),
-    Date(2017, 1, 2),
-    Date(2017, 1, 27),
-    Date(2017, 1, 30),
-    Date(2017, 1, 31),
-    Date(2017, 2, 1),
-    Date(2017, 2, 2),
-    Date(2017, 4, 3),
-    Date(2017, 4, 4),
-    Date(2017, 5, 1),
-    Date(2017, 5, 29),
-    Date(2017, 5, 30),
-    Date(2017, 10, 2),
-    Date(2017, 10, 3),
-    Date(2017, 10, 4),
-    Date(2017, 10, 5),
-    Date(2017, 10, 6),
-    Date(2018, 1, 1),
-    Date(2018, 2, 15),
-    Date(2018, 2, 16),
-    Date(2018, 2, 19),
-    Date(2018, 2, 20),
-    Date(2018, 2, 21),
-    Date(2018, 4, 5),
-    Date(2018, 4, 6),
-    Date(2018, 4, 30),
-    Date(2018, 5, 1),
-    Date(2018, 6, 18),
-    Date(2018, 9, 24),
-    Date(2018, 10, 1),
-    Date(2018, 10, 2),
-    Date(2018, 10, 3),
-    Date(2018, 10, 4),
-    Date(2018, 10, 5),
-    Date(2018, 12, 31),
-    Date(2019, 1, 1),
-    Date(2019, 2, 4),
-    Date(2019, 2, 5),
-    Date(2019, 2, 6),
-    Date(2019, 2, 7),
-    Date(2019, 2, 8),
-    Date(2019, 4, 5),
-    Date(2019, 5, 1),
-    Date(2019, 5, 2),
-    Date(2019, 5, 3),
-    Date(2019, 6, 7),
-    Date(2019, 9, 13),
-    Date(2019, 10, 1),
-    Date(2019, 10, 2),
-    Date(2019, 10, 3),
-    Date(2019, 10, 4),
-    Date(2019, 10, 7),
-    Date(2020, 1, 1),
-    Date(2020, 1, 24),
-    Date(2020, 1, 27),
-    Date(2020, 1, 28),
-    Date(2020, 1, 29),
-    Date(2020, 1, 30),
-    Date(2020, 1, 31),
-    Date(2020, 4, 6),
-    Date(2020, 5, 1),
-    Date(2020, 5, 4),
-    Date(2020, 5, 5),
-    Date(2020, 6, 25),
-    Date(2020, 6, 26),
-    Date(2020, 10, 1),
-    Date(2020, 10, 2),
-    Date(2020, 10, 5),
-    Date(2020, 10, 6),
-    Date(2020, 10, 7),
-    Date(2020, 10, 8),
-    Date(2021, 1, 1),
-    Date(2021, 2, 11),
-    Date(2021, 2, 12),
-    Date(2021, 2, 15),
-    Date(2021, 2, 16),
-    Date(2021, 2, 17),
-    Date(2021, 4, 5),
-    Date(2021, 5, 3),
-    Date(2021, 5, 4),
-    Date(2021, 5, 5),
-    Date(2021, 6, 14),
-    Date(2021, 9, 20),
-    Date(2021, 9, 21),
-    Date(2021, 10, 1),
-    Date(2021, 10, 4),
-    Date(2021, 10, 5),
-    Date(2021, 10, 6),
-    Date(2021, 10, 7),
-    Date(2022, 1, 3),
-    Date(2022, 1, 31),
-    Date(2022, 2, 1),
-    Date(2022, 2, 2),
-    Date(2022, 2, 3),
-    Date(2022, 2, 4),
-    Date(2022, 4, 4),
-    Date(2022, 4, 5),
-    Date(2022, 5, 2),
-    Date(2022, 5, 3),
-    Date(2022, 5, 4),
-    Date(2022, 6, 3),
-    Date(2022, 9, 12),
-    Date(2022, 10, 3),
-    Date(2022, 10, 4),
-    Date(2022, 10, 5),
-    Date(2022, 10, 6),
-    Date(2022, 10, 7),
-    Date(2023, 1, 2),
-    Date(2023, 1, 23),
-    Date(2023, 1, 24),
-    Date(2023, 1, 25),
-    Date(2023, 1, 26),
-    Date(2023, 1, 27),
-    Date(2023, 4, 5),
-    Date(2023, 5, 1),
-    Date(2023, 5, 2),
-    Date(2023, 5, 3),
-    Date(2023, 6, 22),
-    Date(2023, 6, 23),
-    Date(2023, 9, 29),
-    Date(2023, 10, 2),
-    Date(2023, 10, 3),
-    Date(2023, 10, 4),
-    Date(2023, 10, 5),
-    Date(2023, 10, 6),
-    Date(2024, 1, 1),
-    Date(2024, 2, 9),
-    Date(2024, 2, 12),
-    Date(2024, 2, 13),
-    Date(2024, 2, 14),
-    Date(2024, 2, 15),
-    Date(2024, 2, 16),
-    Date(2024, 4, 4),
-    Date(2024, 4, 5),
-    Date(2024, 5, 1),
-    Date(2024, 5, 2),
-    Date(2024, 5, 3),
-    Date(2024, 6, 10),
-    Date(2024, 9, 16),
-    Date(2024, 9, 17),
-    Date(2024, 10, 1),
-    Date(2024, 10, 2),
-    Date(2024, 10, 3),
-    Date(2024, 10, 4),
-    Date(2024, 10, 7),
-}
-
-
-cdef set sse_working_weekends = {
+cdef tuple sse_holDays = (
+    (1991, 1, 1),
+    (1991, 2, 15),
+    (1991, 2, 18),
+    (1991, 5, 1),
+    (1991, 10, 1),
+    (1991, 10, 2),
+    (1992, 1, 1),
+    (1992, 2, 4),
+    (1992, 2, 5),
+    (1992, 2, 6),
+    (1992, 5, 1),
+    (1992, 10, 1),
+    (1992, 10, 2),
+    (1993, 1, 1),
+    (1993, 1, 25),
+    (1993, 1, 26),
+    (1993, 10, 1),
+    (1994, 2, 7),
+    (1994, 2, 8),
+    (1994, 2, 9),
+    (1994, 2, 10),
+    (1994, 2, 11),
+    (1994, 5, 2),
+    (1994, 10, 3),
+    (1994, 10, 4),
+    (1995, 1, 2),
+    (1995, 1, 30),
+    (1995, 1, 31),
+    (1995, 2, 1),
+    (1995, 2, 2),
+    (1995, 2, 3),
+    (1995, 5, 1),
+    (1995, 10, 2),
+    (1995, 10, 3),
+    (1996, 1, 1),
+    (1996, 2, 19),
+    (1996, 2, 20),
+    (1996, 2, 21),
+    (1996, 2, 22),
+    (1996, 2, 23),
+    (1996, 2, 26),
+    (1996, 2, 27),
+    (1996, 2, 28),
+    (1996, 2, 29),
+    (1996, 3, 1),
+    (1996, 5, 1),
+    (1996, 9, 30),
+    (1996, 10, 1),
+    (1996, 10, 2),
+    (1997, 1, 1),
+    (1997, 2, 3),
+    (1997, 2, 4),
+    (1997, 2, 5),
+    (1997, 2, 6),
+    (1997, 2, 7),
+    (1997, 2, 10),
+    (1997, 2, 11),
+    (1997, 2, 12),
+    (1997, 2, 13),
+    (1997, 2, 14),
+    (1997, 5, 1),
+    (1997, 5, 2),
+    (1997, 6, 30),
+    (1997, 7, 1),
+    (1997, 10, 1),
+    (1997, 10, 2),
+    (1997, 10, 3),
+    (1998, 1, 1),
+    (1998, 1, 2),
+    (1998, 1, 26),
+    (1998, 1, 27),
+    (1998, 1, 28),
+    (1998, 1, 29),
+    (1998, 1, 30),
+    (1998, 2, 2),
+    (1998, 2, 3),
+    (1998, 2, 4),
+    (1998, 2, 5),
+    (1998, 2, 6),
+    (1998, 5, 1),
+    (1998, 10, 1),
+    (1998, 10, 2),
+    (1999, 1, 1),
+    (1999, 2, 10),
+    (1999, 2, 11),
+    (1999, 2, 12),
+    (1999, 2, 15),
+    (1999, 2, 16),
+    (1999, 2, 17),
+    (1999, 2, 18),
+    (1999, 2, 19),
+    (1999, 2, 22),
+    (1999, 2, 23),
+    (1999, 2, 24),
+    (1999, 2, 25),
+    (1999, 2, 26),
+    (1999, 5, 3),
+    (1999, 10, 1),
+    (1999, 10, 4),
+    (1999, 10, 5),
+    (1999, 10, 6),
+    (1999, 10, 7),
+    (1999, 12, 20),
+    (1999, 12, 31),
+    (2000, 1, 3),
+    (2000, 1, 31),
+    (2000, 2, 1),
+    (2000, 2, 2),
+    (2000, 2, 3),
+    (2000, 2, 4),
+    (2000, 2, 7),
+    (2000, 2, 8),
+    (2000, 2, 9),
+    (2000, 2, 10),
+    (2000, 2, 11),
+    (2000, 5, 1),
+    (2000, 5, 2),
+    (2000, 5, 3),
+    (2000, 5, 4),
+    (2000, 5, 5),
+    (2000, 10, 2),
+    (2000, 10, 3),
+    (2000, 10, 4),
+    (2000, 10, 5),
+    (2000, 10, 6),
+    (2001, 1, 1),
+    (2001, 1, 22),
+    (2001, 1, 23),
+    (2001, 1, 24),
+    (2001, 1, 25),
+    (2001, 1, 26),
+    (2001, 1, 29),
+    (2001, 1, 30),
+    (2001, 1, 31),
+    (2001, 2, 1),
+    (2001, 2, 2),
+    (2001, 5, 1),
+    (2001, 5, 2),
+    (2001, 5, 3),
+    (2001, 5, 4),
+    (2001, 5, 7),
+    (2001, 10, 1),
+    (2001, 10, 2),
+    (2001, 10, 3),
+    (2001, 10, 4),
+    (2001, 10, 5),
+    (2002, 1, 1),
+    (2002, 1, 2),
+    (2002, 1, 3),
+    (2002, 2, 11),
+    (2002, 2, 12),
+    (2002, 2, 13),
+    (2002, 2, 14),
+    (2002, 2, 15),
+    (2002, 2, 18),
+    (2002, 2, 19),
+    (2002, 2, 20),
+    (2002, 2, 21),
+    (2002, 2, 22),
+    (2002, 5, 1),
+    (2002, 5, 2),
+    (2002, 5, 3),
+    (2002, 5, 6),
+    (2002, 5, 7),
+    (2002, 9, 30),
+    (2002, 10, 1),
+    (2002, 10, 2),
+    (2002, 10, 3),
+    (2002, 10, 4),
+    (2002, 10, 7),
+    (2003, 1, 1),
+    (2003, 1, 30),
+    (2003, 1, 31),
+    (2003, 2, 3),
+    (2003, 2, 4),
+    (2003, 2, 5),
+    (2003, 2, 6),
+    (2003, 2, 7),
+    (2003, 5, 1),
+    (2003, 5, 2),
+    (2003, 5, 5),
+    (2003, 5, 6),
+    (2003, 5, 7),
+    (2003, 5, 8),
+    (2003, 5, 9),
+    (2003, 10, 1),
+    (2003, 10, 2),
+    (2003, 10, 3),
+    (2003, 10, 6),
+    (2003, 10, 7),
+    (2004, 1, 1),
+    (2004, 1, 19),
+    (2004, 1, 20),
+    (2004, 1, 21),
+    (2004, 1, 22),
+    (2004, 1, 23),
+    (2004, 1, 26),
+    (2004, 1, 27),
+    (2004, 1, 28),
+    (2004, 5, 3),
+    (2004, 5, 4),
+    (2004, 5, 5),
+    (2004, 5, 6),
+    (2004, 5, 7),
+    (2004, 10, 1),
+    (2004, 10, 4),
+    (2004, 10, 5),
+    (2004, 10, 6),
+    (2004, 10, 7),
+    (2005, 1, 3),
+    (2005, 2, 7),
+    (2005, 2, 8),
+    (2005, 2, 9),
+    (2005, 2, 10),
+    (2005, 2, 11),
+    (2005, 2, 14),
+    (2005, 2, 15),
+    (2005, 5, 2),
+    (2005, 5, 3),
+    (2005, 5, 4),
+    (2005, 5, 5),
+    (2005, 5, 6),
+    (2005, 10, 3),
+    (2005, 10, 4),
+    (2005, 10, 5),
+    (2005, 10, 6),
+    (2005, 10, 7),
+    (2006, 1, 2),
+    (2006, 1, 3),
+    (2006, 1, 26),
+    (2006, 1, 27),
+    (2006, 1, 30),
+    (2006, 1, 31),
+    (2006, 2, 1),
+    (2006, 2, 2),
+    (2006, 2, 3),
+    (2006, 5, 1),
+    (2006, 5, 2),
+    (2006, 5, 3),
+    (2006, 5, 4),
+    (2006, 5, 5),
+    (2006, 10, 2),
+    (2006, 10, 3),
+    (2006, 10, 4),
+    (2006, 10, 5),
+    (2006, 10, 6),
+    (2007, 1, 1),
+    (2007, 1, 2),
+    (2007, 1, 3),
+    (2007, 2, 19),
+    (2007, 2, 20),
+    (2007, 2, 21),
+    (2007, 2, 22),
+    (2007, 2, 23),
+    (2007, 5, 1),
+    (2007, 5, 2),
+    (2007, 5, 3),
+    (2007, 5, 4),
+    (2007, 5, 7),
+    (2007, 10, 1),
+    (2007, 10, 2),
+    (2007, 10, 3),
+    (2007, 10, 4),
+    (2007, 10, 5),
+    (2007, 12, 31),
+    (2008, 1, 1),
+    (2008, 2, 6),
+    (2008, 2, 7),
+    (2008, 2, 8),
+    (2008, 2, 11),
+    (2008, 2, 12),
+    (2008, 4, 4),
+    (2008, 5, 1),
+    (2008, 5, 2),
+    (2008, 6, 9),
+    (2008, 9, 15),
+    (2008, 9, 29),
+    (2008, 9, 30),
+    (2008, 10, 1),
+    (2008, 10, 2),
+    (2008, 10, 3),
+    (2009, 1, 1),
+    (2009, 1, 2),
+    (2009, 1, 26),
+    (2009, 1, 27),
+    (2009, 1, 28),
+    (2009, 1, 29),
+    (2009, 1, 30),
+    (2009, 4, 6),
+    (2009, 5, 1),
+    (2009, 5, 28),
+    (2009, 5, 29),
+    (2009, 10, 1),
+    (2009, 10, 2),
+    (2009, 10, 5),
+    (2009, 10, 6),
+    (2009, 10, 7),
+    (2009, 10, 8),
+    (2010, 1, 1),
+    (2010, 2, 15),
+    (2010, 2, 16),
+    (2010, 2, 17),
+    (2010, 2, 18),
+    (2010, 2, 19),
+    (2010, 4, 5),
+    (2010, 5, 3),
+    (2010, 6, 14),
+    (2010, 6, 15),
+    (2010, 6, 16),
+    (2010, 9, 22),
+    (2010, 9, 23),
+    (2010, 9, 24),
+    (2010, 10, 1),
+    (2010, 10, 4),
+    (2010, 10, 5),
+    (2010, 10, 6),
+    (2010, 10, 7),
+    (2011, 1, 3),
+    (2011, 2, 2),
+    (2011, 2, 3),
+    (2011, 2, 4),
+    (2011, 2, 7),
+    (2011, 2, 8),
+    (2011, 4, 4),
+    (2011, 4, 5),
+    (2011, 5, 2),
+    (2011, 6, 6),
+    (2011, 9, 12),
+    (2011, 10, 3),
+    (2011, 10, 4),
+    (2011, 10, 5),
+    (2011, 10, 6),
+    (2011, 10, 7),
+    (2012, 1, 2),
+    (2012, 1, 3),
+    (2012, 1, 23),
+    (2012, 1, 24),
+    (2012, 1, 25),
+    (2012, 1, 26),
+    (2012, 1, 27),
+    (2012, 4, 2),
+    (2012, 4, 3),
+    (2012, 4, 4),
+    (2012, 4, 30),
+    (2012, 5, 1),
+    (2012, 6, 22),
+    (2012, 10, 1),
+    (2012, 10, 2),
+    (2012, 10, 3),
+    (2012, 10, 4),
+    (2012, 10, 5),
+    (2013, 1, 1),
+    (2013, 1, 2),
+    (2013, 1, 3),
+    (2013, 2, 11),
+    (2013, 2, 12),
+    (2013, 2, 13),
+    (2013, 2, 14),
+    (2013, 2, 15),
+    (2013, 4, 4),
+    (2013, 4, 5),
+    (2013, 4, 29),
+    (2013, 4, 30),
+    (2013, 5, 1),
+    (2013, 6, 10),
+    (2013, 6, 11),
+    (2013, 6, 12),
+    (2013, 9, 19),
+    (2013, 9, 20),
+    (2013, 10, 1),
+    (2013, 10, 2),
+    (2013, 10, 3),
+    (2013, 10, 4),
+    (2013, 10, 7),
+    (2014, 1, 1),
+    (2014, 1, 31),
+    (2014, 2, 3),
+    (2014, 2, 4),
+    (2014, 2, 5),
+    (2014, 2, 6),
+    (2014, 4, 7),
+    (2014, 5, 1),
+    (2014, 5, 2),
+    (2014, 6, 2),
+    (2014, 9, 8),
+    (2014, 10, 1),
+    (2014, 10, 2),
+    (2014, 10, 3),
+    (2014, 10, 6),
+    (2014, 10, 7),
+    (2015, 1, 1),
+    (2015, 1, 2),
+    (2015, 2, 18),
+    (2015, 2, 19),
+    (2015, 2, 20),
+    (2015, 2, 23),
+    (2015, 2, 24),
+    (2015, 4, 6),
+    (2015, 5, 1),
+    (2015, 6, 22),
+    (2015, 9, 3),
+    (2015, 9, 4),
+    (2015, 10, 1),
+    (2015, 10, 2),
+    (2015, 10, 5),
+    (2015, 10, 6),
+    (2015, 10, 7),
+    (2016, 1, 1),
+    (2016, 2, 8),
+    (2016, 2, 9),
+    (2016, 2, 10),
+    (2016, 2, 11),
+    (2016, 2, 12),
+    (2016, 4, 4),
+    (2016, 5, 1),
+    (2016, 5, 2),
+    (2016, 6, 9),
+    (2016, 6, 10),
+    (2016, 9, 15),
+    (2016, 9, 16),
+    (2016, 10, 3),
+    (2016, 10, 4),
+    (2016, 10, 5),
+    (2016, 10, 6),
+    (2016, 10, 7),
+    (2017, 1, 2),
+    (2017, 1, 27),
+    (2017, 1, 30),
+    (2017, 1, 31),
+    (2017, 2, 1),
+    (2017, 2, 2),
+    (2017, 4, 3),
+    (2017, 4, 4),
+    (2017, 5, 1),
+    (2017, 5, 29),
+    (2017, 5, 30),
+    (2017, 10, 2),
+    (2017, 10, 3),
+    (2017, 10, 4),
+    (2017, 10, 5),
+    (2017, 10, 6),
+    (2018, 1, 1),
+    (2018, 2, 15),
+    (2018, 2, 16),
+    (2018, 2, 19),
+    (2018, 2, 20),
+    (2018, 2, 21),
+    (2018, 4, 5),
+    (2018, 4, 6),
+    (2018, 4, 30),
+    (2018, 5, 1),
+    (2018, 6, 18),
+    (2018, 9, 24),
+    (2018, 10, 1),
+    (2018, 10, 2),
+    (2018, 10, 3),
+    (2018, 10, 4),
+    (2018, 10, 5),
+    (2018, 12, 31),
+    (2019, 1, 1),
+    (2019, 2, 4),
+    (2019, 2, 5),
+    (2019, 2, 6),
+    (2019, 2, 7),
+    (2019, 2, 8),
+    (2019, 4, 5),
+    (2019, 5, 1),
+    (2019, 5, 2),
+    (2019, 5, 3),
+    (2019, 6, 7),
+    (2019, 9, 13),
+    (2019, 10, 1),
+    (2019, 10, 2),
+    (2019, 10, 3),
+    (2019, 10, 4),
+    (2019, 10, 7),
+    (2020, 1, 1),
+    (2020, 1, 24),
+    (2020, 1, 27),
+    (2020, 1, 28),
+    (2020, 1, 29),
+    (2020, 1, 30),
+    (2020, 1, 31),
+    (2020, 4, 6),
+    (2020, 5, 1),
+    (2020, 5, 4),
+    (2020, 5, 5),
+    (2020, 6, 25),
+    (2020, 6, 26),
+    (2020, 10, 1),
+    (2020, 10, 2),
+    (2020, 10, 5),
+    (2020, 10, 6),
+    (2020, 10, 7),
+    (2020, 10, 8),
+    (2021, 1, 1),
+    (2021, 2, 11),
+    (2021, 2, 12),
+    (2021, 2, 15),
+    (2021, 2, 16),
+    (2021, 2, 17),
+    (2021, 4, 5),
+    (2021, 5, 3),
+    (2021, 5, 4),
+    (2021, 5, 5),
+    (2021, 6, 14),
+    (2021, 9, 20),
+    (2021, 9, 21),
+    (2021, 10, 1),
+    (2021, 10, 4),
+    (2021, 10, 5),
+    (2021, 10, 6),
+    (2021, 10, 7),
+    (2022, 1, 3),
+    (2022, 1, 31),
+    (2022, 2, 1),
+    (2022, 2, 2),
+    (2022, 2, 3),
+    (2022, 2, 4),
+    (2022, 4, 4),
+    (2022, 4, 5),
+    (2022, 5, 2),
+    (2022, 5, 3),
+    (2022, 5, 4),
+    (2022, 6, 3),
+    (2022, 9, 12),
+    (2022, 10, 3),
+    (2022, 10, 4),
+    (2022, 10, 5),
+    (2022, 10, 6),
+    (2022, 10, 7),
+    (2023, 1, 2),
+    (2023, 1, 23),
+    (2023, 1, 24),
+    (2023, 1, 25),
+    (2023, 1, 26),
+    (2023, 1, 27),
+    (2023, 4, 5),
+    (2023, 5, 1),
+    (2023, 5, 2),
+    (2023, 5, 3),
+    (2023, 6, 22),
+    (2023, 6, 23),
+    (2023, 9, 29),
+    (2023, 10, 2),
+    (2023, 10, 3),
+    (2023, 10, 4),
+    (2023, 10, 5),
+    (2023, 10, 6),
+    (2024, 1, 1),
+    (2024, 2, 9),
+    (2024, 2, 12),
+    (2024, 2, 13),
+    (2024, 2, 14),
+    (2024, 2, 15),
+    (2024, 2, 16),
+    (2024, 4, 4),
+    (2024, 4, 5),
+    (2024, 5, 1),
+    (2024, 5, 2),
+    (2024, 5, 3),
+    (2024, 6, 10),
+    (2024, 9, 16),
+    (2024, 9, 17),
+    (2024, 10, 1),
+    (2024, 10, 2),
+    (2024, 10, 3),
+    (2024, 10, 4),
+    (2024, 10, 7),
+)
+
+
+cdef tuple sse_working_weekends = (
     # 1992
-    Date.westernStyle(4, Months.October, 1992)
-}
+    (1992, 10, 4),
+)
 
 
 cdef class ChinaSseImpl(CalendarImpl):
@@ -762,10 +892,7 @@ cdef class ChinaSseImpl(CalendarImpl):
         pass
 
     cdef bint isBizDay(self, Date date):
-        cdef int w = date.weekday()
-        if (self.isWeekEnd(w) or date in sse_holDays) and date not in sse_working_weekends:
-            return False
-        return True
+        return _testBit(_sseBizDays, date.__serialNumber__)
 
     cdef bint isWeekEnd(self, int weekDay):
         return weekDay == Weekdays.Saturday or weekDay == Weekdays.Sunday
@@ -774,163 +901,212 @@ cdef class ChinaSseImpl(CalendarImpl):
         if op == 2:
             return isinstance(right, ChinaSseImpl)
 
-cdef set ib_working_weekends = {
+cdef tuple ib_working_weekends = (
     # 1992
-    Date.westernStyle(4, Months.October, 1992),
+    (1992, 10, 4),
     # 2005
-    Date.westernStyle(5, Months.February, 2005),
-    Date.westernStyle(6, Months.February, 2005),
-    Date.westernStyle(30, Months.April, 2005),
-    Date.westernStyle(8, Months.May, 2005),
-    Date.westernStyle(8, Months.October, 2005),
-    Date.westernStyle(9, Months.October, 2005),
-    Date.westernStyle(31, Months.December, 2005),
+    (2005, 2, 5),
+    (2005, 2, 6),
+    (2005, 4, 30),
+    (2005, 5, 8),
+    (2005, 10, 8),
+    (2005, 10, 9),
+    (2005, 12, 31),
     # 2006
-    Date.westernStyle(28, Months.January, 2006),
-    Date.westernStyle(29, Months.April, 2006),
-    Date.westernStyle(30, Months.April, 2006),
-    Date.westernStyle(30, Months.September, 2006),
-    Date.westernStyle(30, Months.December, 2006),
-    Date.westernStyle(31, Months.December, 2006),
+    (2006, 1, 28),
+    (2006, 4, 29),
+    (2006, 4, 30),
+    (2006, 9, 30),
+    (2006, 12, 30),
+    (2006, 12, 31),
     # 2007
-    Date.westernStyle(17, Months.February, 2007),
-    Date.westernStyle(25, Months.February, 2007),
-    Date.westernStyle(28, Months.April, 2007),
-    Date.westernStyle(29, Months.April, 2007),
-    Date.westernStyle(29, Months.September, 2007),
-    Date.westernStyle(30, Months.September, 2007),
-    Date.westernStyle(29, Months.December, 2007),
+    (2007, 2, 17),
+    (2007, 2, 25),
+    (2007, 4, 28),
+    (2007, 4, 29),
+    (2007, 9, 29),
+    (2007, 9, 30),
+    (2007, 12, 29),
     # 2008
-    Date.westernStyle(2, Months.February, 2008),
-    Date.westernStyle(3, Months.February, 2008),
-    Date.westernStyle(4, Months.May, 2008),
-    Date.westernStyle(27, Months.September, 2008),
-    Date.westernStyle(28, Months.September, 2008),
+    (2008, 2, 2),
+    (2008, 2, 3),
+    (2008, 5, 4),
+    (2008, 9, 27),
+    (2008, 9, 28),
     # 2009
-    Date.westernStyle(4, Months.January, 2009),
-    Date.westernStyle(24, Months.January, 2009),
-    Date.westernStyle(1, Months.February, 2009),
-    Date.westernStyle(31, Months.May, 2009),
-    Date.westernStyle(27, Months.September, 2009),
-    Date.westernStyle(10, Months.October, 2009),
+    (2009, 1, 4),
+    (2009, 1, 24),
+    (2009, 2, 1),
+    (2009, 5, 31),
+    (2009, 9, 27),
+    (2009, 10, 10),
     # 2010
-    Date.westernStyle(20, Months.February, 2010),
-    Date.westernStyle(21, Months.February, 2010),
-    Date.westernStyle(12, Months.June, 2010),
-    Date.westernStyle(13, Months.June, 2010),
-    Date.westernStyle(19, Months.September, 2010),
-    Date.westernStyle(25, Months.September, 2010),
-    Date.westernStyle(26, Months.September, 2010),
-    Date.westernStyle(9, Months.October, 2010),
+    (2010, 2, 20),
+    (2010, 2, 21),
+    (2010, 6, 12),
+    (2010, 6, 13),
+    (2010, 9, 19),
+    (2010, 9, 25),
+    (2010, 9, 26),
+    (2010, 10, 9),
     # 2011
-    Date.westernStyle(30, Months.January, 2011),
-    Date.westernStyle(12, Months.February, 2011),
-    Date.westernStyle(2, Months.April, 2011),
-    Date.westernStyle(8, Months.October, 2011),
-    Date.westernStyle(9, Months.October, 2011),
-    Date.westernStyle(31, Months.December, 2011),
+    (2011, 1, 30),
+    (2011, 2, 12),
+    (2011, 4, 2),
+    (2011, 10, 8),
+    (2011, 10, 9),
+    (2011, 12, 31),
     # 2012
-    Date.westernStyle(21, Months.January, 2012),
-    Date.westernStyle(29, Months.January, 2012),
-    Date.westernStyle(31, Months.March, 2012),
-    Date.westernStyle(1, Months.April, 2012),
-    Date.westernStyle(28, Months.April, 2012),
-    Date.westernStyle(29, Months.September, 2012),
+    (2012, 1, 21),
+    (2012, 1, 29),
+    (2012, 3, 31),
+    (2012, 4, 1),
+    (2012, 4, 28),
+    (2012, 9, 29),
     # 2013
-    Date.westernStyle(5, Months.January, 2013),
-    Date.westernStyle(6, Months.January, 2013),
-    Date.westernStyle(16, Months.February, 2013),
-    Date.westernStyle(17, Months.February, 2013),
-    Date.westernStyle(7, Months.April, 2013),
-    Date.westernStyle(27, Months.April, 2013),
-    Date.westernStyle(28, Months.April, 2013),
-    Date.westernStyle(8, Months.June, 2013),
-    Date.westernStyle(9, Months.June, 2013),
-    Date.westernStyle(22, Months.September, 2013),
-    Date.westernStyle(29, Months.September, 2013),
-    Date.westernStyle(12, Months.October, 2013),
+    (2013, 1, 5),
+    (2013, 1, 6),
+    (2013, 2, 16),
+    (2013, 2, 17),
+    (2013, 4, 7),
+    (2013, 4, 27),
+    (2013, 4, 28),
+    (2013, 6, 8),
+    (2013, 6, 9),
+    (2013, 9, 22),
+    (2013, 9, 29),
+    (2013, 10, 12),
     # 2014
-    Date.westernStyle(26, Months.January, 2014),
-    Date.westernStyle(8, Months.February, 2014),
-    Date.westernStyle(4, Months.May, 2014),
-    Date.westernStyle(28, Months.September, 2014),
-    Date.westernStyle(11, Months.October, 2014),
+    (2014, 1, 26),
+    (2014, 2, 8),
+    (2014, 5, 4),
+    (2014, 9, 28),
+    (2014, 10, 11),
     # 2015
-    Date.westernStyle(4, Months.January, 2015),
-    Date.westernStyle(15, Months.February, 2015),
-    Date.westernStyle(28, Months.February, 2015),
-    Date.westernStyle(6, Months.September, 2015),
-    Date.westernStyle(10, Months.October, 2015),
+    (2015, 1, 4),
+    (2015, 2, 15),
+    (2015, 2, 28),
+    (2015, 9, 6),
+    (2015, 10, 10),
     # 2016
-    Date.westernStyle(6, Months.February, 2016),
-    Date.westernStyle(14, Months.February, 2016),
-    Date.westernStyle(12, Months.June, 2016),
-    Date.westernStyle(18, Months.September, 2016),
-    Date.westernStyle(8, Months.October, 2016),
-    Date.westernStyle(9, Months.October, 2016),
+    (2016, 2, 6),
+    (2016, 2, 14),
+    (2016, 6, 12),
+    (2016, 9, 18),
+    (2016, 10, 8),
+    (2016, 10, 9),
     # 2017
-    Date.westernStyle(22, Months.January, 2017),
-    Date.westernStyle(4, Months.February, 2017),
-    Date.westernStyle(1, Months.April, 2017),
-    Date.westernStyle(27, Months.May, 2017),
-    Date.westernStyle(30, Months.September, 2017),
+    (2017, 1, 22),
+    (2017, 2, 4),
+    (2017, 4, 1),
+    (2017, 5, 27),
+    (2017, 9, 30),
     # 2018
-    Date.westernStyle(11, Months.February, 2018),
-    Date.westernStyle(24, Months.February, 2018),
-    Date.westernStyle(8, Months.April, 2018),
-    Date.westernStyle(28, Months.April, 2018),
-    Date.westernStyle(29, Months.September, 2018),
-    Date.westernStyle(30, Months.September, 2018),
-    Date.westernStyle(29, Months.December, 2018),
+    (2018, 2, 11),
+    (2018, 2, 24),
+    (2018, 4, 8),
+    (2018, 4, 28),
+    (2018, 9, 29),
+    (2018, 9, 30),
+    (2018, 12, 29),
     # 2019
-    Date.westernStyle(2, Months.February, 2019),
-    Date.westernStyle(3, Months.February, 2019),
-    Date.westernStyle(28, Months.April, 2019),
-    Date.westernStyle(5, Months.May, 2019),
-    Date.westernStyle(29, Months.September, 2019),
-    Date.westernStyle(12, Months.October, 2019),
+    (2019, 2, 2),
+    (2019, 2, 3),
+    (2019, 4, 28),
+    (2019, 5, 5),
+    (2019, 9, 29),
+    (2019, 10, 12),
     # 2020
-    Date.westernStyle(19, Months.January, 2020),
-    Date.westernStyle(26, Months.April, 2020),
-    Date.westernStyle(9, Months.May, 2020),
-    Date.westernStyle(28, Months.June, 2020),
-    Date.westernStyle(27, Months.September, 2020),
-    Date.westernStyle(10, Months.October, 2020),
+    (2020, 1, 19),
+    (2020, 4, 26),
+    (2020, 5, 9),
+    (2020, 6, 28),
+    (2020, 9, 27),
+    (2020, 10, 10),
     # 2021
-    Date(2021, 2, 7),
-    Date(2021, 2, 20),
-    Date(2021, 4, 25),
-    Date(2021, 5, 8),
-    Date(2021, 9, 18),
-    Date(2021, 9, 26),
-    Date(2021, 10, 9),
+    (2021, 2, 7),
+    (2021, 2, 20),
+    (2021, 4, 25),
+    (2021, 5, 8),
+    (2021, 9, 18),
+    (2021, 9, 26),
+    (2021, 10, 9),
     # 2022
-    Date(2022, 1, 29),
-    Date(2022, 1, 30),
-    Date(2022, 4, 2),
-    Date(2022, 4, 24),
-    Date(2022, 5, 7),
-    Date(2022, 10, 8),
-    Date(2022, 10, 9),
+    (2022, 1, 29),
+    (2022, 1, 30),
+    (2022, 4, 2),
+    (2022, 4, 24),
+    (2022, 5, 7),
+    (2022, 10, 8),
+    (2022, 10, 9),
     # 2023
-    Date(2023, 1, 28),
-    Date(2023, 1, 29),
-    Date(2023, 4, 23),
-    Date(2023, 5, 6),
-    Date(2023, 6, 25),
-    Date(2023, 10, 7),
-    Date(2023, 10, 8),
+    (2023, 1, 28),
+    (2023, 1, 29),
+    (2023, 4, 23),
+    (2023, 5, 6),
+    (2023, 6, 25),
+    (2023, 10, 7),
+    (2023, 10, 8),
     # 2024
-    Date(2024, 2, 4),
-    Date(2024, 2, 9),
-    Date(2024, 2, 18),
-    Date(2024, 4, 7),
-    Date(2024, 4, 28),
-    Date(2024, 5, 11),
-    Date(2024, 9, 14),
-    Date(2024, 9, 29),
-    Date(2024, 10, 12)
-}
+    (2024, 2, 4),
+    (2024, 2, 9),
+    (2024, 2, 18),
+    (2024, 4, 7),
+    (2024, 4, 28),
+    (2024, 5, 11),
+    (2024, 9, 14),
+    (2024, 9, 29),
+    (2024, 10, 12),
+)
+
+
+cdef int _serialNumber(tuple ymd):
+    return dt.date(ymd[0], ymd[1], ymd[2]).toordinal() - _EXCEL_BASE
+
+
+cdef unsigned char* _bizDayBits(tuple holidays, tuple workingWeekends, const unsigned char* base) except NULL:
+    # one bit per serial number from Date.minDate() to Date.maxDate(), set for business days
+    cdef int n = (_MAX_SERIAL - _MIN_SERIAL) // 8 + 1
+    cdef unsigned char* bits = <unsigned char*> PyMem_Malloc(n)
+    cdef int serial
+    cdef int w
+    cdef tuple ymd
+
+    if not bits:
+        raise MemoryError()
+
+    if base:
+        memcpy(bits, base, n)
+    else:
+        memset(bits, 0, n)
+        for serial in range(_MIN_SERIAL, _MAX_SERIAL + 1):
+            w = serial % 7
+            if w != 0 and w != Weekdays.Sunday:
+                _setBit(bits, serial, True)
+
+    for ymd in holidays:
+        _setBit(bits, _serialNumber(ymd), False)
+    for ymd in workingWeekends:
+        _setBit(bits, _serialNumber(ymd), True)
+    return bits
+
+
+cdef inline void _setBit(unsigned char* bits, int serial, bint flag) nogil:
+    serial -= _MIN_SERIAL
+    if flag:
+        bits[serial >> 3] |= 1 << (serial & 7)
+    else:
+        bits[serial >> 3] &= ~(1 << (serial & 7))
+
+
+cdef inline bint _testBit(const unsigned char* bits, int serial) nogil:
+    serial -= _MIN_SERIAL
+    return (bits[serial >> 3] >> (serial & 7)) & 1
+
+
+# the bitmaps live as long as the module
+cdef unsigned char* _sseBizDays = _bizDayBits(sse_holDays, sse_working_weekends, NULL)
+cdef unsigned char* _ibBizDays = _bizDayBits((), ib_working_weekends, _sseBizDays)
 
 cdef ChinaSseImpl _sseImpl = ChinaSseImpl()
 
@@ -939,7 +1115,7 @@ cdef class ChinaIBImpl(CalendarImpl):
         pass
 
     cpdef bint isBizDay(self, Date date):
-        return _sseImpl.isBizDay(date) or date in ib_working_weekends
+        return _testBit(_ibBizDays, date.__serialNumber__)
 
     cpdef bint isWeekEnd(self, int weekDay):
         return weekDay == Weekdays.Saturday or weekDay == Weekdays.Sunday
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+u"""
+Created on 2026-10-18
+"""
+
+from PyFin.DateUtilities.Calendar cimport BizDayIndex
+
+
+cdef enum:
+    # marks a date falling out of the supported range
+    _NO_DATE = -1
+
+
+cdef int _endOfMonth(int serial) noexcept nogil
+cdef int _following(BizDayIndex index, int serial) noexcept nogil
+cdef int _preceding(BizDayIndex index, int serial) noexcept nogil
+cdef int _adjust(BizDayIndex index, int serial, int c) noexcept nogil
+cdef int _advance(int serial, int n, int units) noexcept nogil
+cdef bint _isEndOfMonth(BizDayIndex index, int serial) noexcept nogil
@@ -0,0 +1,516 @@
+# -*- coding: utf-8 -*-
+u"""
+Created on 2026-10-18
+"""
+
+import numpy as np
+cimport cython
+from libc.math cimport NAN
+from PyFin.DateUtilities.Date import Date
+from PyFin.DateUtilities.Calendar cimport Calendar
+from PyFin.DateUtilities.Calendar cimport BizDayIndex
+from PyFin.DateUtilities.Period cimport Period
+from PyFin.DateUtilities.Period import check_period
+from PyFin.Enums._BizDayConventions cimport BizDayConventions
+from PyFin.Enums._TimeUnits cimport TimeUnits
+from PyFin.Utilities.Asserts cimport require
+
+
+cdef int _MIN_SERIAL = Date.minDate().serialNumber
+cdef int _MAX_SERIAL = Date.maxDate().serialNumber
+cdef int _MIN_YEAR = 1901
+cdef int _MAX_YEAR = 2199
+# serial number of 1970-01-01, the epoch of numpy datetime64
+cdef int _EPOCH_SERIAL = 25569
+
+cdef int _MonthLength[12]
+_MonthLength[:] = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+
+
+cdef inline bint _isLeap(int y) noexcept nogil:
+    return y % 4 == 0 and (y % 100 != 0 or y % 400 == 0)
+
+
+cdef inline int _monthLength(int y, int m) noexcept nogil:
+    if m == 2 and _isLeap(y):
+        return 29
+    return _MonthLength[m - 1]
+
+
+@cython.cdivision(True)
+cdef inline void _splitSerial(int serial, int* y, int* m, int* d) noexcept nogil:
+    # civil calendar from the number of days since 0000-03-01,
+    # valid for every serial number of the supported date range
+    cdef int z = serial - _EPOCH_SERIAL + 719468
+    cdef int era = z // 146097
+    cdef int doe = z - era * 146097
+    cdef int yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    cdef int doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    cdef int mp = (5 * doy + 2) // 153
+    d[0] = doy - (153 * mp + 2) // 5 + 1
+    m[0] = mp + 3 if mp < 10 else mp - 9
+    y[0] = yoe + era * 400 + (1 if m[0] <= 2 else 0)
+
+
+@cython.cdivision(True)
+cdef inline int _makeSerial(int y, int m, int d) noexcept nogil:
+    cdef int era
+    cdef int yoe
+    cdef int doy
+    cdef int doe
+    if m <= 2:
+        y -= 1
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * (m - 3 if m > 2 else m + 9) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468 + _EPOCH_SERIAL
+
+
+@cython.cdivision(True)
+cdef inline int _advanceMonths(int serial, int n) noexcept nogil:
+    cdef int y
+    cdef int m
+    cdef int d
+    cdef int months
+    cdef int length
+
+    _splitSerial(serial, &y, &m, &d)
+    months = y * 12 + m - 1 + n
+    y = months // 12
+    m = months % 12 + 1
+    if y < _MIN_YEAR or y > _MAX_YEAR:
+        return _NO_DATE
+    length = _monthLength(y, m)
+    if d > length:
+        d = length
+    return _makeSerial(y, m, d)
+
+
+cdef int _endOfMonth(int serial) noexcept nogil:
+    cdef int y
+    cdef int m
+    cdef int d
+    _splitSerial(serial, &y, &m, &d)
+    return serial + _monthLength(y, m) - d
+
+
+cdef inline int _month(int serial) noexcept nogil:
+    cdef int y
+    cdef int m
+    cdef int d
+    _splitSerial(serial, &y, &m, &d)
+    return m
+
+
+cdef inline int _dayOfMonth(int serial) noexcept nogil:
+    cdef int y
+    cdef int m
+    cdef int d
+    _splitSerial(serial, &y, &m, &d)
+    return d
+
+
+cdef int _following(BizDayIndex index, int serial) noexcept nogil:
+    cdef int j
+    if index.isBizDay(serial):
+        return serial
+    j = index.countBefore(serial)
+    return index.serials[j] if j < index.size else _NO_DATE
+
+
+cdef int _preceding(BizDayIndex index, int serial) noexcept nogil:
+    cdef int j
+    if index.isBizDay(serial):
+        return serial
+    j = index.countBefore(serial) - 1
+    return index.serials[j] if j >= 0 else _NO_DATE
+
+
+cdef int _adjust(BizDayIndex index, int serial, int c) noexcept nogil:
+    cdef int d1
+    cdef int d2
+
+    if serial == _NO_DATE or c == BizDayConventions.Unadjusted:
+        return serial
+    elif c == BizDayConventions.Following:
+        return _following(index, serial)
+    elif c == BizDayConventions.ModifiedFollowing or c == BizDayConventions.HalfMonthModifiedFollowing:
+        d1 = _following(index, serial)
+        if d1 == _NO_DATE or _month(d1) != _month(serial):
+            return _preceding(index, serial)
+        if c == BizDayConventions.HalfMonthModifiedFollowing and _dayOfMonth(serial) <= 15 < _dayOfMonth(d1):
+            return _preceding(index, serial)
+        return d1
+    elif c == BizDayConventions.Preceding:
+        return _preceding(index, serial)
+    elif c == BizDayConventions.ModifiedPreceding:
+        d1 = _preceding(index, serial)
+        if d1 == _NO_DATE or _month(d1) != _month(serial):
+            return _following(index, serial)
+        return d1
+    else:
+        # Nearest, ties go to the following business day
+        d1 = _following(index, serial)
+        d2 = _preceding(index, serial)
+        if d1 == _NO_DATE:
+            return d2
+        if d2 == _NO_DATE or d1 - serial <= serial - d2:
+            return d1
+        return d2
+
+
+cdef int _advance(int serial, int n, int units) noexcept nogil:
+    if units == TimeUnits.Days or units == TimeUnits.BDays:
+        serial += n
+    elif units == TimeUnits.Weeks:
+        serial += 7 * n
+    elif units == TimeUnits.Months:
+        return _advanceMonths(serial, n)
+    else:
+        return _advanceMonths(serial, 12 * n)
+    return serial if _MIN_SERIAL <= serial <= _MAX_SERIAL else _NO_DATE
+
+
+cdef inline int _advanceBizDays(BizDayIndex index, int serial, int n) noexcept nogil:
+    cdef int j
+    # position of the target in the ordered business days
+    if n > 0:
+        j = index.countBefore(serial + 1) + n - 1
+    else:
+        j = index.countBefore(serial) + n
+    return index.serials[j] if 0 <= j < index.size else _NO_DATE
+
+
+cdef bint _isEndOfMonth(BizDayIndex index, int serial) noexcept nogil:
+    cdef int following = _following(index, serial + 1) if serial < _MAX_SERIAL else _NO_DATE
+    return following == _NO_DATE or _month(following) != _month(serial)
+
+
+def _serials(serialNumbers):
+    np_serials = np.asarray(serialNumbers)
+    if np_serials.size:
+        require(_MIN_SERIAL <= np_serials.min() and np_serials.max() <= _MAX_SERIAL,
+                ValueError,
+                "serial numbers should be in [{0}, {1}]".format(_MIN_SERIAL, _MAX_SERIAL))
+    return np_serials.astype(np.intc, copy=False)
+
+
+def _checked(result, shape):
+    require(not (result == _NO_DATE).any(),
+            ValueError,
+            "dates are out of bound. They must be in [1901-01-01, 2199-12-31]")
+    return result.reshape(shape)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def splitSerialNumbers(serialNumbers):
+    u"""
+    Year, month and day of month of an array of date serial numbers.
+
+    :param serialNumbers: int array of serial numbers
+    :return: tuple of three int32 arrays with the shape of the input
+    """
+    np_serials = _serials(serialNumbers)
+    cdef const int[:] serials = np_serials.ravel()
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n = serials.shape[0]
+    years = np.empty(n, dtype=np.intc)
+    months = np.empty(n, dtype=np.intc)
+    days = np.empty(n, dtype=np.intc)
+    cdef int[:] y = years
+    cdef int[:] m = months
+    cdef int[:] d = days
+
+    with nogil:
+        for i in range(n):
+            _splitSerial(serials[i], &y[i], &m[i], &d[i])
+    shape = np_serials.shape
+    return years.reshape(shape), months.reshape(shape), days.reshape(shape)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def makeSerialNumbers(years, months, days):
+    u"""
+    Date serial numbers from arrays of year, month and day of month. The
+    inputs are broadcast against each other.
+    """
+    np_years, np_months, np_days = np.broadcast_arrays(np.asarray(years, dtype=np.intc),
+                                                       np.asarray(months, dtype=np.intc),
+                                                       np.asarray(days, dtype=np.intc))
+    shape = np_years.shape
+    cdef const int[:] y = np.ascontiguousarray(np_years).ravel()
+    cdef const int[:] m = np.ascontiguousarray(np_months).ravel()
+    cdef const int[:] d = np.ascontiguousarray(np_days).ravel()
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n = y.shape[0]
+    cdef bint valid = True
+
+    result = np.empty(n, dtype=np.intc)
+    cdef int[:] serials = result
+
+    with nogil:
+        for i in range(n):
+            if y[i] < _MIN_YEAR or y[i] > _MAX_YEAR or m[i] < 1 or m[i] > 12 \
+                    or d[i] < 1 or d[i] > _monthLength(y[i], m[i]):
+                valid = False
+                break
+            serials[i] = _makeSerial(y[i], m[i], d[i])
+    require(valid, ValueError, "year, month and day should form valid dates in [1901-01-01, 2199-12-31]")
+    return result.reshape(shape)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def weekdayArray(serialNumbers):
+    u"""
+    Vectorized Date.weekday: 1 for Sunday up to 7 for Saturday.
+    """
+    np_serials = _serials(serialNumbers)
+    cdef const int[:] serials = np_serials.ravel()
+    cdef Py_ssize_t i
+    cdef int w
+    result = np.empty(serials.shape[0], dtype=np.intc)
+    cdef int[:] weekdays = result
+
+    with nogil:
+        for i in range(serials.shape[0]):
+            w = serials[i] % 7
+            weekdays[i] = 7 if w == 0 else w
+    return result.reshape(np_serials.shape)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def endOfMonthArray(serialNumbers):
+    u"""
+    Vectorized Date.endOfMonth: the last calendar day of the month of every
+    date.
+    """
+    np_serials = _serials(serialNumbers)
+    cdef const int[:] serials = np_serials.ravel()
+    cdef Py_ssize_t i
+    result = np.empty(serials.shape[0], dtype=np.intc)
+    cdef int[:] ends = result
+
+    with nogil:
+        for i in range(serials.shape[0]):
+            ends[i] = _endOfMonth(serials[i])
+    return result.reshape(np_serials.shape)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def advanceArray(serialNumbers, period):
+    u"""
+    Vectorized ``Date + Period``. As with Date, business days are counted as
+    calendar days; use advanceDateArray to move along a calendar.
+
+    :param serialNumbers: int array of serial numbers
+    :param period: Period or its string representation, e.g. '3m'
+    :return: int32 array of serial numbers
+    """
+    cdef Period p = check_period(period)
+    np_serials = _serials(serialNumbers)
+    cdef const int[:] serials = np_serials.ravel()
+    cdef int n = p.length()
+    cdef int units = p.units()
+    cdef Py_ssize_t i
+    result = np.empty(serials.shape[0], dtype=np.intc)
+    cdef int[:] advanced = result
+
+    with nogil:
+        for i in range(serials.shape[0]):
+            advanced[i] = _advance(serials[i], n, units)
+    return _checked(result, np_serials.shape)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def adjustDateArray(Calendar calendar, serialNumbers, int convention=BizDayConventions.Following):
+    u"""
+    Vectorized Calendar.adjustDate.
+
+    :param calendar: holiday calendar
+    :param serialNumbers: int array of serial numbers
+    :param convention: business day convention
+    :return: int32 array of adjusted serial numbers
+    """
+    require(BizDayConventions.Following <= convention <= BizDayConventions.Nearest,
+            ValueError,
+            "unknown business-day convention")
+    np_serials = _serials(serialNumbers)
+    cdef const int[:] serials = np_serials.ravel()
+    cdef BizDayIndex index = calendar._bizDayIndex()
+    cdef Py_ssize_t i
+    result = np.empty(serials.shape[0], dtype=np.intc)
+    cdef int[:] adjusted = result
+
+    with nogil:
+        for i in range(serials.shape[0]):
+            adjusted[i] = _adjust(index, serials[i], convention)
+    return _checked(result, np_serials.shape)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def advanceDateArray(Calendar calendar,
+                     serialNumbers,
+                     period,
+                     int convention=BizDayConventions.Following,
+                     bint endOfMonth=False):
+    u"""
+    Vectorized Calendar.advanceDate.
+
+    :param calendar: holiday calendar
+    :param serialNumbers: int array of serial numbers
+    :param period: Period or its string representation, e.g. '-2b'
+    :param convention: business day convention
+    :param endOfMonth: keep business end of month dates at the end of month
+                       when advancing by months or years
+    :return: int32 array of serial numbers
+    """
+    require(BizDayConventions.Following <= convention <= BizDayConventions.Nearest,
+            ValueError,
+            "unknown business-day convention")
+    cdef Period p = check_period(period)
+    np_serials = _serials(serialNumbers)
+    cdef const int[:] serials = np_serials.ravel()
+    cdef BizDayIndex index = calendar._bizDayIndex()
+    cdef int n = p.length()
+    cdef int units = p.units()
+    cdef bint monthly = units == TimeUnits.Months or units == TimeUnits.Years
+    cdef Py_ssize_t i
+    cdef int serial
+    result = np.empty(serials.shape[0], dtype=np.intc)
+    cdef int[:] advanced = result
+
+    with nogil:
+        for i in range(serials.shape[0]):
+            serial = serials[i]
+            if n == 0:
+                advanced[i] = _adjust(index, serial, convention)
+            elif units == TimeUnits.BDays:
+                advanced[i] = _advanceBizDays(index, serial, n)
+            elif monthly and endOfMonth and _isEndOfMonth(index, serial):
+                serial = _advance(serial, n, units)
+                if serial != _NO_DATE:
+                    serial = _preceding(index, _endOfMonth(serial))
+                advanced[i] = serial
+            else:
+                advanced[i] = _adjust(index, _advance(serial, n, units), convention)
+    return _checked(result, np_serials.shape)
+
+
+def toDatetime64(serialNumbers):
+    u"""
+    Convert serial numbers to a ``datetime64[D]`` array.
+    """
+    np_serials = _serials(serialNumbers)
+    return (np_serials.astype(np.int64) - _EPOCH_SERIAL).astype('datetime64[D]')
+
+
+def fromDatetime64(values):
+    u"""
+    Convert a ``datetime64`` array (any unit, truncated to days) to int32
+    serial numbers.
+    """
+    days = np.asarray(values).astype('datetime64[D]')
+    require(not np.isnat(days).any(), ValueError, "NaT can't be converted to a serial number")
+    return _serials(days.astype(np.int64) + _EPOCH_SERIAL)
+
+
+cdef double _yearFractionISMA(int d1, int d2, int d3, int d4) noexcept nogil:
+    # ActualActualISMAImpl.yearFraction with 0 for a missing reference date
+    cdef int refPeriodStart
+    cdef int refPeriodEnd
+    cdef int months
+    cdef int previousRef
+    cdef int newRefStart
+    cdef int newRefEnd
+    cdef int i
+    cdef double period
+    cdef double total
+
+    if d1 == d2:
+        return 0.
+    if d1 > d2:
+        return -_yearFractionISMA(d2, d1, d3, d4)
+
+    refPeriodStart = d3 if d3 else d1
+    refPeriodEnd = d4 if d4 else d2
+    months = <int>(0.5 + 12. * (refPeriodEnd - refPeriodStart) / 365.)
+
+    if months == 0:
+        refPeriodStart = d1
+        refPeriodEnd = _advance(d1, 1, TimeUnits.Years)
+        months = 12
+        if refPeriodEnd == _NO_DATE:
+            return NAN
+
+    period = months / 12.
+
+    if d2 <= refPeriodEnd:
+        if d1 >= refPeriodStart:
+            return period * (d2 - d1) / (refPeriodEnd - refPeriodStart)
+        previousRef = _advanceMonths(refPeriodStart, -months)
+        if previousRef == _NO_DATE:
+            return NAN
+        if d2 > refPeriodStart:
+            return _yearFractionISMA(d1, refPeriodStart, previousRef, refPeriodStart) \
+                   + _yearFractionISMA(refPeriodStart, d2, refPeriodStart, refPeriodEnd)
+        return _yearFractionISMA(d1, d2, previousRef, refPeriodStart)
+
+    total = _yearFractionISMA(d1, refPeriodEnd, refPeriodStart, refPeriodEnd)
+    i = 0
+    while True:
+        newRefStart = _advanceMonths(refPeriodEnd, i * months)
+        newRefEnd = _advanceMonths(refPeriodEnd, (i + 1) * months)
+        if newRefStart == _NO_DATE or newRefEnd == _NO_DATE:
+            return NAN
+        if d2 < newRefEnd:
+            break
+        total += period
+        i += 1
+    return total + _yearFractionISMA(newRefStart, d2, newRefStart, newRefEnd)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def yearFractionISMAArray(d1, d2, refPeriodStart=None, refPeriodEnd=None):
+    u"""
+    Vectorized Actual/Actual (ISMA) year fraction. The inputs are broadcast
+    against each other; a reference date of 0 (or None for the whole
+    argument) falls back to d1 / d2 as in ActualActualISMAImpl.
+    """
+    np_d1, np_d2, np_d3, np_d4 = np.broadcast_arrays(_serials(d1),
+                                                     _serials(d2),
+                                                     _references(refPeriodStart),
+                                                     _references(refPeriodEnd))
+    shape = np_d1.shape
+    cdef const int[:] s1 = np.ascontiguousarray(np_d1).ravel()
+    cdef const int[:] s2 = np.ascontiguousarray(np_d2).ravel()
+    cdef const int[:] s3 = np.ascontiguousarray(np_d3).ravel()
+    cdef const int[:] s4 = np.ascontiguousarray(np_d4).ravel()
+    cdef Py_ssize_t i
+    result = np.empty(s1.shape[0], dtype=float)
+    cdef double[:] fractions = result
+
+    with nogil:
+        for i in range(s1.shape[0]):
+            fractions[i] = _yearFractionISMA(s1[i], s2[i], s3[i], s4[i])
+    require(not np.isnan(result).any(),
+            ValueError,
+            "reference periods are out of bound. They must be in [1901-01-01, 2199-12-31]")
+    return result.reshape(shape)
+
+
+def _references(dates):
+    if dates is None:
+        return np.zeros((), dtype=np.intc)
+    dates = np.asarray(dates)
+    # 0 stands for a missing reference date
+    _serials(dates[dates != 0])
+    return dates.astype(np.intc)
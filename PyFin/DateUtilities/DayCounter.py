@@ -5,7 +5,10 @@ Created on 2017-6-11
 @author: cheng.li
 """
 
+import numpy as np
 from PyFin.DateUtilities.Period import Period
+from PyFin.DateUtilities.DateArrays import splitSerialNumbers
+from PyFin.DateUtilities.DateArrays import yearFractionISMAArray
 from PyFin.Enums.TimeUnits import TimeUnits
 from PyFin.Enums.Months import Months
 
@@ -29,6 +32,19 @@ class DayCounter(object):
     def yearFraction(self, d1, d2, refPeriodStart=None, refPeriodEnd=None):
         return self.impl_.yearFraction(d1, d2, refPeriodStart, refPeriodEnd)
 
+    def dayCountArray(self, d1, d2):
+        u"""
+        Vectorized dayCount over arrays of date serial numbers.
+        """
+        return self.impl_.dayCountArray(np.asarray(d1), np.asarray(d2))
+
+    def yearFractionArray(self, d1, d2, refPeriodStart=None, refPeriodEnd=None):
+        u"""
+        Vectorized yearFraction over arrays of date serial numbers. Missing
+        reference dates are given as None or as 0 entries.
+        """
+        return self.impl_.yearFractionArray(np.asarray(d1), np.asarray(d2), refPeriodStart, refPeriodEnd)
+
 
 class DayCounterImpl(object):
 
@@ -41,6 +57,12 @@ class DayCounterImpl(object):
     def yearFraction(self, d1, d2, refPeriodStart, refPeriodEnd):
         pass
 
+    def dayCountArray(self, d1, d2):
+        return d2.astype(np.int64) - d1
+
+    def yearFractionArray(self, d1, d2, refPeriodStart, refPeriodEnd):
+        pass
+
 
 class Actual360(DayCounterImpl):
 
@@ -50,6 +72,9 @@ class Actual360(DayCounterImpl):
     def yearFraction(self, d1, d2, refPeriodStart, refPeriodEnd2):
         return float(d2 - d1) / 360.
 
+    def yearFractionArray(self, d1, d2, refPeriodStart, refPeriodEnd):
+        return self.dayCountArray(d1, d2) / 360.
+
 
 class Actual365Fixed(DayCounterImpl):
 
@@ -59,6 +84,9 @@ class Actual365Fixed(DayCounterImpl):
     def yearFraction(self, d1, d2, refPeriodStart, refPeriodEnd2):
         return float(d2 - d1) / 365.
 
+    def yearFractionArray(self, d1, d2, refPeriodStart, refPeriodEnd):
+        return self.dayCountArray(d1, d2) / 365.
+
 
 class Actual365NoLeap(DayCounterImpl):
     MonthOffset = [
@@ -74,10 +102,10 @@ class Actual365NoLeap(DayCounterImpl):
         s1 = d1.dayOfMonth() + self.MonthOffset[d1.month() - 1] + (d1.year() * 365)
         s2 = d2.dayOfMonth() + self.MonthOffset[d2.month() - 1] + (d2.year() * 365)
 
-        if d1.month() == Months.Feb and d1.dayOfMonth() == 29:
+        if d1.month() == Months.February and d1.dayOfMonth() == 29:
             s1 -= 1
 
-        if d2.month() == Months.Feb and d2.dayOfMonth() == 29:
+        if d2.month() == Months.February and d2.dayOfMonth() == 29:
             s2 -= 1
 
         return s2 - s1
@@ -85,6 +113,17 @@ class Actual365NoLeap(DayCounterImpl):
     def yearFraction(self, d1, d2, refPeriodStart, refPeriodEnd2):
         return self.dayCount(d1, d2) / 365.
 
+    def _noLeapSerials(self, d):
+        y, m, day = splitSerialNumbers(d)
+        offsets = np.array(self.MonthOffset)[m - 1]
+        return day + offsets + y.astype(np.int64) * 365 - ((m == Months.February) & (day == 29))
+
+    def dayCountArray(self, d1, d2):
+        return self._noLeapSerials(d2) - self._noLeapSerials(d1)
+
+    def yearFractionArray(self, d1, d2, refPeriodStart, refPeriodEnd):
+        return self.dayCountArray(d1, d2) / 365.
+
 
 class ActualActualISMAImpl(DayCounterImpl):
 
@@ -139,6 +178,9 @@ class ActualActualISMAImpl(DayCounterImpl):
             sum += self.yearFraction(newRefStart, d2, newRefStart, newRefEnd)
             return sum
 
+    def yearFractionArray(self, d1, d2, refPeriodStart, refPeriodEnd):
+        return yearFractionISMAArray(d1, d2, refPeriodStart, refPeriodEnd)
+
 
 _dcDict = {'actual/360': Actual360,
            'actual/365 (fixed)': Actual365Fixed,
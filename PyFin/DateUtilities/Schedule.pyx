@@ -5,12 +5,21 @@ Created on 2015-2-20
 @author: cheng.li
 """
 
+import numpy as np
+cimport cython
 from PyFin.Enums._BizDayConventions cimport BizDayConventions
 from PyFin.Enums._DateGeneration cimport DateGeneration
 from PyFin.Enums._TimeUnits cimport TimeUnits
 from PyFin.DateUtilities.Date cimport Date
 from PyFin.DateUtilities.Period cimport Period
 from PyFin.DateUtilities.Calendar cimport Calendar
+from PyFin.DateUtilities.Calendar cimport BizDayIndex
+from PyFin.DateUtilities.DateArrays cimport _NO_DATE
+from PyFin.DateUtilities.DateArrays cimport _advance
+from PyFin.DateUtilities.DateArrays cimport _adjust
+from PyFin.DateUtilities.DateArrays cimport _endOfMonth
+from PyFin.DateUtilities.DateArrays cimport _isEndOfMonth
+from PyFin.DateUtilities.DateArrays cimport _preceding
 from PyFin.Env import Settings
 from PyFin.Utilities.Asserts cimport require
 
@@ -119,6 +128,8 @@ cdef class Schedule(object):
             self._tenor = Period(length=0, units=TimeUnits.Years)
             self._dates.extend([effectiveDate, terminationDate])
             self._isRegular.append(True)
+            seed = effectiveDate
+            exitDate = terminationDate
         elif self._rule == DateGeneration.Backward:
             self._dates.append(terminationDate)
             seed = terminationDate
@@ -206,7 +217,7 @@ cdef class Schedule(object):
             raise ValueError("unknown rule ({0:d})".format(self._rule))
 
         # adjustments
-        if self._endOfMonth and self._cal.isEndOfMonth(seed):
+        if self._endOfMonth and self._rule != DateGeneration.Zero and self._cal.isEndOfMonth(seed):
             # adjust to end of month
             if convention == BizDayConventions.Unadjusted:
                 for i in range(len(self._dates) - 1):
@@ -325,3 +336,368 @@ cdef class Schedule(object):
                    and self._endOfMonth == other._endOfMonth \
                    and self._firstDate == other._firstDate \
                    and self._nextToLastDate == other._nextToLastDate
+
+
+# error codes of the batch schedule builder
+cdef enum:
+    _OUT_OF_RANGE = -1
+    _DEGENERATE = -2
+
+
+cdef inline int _nullAdvance(int seed, int n, int units, bint endOfMonth) noexcept nogil:
+    # Calendar("Null").advanceDate: every day is a business day
+    cdef int d = _advance(seed, n, units)
+    if d != _NO_DATE and endOfMonth and (units == TimeUnits.Months or units == TimeUnits.Years) \
+            and _endOfMonth(seed) == seed:
+        return _endOfMonth(d)
+    return d
+
+
+cdef inline void _reverse(int* values, int n) noexcept nogil:
+    cdef int i
+    cdef int tmp
+    for i in range(n // 2):
+        tmp = values[i]
+        values[i] = values[n - 1 - i]
+        values[n - 1 - i] = tmp
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef int _buildSchedule(BizDayIndex index,
+                        int effectiveDate,
+                        int terminationDate,
+                        int length,
+                        int units,
+                        int convention,
+                        int terminationConvention,
+                        int rule,
+                        bint endOfMonth,
+                        int firstDate,
+                        int nextToLastDate,
+                        int* dates,
+                        int* isRegular,
+                        int capacity) noexcept nogil:
+    # serial number version of Schedule.__init__. isRegular[i] flags the period
+    # ending at dates[i]; returns the number of dates or an error code
+    cdef int size = 0
+    cdef int periods = 1
+    cdef int seed = effectiveDate
+    cdef int exitDate
+    cdef int temp
+    cdef int i
+
+    if rule == DateGeneration.Zero:
+        dates[0] = effectiveDate
+        dates[1] = terminationDate
+        isRegular[1] = True
+        size = 2
+    elif rule == DateGeneration.Backward:
+        # built from the termination date on, in reverse order
+        dates[0] = terminationDate
+        size = 1
+        seed = terminationDate
+        if nextToLastDate:
+            temp = _nullAdvance(seed, -periods * length, units, endOfMonth)
+            dates[size] = nextToLastDate
+            isRegular[size - 1] = temp == nextToLastDate
+            size += 1
+            seed = nextToLastDate
+
+        exitDate = firstDate if firstDate else effectiveDate
+        while True:
+            temp = _nullAdvance(seed, -periods * length, units, endOfMonth)
+            if temp == _NO_DATE:
+                return _OUT_OF_RANGE
+            if size + 2 > capacity:
+                return _OUT_OF_RANGE
+            if temp < exitDate:
+                if firstDate and _adjust(index, dates[size - 1], convention) != _adjust(index, firstDate, convention):
+                    dates[size] = firstDate
+                    isRegular[size - 1] = False
+                    size += 1
+                break
+            if _adjust(index, dates[size - 1], convention) != _adjust(index, temp, convention):
+                dates[size] = temp
+                isRegular[size - 1] = True
+                size += 1
+            periods += 1
+
+        if _adjust(index, dates[size - 1], convention) != _adjust(index, effectiveDate, convention):
+            dates[size] = effectiveDate
+            isRegular[size - 1] = False
+            size += 1
+
+        _reverse(dates, size)
+        _reverse(isRegular, size - 1)
+        # realign the flags on the period end dates
+        for i in range(size - 1, 0, -1):
+            isRegular[i] = isRegular[i - 1]
+    else:
+        dates[0] = effectiveDate
+        size = 1
+        seed = effectiveDate
+        if firstDate:
+            temp = _nullAdvance(seed, periods * length, units, endOfMonth)
+            dates[size] = firstDate
+            isRegular[size] = temp == firstDate
+            size += 1
+            seed = firstDate
+
+        exitDate = nextToLastDate if nextToLastDate else terminationDate
+        while True:
+            temp = _nullAdvance(seed, periods * length, units, endOfMonth)
+            if temp == _NO_DATE:
+                return _OUT_OF_RANGE
+            if size + 2 > capacity:
+                return _OUT_OF_RANGE
+            if temp > exitDate:
+                if nextToLastDate and _adjust(index, dates[size - 1], convention) != _adjust(index, nextToLastDate, convention):
+                    dates[size] = nextToLastDate
+                    isRegular[size] = False
+                    size += 1
+                break
+            if _adjust(index, dates[size - 1], convention) != _adjust(index, temp, convention):
+                dates[size] = temp
+                isRegular[size] = True
+                size += 1
+            periods += 1
+
+        if _adjust(index, dates[size - 1], terminationConvention) != _adjust(index, terminationDate, terminationConvention):
+            dates[size] = terminationDate
+            isRegular[size] = False
+            size += 1
+
+    if endOfMonth and rule != DateGeneration.Zero and _isEndOfMonth(index, seed):
+        for i in range(size - 1):
+            if convention == BizDayConventions.Unadjusted:
+                dates[i] = _endOfMonth(dates[i])
+            else:
+                dates[i] = _preceding(index, _endOfMonth(dates[i]))
+
+        if terminationConvention != BizDayConventions.Unadjusted:
+            dates[0] = _preceding(index, _endOfMonth(dates[0]))
+            dates[size - 1] = _preceding(index, _endOfMonth(dates[size - 1]))
+        elif rule == DateGeneration.Backward:
+            dates[size - 1] = _endOfMonth(dates[size - 1])
+        else:
+            dates[0] = _endOfMonth(dates[0])
+    else:
+        for i in range(size - 1):
+            dates[i] = _adjust(index, dates[i], convention)
+        if terminationConvention != BizDayConventions.Unadjusted:
+            dates[size - 1] = _adjust(index, dates[size - 1], terminationConvention)
+
+    for i in range(size):
+        if dates[i] == _NO_DATE:
+            return _OUT_OF_RANGE
+
+    # remove extra next-to-last and second dates, see Schedule.__init__
+    if size >= 2 and dates[size - 2] >= dates[size - 1]:
+        dates[size - 2] = dates[size - 1]
+        size -= 1
+
+    if size >= 2 and dates[1] <= dates[0]:
+        if size == 2:
+            return _DEGENERATE
+        isRegular[2] = dates[1] == dates[0]
+        dates[1] = dates[0]
+        for i in range(1, size):
+            dates[i - 1] = dates[i]
+            isRegular[i - 1] = isRegular[i]
+        size -= 1
+
+    isRegular[0] = False
+    return size
+
+
+cdef inline int _capacity(int effectiveDate, int terminationDate, int length, int units) noexcept nogil:
+    # upper bound of the number of dates of a schedule
+    cdef int days = terminationDate - effectiveDate
+    if units == TimeUnits.Weeks:
+        length *= 7
+    elif units == TimeUnits.Months:
+        length *= 28
+    elif units == TimeUnits.Years:
+        length *= 365
+    return (days // length if length > 0 else 0) + 5
+
+
+def _broadcastParameter(values, size_t n, dtype):
+    values = np.asarray(values, dtype=dtype)
+    require(values.ndim <= 1, ValueError, "schedule parameters should be scalars or 1-d arrays")
+    return np.ascontiguousarray(np.broadcast_to(values, (n,)))
+
+
+def _categories(values, size_t n, convert):
+    # codes of the distinct values of a scalar or of a sequence of n items
+    if isinstance(values, (str, Period, Calendar)):
+        values = [values]
+    values = list(values)
+    require(len(values) in (1, n), ValueError, "expected 1 or {0} items, found {1}".format(n, len(values)))
+
+    cdef dict seen = {}
+    cdef list converted = []
+    codes = np.empty(len(values), dtype=np.intc)
+    for i, v in enumerate(values):
+        if isinstance(v, Calendar):
+            key = v.name
+        elif isinstance(v, Period):
+            key = (v.length(), v.units())
+        else:
+            key = str(v).lower()
+        try:
+            codes[i] = seen[key]
+        except KeyError:
+            seen[key] = len(converted)
+            codes[i] = len(converted)
+            converted.append(convert(v))
+    return converted, np.ascontiguousarray(np.broadcast_to(codes, (n,)))
+
+
+def _toCalendar(cal):
+    return cal if isinstance(cal, Calendar) else Calendar(str(cal))
+
+
+def _toPeriod(tenor):
+    return tenor if isinstance(tenor, Period) else Period(str(tenor))
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def scheduleArrays(effectiveDates,
+                   terminationDates,
+                   tenors,
+                   calendars,
+                   convention=BizDayConventions.Following,
+                   terminationConvention=BizDayConventions.Following,
+                   dateGenerationRule=DateGeneration.Forward,
+                   endOfMonth=False,
+                   firstDates=None,
+                   nextToLastDates=None):
+    u"""
+    Build the schedules of a batch of instruments in one call. Every
+    instrument gets the same dates as
+
+        Schedule(effectiveDate, terminationDate, tenor, calendar, convention,
+                 terminationConvention, dateGenerationRule, endOfMonth,
+                 firstDate, nextToLastDate)
+
+    with dates given as serial numbers. Tenors and calendars are a single
+    value or one item per instrument; the conventions, the rule, the end of
+    month flag and the optional first / next to last dates (0 for none) are
+    a scalar or one value per instrument.
+
+    :return: tuple of (offsets, dates, isRegular). The dates of instrument i
+             are dates[offsets[i]:offsets[i + 1]] and isRegular at position
+             j > offsets[i] is Schedule.isRegular(j - offsets[i]).
+    """
+    cdef const int[:] effective = np.ascontiguousarray(effectiveDates, dtype=np.intc).ravel()
+    cdef size_t n = effective.shape[0]
+    cdef const int[:] termination = _broadcastParameter(terminationDates, n, np.intc)
+    np_conventions = _broadcastParameter(convention, n, np.intc)
+    np_terminationConventions = _broadcastParameter(terminationConvention, n, np.intc)
+    cdef const int[:] rules = _broadcastParameter(dateGenerationRule, n, np.intc)
+    cdef const int[:] first = _broadcastParameter(0 if firstDates is None else firstDates, n, np.intc)
+    cdef const int[:] nextToLast = _broadcastParameter(0 if nextToLastDates is None else nextToLastDates, n, np.intc)
+    np_endOfMonth = _broadcastParameter(endOfMonth, n, bool).copy()
+
+    cdef Calendar cal
+    cdef Period tenor
+    periods, np_tenorCodes = _categories(tenors, n, _toPeriod)
+    calendarsList, np_calendarCodes = _categories(calendars, n, _toCalendar)
+    cdef list indices = [(<Calendar>cal)._bizDayIndex() for cal in calendarsList]
+    np_lengths = np.array([tenor.length() for tenor in periods], dtype=np.intc)
+    np_units = np.array([tenor.units() for tenor in periods], dtype=np.intc)
+    # end of month is only meaningful from monthly tenors on
+    np_endOfMonth &= np.array([not tenor < Period("1M") for tenor in periods], dtype=bool)[np_tenorCodes]
+
+    np_effective = np.asarray(effective)
+    np_termination = np.asarray(termination)
+    np_rules = np.asarray(rules)
+    np_lengths = np_lengths[np_tenorCodes]
+    np_units = np_units[np_tenorCodes]
+    np_first = np.where(np.asarray(first) == np_effective, 0, first).astype(np.intc)
+    np_nextToLast = np.where(np.asarray(nextToLast) == np_termination, 0, nextToLast).astype(np.intc)
+    np_rules = np.where(np_lengths == 0, DateGeneration.Zero, np_rules).astype(np.intc)
+
+    require((np_effective < np_termination).all(), ValueError, "effective dates should be earlier than termination dates")
+    require((np_lengths >= 0).all(), ValueError, "non positive tenors are not allowed")
+    require(((np_rules >= DateGeneration.Zero) & (np_rules <= DateGeneration.Forward)).all(),
+            ValueError,
+            "unknown date generation rule")
+    for conventionValues in (np_conventions, np_terminationConventions):
+        require(((conventionValues >= BizDayConventions.Following)
+                 & (conventionValues <= BizDayConventions.Nearest)).all(),
+                ValueError,
+                "unknown business-day convention")
+    for dates, name in ((np_first, "first"), (np_nextToLast, "next to last")):
+        given = dates != 0
+        require(not (given & (np_rules == DateGeneration.Zero)).any(),
+                ValueError,
+                "{0} date incompatible with zero date generation rule".format(name))
+        require(((np_effective[given] < dates[given]) & (dates[given] < np_termination[given])).all(),
+                ValueError,
+                "{0} dates out of effective-termination date range".format(name))
+
+    cdef const int[:] conventions = np_conventions
+    cdef const int[:] terminationConventions = np_terminationConventions
+    cdef const int[:] calendarCodes = np_calendarCodes
+    cdef const int[:] lengths = np_lengths
+    cdef const int[:] units = np_units
+    cdef const int[:] ruleValues = np_rules
+    cdef const int[:] firstValues = np_first
+    cdef const int[:] nextToLastValues = np_nextToLast
+    cdef const unsigned char[:] eom = np_endOfMonth.view(np.uint8)
+
+    cdef size_t i
+    cdef long long total = 0
+    np_offsets = np.empty(n + 1, dtype=np.int64)
+    cdef long long[:] offsets = np_offsets
+    cdef int[:] capacities = np.empty(n, dtype=np.intc)
+
+    offsets[0] = 0
+    for i in range(n):
+        capacities[i] = _capacity(effective[i], termination[i], lengths[i], units[i])
+        total += capacities[i]
+
+    np_dates = np.empty(total, dtype=np.intc)
+    np_regular = np.zeros(total, dtype=np.intc)
+    cdef int[:] dates_buffer = np_dates
+    cdef int[:] regular_buffer = np_regular
+    cdef long long start = 0
+    cdef long long end = 0
+    cdef int size
+    cdef int k
+    cdef BizDayIndex index
+
+    for i in range(n):
+        index = <BizDayIndex>indices[calendarCodes[i]]
+        size = _buildSchedule(index,
+                              effective[i],
+                              termination[i],
+                              lengths[i],
+                              units[i],
+                              conventions[i],
+                              terminationConventions[i],
+                              ruleValues[i],
+                              eom[i],
+                              firstValues[i],
+                              nextToLastValues[i],
+                              &dates_buffer[start],
+                              &regular_buffer[start],
+                              capacities[i])
+        require(size != _OUT_OF_RANGE,
+                ValueError,
+                "schedule {0} has dates out of bound. They must be in [1901-01-01, 2199-12-31]".format(i))
+        require(size != _DEGENERATE, ValueError, "schedule {0} is degenerate".format(i))
+        # compact the buffer as we go: the schedule was written at its capacity slot
+        if end != start:
+            for k in range(size):
+                dates_buffer[end + k] = dates_buffer[start + k]
+                regular_buffer[end + k] = regular_buffer[start + k]
+        start += capacities[i]
+        end += size
+        offsets[i + 1] = end
+
+    return np_offsets, np_dates[:end].copy(), np_regular[:end].astype(bool)
@@ -8,13 +8,33 @@ Created on 2015-7-9
 from PyFin.DateUtilities.Calendar import Calendar
 from PyFin.DateUtilities.Date import Date
 from PyFin.DateUtilities.Date import check_date
+from PyFin.DateUtilities.DateArrays import splitSerialNumbers
+from PyFin.DateUtilities.DateArrays import makeSerialNumbers
+from PyFin.DateUtilities.DateArrays import weekdayArray
+from PyFin.DateUtilities.DateArrays import endOfMonthArray
+from PyFin.DateUtilities.DateArrays import advanceArray
+from PyFin.DateUtilities.DateArrays import adjustDateArray
+from PyFin.DateUtilities.DateArrays import advanceDateArray
+from PyFin.DateUtilities.DateArrays import toDatetime64
+from PyFin.DateUtilities.DateArrays import fromDatetime64
 from PyFin.DateUtilities.Period import Period
 from PyFin.DateUtilities.Period import check_period
 from PyFin.DateUtilities.Schedule import Schedule
+from PyFin.DateUtilities.Schedule import scheduleArrays
 
 __all__ = ['Calendar',
            'Date',
            'Period',
            'Schedule',
+           'scheduleArrays',
            'check_date',
-           'check_period']
+           'check_period',
+           'splitSerialNumbers',
+           'makeSerialNumbers',
+           'weekdayArray',
+           'endOfMonthArray',
+           'advanceArray',
+           'adjustDateArray',
+           'advanceDateArray',
+           'toDatetime64',
+           'fromDatetime64']
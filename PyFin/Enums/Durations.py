@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+u"""
+Created on 2026-10-18
+"""
+
+from enum import IntEnum
+
+
+class Duration(IntEnum):
+
+    Simple = 0
+    Macaulay = 1
+    Modified = 2
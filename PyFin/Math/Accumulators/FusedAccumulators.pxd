@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+u"""
+Created on 2026-10-18
+"""
+
+cimport numpy as np
+from PyFin.Math.Accumulators.IAccumulators cimport Accumulator
+from PyFin.Math.Accumulators.IAccumulators cimport RowBinding
+
+
+cdef enum:
+    _OP_ADD = 0
+    _OP_SUB = 1
+    _OP_MUL = 2
+    _OP_DIV = 3
+    _OP_LT = 4
+    _OP_LE = 5
+    _OP_GT = 6
+    _OP_GE = 7
+    _OP_EQ = 8
+    _OP_NE = 9
+    _OP_AND = 10
+    _OP_OR = 11
+    _OP_NEG = 12
+    _OP_EXP = 13
+    _OP_LOG = 14
+    _OP_SQRT = 15
+    _OP_POW = 16
+    _OP_ABS = 17
+    _OP_SIGN = 18
+    _OP_ACOS = 19
+    _OP_ACOSH = 20
+    _OP_ASIN = 21
+    _OP_ASINH = 22
+    _OP_CEIL = 23
+    _OP_FLOOR = 24
+    _OP_ROUND = 25
+    _OP_NORMINV = 26
+    _OP_SELECT = 27
+
+
+cdef double apply_op(int op, double a, double b, double c) nogil
+
+
+cdef class FusedValueHolder(Accumulator):
+
+    cdef list _leaves
+    cdef list _inverses
+    cdef int[:, ::1] _code
+    cdef double[::1] _registers
+    cdef Py_ssize_t _output
+    cdef str _expression
+
+    cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
+    cpdef double result(self)
@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+u"""
+Created on 2026-10-18
+"""
+
+import copy
+import numpy as np
+cimport numpy as np
+cimport cython
+from libc.math cimport exp
+from libc.math cimport log
+from libc.math cimport sqrt
+from libc.math cimport pow
+from libc.math cimport fabs
+from libc.math cimport acos
+from libc.math cimport acosh
+from libc.math cimport asin
+from libc.math cimport asinh
+from libc.math cimport ceil
+from libc.math cimport floor
+from libc.math cimport round
+from PyFin.Math.Accumulators.IAccumulators cimport Accumulator
+from PyFin.Math.Accumulators.IAccumulators cimport RowBinding
+from PyFin.Math.Accumulators.IAccumulators cimport Negative
+from PyFin.Math.Accumulators.IAccumulators cimport CombinedValueHolder
+from PyFin.Math.Accumulators.IAccumulators cimport AddedValueHolder
+from PyFin.Math.Accumulators.IAccumulators cimport MinusedValueHolder
+from PyFin.Math.Accumulators.IAccumulators cimport MultipliedValueHolder
+from PyFin.Math.Accumulators.IAccumulators cimport DividedValueHolder
+from PyFin.Math.Accumulators.IAccumulators cimport LtOperatorValueHolder
+from PyFin.Math.Accumulators.IAccumulators cimport LeOperatorValueHolder
+from PyFin.Math.Accumulators.IAccumulators cimport GtOperatorValueHolder
+from PyFin.Math.Accumulators.IAccumulators cimport GeOperatorValueHolder
+from PyFin.Math.Accumulators.IAccumulators cimport EqOperatorValueHolder
+from PyFin.Math.Accumulators.IAccumulators cimport NeOperatorValueHolder
+from PyFin.Math.Accumulators.IAccumulators cimport Identity
+from PyFin.Math.Accumulators.IAccumulators cimport IIF
+from PyFin.Math.Accumulators.IAccumulators cimport BasicFunction
+from PyFin.Math.Accumulators.IAccumulators cimport Exp
+from PyFin.Math.Accumulators.IAccumulators cimport Log
+from PyFin.Math.Accumulators.IAccumulators cimport Sqrt
+from PyFin.Math.Accumulators.IAccumulators cimport Pow
+from PyFin.Math.Accumulators.IAccumulators cimport Abs
+from PyFin.Math.Accumulators.IAccumulators cimport Sign
+from PyFin.Math.Accumulators.IAccumulators cimport Acos
+from PyFin.Math.Accumulators.IAccumulators cimport Acosh
+from PyFin.Math.Accumulators.IAccumulators cimport Asin
+from PyFin.Math.Accumulators.IAccumulators cimport Asinh
+from PyFin.Math.Accumulators.IAccumulators cimport NormInv
+from PyFin.Math.Accumulators.IAccumulators cimport Ceil
+from PyFin.Math.Accumulators.IAccumulators cimport Floor
+from PyFin.Math.Accumulators.IAccumulators cimport Round
+from PyFin.Math.Distributions.NormalDistribution cimport InverseCumulativeNormal as InvNormImpl
+from PyFin.Math.MathConstants cimport NAN
+from PyFin.Math.udfs cimport sign
+
+
+@cython.cdivision(True)
+cdef double apply_op(int op, double a, double b, double c) nogil:
+    if op == _OP_ADD:
+        return a + b
+    elif op == _OP_SUB:
+        return a - b
+    elif op == _OP_MUL:
+        return a * b
+    elif op == _OP_DIV:
+        return a / b
+    elif op == _OP_LT:
+        return a < b
+    elif op == _OP_LE:
+        return a <= b
+    elif op == _OP_GT:
+        return a > b
+    elif op == _OP_GE:
+        return a >= b
+    elif op == _OP_EQ:
+        return a == b
+    elif op == _OP_NE:
+        return a != b
+    elif op == _OP_AND:
+        return a != 0. and b != 0.
+    elif op == _OP_OR:
+        return a != 0. or b != 0.
+    elif op == _OP_NEG:
+        return -a
+    elif op == _OP_EXP:
+        return exp(a)
+    elif op == _OP_LOG:
+        return log(a)
+    elif op == _OP_SQRT:
+        return sqrt(a)
+    elif op == _OP_POW:
+        return pow(a, b)
+    elif op == _OP_ABS:
+        return fabs(a)
+    elif op == _OP_SIGN:
+        return sign(a)
+    elif op == _OP_ACOS:
+        return acos(a)
+    elif op == _OP_ACOSH:
+        return acosh(a)
+    elif op == _OP_ASIN:
+        return asin(a)
+    elif op == _OP_ASINH:
+        return asinh(a)
+    elif op == _OP_CEIL:
+        return ceil(a)
+    elif op == _OP_FLOOR:
+        return floor(a)
+    elif op == _OP_ROUND:
+        return round(a)
+    elif op == _OP_SELECT:
+        return b if a != 0. else c
+    return NAN
+
+
+def compile_program(root, describe):
+    u"""
+    Flatten the operator nodes reachable from root into register code.
+
+    describe(node) returns (opcode, children, aux) for an operator node, a
+    float for a constant and None for a leaf. Registers hold the leaves,
+    then the constants, then one temporary per instruction; an instruction
+    is the row (opcode, target, a, b, c) and c indexes the auxiliary objects
+    for NORMINV.
+
+    :return: (leaves, constants, auxiliaries, code, output, first) where first
+             is the position of the leftmost leaf, -1 if there is no leaf
+    """
+    leaves = []
+    constants = []
+    auxiliaries = []
+    instructions = []
+
+    def visit(node):
+        if isinstance(node, float):
+            constants.append(node)
+            return ('c', len(constants) - 1), -1
+
+        description = describe(node)
+        if description is None:
+            leaves.append(node)
+            return ('l', len(leaves) - 1), len(leaves) - 1
+        elif isinstance(description, float):
+            return visit(description)
+
+        op, children, aux = description
+        args = []
+        first = -1
+        for child in children:
+            arg, child_first = visit(child)
+            args.append(arg)
+            if first == -1:
+                first = child_first
+        if aux is not None:
+            auxiliaries.append(aux)
+            args.append(('a', len(auxiliaries) - 1))
+        instructions.append((op, args))
+        return ('t', len(instructions) - 1), first
+
+    output, first = visit(root)
+
+    n_leaves = len(leaves)
+    offsets = {'l': 0, 'c': n_leaves, 't': n_leaves + len(constants), 'a': 0}
+    code = np.zeros((len(instructions), 5), dtype=np.intc)
+    for i, (op, args) in enumerate(instructions):
+        code[i, 0] = op
+        code[i, 1] = offsets['t'] + i
+        for k, (kind, pos) in enumerate(args):
+            code[i, 2 + k] = offsets[kind] + pos
+
+    return leaves, np.array(constants, dtype=float), auxiliaries, code, offsets[output[0]] + output[1], first
+
+
+_BINARY_OPERATORS = {AddedValueHolder: _OP_ADD,
+                     MinusedValueHolder: _OP_SUB,
+                     MultipliedValueHolder: _OP_MUL,
+                     DividedValueHolder: _OP_DIV,
+                     LtOperatorValueHolder: _OP_LT,
+                     LeOperatorValueHolder: _OP_LE,
+                     GtOperatorValueHolder: _OP_GT,
+                     GeOperatorValueHolder: _OP_GE,
+                     EqOperatorValueHolder: _OP_EQ,
+                     NeOperatorValueHolder: _OP_NE}
+
+_FUNCTIONS = {Exp: _OP_EXP,
+              Log: _OP_LOG,
+              Sqrt: _OP_SQRT,
+              Abs: _OP_ABS,
+              Sign: _OP_SIGN,
+              Acos: _OP_ACOS,
+              Acosh: _OP_ACOSH,
+              Asin: _OP_ASIN,
+              Asinh: _OP_ASINH,
+              Ceil: _OP_CEIL,
+              Floor: _OP_FLOOR,
+              Round: _OP_ROUND}
+
+
+def _describe(node):
+    cls = type(node)
+    if cls in _BINARY_OPERATORS:
+        return _BINARY_OPERATORS[cls], [(<CombinedValueHolder>node)._left, (<CombinedValueHolder>node)._right], None
+    elif cls in _FUNCTIONS:
+        return _FUNCTIONS[cls], [(<BasicFunction>node)._inner], None
+    elif cls is Pow:
+        return _OP_POW, [(<Pow>node)._inner, (<Pow>node)._n], None
+    elif cls is NormInv:
+        return _OP_NORMINV, [(<NormInv>node)._inner], (<NormInv>node)._inv
+    elif cls is Negative:
+        return _OP_NEG, [(<Negative>node)._inner], None
+    elif cls is IIF:
+        return _OP_SELECT, [(<IIF>node)._cond, (<IIF>node)._left, (<IIF>node)._right], None
+    elif cls is Identity:
+        return node.result()
+    return None
+
+
+cdef class FusedValueHolder(Accumulator):
+    u"""
+    Stateless operator subtree flattened into register code by ``fuse``: the
+    leaves are pushed as before and result() runs one loop over the code
+    instead of a virtual call per operator node.
+    """
+
+    def __init__(self, leaves, constants, inverses, code, output, expression, window, dependency, isFull=False):
+        super(FusedValueHolder, self).__init__()
+        registers = np.zeros(len(leaves) + len(constants) + len(code))
+        registers[len(leaves):len(leaves) + len(constants)] = constants
+        self._leaves = list(leaves)
+        self._inverses = list(inverses)
+        self._code = np.ascontiguousarray(code, dtype=np.intc)
+        self._registers = registers
+        self._output = output
+        self._expression = expression
+        self._window = window
+        self._dependency = list(dependency)
+        self._isFull = isFull
+
+    cpdef push(self, dict data):
+        cdef Accumulator leaf
+        cdef bint full = True
+        for leaf in self._leaves:
+            leaf.push(data)
+            full = full and leaf.isFull()
+        self._isFull = self._isFull or full
+
+    cpdef bind(self, RowBinding binding):
+        cdef Accumulator leaf
+        for leaf in self._leaves:
+            leaf.bind(binding)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef double result(self):
+        cdef Py_ssize_t i = 0
+        cdef int op
+        cdef Accumulator leaf
+
+        for leaf in self._leaves:
+            self._registers[i] = leaf.result()
+            i += 1
+
+        for i in range(self._code.shape[0]):
+            op = self._code[i, 0]
+            if op == _OP_NORMINV:
+                self._registers[self._code[i, 1]] = \
+                    (<InvNormImpl>self._inverses[self._code[i, 4]]).inv(self._registers[self._code[i, 2]])
+            else:
+                self._registers[self._code[i, 1]] = apply_op(op,
+                                                             self._registers[self._code[i, 2]],
+                                                             self._registers[self._code[i, 3]],
+                                                             self._registers[self._code[i, 4]])
+        return self._registers[self._output]
+
+    def __str__(self):
+        return self._expression
+
+    def __reduce__(self):
+        n_leaves = len(self._leaves)
+        n_constants = self._registers.shape[0] - n_leaves - self._code.shape[0]
+        constants = np.asarray(self._registers)[n_leaves:n_leaves + n_constants].copy()
+        return FusedValueHolder, (self._leaves,
+                                  constants,
+                                  self._inverses,
+                                  np.asarray(self._code).copy(),
+                                  self._output,
+                                  self._expression,
+                                  self._window,
+                                  self._dependency,
+                                  self._isFull)
+
+
+def fuse(expression):
+    u"""
+    Collapse the stateless operators at the top of expression (arithmetic,
+    comparisons, functions and IIF) into one FusedValueHolder. Stateful
+    nodes stay as they are and become the leaves of the fused node;
+    expression is returned untouched when there is fewer than two operators
+    to collapse.
+    """
+    expression = copy.deepcopy(expression)
+    leaves, constants, inverses, code, output, _ = compile_program(expression, _describe)
+    if len(code) < 2:
+        return expression
+    return FusedValueHolder(leaves,
+                            constants,
+                            inverses,
+                            code,
+                            output,
+                            str(expression),
+                            expression.window,
+                            expression.dependency)
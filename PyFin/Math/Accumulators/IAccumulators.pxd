@@ -5,9 +5,19 @@ Created on 2017-2-8
 @author: cheng.li
 """
 
+cimport numpy as np
 from PyFin.Math.Distributions.NormalDistribution cimport InverseCumulativeNormal as InvNormImpl
 
 
+cdef class RowBinding(object):
+
+    cdef const double* row
+    cdef readonly list columns
+    cdef dict _positions
+
+    cdef Py_ssize_t position(self, name)
+
+
 cdef class IAccumulator(object):
     pass
 
@@ -20,7 +30,9 @@ cdef class Accumulator(IAccumulator):
 
     cpdef bint isFull(self)
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
+    cpdef np.ndarray push_rows(self, const double[:, ::1] values, list columns)
     cpdef transform(self, data, str name=*, bint to_sort=*)
 
 cdef bint isanumber(a)
@@ -32,6 +44,7 @@ cdef class Negative(Accumulator):
     cdef Accumulator _inner
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -41,6 +54,7 @@ cdef class CombinedValueHolder(Accumulator):
     cdef Accumulator _right
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
 
 
 cdef class AddedValueHolder(CombinedValueHolder):
@@ -104,16 +118,22 @@ cdef class Identity(Accumulator):
 cdef class Current(Accumulator):
 
     cdef double _current
+    cdef RowBinding _binding
+    cdef Py_ssize_t _column
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
 cdef class Latest(Accumulator):
 
     cdef double _latest
+    cdef RowBinding _binding
+    cdef Py_ssize_t _column
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -123,6 +143,7 @@ cdef class CompoundedValueHolder(Accumulator):
     cdef Accumulator _right
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -133,6 +154,7 @@ cdef class IIF(Accumulator):
     cdef Accumulator _right
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -142,6 +164,7 @@ cdef class BasicFunction(Accumulator):
     cdef Accumulator _inner
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
 
 
 cdef class Exp(BasicFunction):
@@ -30,6 +30,24 @@ from PyFin.Math.udfs cimport sign
 from PyFin.Math.Distributions.NormalDistribution cimport InverseCumulativeNormal as InvNormImpl
 
 
+cdef class RowBinding(object):
+    u"""
+    Column layout of the rows pushed into a bound accumulator tree. Leaves
+    resolve their field to a column position once in bind() and then read
+    the value straight from the current row.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self._positions = {name: i for i, name in enumerate(self.columns)}
+        self.row = NULL
+
+    cdef Py_ssize_t position(self, name):
+        return self._positions.get(name, -1)
+
+    def __reduce__(self):
+        return RowBinding, (self.columns,)
+
 
 cdef class IAccumulator(object):
 
@@ -103,18 +121,40 @@ cdef class Accumulator(IAccumulator):
     cpdef double result(self):
         pass
 
+    cpdef bind(self, RowBinding binding):
+        u"""
+        Resolve the fields of the leaves to the columns of binding, or go
+        back to the dict based push when binding is None.
+        """
+        pass
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
-    cpdef transform(self, data, str name=None, bint to_sort=False):
-
-        cdef int i
-        cdef int k
-        cdef double[:, :] matrix_values
-        cdef size_t n = len(data)
+    cpdef np.ndarray push_rows(self, const double[:, ::1] values, list columns):
+        u"""
+        Push every row of values, laid out as columns, and return the result
+        after each push. Leaves read the rows directly, no dict is built.
+        """
+        cdef Py_ssize_t i
+        cdef Py_ssize_t n = values.shape[0]
         cdef np.ndarray[double, ndim=1] output_values = np.zeros(n)
-        cdef list columns
-        cdef size_t column_length
-        cdef dict data_dict
+        cdef RowBinding binding = RowBinding(columns)
+
+        require(values.shape[1] == len(columns), ValueError, "values and columns have different widths")
+
+        self.bind(binding)
+        try:
+            for i in range(n):
+                if values.shape[1] > 0:
+                    binding.row = &values[i, 0]
+                self.push(None)
+                output_values[i] = self.result()
+        finally:
+            binding.row = NULL
+            self.bind(None)
+        return output_values
+
+    cpdef transform(self, data, str name=None, bint to_sort=False):
 
         if to_sort:
             data.sort_index(inplace=True)
@@ -123,18 +163,7 @@ cdef class Accumulator(IAccumulator):
             name = 'transformed'
 
         data = data.select_dtypes([np.number])
-        matrix_values = data.values.astype(float)
-        columns = data.columns.tolist()
-        column_length = len(columns)
-
-        data_dict = {columns[k]: 0 for k in range(column_length)}
-
-        for i in range(n):
-            for k in range(column_length):
-                data_dict[columns[k]] = matrix_values[i, k]
-            self.push(data_dict)
-            output_values[i] = self.result()
-
+        output_values = self.push_rows(np.ascontiguousarray(data.values, dtype=float), data.columns.tolist())
         return pd.Series(output_values, index=data.index, name=name)
 
     @property
@@ -152,6 +181,42 @@ cdef class Accumulator(IAccumulator):
     def dependency(self):
         return self._dependency
 
+    def _members(self):
+        u"""
+        Members pickled by the accumulators with an explicit ``__reduce__``.
+        """
+        return {'_dependency': self._dependency, '_isFull': self._isFull, '_window': self._window}
+
+    def _set_members(self, dict members):
+        self._dependency = members['_dependency']
+        self._isFull = members['_isFull']
+        self._window = members['_window']
+
+    def _reduce_members(self):
+        return _new_accumulator, (type(self),), (_STATE_VERSION, self._members())
+
+    def _restore_members(self, state, dict layouts):
+        u"""
+        Set the members from a state written by ``_reduce_members``, or from
+        the member tuple Cython wrote for the class in a former release, with
+        the members named in ``layouts[class name]`` in sorted order.
+        """
+        cdef int version
+        if isinstance(state, tuple) and len(state) == 2 and isinstance(state[1], dict):
+            version, members = state
+            require(version <= _STATE_VERSION,
+                    ValueError,
+                    "state version {0} is newer than the supported version {1}".format(version, _STATE_VERSION))
+        else:
+            members = self._upgrade_members(dict(zip(sorted(layouts[type(self).__name__]), state)))
+        self._set_members(members)
+
+    def _upgrade_members(self, dict members):
+        u"""
+        Bring the members of a state pickled with a former layout up to date.
+        """
+        return members
+
 
 cdef class Negative(Accumulator):
 
@@ -166,6 +231,9 @@ cdef class Negative(Accumulator):
         self._inner.push(data)
         self._isFull = self._isFull if self._isFull else self._inner.isFull()
 
+    cpdef bind(self, RowBinding binding):
+        self._inner.bind(binding)
+
     def __str__(self):
         return "-{0}".format(str(self._inner))
 
@@ -188,6 +256,10 @@ cdef class CombinedValueHolder(Accumulator):
         self._right.push(data)
         self._isFull = self._isFull or (self._left.isFull() and self._right.isFull())
 
+    cpdef bind(self, RowBinding binding):
+        self._left.bind(binding)
+        self._right.bind(binding)
+
 
 cdef class AddedValueHolder(CombinedValueHolder):
     def __init__(self, left, right):
@@ -427,19 +499,50 @@ cdef class Current(Accumulator):
         self._isFull = True
         self._dependency = [x]
         self._current = NAN
+        self._binding = None
+        self._column = -1
 
     cpdef push(self, dict data):
+        if self._binding is not None:
+            self._current = self._binding.row[self._column] if self._column >= 0 else NAN
+            return
         try:
             self._current = data[self._dependency[0]]
         except KeyError:
             self._current = NAN
 
+    cpdef bind(self, RowBinding binding):
+        self._binding = binding
+        self._column = binding.position(self._dependency[0]) if binding is not None else -1
+
     def __str__(self):
         return "''\\text{{{0}}}''".format(str(self._dependency[0]))
 
     cpdef double result(self):
         return self._current
 
+    def __reduce__(self):
+        return self._reduce_members()
+
+    def __setstate__(self, state):
+        self._restore_members(state, _LEGACY_LAYOUTS)
+
+    def _members(self):
+        members = super(Current, self)._members()
+        members.update(_current=self._current, _binding=self._binding, _column=self._column)
+        return members
+
+    def _set_members(self, dict members):
+        super(Current, self)._set_members(members)
+        self._current = members['_current']
+        self._binding = members['_binding']
+        self._column = members['_column']
+
+    def _upgrade_members(self, dict members):
+        members.setdefault('_binding', None)
+        members.setdefault('_column', -1)
+        return members
+
 
 cdef class Latest(Accumulator):
 
@@ -454,9 +557,17 @@ cdef class Latest(Accumulator):
         self._isFull = True
         self._latest = current_value
         self._dependency = [x]
+        self._binding = None
+        self._column = -1
 
     cpdef push(self, dict data):
         cdef double res
+        if self._binding is not None:
+            if self._column >= 0:
+                res = self._binding.row[self._column]
+                if not isnan(res):
+                    self._latest = res
+            return
         try:
             res = data[self._dependency[0]]
         except KeyError:
@@ -465,12 +576,38 @@ cdef class Latest(Accumulator):
             if not isnan(res):
                 self._latest = res
 
+    cpdef bind(self, RowBinding binding):
+        self._binding = binding
+        self._column = binding.position(self._dependency[0]) if binding is not None else -1
+
     def __str__(self):
         return "''\\text{{{0}}}''".format(str(self._dependency[0]))
 
     cpdef double result(self):
         return self._latest
 
+    def __reduce__(self):
+        return self._reduce_members()
+
+    def __setstate__(self, state):
+        self._restore_members(state, _LEGACY_LAYOUTS)
+
+    def _members(self):
+        members = super(Latest, self)._members()
+        members.update(_latest=self._latest, _binding=self._binding, _column=self._column)
+        return members
+
+    def _set_members(self, dict members):
+        super(Latest, self)._set_members(members)
+        self._latest = members['_latest']
+        self._binding = members['_binding']
+        self._column = members['_column']
+
+    def _upgrade_members(self, dict members):
+        members.setdefault('_binding', None)
+        members.setdefault('_column', -1)
+        return members
+
 
 cdef bint isanumber(a):
     cdef bint bool_a = True
@@ -511,6 +648,9 @@ cdef class CompoundedValueHolder(Accumulator):
         self._right.push({self._right.dependency[0]: left_value})
         self._isFull = self._isFull or (self._left.isFull() and self._right.isFull())
 
+    cpdef bind(self, RowBinding binding):
+        self._left.bind(binding)
+
     cpdef double result(self):
         return self._right.result()
 
@@ -532,9 +672,17 @@ cdef class IIF(Accumulator):
         self._right.push(data)
         self._isFull = self._isFull or (self._cond.isFull() and self._left.isFull() and self._right.isFull())
 
+    cpdef bind(self, RowBinding binding):
+        self._cond.bind(binding)
+        self._left.bind(binding)
+        self._right.bind(binding)
+
     cpdef double result(self):
         return self._left.result() if self._cond.result() else self._right.result()
 
+    def __str__(self):
+        return "\\mathrm{{IIF}}({0}, {1}, {2})".format(str(self._cond), str(self._left), str(self._right))
+
 
 cdef class BasicFunction(Accumulator):
 
@@ -551,6 +699,9 @@ cdef class BasicFunction(Accumulator):
         self._origValue = self._inner.result()
         self._isFull = self._isFull or self._inner.isFull()
 
+    cpdef bind(self, RowBinding binding):
+        self._inner.bind(binding)
+
 
 cdef class Exp(BasicFunction):
     def __init__(self, x, orig_value=NAN):
@@ -707,3 +858,39 @@ cdef class Round(BasicFunction):
 
     def __str__(self):
         return "\\mathrm{{Round}}({0})".format(str(self._inner))
+
+
+# version of the states written by the explicit __reduce__ methods, the
+# member tuples Cython wrote in the former releases come before it
+_STATE_VERSION = 1
+
+# member names of the classes whose pickled layout changed in the former
+# releases
+_LEGACY_LAYOUTS = {
+    'Current': ('_current', '_dependency', '_isFull', '_window'),
+    'Latest': ('_dependency', '_isFull', '_latest', '_window'),
+}
+
+
+def _new_accumulator(cls):
+    return cls.__new__(cls)
+
+
+def _unpickle_former_layout(cls, checksum, state):
+    u"""
+    Loader of the pickles written by the former releases, which name the
+    unpickle function Cython generated for the class. The classes now pickle
+    themselves, their ``__setstate__`` takes the former member tuple.
+    """
+    obj = cls.__new__(cls)
+    if state is not None:
+        obj.__setstate__(state)
+    return obj
+
+
+def register_former_loaders(module_globals, dict layouts):
+    for name in layouts:
+        module_globals['__pyx_unpickle_' + name] = _unpickle_former_layout
+
+
+register_former_loaders(globals(), _LEGACY_LAYOUTS)
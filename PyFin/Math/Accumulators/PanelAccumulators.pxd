@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+u"""
+Created on 2026-10-18
+"""
+
+cimport numpy as np
+
+
+cdef class PanelStatefulValueHolder:
+
+    cdef public size_t _window
+    cdef public np.ndarray _buffer
+    cdef public np.ndarray _start
+    cdef public np.ndarray _count
+
+    cpdef size_t n_symbols(self)
+    cpdef resize(self, size_t n)
+    cpdef np.ndarray size(self)
+    cpdef np.ndarray isFull(self)
+    cdef int _check_length(self, double[:] values) except -1
+
+
+cdef class PanelMovingSum(PanelStatefulValueHolder):
+
+    cdef public np.ndarray _runningSum
+
+    cpdef push(self, double[:] values)
+    cpdef np.ndarray result(self)
+
+
+cdef class PanelMovingAverage(PanelMovingSum):
+
+    cpdef np.ndarray result(self)
+
+
+cdef class PanelMovingVariance(PanelStatefulValueHolder):
+
+    cdef public np.ndarray _runningSum
+    cdef public np.ndarray _runningSumSquare
+    cdef public int _isPop
+
+    cpdef push(self, double[:] values)
+    cpdef np.ndarray result(self)
+
+
+cdef class PanelMovingStandardDeviation(PanelMovingVariance):
+
+    cpdef np.ndarray result(self)
+
+
+cdef class PanelExtremeValueHolder(PanelStatefulValueHolder):
+
+    cdef public np.ndarray _values
+    cdef public np.ndarray _stamps
+    cdef public np.ndarray _head
+    cdef public np.ndarray _depth
+    cdef public np.ndarray _tick
+    cdef public double _sign
+
+    cpdef push(self, double[:] values)
+    cpdef np.ndarray result(self)
+
+
+cdef class PanelMovingMax(PanelExtremeValueHolder):
+    pass
+
+
+cdef class PanelMovingMin(PanelExtremeValueHolder):
+    pass
+
+
+cdef class PanelMovingCorrelation(PanelStatefulValueHolder):
+
+    cdef public np.ndarray _buffer_y
+    cdef public np.ndarray _runningSumLeft
+    cdef public np.ndarray _runningSumRight
+    cdef public np.ndarray _runningSumSquareLeft
+    cdef public np.ndarray _runningSumSquareRight
+    cdef public np.ndarray _runningSumCrossSquare
+
+    cpdef push(self, double[:] x, double[:] y)
+    cpdef np.ndarray result(self)
@@ -0,0 +1,424 @@
+# -*- coding: utf-8 -*-
+u"""
+Created on 2026-10-18
+"""
+
+import numpy as np
+cimport numpy as np
+cimport cython
+from libc.math cimport isnan
+from libc.math cimport sqrt
+from PyFin.Utilities.Asserts cimport require
+from PyFin.Utilities.Asserts cimport isClose
+from PyFin.Math.MathConstants cimport NAN
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline double _dump(double[:, ::1] buffer,
+                         long long[::1] start,
+                         long long[::1] count,
+                         size_t window,
+                         size_t i,
+                         double value,
+                         double default) nogil:
+    cdef long long pos
+    cdef double popout
+
+    if count[i] < window:
+        pos = (start[i] + count[i]) % window
+        buffer[pos, i] = value
+        count[i] += 1
+        return default
+    else:
+        pos = start[i]
+        popout = buffer[pos, i]
+        buffer[pos, i] = value
+        start[i] = (pos + 1) % window
+        return popout
+
+
+cdef class PanelStatefulValueHolder:
+    u"""
+    Base class of the panel accumulators. Every symbol owns one column of a
+    (window x symbols) ring buffer, so a whole cross section is updated by a
+    single call of ``push`` with an array of values.
+
+    Like the single symbol accumulators, nan values are skipped and leave the
+    corresponding symbol's window untouched.
+    """
+
+    _panels = ('_buffer',)
+    _columns = (('_start', 0), ('_count', 0))
+
+    def __init__(self, window, n=0):
+        if not isinstance(window, int):
+            raise ValueError("window parameter should be a positive int however {0} received"
+                             .format(window))
+        require(window > 0, ValueError, "window length should be greater than 0")
+        self._window = window
+        self._buffer = np.zeros((window, 0), dtype=float)
+        self._start = np.zeros(0, dtype=np.int64)
+        self._count = np.zeros(0, dtype=np.int64)
+        self.resize(n)
+
+    cpdef size_t n_symbols(self):
+        return self._count.shape[0]
+
+    cpdef resize(self, size_t n):
+        cdef size_t old_n = self.n_symbols()
+        cdef str name
+        cdef np.ndarray old_values
+        cdef np.ndarray new_values
+
+        require(n >= old_n, ValueError, "panel can't be shrunk from {0} to {1} symbols".format(old_n, n))
+        if n == old_n:
+            return
+
+        for name in self._panels:
+            old_values = getattr(self, name)
+            new_values = np.zeros((self._window, n), dtype=float)
+            new_values[:, :old_n] = old_values
+            setattr(self, name, new_values)
+
+        for name, fill in self._columns:
+            old_values = getattr(self, name)
+            new_values = np.full(n, fill, dtype=old_values.dtype)
+            new_values[:old_n] = old_values
+            setattr(self, name, new_values)
+
+    cpdef np.ndarray size(self):
+        return self._count.copy()
+
+    cpdef np.ndarray isFull(self):
+        return self._count >= self._window
+
+    cdef int _check_length(self, double[:] values) except -1:
+        return require(values.shape[0] == self.n_symbols(),
+                       ValueError,
+                       "length of pushed values ({0}) doesn't match the number of symbols ({1})"
+                       .format(values.shape[0], self.n_symbols()))
+
+
+cdef class PanelMovingSum(PanelStatefulValueHolder):
+
+    _columns = PanelStatefulValueHolder._columns + (('_runningSum', 0.),)
+
+    def __init__(self, window, n=0):
+        self._runningSum = np.zeros(0, dtype=float)
+        super(PanelMovingSum, self).__init__(window, n)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef push(self, double[:] values):
+        cdef size_t i
+        cdef double value
+        cdef double popout
+        cdef double[:, ::1] buffer = self._buffer
+        cdef long long[::1] start = self._start
+        cdef long long[::1] count = self._count
+        cdef double[::1] running_sum = self._runningSum
+
+        self._check_length(values)
+        for i in range(values.shape[0]):
+            value = values[i]
+            if isnan(value):
+                continue
+            popout = _dump(buffer, start, count, self._window, i, value, 0.)
+            running_sum[i] += value - popout
+
+    cpdef np.ndarray result(self):
+        return self._runningSum.copy()
+
+    def __str__(self):
+        return "\\mathrm{{PanelMSum}}({0})".format(self._window)
+
+
+cdef class PanelMovingAverage(PanelMovingSum):
+
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef np.ndarray result(self):
+        cdef size_t i
+        cdef long long[::1] count = self._count
+        cdef double[::1] running_sum = self._runningSum
+        cdef np.ndarray res = np.empty(count.shape[0], dtype=float)
+        cdef double[::1] res_view = res
+
+        for i in range(count.shape[0]):
+            if count[i]:
+                res_view[i] = running_sum[i] / count[i]
+            else:
+                res_view[i] = NAN
+        return res
+
+    def __str__(self):
+        return "\\mathrm{{PanelMA}}({0})".format(self._window)
+
+
+cdef class PanelMovingVariance(PanelStatefulValueHolder):
+
+    _columns = PanelStatefulValueHolder._columns + (('_runningSum', 0.), ('_runningSumSquare', 0.))
+
+    def __init__(self, window, n=0, isPopulation=False):
+        self._runningSum = np.zeros(0, dtype=float)
+        self._runningSumSquare = np.zeros(0, dtype=float)
+        super(PanelMovingVariance, self).__init__(window, n)
+        self._isPop = isPopulation
+        if not self._isPop:
+            require(window >= 2, ValueError, "sampling variance can't be calculated with window size < 2")
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef push(self, double[:] values):
+        cdef size_t i
+        cdef double value
+        cdef double popout
+        cdef double[:, ::1] buffer = self._buffer
+        cdef long long[::1] start = self._start
+        cdef long long[::1] count = self._count
+        cdef double[::1] running_sum = self._runningSum
+        cdef double[::1] running_sum_square = self._runningSumSquare
+
+        self._check_length(values)
+        for i in range(values.shape[0]):
+            value = values[i]
+            if isnan(value):
+                continue
+            popout = _dump(buffer, start, count, self._window, i, value, 0.)
+            running_sum[i] += value - popout
+            running_sum_square[i] += value * value - popout * popout
+
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef np.ndarray result(self):
+        cdef size_t i
+        cdef long long length
+        cdef double tmp
+        cdef long long[::1] count = self._count
+        cdef double[::1] running_sum = self._runningSum
+        cdef double[::1] running_sum_square = self._runningSumSquare
+        cdef np.ndarray res = np.empty(count.shape[0], dtype=float)
+        cdef double[::1] res_view = res
+
+        for i in range(count.shape[0]):
+            length = count[i]
+            if length == 0 or (not self._isPop and length < 2):
+                res_view[i] = NAN
+                continue
+            tmp = running_sum_square[i] - running_sum[i] * running_sum[i] / length
+            if self._isPop:
+                res_view[i] = tmp / length
+            else:
+                res_view[i] = tmp / (length - 1)
+        return res
+
+    def __str__(self):
+        return "\\mathrm{{PanelMVar}}({0}, {1})".format(self._window, self._isPop)
+
+
+cdef class PanelMovingStandardDeviation(PanelMovingVariance):
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef np.ndarray result(self):
+        cdef size_t i
+        cdef np.ndarray res = PanelMovingVariance.result(self)
+        cdef double[::1] res_view = res
+
+        for i in range(res_view.shape[0]):
+            res_view[i] = sqrt(res_view[i])
+        return res
+
+    def __str__(self):
+        return "\\mathrm{{PanelMStd}}({0}, {1})".format(self._window, self._isPop)
+
+
+cdef class PanelExtremeValueHolder(PanelStatefulValueHolder):
+    u"""
+    Running extreme of each column, kept by a monotonic deque per column: the
+    ``_values`` and ``_stamps`` panels hold the candidates of every column in
+    a ring starting at ``_head``, the front being the extreme. Each value is
+    appended and dropped at most once, so no window is ever rescanned, and
+    the values themselves need no ring buffer.
+    """
+
+    _panels = ('_values', '_stamps')
+    _columns = PanelStatefulValueHolder._columns + (('_head', 0), ('_depth', 0), ('_tick', 0))
+
+    def __init__(self, window, n=0, sign=1.):
+        self._values = np.zeros((window, 0), dtype=float)
+        self._stamps = np.zeros((window, 0), dtype=float)
+        self._head = np.zeros(0, dtype=np.int64)
+        self._depth = np.zeros(0, dtype=np.int64)
+        self._tick = np.zeros(0, dtype=np.int64)
+        self._sign = sign
+        super(PanelExtremeValueHolder, self).__init__(window, n)
+
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef push(self, double[:] values):
+        cdef size_t i
+        cdef long long window = self._window
+        cdef long long tail
+        cdef double value
+        cdef double sign = self._sign
+        cdef double[:, ::1] deque_values = self._values
+        cdef double[:, ::1] deque_stamps = self._stamps
+        cdef long long[::1] count = self._count
+        cdef long long[::1] head = self._head
+        cdef long long[::1] depth = self._depth
+        cdef long long[::1] tick = self._tick
+
+        self._check_length(values)
+        for i in range(values.shape[0]):
+            value = values[i]
+            if isnan(value):
+                continue
+            if count[i] < window:
+                count[i] += 1
+
+            # the front leaves with the value pushed window ticks ago
+            if depth[i] and <long long>deque_stamps[head[i], i] + window <= tick[i]:
+                head[i] = (head[i] + 1) % window
+                depth[i] -= 1
+
+            # values beaten by the new one can never be the extreme again
+            while depth[i]:
+                tail = (head[i] + depth[i] - 1) % window
+                if sign * deque_values[tail, i] > sign * value:
+                    break
+                depth[i] -= 1
+
+            tail = (head[i] + depth[i]) % window
+            deque_values[tail, i] = value
+            deque_stamps[tail, i] = tick[i]
+            depth[i] += 1
+            tick[i] += 1
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef np.ndarray result(self):
+        cdef size_t i
+        cdef double[:, ::1] deque_values = self._values
+        cdef long long[::1] head = self._head
+        cdef long long[::1] depth = self._depth
+        cdef np.ndarray res = np.empty(depth.shape[0], dtype=float)
+        cdef double[::1] res_view = res
+
+        for i in range(depth.shape[0]):
+            if depth[i]:
+                res_view[i] = deque_values[head[i], i]
+            else:
+                res_view[i] = NAN
+        return res
+
+
+cdef class PanelMovingMax(PanelExtremeValueHolder):
+
+    def __init__(self, window, n=0):
+        super(PanelMovingMax, self).__init__(window, n, 1.)
+
+    def __str__(self):
+        return "\\mathrm{{PanelMMax}}({0})".format(self._window)
+
+
+cdef class PanelMovingMin(PanelExtremeValueHolder):
+
+    def __init__(self, window, n=0):
+        super(PanelMovingMin, self).__init__(window, n, -1.)
+
+    def __str__(self):
+        return "\\mathrm{{PanelMMin}}({0})".format(self._window)
+
+
+cdef class PanelMovingCorrelation(PanelStatefulValueHolder):
+
+    _panels = PanelStatefulValueHolder._panels + ('_buffer_y',)
+    _columns = PanelStatefulValueHolder._columns + (('_runningSumLeft', 0.),
+                                                    ('_runningSumRight', 0.),
+                                                    ('_runningSumSquareLeft', 0.),
+                                                    ('_runningSumSquareRight', 0.),
+                                                    ('_runningSumCrossSquare', 0.))
+
+    def __init__(self, window, n=0):
+        self._buffer_y = np.zeros((window, 0), dtype=float)
+        self._runningSumLeft = np.zeros(0, dtype=float)
+        self._runningSumRight = np.zeros(0, dtype=float)
+        self._runningSumSquareLeft = np.zeros(0, dtype=float)
+        self._runningSumSquareRight = np.zeros(0, dtype=float)
+        self._runningSumCrossSquare = np.zeros(0, dtype=float)
+        super(PanelMovingCorrelation, self).__init__(window, n)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef push(self, double[:] x, double[:] y):
+        cdef size_t i
+        cdef long long pos
+        cdef double head_left
+        cdef double head_right
+        cdef double[:, ::1] buffer = self._buffer
+        cdef double[:, ::1] buffer_y = self._buffer_y
+        cdef long long[::1] start = self._start
+        cdef long long[::1] count = self._count
+        cdef double[::1] sum_left = self._runningSumLeft
+        cdef double[::1] sum_right = self._runningSumRight
+        cdef double[::1] sum_square_left = self._runningSumSquareLeft
+        cdef double[::1] sum_square_right = self._runningSumSquareRight
+        cdef double[::1] sum_cross = self._runningSumCrossSquare
+
+        self._check_length(x)
+        self._check_length(y)
+        for i in range(x.shape[0]):
+            if isnan(x[i]) or isnan(y[i]):
+                continue
+            if count[i] < self._window:
+                pos = (start[i] + count[i]) % self._window
+                head_right = 0.
+            else:
+                pos = start[i]
+                head_right = buffer_y[pos, i]
+            buffer_y[pos, i] = y[i]
+            head_left = _dump(buffer, start, count, self._window, i, x[i], 0.)
+
+            sum_left[i] += x[i] - head_left
+            sum_right[i] += y[i] - head_right
+            sum_square_left[i] += x[i] * x[i] - head_left * head_left
+            sum_square_right[i] += y[i] * y[i] - head_right * head_right
+            sum_cross[i] += x[i] * y[i] - head_left * head_right
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef np.ndarray result(self):
+        cdef size_t i
+        cdef long long n
+        cdef double nominator
+        cdef double denominator
+        cdef long long[::1] count = self._count
+        cdef double[::1] sum_left = self._runningSumLeft
+        cdef double[::1] sum_right = self._runningSumRight
+        cdef double[::1] sum_square_left = self._runningSumSquareLeft
+        cdef double[::1] sum_square_right = self._runningSumSquareRight
+        cdef double[::1] sum_cross = self._runningSumCrossSquare
+        cdef np.ndarray res = np.empty(count.shape[0], dtype=float)
+        cdef double[::1] res_view = res
+
+        for i in range(count.shape[0]):
+            n = count[i]
+            if n >= 2:
+                nominator = n * sum_cross[i] - sum_left[i] * sum_right[i]
+                denominator = (n * sum_square_left[i] - sum_left[i] * sum_left[i]) \
+                              * (n * sum_square_right[i] - sum_right[i] * sum_right[i])
+                if not isClose(denominator, 0.):
+                    res_view[i] = nominator / sqrt(denominator)
+                else:
+                    res_view[i] = 0.0
+            else:
+                res_view[i] = NAN
+        return res
+
+    def __str__(self):
+        return "\\mathrm{{PanelMCorr}}({0})".format(self._window)
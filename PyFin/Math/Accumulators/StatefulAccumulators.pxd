@@ -9,7 +9,10 @@ cimport numpy as np
 from PyFin.Math.Accumulators.impl cimport Deque
 from PyFin.Math.Accumulators.impl cimport DiffDeque
 from PyFin.Math.Accumulators.impl cimport UniqueDiffDeque
+from PyFin.Math.Accumulators.impl cimport SkipList
+from PyFin.Math.Accumulators.impl cimport MonotonicDeque
 from PyFin.Math.Accumulators.IAccumulators cimport Accumulator
+from PyFin.Math.Accumulators.IAccumulators cimport RowBinding
 
 
 cdef class StatefulValueHolder(Accumulator):
@@ -23,17 +26,23 @@ cdef class StatefulValueHolder(Accumulator):
 cdef class TimeStatefulValueHolder(Accumulator):
 
     cdef public DiffDeque _deque
+    cdef RowBinding _binding
+    cdef Py_ssize_t _stamp_column
 
     cpdef size_t size(self)
     cpdef bint isFull(self)
+    cdef int _stamp(self, dict data) except? -1
 
 
 cdef class TimeStatefulUniqueValueHolder(Accumulator):
 
     cdef public UniqueDiffDeque _deque
+    cdef RowBinding _binding
+    cdef Py_ssize_t _stamp_column
 
     cpdef size_t size(self)
     cpdef bint isFull(self)
+    cdef int _stamp(self, dict data) except? -1
 
 
 cdef class Shift(StatefulValueHolder):
@@ -43,6 +52,7 @@ cdef class Shift(StatefulValueHolder):
 
     cpdef int lag(self)
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -54,6 +64,7 @@ cdef class Delta(StatefulValueHolder):
 
     cpdef int lag(self)
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -61,39 +72,53 @@ cdef class SingleValuedValueHolder(StatefulValueHolder):
 
     cdef public Accumulator _x
 
+    cpdef bind(self, RowBinding binding)
+
 
 
 cdef class TimeSingleValuedValueHolder(TimeStatefulValueHolder):
 
     cdef public Accumulator _x
 
+    cpdef bind(self, RowBinding binding)
+
 
 cdef class TimeSingleValuedUniqueValueHolder(TimeStatefulUniqueValueHolder):
 
     cdef public Accumulator _x
 
+    cpdef bind(self, RowBinding binding)
+
 
 cdef class SortedValueHolder(SingleValuedValueHolder):
 
-    cdef list _sortedArray
+    cdef SkipList _sortedArray
     cdef double _cur_pos
     cpdef push(self, dict data)
 
-cdef class MovingMax(SortedValueHolder):
+
+cdef class MonotonicValueHolder(SingleValuedValueHolder):
+
+    cdef MonotonicDeque _extremes
+    cpdef push(self, dict data)
+
+
+cdef class MovingMax(MonotonicValueHolder):
 
     cpdef double result(self)
 
-cdef class MovingArgMax(SortedValueHolder):
+
+cdef class MovingArgMax(MonotonicValueHolder):
 
     cpdef double result(self)
 
 
-cdef class MovingMin(SortedValueHolder):
+cdef class MovingMin(MonotonicValueHolder):
 
     cpdef double result(self)
 
 
-cdef class MovingArgMin(SortedValueHolder):
+cdef class MovingArgMin(MonotonicValueHolder):
 
     cpdef double result(self)
 
@@ -209,6 +234,7 @@ cdef class MovingPositiveDifferenceAverage(SingleValuedValueHolder):
     cdef public MovingAverage _runningAverage
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -217,6 +243,7 @@ cdef class MovingNegativeDifferenceAverage(SingleValuedValueHolder):
     cdef public MovingAverage _runningAverage
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -226,6 +253,7 @@ cdef class MovingRSI(SingleValuedValueHolder):
     cdef public MovingNegativeDifferenceAverage _negDiffAvg
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -307,6 +335,7 @@ cdef class MovingCorrelation(StatefulValueHolder):
     cdef Deque _deque_y
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -324,6 +353,7 @@ cdef class MACD(Accumulator):
     cdef public Accumulator _long_average
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -344,6 +374,7 @@ cdef class MovingSharp(StatefulValueHolder):
     cdef Deque _deque_y
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -356,6 +387,7 @@ cdef class MovingSortino(StatefulValueHolder):
     cdef Deque _deque_y
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -367,6 +399,7 @@ cdef class MovingDrawdown(StatefulValueHolder):
     cdef Accumulator _x
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -377,6 +410,7 @@ cdef class MovingMaxDrawdown(StatefulValueHolder):
     cdef Accumulator _x
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -391,5 +425,6 @@ cdef class MovingResidue(StatefulValueHolder):
     cdef Deque _deque_y
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
     cpdef bint isFull(self)
@@ -6,7 +6,6 @@ Created on 2017-2-8
 """
 
 import copy
-import bisect
 import six
 import numpy as np
 cimport numpy as np
@@ -16,8 +15,10 @@ from libc.math cimport log
 from libc.math cimport sqrt
 from copy import deepcopy
 from PyFin.Math.Accumulators.IAccumulators cimport Accumulator
+from PyFin.Math.Accumulators.IAccumulators cimport RowBinding
 from PyFin.Math.Accumulators.IAccumulators cimport Latest
 from PyFin.Math.Accumulators.IAccumulators cimport build_holder
+from PyFin.Math.Accumulators.IAccumulators import register_former_loaders
 from PyFin.Math.Accumulators.StatelessAccumulators cimport PositivePart
 from PyFin.Math.Accumulators.StatelessAccumulators cimport NegativePart
 from PyFin.Math.Accumulators.StatelessAccumulators cimport XAverage
@@ -28,6 +29,8 @@ from PyFin.Math.udfs cimport consecutive_int_sum
 from PyFin.Math.Accumulators.impl cimport Deque
 from PyFin.Math.Accumulators.impl cimport DiffDeque
 from PyFin.Math.Accumulators.impl cimport UniqueDiffDeque
+from PyFin.Math.Accumulators.impl cimport SkipList
+from PyFin.Math.Accumulators.impl cimport MonotonicDeque
 from PyFin.Math.MathConstants cimport NAN
 
 
@@ -73,6 +76,8 @@ cdef class TimeStatefulValueHolder(Accumulator):
         super(TimeStatefulValueHolder, self).__init__()
         self._deque = DiffDeque(_parse(window), closed)
         self._isFull = False
+        self._binding = None
+        self._stamp_column = -1
 
     cpdef size_t size(self):
         return self._deque.size()
@@ -80,12 +85,43 @@ cdef class TimeStatefulValueHolder(Accumulator):
     cpdef bint isFull(self):
         return self._isFull
 
+    cdef int _stamp(self, dict data) except? -1:
+        if self._binding is None:
+            return data["stamp"]
+        if self._stamp_column < 0:
+            raise KeyError("stamp")
+        return <int>self._binding.row[self._stamp_column]
+
+    def __reduce__(self):
+        return self._reduce_members()
+
+    def __setstate__(self, state):
+        self._restore_members(state, _LEGACY_LAYOUTS)
+
+    def _members(self):
+        members = super(TimeStatefulValueHolder, self)._members()
+        members.update(_deque=self._deque, _binding=self._binding, _stamp_column=self._stamp_column)
+        return members
+
+    def _set_members(self, dict members):
+        super(TimeStatefulValueHolder, self)._set_members(members)
+        self._deque = members['_deque']
+        self._binding = members['_binding']
+        self._stamp_column = members['_stamp_column']
+
+    def _upgrade_members(self, dict members):
+        members.setdefault('_binding', None)
+        members.setdefault('_stamp_column', -1)
+        return members
+
 
 cdef class TimeStatefulUniqueValueHolder(Accumulator):
     def __init__(self, window, closed):
         super(TimeStatefulUniqueValueHolder, self).__init__()
         self._deque = UniqueDiffDeque(_parse(window), closed)
         self._isFull = False
+        self._binding = None
+        self._stamp_column = -1
 
     cpdef size_t size(self):
         return self._deque.size()
@@ -93,6 +129,35 @@ cdef class TimeStatefulUniqueValueHolder(Accumulator):
     cpdef bint isFull(self):
         return self._isFull
 
+    cdef int _stamp(self, dict data) except? -1:
+        if self._binding is None:
+            return data["stamp"]
+        if self._stamp_column < 0:
+            raise KeyError("stamp")
+        return <int>self._binding.row[self._stamp_column]
+
+    def __reduce__(self):
+        return self._reduce_members()
+
+    def __setstate__(self, state):
+        self._restore_members(state, _LEGACY_LAYOUTS)
+
+    def _members(self):
+        members = super(TimeStatefulUniqueValueHolder, self)._members()
+        members.update(_deque=self._deque, _binding=self._binding, _stamp_column=self._stamp_column)
+        return members
+
+    def _set_members(self, dict members):
+        super(TimeStatefulUniqueValueHolder, self)._set_members(members)
+        self._deque = members['_deque']
+        self._binding = members['_binding']
+        self._stamp_column = members['_stamp_column']
+
+    def _upgrade_members(self, dict members):
+        members.setdefault('_binding', None)
+        members.setdefault('_stamp_column', -1)
+        return members
+
 
 cdef class Shift(StatefulValueHolder):
 
@@ -109,6 +174,9 @@ cdef class Shift(StatefulValueHolder):
         self._popout = self._deque.dump(self._x.result())
         self._isFull = self._isFull or self._deque.isFull()
 
+    cpdef bind(self, RowBinding binding):
+        self._x.bind(binding)
+
     cpdef double result(self):
         return self._popout
 
@@ -136,6 +204,9 @@ cdef class Delta(StatefulValueHolder):
         self._popout = self._deque.dump(self._current)
         self._isFull = self._isFull or self._deque.isFull()
 
+    cpdef bind(self, RowBinding binding):
+        self._x.bind(binding)
+
     cpdef double result(self):
         if self._isFull:
             return self._current - self._popout
@@ -156,6 +227,9 @@ cdef class SingleValuedValueHolder(StatefulValueHolder):
         self._window = self._x.window + window
         self._dependency = deepcopy(self._x.dependency)
 
+    cpdef bind(self, RowBinding binding):
+        self._x.bind(binding)
+
 
 cdef class TimeSingleValuedValueHolder(TimeStatefulValueHolder):
     def __init__(self, window, x, closed):
@@ -165,6 +239,20 @@ cdef class TimeSingleValuedValueHolder(TimeStatefulValueHolder):
         self._dependency = deepcopy(self._x.dependency)
         self._dependency = list(set(self._x.dependency + ["stamp"]))
 
+    cpdef bind(self, RowBinding binding):
+        self._binding = binding
+        self._stamp_column = binding.position("stamp") if binding is not None else -1
+        self._x.bind(binding)
+
+    def _members(self):
+        members = super(TimeSingleValuedValueHolder, self)._members()
+        members['_x'] = self._x
+        return members
+
+    def _set_members(self, dict members):
+        super(TimeSingleValuedValueHolder, self)._set_members(members)
+        self._x = members['_x']
+
 
 cdef class TimeSingleValuedUniqueValueHolder(TimeStatefulUniqueValueHolder):
     def __init__(self, window, x, closed):
@@ -174,17 +262,30 @@ cdef class TimeSingleValuedUniqueValueHolder(TimeStatefulUniqueValueHolder):
         self._dependency = deepcopy(self._x.dependency)
         self._dependency = list(set(self._x.dependency + ["stamp"]))
 
+    cpdef bind(self, RowBinding binding):
+        self._binding = binding
+        self._stamp_column = binding.position("stamp") if binding is not None else -1
+        self._x.bind(binding)
+
+    def _members(self):
+        members = super(TimeSingleValuedUniqueValueHolder, self)._members()
+        members['_x'] = self._x
+        return members
+
+    def _set_members(self, dict members):
+        super(TimeSingleValuedUniqueValueHolder, self)._set_members(members)
+        self._x = members['_x']
+
 
 cdef class SortedValueHolder(SingleValuedValueHolder):
 
     def __init__(self, window, x):
         super(SortedValueHolder, self).__init__(window, x)
-        self._sortedArray = []
+        self._sortedArray = SkipList(window)
         self._cur_pos = NAN
 
     cpdef push(self, dict data):
         cdef double popout
-        cdef int delPos
 
         self._x.push(data)
         cdef double value = self._x.result()
@@ -192,78 +293,130 @@ cdef class SortedValueHolder(SingleValuedValueHolder):
             return NAN
         if self._deque.isFull():
             popout = self._deque.dump(value)
-            delPos = bisect.bisect_left(self._sortedArray, popout)
-            del self._sortedArray[delPos]
-            self._cur_pos = bisect.bisect_left(self._sortedArray, value)
-            self._sortedArray.insert(int(self._cur_pos), value)
+            self._sortedArray.remove(popout)
         else:
             self._deque.dump(value)
-            self._cur_pos = bisect.bisect_left(self._sortedArray, value)
-            self._sortedArray.insert(int(self._cur_pos), value)
+        self._cur_pos = self._sortedArray.insert(value)
         self._isFull = self._isFull or self._deque.isFull()
 
+    def _upgrade_members(self, dict members):
+        cdef Deque deque = members['_deque']
+        cdef SkipList sorted_array
+        if isinstance(members['_sortedArray'], list):
+            sorted_array = SkipList(deque.window)
+            for value in members['_sortedArray']:
+                sorted_array.insert(value)
+            members['_sortedArray'] = sorted_array
+        return members
+
+    def __reduce__(self):
+        return self._reduce_members()
+
+    def __setstate__(self, state):
+        self._restore_members(state, _LEGACY_LAYOUTS)
+
+    def _members(self):
+        members = super(SortedValueHolder, self)._members()
+        members.update(_deque=self._deque, _x=self._x, _sortedArray=self._sortedArray, _cur_pos=self._cur_pos)
+        return members
 
-cdef class MovingMax(SortedValueHolder):
+    def _set_members(self, dict members):
+        super(SortedValueHolder, self)._set_members(members)
+        self._deque = members['_deque']
+        self._x = members['_x']
+        self._sortedArray = members['_sortedArray']
+        self._cur_pos = members['_cur_pos']
+
+
+cdef class MonotonicValueHolder(SingleValuedValueHolder):
+
+    def __init__(self, window, x, is_max):
+        super(MonotonicValueHolder, self).__init__(window, x)
+        self._extremes = MonotonicDeque(window, is_max)
+
+    cpdef push(self, dict data):
+        self._x.push(data)
+        cdef double value = self._x.result()
+        if isnan(value):
+            return NAN
+        self._deque.dump(value)
+        self._extremes.dump(value)
+        self._isFull = self._isFull or self._deque.isFull()
+
+    def _upgrade_members(self, dict members):
+        cdef Deque deque = members['_deque']
+        cdef MonotonicDeque extremes
+        cdef size_t i
+        if '_extremes' not in members:
+            # replay the window so that the stamps match the ring slots
+            extremes = MonotonicDeque(deque.window, isinstance(self, (MovingMax, MovingArgMax)))
+            extremes.tick = deque.start
+            for i in range(deque.count):
+                extremes.dump(deque[i])
+            members['_extremes'] = extremes
+            del members['_cur_pos']
+            del members['_sortedArray']
+        return members
+
+    def __reduce__(self):
+        return self._reduce_members()
+
+    def __setstate__(self, state):
+        self._restore_members(state, _LEGACY_LAYOUTS)
+
+    def _members(self):
+        members = super(MonotonicValueHolder, self)._members()
+        members.update(_deque=self._deque, _x=self._x, _extremes=self._extremes)
+        return members
+
+    def _set_members(self, dict members):
+        super(MonotonicValueHolder, self)._set_members(members)
+        self._deque = members['_deque']
+        self._x = members['_x']
+        self._extremes = members['_extremes']
+
+
+cdef class MovingMax(MonotonicValueHolder):
     def __init__(self, window, x):
-        super(MovingMax, self).__init__(window, x)
+        super(MovingMax, self).__init__(window, x, True)
 
     cpdef double result(self):
-        if self._sortedArray:
-            return self._sortedArray[-1]
-        else:
-            return NAN
+        return self._extremes.front()
 
     def __str__(self):
         return "\\mathrm{{MMax}}({0}, {1})".format(self._window, str(self._x))
 
 
-cdef class MovingArgMax(SortedValueHolder):
+cdef class MovingArgMax(MonotonicValueHolder):
 
     def __init__(self, window, x):
-        super(MovingArgMax, self).__init__(window, x)
+        super(MovingArgMax, self).__init__(window, x, True)
 
     cpdef double result(self):
-        cdef double currMax
-        cdef double idx
-        if self._sortedArray:
-            currMax = self._sortedArray[-1]
-            idx = self._deque.idx(currMax)
-            return self.size() - idx - 1
-        else:
-            return NAN
+        return self._extremes.front_age()
 
     def __str__(self):
         return "\\mathrm{{MArgMax}}({0}, {1})".format(self._window, str(self._x))
 
 
-cdef class MovingMin(SortedValueHolder):
+cdef class MovingMin(MonotonicValueHolder):
     def __init__(self, window, x):
-        super(MovingMin, self).__init__(window, x)
+        super(MovingMin, self).__init__(window, x, False)
 
     cpdef double result(self):
-        if self._sortedArray:
-            return self._sortedArray[0]
-        else:
-            return NAN
+        return self._extremes.front()
 
     def __str__(self):
         return "\\mathrm{{MMin}}({0}, {1})".format(self._window, str(self._x))
 
 
-cdef class MovingArgMin(SortedValueHolder):
+cdef class MovingArgMin(MonotonicValueHolder):
 
     def __init__(self, window, x):
-        super(MovingArgMin, self).__init__(window, x)
+        super(MovingArgMin, self).__init__(window, x, False)
 
     cpdef double result(self):
-        cdef double currMax
-        cdef double idx
-        if self._sortedArray:
-            currMin = self._sortedArray[0]
-            idx = self._deque.idx(currMin)
-            return self.size() - idx - 1
-        else:
-            return NAN
+        return self._extremes.front_age()
 
     def __str__(self):
         return "\\mathrm{{MArgMin}}({0}, {1})".format(self._window, str(self._x))
@@ -286,7 +439,7 @@ cdef class MovingQuantile(SortedValueHolder):
 
     @cython.cdivision(True)
     cpdef double result(self):
-        cdef size_t n = len(self._sortedArray)
+        cdef size_t n = self._sortedArray.size()
         if n > 1:
             return self._cur_pos / (n - 1)
         else:
@@ -331,20 +484,24 @@ cdef class TimeMovingCount(TimeSingleValuedValueHolder):
         super(TimeMovingCount, self).__init__(window, x, closed)
         self._count = 0
 
+    def _members(self):
+        members = super(TimeMovingCount, self)._members()
+        members.update(_count=self._count)
+        return members
+
+    def _set_members(self, dict members):
+        super(TimeMovingCount, self)._set_members(members)
+        self._count = members['_count']
+
     cpdef push(self, dict data):
-        cdef int added
-        cdef list popouts
-        cdef size_t previous_size
+        cdef size_t popped
 
         self._x.push(data)
         cdef double value = self._x.result()
         if isnan(value):
             return NAN
-        previous_size = self._deque.size()
-        popouts = self._deque.dump(value, data["stamp"], NAN)
-        added = self._deque.size() - previous_size
-
-        self._count += added
+        popped = self._deque.dump(value, self._stamp(data))
+        self._count += <int> self._deque.is_new_added - <int> popped
         self._isFull = self._isFull or self._deque.isFull()
 
     cpdef double result(self):
@@ -398,10 +555,17 @@ cdef class TimeMovingCountUnique(TimeSingleValuedUniqueValueHolder):
         super(TimeMovingCountUnique, self).__init__(window, x, closed)
         self._count = 0
 
+    def _members(self):
+        members = super(TimeMovingCountUnique, self)._members()
+        members.update(_count=self._count)
+        return members
+
+    def _set_members(self, dict members):
+        super(TimeMovingCountUnique, self)._set_members(members)
+        self._count = members['_count']
+
     cpdef push(self, dict data):
-        cdef int added
         cdef size_t previous_size
-        cdef list popouts
 
         self._x.push(data)
         cdef double value = self._x.result()
@@ -409,10 +573,8 @@ cdef class TimeMovingCountUnique(TimeSingleValuedUniqueValueHolder):
             return NAN
 
         previous_size = self._deque.size()
-        popouts = self._deque.dump(value, data["stamp"], NAN)
-        added = self._deque.size() - previous_size
-
-        self._count += added
+        self._deque.dump(value, self._stamp(data))
+        self._count += <int> self._deque.size() - <int> previous_size
         self._isFull = self._isFull or self._deque.isFull()
 
     cpdef double result(self):
@@ -516,18 +678,25 @@ cdef class TimeMovingSum(TimeSingleValuedValueHolder):
         super(TimeMovingSum, self).__init__(window, x, closed)
         self._runningSum = 0.0
 
+    def _members(self):
+        members = super(TimeMovingSum, self)._members()
+        members.update(_runningSum=self._runningSum)
+        return members
+
+    def _set_members(self, dict members):
+        super(TimeMovingSum, self)._set_members(members)
+        self._runningSum = members['_runningSum']
+
     cpdef push(self, dict data):
-        cdef list popouts
 
         self._x.push(data)
         cdef double value = self._x.result()
         if isnan(value):
             return NAN
-        popouts = self._deque.dump(value, data["stamp"], 0.)
+        self._deque.dump(value, self._stamp(data))
         if self._deque.is_new_added:
             self._runningSum += self._deque.back()
-        for p in popouts:
-            self._runningSum -= p
+        self._runningSum -= self._deque.popped_sum
         self._isFull = self._isFull or self._deque.isFull()
 
     cpdef double result(self):
@@ -574,19 +743,25 @@ cdef class TimeMovingAverage(TimeSingleValuedValueHolder):
         super(TimeMovingAverage, self).__init__(window, x, closed)
         self._runningSum = 0.0
 
+    def _members(self):
+        members = super(TimeMovingAverage, self)._members()
+        members.update(_runningSum=self._runningSum)
+        return members
+
+    def _set_members(self, dict members):
+        super(TimeMovingAverage, self)._set_members(members)
+        self._runningSum = members['_runningSum']
+
     cpdef push(self, dict data):
-        cdef list popouts
 
         self._x.push(data)
         cdef double value = self._x.result()
         if isnan(value):
             return NAN
-        popouts = self._deque.dump(value, data["stamp"], 0.)
-
+        self._deque.dump(value, self._stamp(data))
         if self._deque.is_new_added:
             self._runningSum += self._deque.back()
-        for p in popouts:
-            self._runningSum -= p
+        self._runningSum -= self._deque.popped_sum
         self._isFull = self._isFull or self._deque.isFull()
 
     @cython.cdivision(True)
@@ -686,6 +861,9 @@ cdef class MovingPositiveDifferenceAverage(SingleValuedValueHolder):
         self._runningAverage.push(data)
         self._isFull = self._isFull or self._runningAverage.isFull()
 
+    cpdef bind(self, RowBinding binding):
+        self._runningAverage.bind(binding)
+
     cpdef double result(self):
         return self._runningAverage.result()
 
@@ -704,6 +882,9 @@ cdef class MovingNegativeDifferenceAverage(SingleValuedValueHolder):
         self._runningAverage.push(data)
         self._isFull = self._isFull or self._runningAverage.isFull()
 
+    cpdef bind(self, RowBinding binding):
+        self._runningAverage.bind(binding)
+
     cpdef double result(self):
         return self._runningAverage.result()
 
@@ -723,6 +904,10 @@ cdef class MovingRSI(SingleValuedValueHolder):
         self._negDiffAvg.push(data)
         self._isFull = self._isFull or (self._posDiffAvg.isFull() and self._negDiffAvg.isFull())
 
+    cpdef bind(self, RowBinding binding):
+        self._posDiffAvg.bind(binding)
+        self._negDiffAvg.bind(binding)
+
     @cython.cdivision(True)
     cpdef double result(self):
         cdef double nominator = self._posDiffAvg.result()
@@ -871,22 +1056,31 @@ cdef class TimeMovingStandardDeviation(TimeSingleValuedValueHolder):
         if not self._isPop:
             require(window >= 2, ValueError, "sampling standard deviation can't be calculated with window size < 2")
 
+    def _members(self):
+        members = super(TimeMovingStandardDeviation, self)._members()
+        members.update(_runningSum=self._runningSum, _runningSumSquare=self._runningSumSquare, _isPop=self._isPop)
+        return members
+
+    def _set_members(self, dict members):
+        super(TimeMovingStandardDeviation, self)._set_members(members)
+        self._runningSum = members['_runningSum']
+        self._runningSumSquare = members['_runningSumSquare']
+        self._isPop = members['_isPop']
+
     cpdef push(self, dict data):
-        cdef list popouts
         cdef double last_value
 
         self._x.push(data)
         cdef double value = self._x.result()
         if isnan(value):
             return NAN
-        popouts = self._deque.dump(value, data["stamp"], 0.)
+        self._deque.dump(value, self._stamp(data))
         if self._deque.is_new_added:
             last_value = self._deque.back()
             self._runningSum += last_value
             self._runningSumSquare += last_value * last_value
-        for p in popouts:
-            self._runningSum -= p
-            self._runningSumSquare -= p * p
+        self._runningSum -= self._deque.popped_sum
+        self._runningSumSquare -= self._deque.popped_sum_square
         self._isFull = self._isFull or self._deque.isFull()
 
     @cython.cdivision(True)
@@ -1062,6 +1256,10 @@ cdef class MovingCorrelation(StatefulValueHolder):
         self._runningSumCrossSquare = self._runningSumCrossSquare - headLeft * headRight + x * y
         self._isFull = self._isFull or self._deque.isFull()
 
+    cpdef bind(self, RowBinding binding):
+        self._x.bind(binding)
+        self._y.bind(binding)
+
     cpdef double result(self):
         cdef size_t n = self.size()
         cdef double nominator
@@ -1123,6 +1321,10 @@ cdef class MACD(Accumulator):
         self._long_average.push(data)
         self._isFull = self._isFull or (self._short_average.isFull() and self._long_average.isFull())
 
+    cpdef bind(self, RowBinding binding):
+        self._short_average.bind(binding)
+        self._long_average.bind(binding)
+
     cpdef double result(self):
         return self._short_average.result() - self._long_average.result()
 
@@ -1186,6 +1388,10 @@ cdef class MovingSharp(StatefulValueHolder):
         self._var.push(new_data)
         self._isFull = self._isFull or (self._mean.isFull() and self._var.isFull())
 
+    cpdef bind(self, RowBinding binding):
+        self._x.bind(binding)
+        self._y.bind(binding)
+
     @cython.cdivision(True)
     cpdef double result(self):
         cdef double tmp = self._var.result()
@@ -1227,6 +1433,10 @@ cdef class MovingSortino(StatefulValueHolder):
         self._negativeVar.push(new_data)
         self._isFull = self._isFull or (self._negativeVar.isFull() and self._mean.isFull())
 
+    cpdef bind(self, RowBinding binding):
+        self._x.bind(binding)
+        self._y.bind(binding)
+
     @cython.cdivision(True)
     cpdef double result(self):
         cdef double tmp = self._negativeVar.result()
@@ -1258,6 +1468,9 @@ cdef class MovingDrawdown(StatefulValueHolder):
         self._currentMax = self._maxer.result()
         self._isFull = self._isFull or self._maxer.isFull()
 
+    cpdef bind(self, RowBinding binding):
+        self._x.bind(binding)
+
     cpdef double result(self):
         return self._runningCum - self._currentMax
 
@@ -1283,6 +1496,9 @@ cdef class MovingMaxDrawdown(StatefulValueHolder):
         self._deque.dump(draw_down)
         self._isFull = self._isFull or self._deque.isFull()
 
+    cpdef bind(self, RowBinding binding):
+        self._x.bind(binding)
+
     cpdef double result(self):
         return self._minimer.result()
 
@@ -1325,6 +1541,10 @@ cdef class MovingResidue(StatefulValueHolder):
         self._lastx = x
         self._lasty = y
 
+    cpdef bind(self, RowBinding binding):
+        self._x.bind(binding)
+        self._y.bind(binding)
+
     cpdef bint isFull(self):
         return self._deque.isFull()
 
@@ -1336,3 +1556,28 @@ cdef class MovingResidue(StatefulValueHolder):
     def __str__(self):
         return "\\mathrm{{Res}}({0}, {1}, {2})".format(self._window, str(self._x), str(self._y))
 
+
+# MovingMax and co. used to be sorted holders too
+_SORTED_LAYOUT = ('_cur_pos', '_dependency', '_deque', '_isFull', '_sortedArray', '_window', '_x')
+_TIME_LAYOUT = ('_dependency', '_deque', '_isFull', '_window')
+
+_LEGACY_LAYOUTS = {
+    'MovingMax': _SORTED_LAYOUT,
+    'MovingMin': _SORTED_LAYOUT,
+    'MovingArgMax': _SORTED_LAYOUT,
+    'MovingArgMin': _SORTED_LAYOUT,
+    'SortedValueHolder': _SORTED_LAYOUT,
+    'MovingRank': _SORTED_LAYOUT,
+    'MovingQuantile': _SORTED_LAYOUT,
+    'TimeStatefulValueHolder': _TIME_LAYOUT,
+    'TimeStatefulUniqueValueHolder': _TIME_LAYOUT,
+    'TimeSingleValuedValueHolder': _TIME_LAYOUT + ('_x',),
+    'TimeSingleValuedUniqueValueHolder': _TIME_LAYOUT + ('_x',),
+    'TimeMovingCount': _TIME_LAYOUT + ('_count', '_x'),
+    'TimeMovingCountUnique': _TIME_LAYOUT + ('_count', '_x'),
+    'TimeMovingSum': _TIME_LAYOUT + ('_runningSum', '_x'),
+    'TimeMovingAverage': _TIME_LAYOUT + ('_runningSum', '_x'),
+    'TimeMovingStandardDeviation': _TIME_LAYOUT + ('_isPop', '_runningSum', '_runningSumSquare', '_x'),
+}
+
+register_former_loaders(globals(), _LEGACY_LAYOUTS)
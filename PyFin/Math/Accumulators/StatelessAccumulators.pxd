@@ -7,6 +7,7 @@ Created on 2017-2-10
 
 cimport numpy as np
 from PyFin.Math.Accumulators.IAccumulators cimport Accumulator
+from PyFin.Math.Accumulators.IAccumulators cimport RowBinding
 
 
 cdef class Diff(Accumulator):
@@ -16,6 +17,7 @@ cdef class Diff(Accumulator):
     cdef Accumulator _inner
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -27,6 +29,7 @@ cdef class SimpleReturn(Accumulator):
     cdef Accumulator _inner
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -38,6 +41,7 @@ cdef class LogReturn(Accumulator):
     cdef Accumulator _inner
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -47,6 +51,7 @@ cdef class PositivePart(Accumulator):
     cdef Accumulator _inner
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -56,6 +61,7 @@ cdef class NegativePart(Accumulator):
     cdef Accumulator _inner
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -66,6 +72,7 @@ cdef class Max(Accumulator):
     cdef Accumulator _inner
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -76,6 +83,7 @@ cdef class Maximum(Accumulator):
     cdef Accumulator _y
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -86,6 +94,7 @@ cdef class Min(Accumulator):
     cdef Accumulator _inner
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -97,6 +106,7 @@ cdef class Minimum(Accumulator):
     cdef Accumulator _y
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -107,6 +117,7 @@ cdef class Sum(Accumulator):
     cdef Accumulator _inner
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -117,6 +128,7 @@ cdef class Average(Accumulator):
     cdef Accumulator _inner
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -128,6 +140,7 @@ cdef class XAverage(Accumulator):
     cdef Accumulator _inner
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -140,6 +153,7 @@ cdef class Variance(Accumulator):
     cdef Accumulator _inner
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
 
 
@@ -149,4 +163,5 @@ cdef class Product(Accumulator):
     cdef Accumulator _inner
 
     cpdef push(self, dict data)
+    cpdef bind(self, RowBinding binding)
     cpdef double result(self)
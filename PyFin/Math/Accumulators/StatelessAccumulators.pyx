@@ -18,6 +18,7 @@ from libc.math cimport fmin
 from libc.math cimport sqrt
 from PyFin.Math.Accumulators.IAccumulators import build_holder
 from PyFin.Math.Accumulators.IAccumulators cimport Accumulator
+from PyFin.Math.Accumulators.IAccumulators cimport RowBinding
 from PyFin.Math.Accumulators.IAccumulators cimport Pow
 from PyFin.Math.Accumulators.IAccumulators cimport Latest
 from PyFin.Math.MathConstants cimport NAN
@@ -45,6 +46,9 @@ cdef class Diff(Accumulator):
         self._previous = self._curr
         self._curr = value
 
+    cpdef bind(self, RowBinding binding):
+        self._inner.bind(binding)
+
     cpdef double result(self):
         return self._curr - self._previous
 
@@ -74,6 +78,9 @@ cdef class SimpleReturn(Accumulator):
         self._previous = self._curr
         self._curr = value
 
+    cpdef bind(self, RowBinding binding):
+        self._inner.bind(binding)
+
     @cython.cdivision(True)
     cpdef double result(self):
         cdef double denorm = self._previous
@@ -108,6 +115,9 @@ cdef class LogReturn(Accumulator):
         self._previous = self._curr
         self._curr = value
 
+    cpdef bind(self, RowBinding binding):
+        self._inner.bind(binding)
+
     @cython.cdivision(True)
     cpdef double result(self):
         cdef double denorm = self._previous
@@ -140,6 +150,9 @@ cdef class PositivePart(Accumulator):
             self._pos = fmax(value, 0.)
         self._isFull = self._isFull or self._inner.isFull()
 
+    cpdef bind(self, RowBinding binding):
+        self._inner.bind(binding)
+
     cpdef double result(self):
         return self._pos
 
@@ -167,6 +180,9 @@ cdef class NegativePart(Accumulator):
             self._neg = fmin(value, 0.)
         self._isFull = self._isFull or self._inner.isFull()
 
+    cpdef bind(self, RowBinding binding):
+        self._inner.bind(binding)
+
     cpdef double result(self):
         return self._neg
 
@@ -194,6 +210,9 @@ cdef class Max(Accumulator):
         self._currentMax = fmax(value, self._currentMax)
         self._isFull = self._isFull or self._inner.isFull()
 
+    cpdef bind(self, RowBinding binding):
+        self._inner.bind(binding)
+
     cpdef double result(self):
         return self._currentMax
 
@@ -218,6 +237,10 @@ cdef class Maximum(Accumulator):
         self._currentMax = fmax(left, right)
         self._isFull = self._isFull or (self._y.isFull() and self._y.isFull())
 
+    cpdef bind(self, RowBinding binding):
+        self._x.bind(binding)
+        self._y.bind(binding)
+
     cpdef double result(self):
         return self._currentMax
 
@@ -244,6 +267,9 @@ cdef class Min(Accumulator):
         self._currentMin = fmin(value, self._currentMin)
         self._isFull = self._isFull or self._inner.isFull()
 
+    cpdef bind(self, RowBinding binding):
+        self._inner.bind(binding)
+
     cpdef double result(self):
         return self._currentMin
 
@@ -269,6 +295,10 @@ cdef class Minimum(Accumulator):
         self._currentMin = fmin(left, right)
         self._isFull = self._isFull or (self._y.isFull() and self._y.isFull())
 
+    cpdef bind(self, RowBinding binding):
+        self._x.bind(binding)
+        self._y.bind(binding)
+
     cpdef double result(self):
         return self._currentMin
 
@@ -295,6 +325,9 @@ cdef class Sum(Accumulator):
         self._currentSum += value
         self._isFull = self._isFull or self._inner.isFull()
 
+    cpdef bind(self, RowBinding binding):
+        self._inner.bind(binding)
+
     cpdef double result(self):
         return self._currentSum
 
@@ -323,6 +356,9 @@ cdef class Average(Accumulator):
         self._currentSum += value
         self._isFull = self._isFull or self._inner.isFull()
 
+    cpdef bind(self, RowBinding binding):
+        self._inner.bind(binding)
+
     @cython.cdivision(True)
     cpdef double result(self):
         if self._currentCount:
@@ -359,6 +395,9 @@ cdef class XAverage(Accumulator):
             self._average += self._exp * (value - self._average)
         self._isFull = self._isFull or self._inner.isFull()
 
+    cpdef bind(self, RowBinding binding):
+        self._inner.bind(binding)
+
     def __str__(self):
         return "\\mathrm{{XAverage}}({0}, {1})".format(2.0 / self._exp - 1., str(self._inner))
 
@@ -392,6 +431,9 @@ cdef class Variance(Accumulator):
         self._currentCount += 1
         self._isFull = self._isFull or self._inner.isFull()
 
+    cpdef bind(self, RowBinding binding):
+        self._inner.bind(binding)
+
     @cython.cdivision(True)
     cpdef double result(self):
 
@@ -426,6 +468,9 @@ cdef class Product(Accumulator):
         self._product *= value
         self._isFull = self._isFull or self._inner.isFull()
 
+    cpdef bind(self, RowBinding binding):
+        self._inner.bind(binding)
+
     cpdef double result(self):
         return self._product
 
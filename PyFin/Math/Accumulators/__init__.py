@@ -82,6 +82,16 @@ from PyFin.Math.Accumulators.StatefulAccumulators import MovingSortino
 from PyFin.Math.Accumulators.StatefulAccumulators import MovingDrawdown
 from PyFin.Math.Accumulators.StatefulAccumulators import MovingMaxDrawdown
 
+from PyFin.Math.Accumulators.PanelAccumulators import PanelMovingSum
+from PyFin.Math.Accumulators.PanelAccumulators import PanelMovingAverage
+from PyFin.Math.Accumulators.PanelAccumulators import PanelMovingVariance
+from PyFin.Math.Accumulators.PanelAccumulators import PanelMovingStandardDeviation
+from PyFin.Math.Accumulators.PanelAccumulators import PanelMovingMax
+from PyFin.Math.Accumulators.PanelAccumulators import PanelMovingMin
+from PyFin.Math.Accumulators.PanelAccumulators import PanelMovingCorrelation
+
+from PyFin.Math.Accumulators.FusedAccumulators import FusedValueHolder
+from PyFin.Math.Accumulators.FusedAccumulators import fuse
 
 __all__ = ["Exp",
            "Log",
@@ -152,4 +162,13 @@ __all__ = ["Exp",
            "MovingDrawdown",
            "MovingMaxDrawdown",
            "Product",
-           "MovingProduct"]
+           "MovingProduct",
+           "PanelMovingSum",
+           "PanelMovingAverage",
+           "PanelMovingVariance",
+           "PanelMovingStandardDeviation",
+           "PanelMovingMax",
+           "PanelMovingMin",
+           "PanelMovingCorrelation",
+           "FusedValueHolder",
+           "fuse"]
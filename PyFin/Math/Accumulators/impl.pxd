@@ -6,9 +6,8 @@ Created on 2017-2-8
 @author: cheng.li
 """
 
-from libcpp.list cimport list as CList
 from libcpp.string cimport string as CString
-from libcpp.map cimport map as CMap
+from libcpp.unordered_map cimport unordered_map
 
 cdef class Deque:
 
@@ -24,9 +23,31 @@ cdef class Deque:
     cdef inline bint isFull(self)
     cpdef size_t idx(self, double value)
     cpdef double sum(self)
-    cdef void set_data(self, bytes data)
+    cdef void set_data(self, const unsigned char[::1] data)
 
-cpdef object rebuild_deque(bytes data, size_t window, bint is_full, size_t start, size_t count)
+cpdef object rebuild_deque(data, size_t window, bint is_full, size_t start, size_t count)
+
+cdef class MonotonicDeque:
+
+    cdef size_t window
+    cdef double sign
+    cdef double* values
+    cdef size_t* stamps
+    cdef size_t head
+    cdef public size_t count
+    cdef public size_t tick
+
+    cdef void dump(self, double value)
+    cdef inline double front(self)
+    cdef inline double front_age(self)
+
+cpdef object rebuild_monotonic_deque(size_t window, bint is_max, values, stamps, size_t tick)
+
+cdef enum:
+    _CLOSED_RIGHT = 0
+    _CLOSED_LEFT = 1
+    _CLOSED_BOTH = 2
+    _CLOSED_NEITHER = 3
 
 cdef class DiffDeque:
 
@@ -35,12 +56,21 @@ cdef class DiffDeque:
     cdef public bint is_new_added
     cdef double last
     cdef double last_stamp
-    cdef CList[double] con
-    cdef CList[double] stamps
+    cdef double* con
+    cdef double* stamps
+    cdef size_t capacity
+    cdef size_t head
+    cdef size_t count
+    cdef int mode
     cdef CString closed
-
-    cdef CList[double] dump(self, double value, int stamp, double default= *)
-    cpdef CList[double] dumps(self, values, stamps)
+    cdef public size_t popped_count
+    cdef public double popped_sum
+    cdef public double popped_sum_square
+
+    cdef void _grow(self) except *
+    cdef void _push(self, double value, double stamp) except *
+    cdef size_t dump(self, double value, int stamp) except? -1
+    cpdef size_t dumps(self, values, stamps)
     cpdef size_t size(self)
     cpdef bint isFull(self)
     cpdef size_t idx(self, double value)
@@ -48,7 +78,13 @@ cdef class DiffDeque:
     cpdef CString close(self)
     cpdef double back(self)
 
-cpdef object rebuild_diff_deque(double window, str closed)
+cpdef object rebuild_diff_deque(double window,
+                                str closed,
+                                values=*,
+                                stamps=*,
+                                double last=*,
+                                double last_stamp=*,
+                                bint is_new_added=*)
 
 
 cdef class UniqueDiffDeque:
@@ -57,12 +93,26 @@ cdef class UniqueDiffDeque:
     cdef public bint is_full
     cdef double last
     cdef double last_stamp
+    cdef int mode
     cdef CString closed
-    cdef CMap[double, double] values_map
-    cdef CMap[double, double] stamps_map
-
-    cdef CList[double] dump(self, double value, int stamp, double default= *)
-    cpdef CList[double] dumps(self, values, stamps)
+    cdef unordered_map[double, unsigned long long] index
+    cdef double* con
+    cdef double* stamps
+    cdef char* live
+    cdef size_t* tree
+    cdef size_t capacity
+    cdef size_t head
+    cdef size_t count
+    cdef unsigned long long head_seq
+    cdef double running_sum
+
+    cdef void _allocate(self, size_t capacity) except *
+    cdef inline void _mark(self, size_t slot, bint alive)
+    cdef inline size_t _prefix(self, size_t slot)
+    cdef inline size_t _select(self, size_t k)
+    cdef void _insert(self, double value, double stamp) except *
+    cdef size_t dump(self, double value, int stamp) except? -1
+    cpdef size_t dumps(self, values, stamps)
     cpdef size_t size(self)
     cpdef bint isFull(self)
     cpdef size_t idx(self, double value)
@@ -70,4 +120,30 @@ cdef class UniqueDiffDeque:
     cpdef CString close(self)
 
 
-cpdef object rebuild_unique_diff_deque(double window, str closed)
\ No newline at end of file
+cpdef object rebuild_unique_diff_deque(double window,
+                                       str closed,
+                                       dict values_map=*,
+                                       dict stamps_map=*,
+                                       double last=*,
+                                       double last_stamp=*)
+
+cdef class SkipList:
+
+    cdef size_t capacity
+    cdef size_t max_levels
+    cdef public size_t count
+    cdef size_t n_free
+    cdef unsigned long long seed
+    cdef double* values
+    cdef size_t* levels
+    cdef size_t* nexts
+    cdef size_t* widths
+    cdef size_t* free_nodes
+
+    cdef inline size_t _random_level(self)
+    cdef size_t insert(self, double value) except? -1
+    cdef int remove(self, double value) except -1
+    cdef double get(self, size_t i)
+    cdef inline size_t size(self)
+
+cpdef object rebuild_skip_list(size_t capacity, values)
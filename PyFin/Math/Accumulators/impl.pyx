@@ -6,18 +6,44 @@ Created on 2017-1-1
 @author: cheng.li
 """
 
+import struct
 cimport cython
 from PyFin.Math.MathConstants cimport NAN
 from cpython.mem cimport PyMem_Malloc, PyMem_Free
 from libc.math cimport isnan
+from libc.math cimport INFINITY
 from libc.string cimport memcpy
-from libcpp.list cimport list as CList
 from libcpp.string cimport string as CString
-from libcpp.map cimport map as CMap
-from libcpp.pair cimport pair as CPair
-from cython.operator import dereference, preincrement
+from libcpp.unordered_map cimport unordered_map
+from cython.operator cimport dereference
 from PyFin.Utilities.Asserts cimport require
 
+try:
+    from pickle import PickleBuffer
+except ImportError:
+    PickleBuffer = None
+
+
+cdef object _raw(bytes data, int protocol):
+    # with pickle protocol 5 the raw bytes of a C array are handed out of
+    # band, so that a snapshot file keeps them as one contiguous block
+    if PickleBuffer is not None and protocol >= 5:
+        return PickleBuffer(data)
+    return data
+
+
+cdef bytes _ring_bytes(const char* con, size_t item, size_t head, size_t count, size_t capacity):
+    # the ``count`` items of a ring buffer starting at ``head``, in order
+    cdef size_t first = min(count, capacity - head)
+    return con[head * item:(head + first) * item] + con[:(count - first) * item]
+
+
+cdef object _items(object data, str fmt):
+    # pickles written before the raw layout hold python lists
+    if isinstance(data, list):
+        data = struct.pack('{0}{1}'.format(len(data), fmt), *data)
+    return memoryview(data).cast(fmt)
+
 
 cdef class Deque:
 
@@ -115,15 +141,16 @@ cdef class Deque:
         elif op == 3:
             return not self.__richcmp__(other, 2)
 
-    cdef void set_data(self, bytes data):
-        memcpy(self.con, <char*>data, sizeof(double)*self.window)
+    cdef void set_data(self, const unsigned char[::1] data):
+        if data.shape[0]:
+            memcpy(self.con, &data[0], sizeof(double)*self.window)
 
-    def __reduce__(self):
+    def __reduce_ex__(self, protocol):
         cdef bytes data = <bytes>(<char *>self.con)[:sizeof(double)*self.window]
-        return rebuild_deque, (data, self.window, self.is_full, self.start, self.count)
+        return rebuild_deque, (_raw(data, protocol), self.window, self.is_full, self.start, self.count)
 
 
-cpdef object rebuild_deque(bytes data, size_t window, bint is_full, size_t start, size_t count):
+cpdef object rebuild_deque(data, size_t window, bint is_full, size_t start, size_t count):
     c = Deque(window)
     c.set_data(data)
     c.is_full = is_full
@@ -132,10 +159,135 @@ cpdef object rebuild_deque(bytes data, size_t window, bint is_full, size_t start
     return c
 
 
-cdef CString _RIGHT = "right".encode("UTF-8")
-cdef CString _LEFT = "left".encode("UTF-8")
-cdef CString _BOTH = "both".encode("UTF-8")
-cdef CString _NEITHER = "neither".encode("UTF-8")
+
+cdef class MonotonicDeque:
+    u"""
+    Running extreme of the last ``window`` values: a ring buffer of candidates
+    kept in monotonic order. Tied values are all kept, oldest at the front.
+    """
+
+    def __cinit__(self, size_t window, bint is_max=True):
+        self.window = window
+        self.sign = 1. if is_max else -1.
+        self.values = <double*> PyMem_Malloc(window * sizeof(double))
+        self.stamps = <size_t*> PyMem_Malloc(window * sizeof(size_t))
+        self.head = 0
+        self.count = 0
+        self.tick = 0
+
+    def __dealloc__(self):
+        PyMem_Free(self.values)
+        PyMem_Free(self.stamps)
+
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void dump(self, double value):
+        cdef size_t tail
+        cdef double sign = self.sign
+
+        if self.count and self.stamps[self.head] + self.window <= self.tick:
+            self.head = (self.head + 1) % self.window
+            self.count -= 1
+
+        while self.count:
+            tail = (self.head + self.count - 1) % self.window
+            if sign * self.values[tail] < sign * value:
+                self.count -= 1
+            else:
+                break
+
+        tail = (self.head + self.count) % self.window
+        self.values[tail] = value
+        self.stamps[tail] = self.tick
+        self.count += 1
+        self.tick += 1
+
+    cdef inline double front(self):
+        if self.count:
+            return self.values[self.head]
+        else:
+            return NAN
+
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef inline double front_age(self):
+        u"""
+        Age of the front extreme. Among tied extremes the one a ring buffer of
+        ``window`` slots stores first is taken, i.e. the oldest one dumped
+        since the last wrap of the ring if any, else the oldest one.
+        """
+        cdef size_t last
+        cdef size_t wrap
+        cdef size_t lo
+        cdef size_t hi
+        cdef size_t mid
+        cdef size_t pos
+
+        if not self.count:
+            return NAN
+
+        last = self.tick - 1
+        wrap = last - last % self.window
+        lo = 0
+        hi = self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.stamps[(self.head + mid) % self.window] < wrap:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count:
+            pos = (self.head + lo) % self.window
+            if self.values[pos] == self.values[self.head]:
+                return last - self.stamps[pos]
+        return last - self.stamps[self.head]
+
+    def push(self, double value):
+        self.dump(value)
+
+    @property
+    def value(self):
+        return self.front()
+
+    @property
+    def age(self):
+        return self.front_age()
+
+    def __reduce_ex__(self, protocol):
+        cdef bytes values = _ring_bytes(<char*>self.values, sizeof(double), self.head, self.count, self.window)
+        cdef bytes stamps = _ring_bytes(<char*>self.stamps, sizeof(size_t), self.head, self.count, self.window)
+        return rebuild_monotonic_deque, (self.window,
+                                         self.sign > 0.,
+                                         _raw(values, protocol),
+                                         _raw(stamps, protocol),
+                                         self.tick)
+
+
+cpdef object rebuild_monotonic_deque(size_t window, bint is_max, values, stamps, size_t tick):
+    cdef MonotonicDeque c = MonotonicDeque(window, is_max)
+    cdef const unsigned char[::1] value_bytes = _items(values, 'd').cast('B')
+    cdef const unsigned char[::1] stamp_bytes = _items(stamps, 'N').cast('B')
+    c.count = value_bytes.shape[0] // sizeof(double)
+    if c.count:
+        memcpy(c.values, &value_bytes[0], value_bytes.shape[0])
+        memcpy(c.stamps, &stamp_bytes[0], stamp_bytes.shape[0])
+    c.tick = tick
+    return c
+
+cdef int _closed_mode(str closed) except -1:
+    cdef str closed_str = closed.lower()
+    require(closed_str in ("left", "right", "both", "neither"),
+            ValueError,
+            "closed parameter is <{0}> which is not in the recognized formats".format(closed))
+    if closed_str == "right":
+        return _CLOSED_RIGHT
+    elif closed_str == "left":
+        return _CLOSED_LEFT
+    elif closed_str == "both":
+        return _CLOSED_BOTH
+    return _CLOSED_NEITHER
 
 
 cdef class DiffDeque:
@@ -144,111 +296,150 @@ cdef class DiffDeque:
                   window,
                   closed="right"):
         self.window = window
-        self.con = CList[double]()
-        self.stamps = CList[double]()
-        cdef str closed_str = closed.lower()
-        require(closed_str in ("left", "right", "both", "neither"),
-                    ValueError,
-                    "closed parameter is <{0}> which is not in the recognized formats".format(closed))
-        self.closed = closed_str.encode("UTF-8")
+        self.mode = _closed_mode(closed)
+        self.closed = closed.lower().encode("UTF-8")
+        self.capacity = 16
+        self.con = <double*> PyMem_Malloc(self.capacity * sizeof(double))
+        self.stamps = <double*> PyMem_Malloc(self.capacity * sizeof(double))
+        if self.con == NULL or self.stamps == NULL:
+            raise MemoryError()
+        self.head = 0
+        self.count = 0
         self.last = NAN
         self.last_stamp = NAN
         self.is_new_added = False
+        self.popped_count = 0
+        self.popped_sum = 0.
+        self.popped_sum_square = 0.
+
+    def __dealloc__(self):
+        PyMem_Free(self.con)
+        PyMem_Free(self.stamps)
+
+    cdef void _grow(self) except *:
+        cdef size_t capacity = 2 * self.capacity
+        cdef double* con = <double*> PyMem_Malloc(capacity * sizeof(double))
+        cdef double* stamps = <double*> PyMem_Malloc(capacity * sizeof(double))
+        cdef size_t first = self.capacity - self.head
+
+        if con == NULL or stamps == NULL:
+            PyMem_Free(con)
+            PyMem_Free(stamps)
+            raise MemoryError()
+
+        if first > self.count:
+            first = self.count
+        memcpy(con, self.con + self.head, first * sizeof(double))
+        memcpy(con + first, self.con, (self.count - first) * sizeof(double))
+        memcpy(stamps, self.stamps + self.head, first * sizeof(double))
+        memcpy(stamps + first, self.stamps, (self.count - first) * sizeof(double))
+        PyMem_Free(self.con)
+        PyMem_Free(self.stamps)
+        self.con = con
+        self.stamps = stamps
+        self.capacity = capacity
+        self.head = 0
+
+    @cython.cdivision(True)
+    cdef void _push(self, double value, double stamp) except *:
+        cdef size_t tail
+        if self.count == self.capacity:
+            self._grow()
+        tail = (self.head + self.count) % self.capacity
+        self.con[tail] = value
+        self.stamps[tail] = stamp
+        self.count += 1
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
     @cython.wraparound(False)
-    cdef CList[double] dump(self, double value, int stamp, double default=NAN):
-        cdef CList[double] ret_values = CList[double]()
-        if self.closed == _BOTH or self.closed == _LEFT:
-            while self.con.size() > 0 and (stamp - self.stamps.front()) > self.window:
-                ret_values.push_back(self.con.front())
-                self.con.pop_front()
-                self.stamps.pop_front()
-        else:
-            while self.con.size() > 0 and (stamp - self.stamps.front()) >= self.window:
-                ret_values.push_back(self.con.front())
-                self.con.pop_front()
-                self.stamps.pop_front()
-        if self.closed == _RIGHT or self.closed == _BOTH:
-            self.con.push_back(value)
-            self.stamps.push_back(stamp)
+    cdef size_t dump(self, double value, int stamp) except? -1:
+        u"""
+        Push a new value and evict the ones out of the window. The evicted
+        values are summarized in popped_count, popped_sum and
+        popped_sum_square; is_new_added tells whether a value entered the
+        window (it is then the back of the deque).
+        """
+        cdef size_t popped = 0
+        cdef double popped_sum = 0.
+        cdef double popped_sum_square = 0.
+        cdef double out
+        cdef bint inclusive = self.mode == _CLOSED_BOTH or self.mode == _CLOSED_LEFT
+
+        while self.count > 0 and ((inclusive and (stamp - self.stamps[self.head]) > self.window)
+                                  or (not inclusive and (stamp - self.stamps[self.head]) >= self.window)):
+            out = self.con[self.head]
+            popped += 1
+            popped_sum += out
+            popped_sum_square += out * out
+            self.head += 1
+            if self.head == self.capacity:
+                self.head = 0
+            self.count -= 1
+
+        self.popped_count = popped
+        self.popped_sum = popped_sum
+        self.popped_sum_square = popped_sum_square
+
+        if self.mode == _CLOSED_RIGHT or self.mode == _CLOSED_BOTH:
+            self._push(value, stamp)
             self.is_new_added = True
-        else:
-            if not isnan(self.last):
-                if (self.closed == _NEITHER and (stamp - self.last_stamp) < self.window) \
-                    or (self.closed == _LEFT and (stamp - self.last_stamp) <= self.window):
-                    self.con.push_back(self.last)
-                    self.stamps.push_back(self.last_stamp)
-                    self.is_new_added = True
-                else:
-                    self.is_new_added = False
+        elif not isnan(self.last):
+            if (self.mode == _CLOSED_NEITHER and (stamp - self.last_stamp) < self.window) \
+                or (self.mode == _CLOSED_LEFT and (stamp - self.last_stamp) <= self.window):
+                self._push(self.last, self.last_stamp)
+                self.is_new_added = True
+            else:
+                self.is_new_added = False
         self.last = value
         self.last_stamp = stamp
-        return ret_values
+        return popped
 
+    @cython.cdivision(True)
     cpdef double back(self):
-        return self.con.back()
+        return self.con[(self.head + self.count - 1) % self.capacity]
 
-    cpdef CList[double] dumps(self, values, stamps):
-        cdef CList[double] ret_values = CList[double]()
-        cdef CList[double] tmp
+    cpdef size_t dumps(self, values, stamps):
+        cdef size_t popped = 0
         for v, s in zip(values, stamps):
-            tmp = self.dump(v, s)
-            ret_values.merge(tmp)
-        return ret_values
+            popped += self.dump(v, s)
+        return popped
 
     cpdef size_t size(self):
-        return self.con.size()
+        return self.count
 
     cpdef bint isFull(self):
-        if self.con.size() > 0:
-            return True
-        else:
-            return False
+        return self.count > 0
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
     @cython.wraparound(False)
     cpdef size_t idx(self, double value):
         cdef size_t i
-        cdef CList[double].iterator it
-        it = self.con.begin()
-        for i in range(self.con.size()):
-            if value == dereference(it):
+        for i in range(self.count):
+            if value == self.con[(self.head + i) % self.capacity]:
                 break
-            else:
-                preincrement(it)
         else:
             i = -1
         return i
 
+    @cython.cdivision(True)
     @cython.wraparound(False)
     @cython.boundscheck(False)
     cpdef double sum(self):
         cdef double x = 0.0
         cdef size_t i
-        cdef CList[double].iterator it
-        it = self.con.begin()
-        for i in range(self.con.size()):
-            x += dereference(it)
-            preincrement(it)
+        for i in range(self.count):
+            x += self.con[(self.head + i) % self.capacity]
         return x
 
     cpdef CString close(self):
         return self.closed
 
     @cython.cdivision(True)
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
     def __getitem__(self, size_t item):
-        cdef size_t i
-        cdef CList[double].iterator it
-        it = self.con.begin()
-        for i in range(self.con.size()):
-            if i == item:
-                return dereference(it)
-            preincrement(it)
+        if item < self.count:
+            return self.con[(self.head + item) % self.capacity]
 
     def __richcmp__(Deque self, DiffDeque other, int op):
         cdef bint flag = False
@@ -265,150 +456,236 @@ cdef class DiffDeque:
         elif op == 3:
             return not self.__richcmp__(other, 2)
 
-    def __reduce__(self):
-        return rebuild_diff_deque, (self.window, self.closed.decode("UTF-8"))
-
-cpdef object rebuild_diff_deque(double window, str closed):
-    c = DiffDeque(window, closed)
+    def __reduce_ex__(self, protocol):
+        cdef bytes values = _ring_bytes(<char*>self.con, sizeof(double), self.head, self.count, self.capacity)
+        cdef bytes stamps = _ring_bytes(<char*>self.stamps, sizeof(double), self.head, self.count, self.capacity)
+        return rebuild_diff_deque, (self.window,
+                                    self.closed.decode("UTF-8"),
+                                    _raw(values, protocol),
+                                    _raw(stamps, protocol),
+                                    self.last,
+                                    self.last_stamp,
+                                    self.is_new_added)
+
+cpdef object rebuild_diff_deque(double window,
+                                str closed,
+                                values=None,
+                                stamps=None,
+                                double last=NAN,
+                                double last_stamp=NAN,
+                                bint is_new_added=False):
+    cdef DiffDeque c = DiffDeque(window, closed)
+    cdef const double[::1] value_items
+    cdef const double[::1] stamp_items
+    cdef size_t i
+    if values is not None:
+        value_items = _items(values, 'd')
+        stamp_items = _items(stamps, 'd')
+        for i in range(value_items.shape[0]):
+            c._push(value_items[i], stamp_items[i])
+    c.last = last
+    c.last_stamp = last_stamp
+    c.is_new_added = is_new_added
     return c
 
 
 cdef class UniqueDiffDeque:
+    u"""
+    Distinct values seen within a time window, each one living until its
+    latest stamp leaves the window. Stamps are expected to be non decreasing.
+
+    Entries are queued in a ring buffer in stamp order, and a hash index maps
+    every distinct value to the sequence number of its latest entry; older
+    entries of the same value are only marked as dead and dropped when they
+    reach the head. A Fenwick tree over the ring slots counts the live entries
+    so positions are found in O(log n).
+    """
 
     def __cinit__(self,
                   window,
                   closed="right"):
         self.window = window
-        cdef str closed_str = closed.lower()
-        require(closed_str in ("left", "right", "both", "neither"),
-                    ValueError,
-                    "closed parameter is <{0}> which is not in the recognized formats".format(closed))
-        self.closed = closed_str.encode("UTF-8")
+        self.mode = _closed_mode(closed)
+        self.closed = closed.lower().encode("UTF-8")
         self.last = NAN
         self.last_stamp = NAN
-        self.values_map = CMap[double, double]()
-        self.stamps_map = CMap[double, double]()
+        self.capacity = 0
+        self.head = 0
+        self.count = 0
+        self.head_seq = 0
+        self.running_sum = 0.
+        self._allocate(16)
+
+    def __dealloc__(self):
+        PyMem_Free(self.con)
+        PyMem_Free(self.stamps)
+        PyMem_Free(self.live)
+        PyMem_Free(self.tree)
+
+    cdef void _allocate(self, size_t capacity) except *:
+        cdef double* con = <double*> PyMem_Malloc(capacity * sizeof(double))
+        cdef double* stamps = <double*> PyMem_Malloc(capacity * sizeof(double))
+        cdef char* live = <char*> PyMem_Malloc(capacity * sizeof(char))
+        cdef size_t* tree = <size_t*> PyMem_Malloc((capacity + 1) * sizeof(size_t))
+        cdef size_t i
+        cdef size_t j
+        cdef size_t slot
+
+        if con == NULL or stamps == NULL or live == NULL or tree == NULL:
+            PyMem_Free(con)
+            PyMem_Free(stamps)
+            PyMem_Free(live)
+            PyMem_Free(tree)
+            raise MemoryError()
+
+        for i in range(capacity + 1):
+            tree[i] = 0
+        for i in range(self.count):
+            slot = (self.head + i) % self.capacity
+            con[i] = self.con[slot]
+            stamps[i] = self.stamps[slot]
+            live[i] = self.live[slot]
+            # linear time Fenwick construction
+            tree[i + 1] += live[i]
+            j = (i + 1) + ((i + 1) & -(i + 1))
+            if j <= capacity:
+                tree[j] += tree[i + 1]
+
+        if self.capacity:
+            PyMem_Free(self.con)
+            PyMem_Free(self.stamps)
+            PyMem_Free(self.live)
+            PyMem_Free(self.tree)
+        self.con = con
+        self.stamps = stamps
+        self.live = live
+        self.tree = tree
+        self.capacity = capacity
+        self.head = 0
+
+    cdef inline void _mark(self, size_t slot, bint alive):
+        cdef size_t i = slot + 1
+        self.live[slot] = alive
+        while i <= self.capacity:
+            if alive:
+                self.tree[i] += 1
+            else:
+                self.tree[i] -= 1
+            i += i & -i
+
+    cdef inline size_t _prefix(self, size_t slot):
+        # live entries in the slots [0, slot)
+        cdef size_t total = 0
+        while slot > 0:
+            total += self.tree[slot]
+            slot -= slot & -slot
+        return total
+
+    cdef inline size_t _select(self, size_t k):
+        # slot of the (k + 1)-th live entry counted from slot 0
+        cdef size_t pos = 0
+        cdef size_t step = self.capacity
+        while step:
+            if pos + step <= self.capacity and self.tree[pos + step] <= k:
+                pos += step
+                k -= self.tree[pos]
+            step >>= 1
+        return pos
+
+    @cython.cdivision(True)
+    cdef void _insert(self, double value, double stamp) except *:
+        cdef unordered_map[double, unsigned long long].iterator it = self.index.find(value)
+        cdef size_t slot
+
+        if it != self.index.end():
+            self._mark((self.head + <size_t> (dereference(it).second - self.head_seq)) % self.capacity, False)
+        else:
+            self.running_sum += value
+
+        if self.count == self.capacity:
+            self._allocate(2 * self.capacity)
+        slot = (self.head + self.count) % self.capacity
+        self.con[slot] = value
+        self.stamps[slot] = stamp
+        self._mark(slot, True)
+        self.index[value] = self.head_seq + self.count
+        self.count += 1
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
     @cython.wraparound(False)
-    cdef CList[double] dump(self, double value, int stamp, double default=NAN):
-        cdef CList[double] ret_values = CList[double]()
-        cdef double out_value
-        cdef double previous_stamp
-        cdef size_t debug_int
-        cdef CMap[double, double].iterator it
-        cdef CPair[double, double] pair_value
-
-        it = self.stamps_map.begin()
-        if self.closed == _BOTH or self.closed == _LEFT:
-            while it != self.stamps_map.end() and (stamp - dereference(it).first) > self.window:
-                out_value =  dereference(it).second
-                ret_values.push_back(out_value)
-                self.stamps_map.erase(it)
-                debug_int = self.values_map.erase(out_value)
-                it = self.stamps_map.begin()
-        else:
-            while it != self.stamps_map.end() and (stamp - dereference(it).first) >= self.window:
-                out_value = dereference(it).second
-                ret_values.push_back(out_value)
-                self.stamps_map.erase(it)
-                debug_int = self.values_map.erase(out_value)
-                it = self.stamps_map.begin()
-
-        if self.closed == _RIGHT or self.closed == _BOTH:
-            it = self.values_map.find(value)
-            if it != self.values_map.end():
-                previous_stamp = dereference(it).second
-                self.stamps_map.erase(previous_stamp)
-                self.values_map[value] = stamp
-            else:
-                pair_value = (value, stamp)
-                self.values_map.insert(pair_value)
-            pair_value = (stamp, value)
-            self.stamps_map.insert(pair_value)
-        else:
-            if not isnan(self.last):
-                if (self.closed == _NEITHER and (stamp - self.last_stamp) < self.window) \
-                        or (self.closed == _LEFT and (stamp - self.last_stamp) <= self.window):
-                    it = self.values_map.find(self.last)
-                    if it != self.values_map.end():
-                        previous_stamp = dereference(it).second
-                        self.stamps_map.erase(previous_stamp)
-                        self.values_map[self.last] = self.last_stamp
-                    else:
-                        pair_value = (self.last, self.last_stamp)
-                        self.values_map.insert(pair_value)
-                    pair_value = (self.last_stamp, self.last)
-                    self.stamps_map.insert(pair_value)
+    cdef size_t dump(self, double value, int stamp) except? -1:
+        u"""
+        Push a new value and evict the values whose latest stamp is out of the
+        window; return the number of distinct values evicted.
+        """
+        cdef size_t popped = 0
+        cdef bint inclusive = self.mode == _CLOSED_BOTH or self.mode == _CLOSED_LEFT
+
+        while self.count > 0 and ((inclusive and (stamp - self.stamps[self.head]) > self.window)
+                                  or (not inclusive and (stamp - self.stamps[self.head]) >= self.window)):
+            if self.live[self.head]:
+                self.index.erase(self.con[self.head])
+                self.running_sum -= self.con[self.head]
+                self._mark(self.head, False)
+                popped += 1
+            self.head += 1
+            if self.head == self.capacity:
+                self.head = 0
+            self.head_seq += 1
+            self.count -= 1
+
+        if self.mode == _CLOSED_RIGHT or self.mode == _CLOSED_BOTH:
+            self._insert(value, stamp)
+        elif not isnan(self.last):
+            if (self.mode == _CLOSED_NEITHER and (stamp - self.last_stamp) < self.window) \
+                    or (self.mode == _CLOSED_LEFT and (stamp - self.last_stamp) <= self.window):
+                self._insert(self.last, self.last_stamp)
         self.last = value
         self.last_stamp = stamp
-        return ret_values
+        return popped
 
-    cpdef CList[double] dumps(self, values, stamps):
-        cdef CList[double] ret_values = CList[double]()
-        cdef CList[double] tmp
+    cpdef size_t dumps(self, values, stamps):
+        cdef size_t popped = 0
         for v, s in zip(values, stamps):
-            tmp = self.dump(v, s)
-            ret_values.merge(tmp)
-        return ret_values
+            popped += self.dump(v, s)
+        return popped
 
     cpdef size_t size(self):
-        return self.values_map.size()
+        return self.index.size()
 
     cpdef bint isFull(self):
-        if not self.values_map.empty():
-            return True
-        else:
-            return False
+        return not self.index.empty()
 
     @cython.cdivision(True)
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
     cpdef size_t idx(self, double value):
-        cdef size_t i
-        cdef double k
-        cdef CMap[double, double].iterator it
-
-        i = 0
-        it = self.stamps_map.begin()
-        while it != self.stamps_map.end():
-            if dereference(it).second == value:
-                return i
-            i += 1
-            preincrement(it)
+        u"""
+        Position of value among the live values in stamp order, -1 when it is
+        not in the window.
+        """
+        cdef unordered_map[double, unsigned long long].iterator it = self.index.find(value)
+        cdef size_t slot
+        cdef size_t before
+        if it == self.index.end():
+            return -1
+        slot = (self.head + <size_t> (dereference(it).second - self.head_seq)) % self.capacity
+        before = self._prefix(slot)
+        if slot >= self.head:
+            return before - self._prefix(self.head)
+        return before + self.index.size() - self._prefix(self.head)
 
-    @cython.wraparound(False)
-    @cython.boundscheck(False)
     cpdef double sum(self):
-        cdef double x = 0.0
-        cdef double k
-        cdef CMap[double, double].iterator it
-
-        it = self.stamps_map.begin()
-        while it != self.stamps_map.end():
-            x += dereference(it).second
-            preincrement(it)
-        return x
+        return self.running_sum
 
     cpdef CString close(self):
         return self.closed
 
-    @cython.cdivision(True)
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
     def __getitem__(self, size_t item):
-        cdef size_t i
-        cdef double k
-        cdef CMap[double, double].iterator it
-
-        i = 0
-        it = self.stamps_map.begin()
-        while it != self.stamps_map.end():
-            if i == item:
-                return dereference(it).second
-            i += 1
-            preincrement(it)
+        cdef size_t k
+        cdef size_t n = self.index.size()
+        if item < n:
+            k = item + self._prefix(self.head)
+            return self.con[self._select(k if k < n else k - n)]
 
     def __richcmp__(Deque self, UniqueDiffDeque other, int op):
         cdef bint flag = False
@@ -425,10 +702,228 @@ cdef class UniqueDiffDeque:
         elif op == 3:
             return not self.__richcmp__(other, 2)
 
+    @cython.cdivision(True)
     def __reduce__(self):
-        return rebuild_unique_diff_deque, (self.window, self.closed.decode("UTF-8"))
+        cdef dict values_map = {}
+        cdef dict stamps_map = {}
+        cdef size_t i
+        cdef size_t slot
+        for i in range(self.count):
+            slot = (self.head + i) % self.capacity
+            if self.live[slot]:
+                values_map[self.con[slot]] = self.stamps[slot]
+                stamps_map[self.stamps[slot]] = self.con[slot]
+        return rebuild_unique_diff_deque, (self.window,
+                                           self.closed.decode("UTF-8"),
+                                           values_map,
+                                           stamps_map,
+                                           self.last,
+                                           self.last_stamp)
+
+
+cpdef object rebuild_unique_diff_deque(double window,
+                                       str closed,
+                                       dict values_map=None,
+                                       dict stamps_map=None,
+                                       double last=NAN,
+                                       double last_stamp=NAN):
+    cdef UniqueDiffDeque c = UniqueDiffDeque(window, closed)
+    cdef list entries
+    if values_map is not None:
+        # __reduce__ lists the values in window order, keep it for equal stamps
+        entries = [(stamp, i, value) for i, (value, stamp) in enumerate(values_map.items())]
+        entries.sort()
+        for stamp, _, value in entries:
+            c._insert(value, stamp)
+    c.last = last
+    c.last_stamp = last_stamp
+    return c
+
+cdef class SkipList:
+    u"""
+    Indexable skip list over at most ``capacity`` doubles. Nodes live in
+    preallocated arrays (0 is the head and ``capacity + 1`` the +inf tail), so
+    insert, remove and positional access are O(log n) without any per value
+    allocation.
+    """
+
+    def __cinit__(self, size_t capacity):
+        cdef size_t i
+        cdef size_t n_nodes = capacity + 2
+
+        self.capacity = capacity
+        self.max_levels = 1
+        while (<size_t>1 << self.max_levels) <= capacity:
+            self.max_levels += 1
+        self.count = 0
+        self.seed = 88172645463325252ULL
+
+        self.values = <double*> PyMem_Malloc(n_nodes * sizeof(double))
+        self.levels = <size_t*> PyMem_Malloc(n_nodes * sizeof(size_t))
+        self.nexts = <size_t*> PyMem_Malloc(n_nodes * self.max_levels * sizeof(size_t))
+        self.widths = <size_t*> PyMem_Malloc(n_nodes * self.max_levels * sizeof(size_t))
+        self.free_nodes = <size_t*> PyMem_Malloc(n_nodes * sizeof(size_t))
+
+        self.values[capacity + 1] = INFINITY
+        for i in range(self.max_levels):
+            self.nexts[i] = capacity + 1
+            self.widths[i] = 1
+        for i in range(capacity):
+            self.free_nodes[i] = capacity - i
+        self.n_free = capacity
 
+    def __dealloc__(self):
+        PyMem_Free(self.values)
+        PyMem_Free(self.levels)
+        PyMem_Free(self.nexts)
+        PyMem_Free(self.widths)
+        PyMem_Free(self.free_nodes)
+
+    cdef inline size_t _random_level(self):
+        cdef size_t level = 1
+        cdef unsigned long long x
+
+        x = self.seed
+        x ^= x << 13
+        x ^= x >> 7
+        x ^= x << 17
+        self.seed = x
+        while level < self.max_levels and (x & 1):
+            level += 1
+            x >>= 1
+        return level
 
-cpdef object rebuild_unique_diff_deque(double window, str closed):
-    c = UniqueDiffDeque(window, closed)
-    return c
\ No newline at end of file
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef size_t insert(self, double value) except? -1:
+        cdef size_t[64] chain
+        cdef size_t[64] steps_at_level
+        cdef size_t node = 0
+        cdef size_t steps = 0
+        cdef size_t new_node
+        cdef size_t prev
+        cdef size_t d
+        cdef size_t m = self.max_levels
+        cdef int level
+
+        require(self.count < self.capacity, IndexError, "skip list is full")
+
+        for level in range(<int>m - 1, -1, -1):
+            while self.values[self.nexts[node * m + level]] < value:
+                steps += self.widths[node * m + level]
+                node = self.nexts[node * m + level]
+            chain[level] = node
+            steps_at_level[level] = steps
+
+        self.n_free -= 1
+        new_node = self.free_nodes[self.n_free]
+        d = self._random_level()
+        self.values[new_node] = value
+        self.levels[new_node] = d
+
+        for level in range(<int>d):
+            prev = chain[level]
+            self.nexts[new_node * m + level] = self.nexts[prev * m + level]
+            self.nexts[prev * m + level] = new_node
+            self.widths[new_node * m + level] = self.widths[prev * m + level] - (steps - steps_at_level[level])
+            self.widths[prev * m + level] = steps - steps_at_level[level] + 1
+
+        for level in range(<int>d, <int>m):
+            self.widths[chain[level] * m + level] += 1
+
+        self.count += 1
+        return steps
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef int remove(self, double value) except -1:
+        cdef size_t[64] chain
+        cdef size_t node = 0
+        cdef size_t target
+        cdef size_t prev
+        cdef size_t m = self.max_levels
+        cdef int level
+
+        for level in range(<int>m - 1, -1, -1):
+            while self.values[self.nexts[node * m + level]] < value:
+                node = self.nexts[node * m + level]
+            chain[level] = node
+
+        target = self.nexts[chain[0] * m]
+        require(target != self.capacity + 1 and self.values[target] == value,
+                KeyError,
+                "{0} is not in the skip list".format(value))
+
+        for level in range(<int>self.levels[target]):
+            prev = chain[level]
+            self.widths[prev * m + level] += self.widths[target * m + level] - 1
+            self.nexts[prev * m + level] = self.nexts[target * m + level]
+
+        for level in range(<int>self.levels[target], <int>m):
+            self.widths[chain[level] * m + level] -= 1
+
+        self.free_nodes[self.n_free] = target
+        self.n_free += 1
+        self.count -= 1
+        return 0
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef double get(self, size_t i):
+        cdef size_t node = 0
+        cdef size_t m = self.max_levels
+        cdef int level
+
+        if i >= self.count:
+            return NAN
+
+        i += 1
+        for level in range(<int>m - 1, -1, -1):
+            while self.widths[node * m + level] <= i:
+                i -= self.widths[node * m + level]
+                node = self.nexts[node * m + level]
+        return self.values[node]
+
+    cdef inline size_t size(self):
+        return self.count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, size_t item):
+        require(item < self.count, IndexError, "skip list index out of range")
+        return self.get(item)
+
+    def add(self, double value):
+        return self.insert(value)
+
+    def discard(self, double value):
+        self.remove(value)
+
+    def tolist(self):
+        cdef list res = []
+        cdef size_t node = self.nexts[0]
+        while node != self.capacity + 1:
+            res.append(self.values[node])
+            node = self.nexts[node * self.max_levels]
+        return res
+
+    def __reduce_ex__(self, protocol):
+        cdef bytearray data = bytearray(sizeof(double) * self.count)
+        cdef double* con = <double*><char*>data
+        cdef size_t node = self.nexts[0]
+        cdef size_t i = 0
+        while node != self.capacity + 1:
+            con[i] = self.values[node]
+            node = self.nexts[node * self.max_levels]
+            i += 1
+        return rebuild_skip_list, (self.capacity, _raw(bytes(data), protocol))
+
+
+cpdef object rebuild_skip_list(size_t capacity, values):
+    cdef SkipList c = SkipList(capacity)
+    cdef const double[::1] items = _items(values, 'd')
+    cdef size_t i
+    for i in range(items.shape[0]):
+        c.insert(items[i])
+    return c
@@ -7,6 +7,7 @@ Created on 2017-6-7
 
 from math import exp
 from math import fabs
+import numpy as np
 from numpy import inf
 from PyFin.Utilities.Asserts import require
 from PyFin.Math.RootFinder.RootFinderBase import RootFinder
@@ -75,6 +76,140 @@ class BracketedBrent(RootFinder):
         return s
 
 
+class BracketedBrentArray(RootFinder):
+    u"""
+    Lock-step version of BracketedBrent: every element of the arrays is an
+    independent bracket, and each putY/nextX call advances all the elements
+    that are still active with the same steps as the scalar engine.
+
+    Brackets that don't contain a root are not raised on; they are left
+    inactive and reported as not converged by solve().
+    """
+
+    def __init__(self, tol, low=None, high=None):
+        self.tol = tol
+        self.ax = None
+        self.ay = None
+        self.bx = None
+        self.by = None
+        self.cx = None
+        self.cy = None
+        self.bisect = None
+        self.d = None
+        self.bracketed = None
+        self.active = None
+
+        if low is not None and high is not None:
+            self.initialize(low, high)
+
+    def initialize(self, low, high):
+        ax, ay, bx, by = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in (low[0], low[1], high[0], high[1])])
+        self.ax = ax.copy()
+        self.ay = ay.copy()
+        self.bx = bx.copy()
+        self.by = by.copy()
+
+        self.bracketed = self.ay * self.by <= 0.
+        self.active = self.bracketed.copy()
+        self._order()
+
+        self.cx = self.ax.copy()
+        self.cy = self.ay.copy()
+        self.bisect = np.ones(self.ax.shape, dtype=bool)
+        self.d = np.zeros(self.ax.shape)
+
+    def _order(self):
+        swap = np.abs(self.ay) < np.abs(self.by)
+        self.ax, self.bx = np.where(swap, self.bx, self.ax), np.where(swap, self.ax, self.bx)
+        self.ay, self.by = np.where(swap, self.by, self.ay), np.where(swap, self.ay, self.by)
+
+    def bracketWidth(self):
+        return np.abs(self.ax - self.bx)
+
+    def putY(self, y):
+        u"""
+        Feed the function values at the last nextX(); only the active elements
+        are updated.
+        """
+        y = np.asarray(y, dtype=float)
+        active = self.active
+        s = self.d
+        self.d = np.where(active, self.cx, self.d)
+        self.cx = np.where(active, self.bx, self.cx)
+        self.cy = np.where(active, self.by, self.cy)
+
+        same = y * self.ay > 0.
+        toA = active & same
+        toB = active & ~same
+        self.ax = np.where(toA, s, self.ax)
+        self.ay = np.where(toA, y, self.ay)
+        self.bx = np.where(toB, s, self.bx)
+        self.by = np.where(toB, y, self.by)
+        self._order()
+
+    def nextX(self):
+        u"""
+        Next trial point of every element; inactive elements get the best
+        point of their bracket.
+        """
+        ax, ay, bx, by, cx, cy = self.ax, self.ay, self.bx, self.by, self.cx, self.cy
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # inverse quadratic interpolation
+            quadratic = ax * by * cy / ((ay - by) * (ay - cy)) \
+                + bx * ay * cy / ((by - ay) * (by - cy)) \
+                + cx * ay * by / ((cy - ay) * (cy - by))
+            secant = (ax * by - bx * ay) / (by - ay)
+        s = np.where((cy != ay) & (cy != by), quadratic, secant)
+
+        c_dist = np.where(self.bisect, np.abs(cx - bx), np.abs(self.d))
+        bisect = ((s - bx) * (s - 0.75 * ax - 0.25 * bx) >= 0.) \
+            | (np.abs(s - bx) > 0.5 * c_dist) \
+            | (c_dist < self.tol) \
+            | ~np.isfinite(s)
+        s = np.where(bisect, 0.5 * (ax + bx), s)
+
+        self.bisect = np.where(self.active, bisect, self.bisect)
+        self.d = np.where(self.active, s, self.d)
+        return np.where(self.active, s, bx)
+
+    def solve(self, func, x_tol, f_tol, maxIterations=100):
+        u"""
+        Drive all the brackets to their roots. ``func`` maps an array of trial
+        points to the array of function values, element by element; inactive
+        elements are evaluated at their last point and ignored.
+
+        An element stops as soon as its value is below f_tol or its bracket
+        is narrower than x_tol, as with Converged.check_converge.
+
+        :return: (roots, iterations, converged) where iterations counts the
+                 function evaluations of every element; roots are nan for
+                 elements without a bracket or with non finite values
+        """
+        roots = np.full(self.ax.shape, np.nan)
+        iterations = np.zeros(self.ax.shape, dtype=int)
+        converged = np.zeros(self.ax.shape, dtype=bool)
+
+        for _ in range(maxIterations):
+            if not self.active.any():
+                break
+            x = self.nextX()
+            y = np.asarray(func(x), dtype=float)
+            active = self.active
+            iterations[active] += 1
+            roots[active] = x[active]
+
+            finite = np.isfinite(y)
+            roots[active & ~finite] = np.nan
+            self.active = active & finite
+            self.putY(y)
+
+            done = self.active & ((np.abs(y) < f_tol) | (self.bracketWidth() < x_tol))
+            converged |= done
+            self.active = self.active & ~done
+
+        return roots, iterations, converged
+
+
 class Brent(RootFinder):
 
     expansion = exp(1.0)
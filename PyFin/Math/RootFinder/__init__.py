@@ -13,11 +13,13 @@ Derivatives Algorithms, Volume 1: Bones, 2nd ed., Tom Hyer, World Scientific, 20
 """
 
 from PyFin.Math.RootFinder.Brent import BracketedBrent
+from PyFin.Math.RootFinder.Brent import BracketedBrentArray
 from PyFin.Math.RootFinder.Brent import Brent
 
 from PyFin.Math.RootFinder.utilities import Converged
 
 
 __all__ = ['BracketedBrent',
+           'BracketedBrentArray',
            'Brent',
            'Converged']
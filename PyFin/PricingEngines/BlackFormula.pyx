@@ -5,7 +5,9 @@ Created on 2017-2-4
 @author: cheng.li
 """
 
+import numpy as np
 cimport cython
+from cython.parallel cimport prange
 from libc.math cimport log
 from libc.math cimport exp
 from libc.math cimport sqrt
@@ -13,18 +15,43 @@ from libc.math cimport fabs
 from libc.math cimport fmax
 from libc.math cimport fmin
 from libc.math cimport atanh
+from libc.math cimport isfinite
 from PyFin.Enums._OptionType cimport OptionType
-from libc.stdlib cimport malloc
-from libc.stdlib cimport free
 from PyFin.Math.Distributions.norm cimport cdf
 from PyFin.Math.Distributions.norm cimport pdf
 from PyFin.Math.Distributions.norm cimport cdf_derivative
+from PyFin.Math.MathConstants cimport NAN
+from PyFin.Utilities.Asserts cimport require
 
 cdef double _M_PI = 3.14159265358979323846
 cdef double _M_SQRT_2 = 0.7071067811865475244008443621048490392848359376887
 cdef double _M_1_SQRTPI = 0.564189583547756286948
 cdef double _QL_EPSILON = 2.2250738585072014e-308
 
+cpdef enum ImpliedVolStatus:
+    Converged = 0
+    MaxIterations = 1
+    Invalid = 2
+
+cdef struct BlackGreeks:
+    double price
+    double delta
+    double gamma
+    double vega
+    double theta
+    double rho
+    double vanna
+    double volga
+
+GREEKS_DTYPE = np.dtype([('price', float),
+                         ('delta', float),
+                         ('gamma', float),
+                         ('vega', float),
+                         ('theta', float),
+                         ('rho', float),
+                         ('vanna', float),
+                         ('volga', float)])
+
 cdef int _checkParameters(double strike, double forward, double displacement) nogil:
     if displacement >= 0 and strike + displacement >= 0 and forward + displacement >= 0:
         return 0
@@ -121,6 +148,77 @@ cpdef double blackFormula2(int optionType,
                    discount,
                    displacement)
 
+@cython.cdivision(True)
+cdef BlackGreeks _blackGreeksImpl(int optionType,
+                                  double strike,
+                                  double forward,
+                                  double tte,
+                                  double vol,
+                                  double riskFree=0.0,
+                                  double displacement=0.0) noexcept nogil:
+    cdef BlackGreeks greeks
+    cdef double discount = exp(-riskFree * tte)
+    cdef double sqrtT = sqrt(tte)
+    cdef double stdDev = sqrtT * vol
+    cdef double d1
+    cdef double d2
+    cdef double nd1
+    cdef double nd2
+    cdef double pd1
+
+    greeks.gamma = 0.0
+    greeks.vega = 0.0
+    greeks.vanna = 0.0
+    greeks.volga = 0.0
+
+    forward += displacement
+    strike += displacement
+
+    if stdDev == 0.0 or strike == 0.0:
+        if strike == 0.0:
+            greeks.delta = discount if optionType == OptionType.Call else 0.0
+        else:
+            greeks.delta = discount * optionType if (forward - strike) * optionType > 0.0 else 0.0
+        greeks.price = greeks.delta * (forward - strike)
+        greeks.theta = riskFree * greeks.price
+        greeks.rho = -tte * greeks.price
+        return greeks
+
+    # one pass over the intermediates shared by the price and all the greeks
+    d1 = log(forward / strike) / stdDev + 0.5 * stdDev
+    d2 = d1 - stdDev
+    nd1 = cdf(d1 * optionType)
+    nd2 = cdf(d2 * optionType)
+    pd1 = cdf_derivative(d1)
+
+    greeks.price = discount * optionType * (forward * nd1 - strike * nd2)
+    greeks.delta = discount * optionType * nd1
+    greeks.gamma = discount * pd1 / (forward * stdDev)
+    greeks.vega = discount * forward * pd1 * sqrtT
+    greeks.theta = riskFree * greeks.price - 0.5 * discount * forward * pd1 * vol / sqrtT
+    greeks.rho = -tte * greeks.price
+    greeks.vanna = -discount * pd1 * d2 / vol
+    greeks.volga = greeks.vega * d1 * d2 / vol
+    return greeks
+
+cpdef BlackGreeks blackGreeks(int optionType,
+                              double strike,
+                              double forward,
+                              double tte,
+                              double vol,
+                              double riskFree=0.0,
+                              double displacement=0.0):
+    u"""
+    Black price of an option on a forward together with its greeks:
+    delta and gamma w.r.t. the forward, vega, vanna (d2V/dFdvol) and volga
+    (d2V/dvol2) w.r.t. the volatility, theta as the change per unit of
+    calendar time and rho w.r.t. riskFree with the forward held fixed.
+
+    :return: dict with keys price, delta, gamma, vega, theta, rho, vanna, volga
+    """
+    cdef int flag = _checkParameters(strike, forward, displacement)
+    return _blackGreeksImpl(optionType, strike, forward, tte, vol, riskFree, displacement)
+
 @cython.cdivision(True)
 cdef double _bsImplStdDevAppr(int optionType, double strike, double forward, double blackPrice, double discount=1.0,
                               double displacement=0.0) nogil:
@@ -158,35 +256,74 @@ cdef double _bsImplStdDevAppr(int optionType, double strike, double forward, dou
         return temp / (forward + strike)
 
 @cython.cdivision(True)
-cdef double _bsImplStdDev(int optionType,
-                          double strike,
-                          double forward,
-                          double blackPrice,
-                          double discount=1.0,
-                          double displacement=0.0,
-                          double xAccuracy=1e-5) nogil:
+cdef double _bsImplStdDevWithStatus(int*status,
+                                    int optionType,
+                                    double strike,
+                                    double forward,
+                                    double blackPrice,
+                                    double discount=1.0,
+                                    double displacement=0.0,
+                                    double xAccuracy=1e-5) nogil:
     cdef double stdDev
-    cdef double stdDevOld
     cdef double err
     cdef double diff
     cdef int count = 0
-    cdef double*dStdDev = <double *> malloc(sizeof(double))
+    cdef double dStdDev = 0.0
+
+    status[0] = ImpliedVolStatus.MaxIterations
 
     # using newton step to fine tune the stdDev
     stdDev = _bsImplStdDevAppr(optionType, strike, forward, blackPrice, discount, displacement)
 
-    err = _bsImplWithDerivative(dStdDev, optionType, strike, forward, stdDev, discount, displacement) - blackPrice
+    err = _bsImplWithDerivative(&dStdDev, optionType, strike, forward, stdDev, discount, displacement) - blackPrice
     while count <= 100:
         count += 1
-        stdDevOld = stdDev
-        diff = err / dStdDev[0]
+        diff = err / dStdDev
         stdDev -= diff
-        err = _bsImplWithDerivative(dStdDev, optionType, strike, forward, stdDev, discount, displacement) - blackPrice
+        err = _bsImplWithDerivative(&dStdDev, optionType, strike, forward, stdDev, discount, displacement) - blackPrice
 
         if fabs(diff) <= xAccuracy:
+            status[0] = ImpliedVolStatus.Converged
             break
 
-    free(dStdDev)
+    if not isfinite(stdDev):
+        status[0] = ImpliedVolStatus.Invalid
+    return stdDev
+
+cdef double _bsImplStdDev(int optionType,
+                          double strike,
+                          double forward,
+                          double blackPrice,
+                          double discount=1.0,
+                          double displacement=0.0,
+                          double xAccuracy=1e-5) nogil:
+    cdef int status
+    return _bsImplStdDevWithStatus(&status,
+                                   optionType,
+                                   strike,
+                                   forward,
+                                   blackPrice,
+                                   discount,
+                                   displacement,
+                                   xAccuracy)
+
+cdef double _impliedStdDevElement(int*status,
+                                  int optionType,
+                                  double strike,
+                                  double forward,
+                                  double blackPrice,
+                                  double discount,
+                                  double displacement,
+                                  double xAccuracy) noexcept nogil:
+    cdef double stdDev
+
+    if _checkParameters(strike, forward, displacement) != 0 or not isfinite(blackPrice):
+        status[0] = ImpliedVolStatus.Invalid
+        return NAN
+
+    stdDev = _bsImplStdDevWithStatus(status, optionType, strike, forward, blackPrice, discount, displacement, xAccuracy)
+    if status[0] == ImpliedVolStatus.Invalid:
+        return NAN
     return stdDev
 
 cpdef double blackFormulaImpliedStdDev(int optionType,
@@ -299,3 +436,270 @@ cpdef double bachelierFormulaImpliedVol(int optionType,
 
     heta = _hcalculate(eta)
     return sqrt(_M_PI / (2. * tte)) * straddlePremium * heta
+
+
+# vectorized versions of the formulas above. Inputs are broadcast against each
+# other, results are written into ``out`` (allocated when not given) and the
+# loops run without the GIL, over ``num_threads`` OpenMP threads if requested.
+
+def _broadcast(optionTypes, *values):
+    arrays = np.broadcast_arrays(np.asarray(optionTypes, dtype=np.intc),
+                                 *[np.asarray(v, dtype=float) for v in values])
+    require(arrays[0].ndim == 1, ValueError, "inputs should be broadcastable to a 1-d array")
+    return arrays
+
+
+def _output(out, size_t n, dtype=float):
+    if out is None:
+        return np.empty(n, dtype=dtype)
+    require(out.shape == (n,), ValueError, "output buffer should have shape ({0},)".format(n))
+    return out
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def blackFormulaArray(optionTypes,
+                      strikes,
+                      forwards,
+                      stdDevs,
+                      discounts=1.0,
+                      double displacement=0.0,
+                      out=None,
+                      int num_threads=1):
+    cdef const int[:] types
+    cdef const double[:] k
+    cdef const double[:] f
+    cdef const double[:] s
+    cdef const double[:] d
+    cdef double[:] res
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n
+
+    types, k, f, s, d = _broadcast(optionTypes, strikes, forwards, stdDevs, discounts)
+    n = types.shape[0]
+    out = _output(out, n)
+    res = out
+
+    for i in prange(n, nogil=True, num_threads=num_threads, schedule='static'):
+        res[i] = _bsImpl(types[i], k[i], f[i], s[i], d[i], displacement)
+    return out
+
+
+@cython.cdivision(True)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def blackFormula2Array(optionTypes,
+                       strikes,
+                       forwards,
+                       ttes,
+                       vols,
+                       riskFrees=0.0,
+                       double displacement=0.0,
+                       out=None,
+                       int num_threads=1):
+    cdef const int[:] types
+    cdef const double[:] k
+    cdef const double[:] f
+    cdef const double[:] t
+    cdef const double[:] v
+    cdef const double[:] r
+    cdef double[:] res
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n
+
+    types, k, f, t, v, r = _broadcast(optionTypes, strikes, forwards, ttes, vols, riskFrees)
+    n = types.shape[0]
+    out = _output(out, n)
+    res = out
+
+    for i in prange(n, nogil=True, num_threads=num_threads, schedule='static'):
+        if t[i] == 0.0:
+            res[i] = fmax((f[i] - k[i]) * types[i], 0.0)
+        else:
+            res[i] = _bsImpl(types[i], k[i], f[i], sqrt(t[i]) * v[i], exp(-r[i] * t[i]), displacement)
+    return out
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def blackFormulaImpliedStdDevArray(optionTypes,
+                                   strikes,
+                                   forwards,
+                                   blackPrices,
+                                   discounts=1.0,
+                                   double displacement=0.0,
+                                   double xAccuracy=1e-5,
+                                   out=None,
+                                   status=None,
+                                   int num_threads=1):
+    u"""
+    Implied standard deviations of an array of black prices.
+
+    :return: (stdDevs, status) where status holds an ImpliedVolStatus per
+             element: Converged, MaxIterations when the newton iteration did
+             not reach xAccuracy, or Invalid for bad inputs and non finite
+             results (the implied std dev is then set to nan)
+    """
+    cdef const int[:] types
+    cdef const double[:] k
+    cdef const double[:] f
+    cdef const double[:] p
+    cdef const double[:] d
+    cdef double[:] res
+    cdef int[:] flags
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n
+
+    types, k, f, p, d = _broadcast(optionTypes, strikes, forwards, blackPrices, discounts)
+    n = types.shape[0]
+    out = _output(out, n)
+    status = _output(status, n, np.intc)
+    res = out
+    flags = status
+
+    for i in prange(n, nogil=True, num_threads=num_threads, schedule='dynamic'):
+        res[i] = _impliedStdDevElement(&flags[i], types[i], k[i], f[i], p[i], d[i], displacement, xAccuracy)
+    return out, status
+
+
+@cython.cdivision(True)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def blackFormulaImpliedVolArray(optionTypes,
+                                strikes,
+                                forwards,
+                                ttes,
+                                blackPrices,
+                                riskFrees=0.0,
+                                double displacement=0.0,
+                                double xAccuracy=1e-5,
+                                out=None,
+                                status=None,
+                                int num_threads=1):
+    u"""
+    Implied black volatilities of an array of prices.
+
+    :return: (vols, status), see blackFormulaImpliedStdDevArray
+    """
+    cdef const int[:] types
+    cdef const double[:] k
+    cdef const double[:] f
+    cdef const double[:] t
+    cdef const double[:] p
+    cdef const double[:] r
+    cdef double[:] res
+    cdef int[:] flags
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n
+
+    types, k, f, t, p, r = _broadcast(optionTypes, strikes, forwards, ttes, blackPrices, riskFrees)
+    n = types.shape[0]
+    out = _output(out, n)
+    status = _output(status, n, np.intc)
+    res = out
+    flags = status
+
+    for i in prange(n, nogil=True, num_threads=num_threads, schedule='dynamic'):
+        res[i] = _impliedStdDevElement(&flags[i],
+                                       types[i],
+                                       k[i],
+                                       f[i],
+                                       p[i],
+                                       exp(-r[i] * t[i]),
+                                       displacement,
+                                       xAccuracy) / sqrt(t[i])
+    return out, status
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def bachelierFormulaArray(optionTypes,
+                          strikes,
+                          forwards,
+                          stdDevs,
+                          discounts=1.0,
+                          out=None,
+                          int num_threads=1):
+    cdef const int[:] types
+    cdef const double[:] k
+    cdef const double[:] f
+    cdef const double[:] s
+    cdef const double[:] d
+    cdef double[:] res
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n
+
+    types, k, f, s, d = _broadcast(optionTypes, strikes, forwards, stdDevs, discounts)
+    n = types.shape[0]
+    out = _output(out, n)
+    res = out
+
+    for i in prange(n, nogil=True, num_threads=num_threads, schedule='static'):
+        res[i] = bachelierFormula(types[i], k[i], f[i], s[i], d[i])
+    return out
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def bachelierFormulaImpliedVolArray(optionTypes,
+                                    strikes,
+                                    forwards,
+                                    ttes,
+                                    bachelierPrices,
+                                    discounts=1.0,
+                                    out=None,
+                                    int num_threads=1):
+    cdef const int[:] types
+    cdef const double[:] k
+    cdef const double[:] f
+    cdef const double[:] t
+    cdef const double[:] p
+    cdef const double[:] d
+    cdef double[:] res
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n
+
+    types, k, f, t, p, d = _broadcast(optionTypes, strikes, forwards, ttes, bachelierPrices, discounts)
+    n = types.shape[0]
+    out = _output(out, n)
+    res = out
+
+    for i in prange(n, nogil=True, num_threads=num_threads, schedule='static'):
+        res[i] = bachelierFormulaImpliedVol(types[i], k[i], f[i], t[i], p[i], d[i])
+    return out
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def blackGreeksArray(optionTypes,
+                     strikes,
+                     forwards,
+                     ttes,
+                     vols,
+                     riskFrees=0.0,
+                     double displacement=0.0,
+                     out=None,
+                     int num_threads=1):
+    u"""
+    Vectorized blackGreeks.
+
+    :return: structured array of GREEKS_DTYPE, e.g. ``res['delta']``
+    """
+    cdef const int[:] types
+    cdef const double[:] k
+    cdef const double[:] f
+    cdef const double[:] t
+    cdef const double[:] v
+    cdef const double[:] r
+    cdef BlackGreeks[:] res
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n
+
+    types, k, f, t, v, r = _broadcast(optionTypes, strikes, forwards, ttes, vols, riskFrees)
+    n = types.shape[0]
+    out = _output(out, n, GREEKS_DTYPE)
+    res = out
+
+    for i in prange(n, nogil=True, num_threads=num_threads, schedule='static'):
+        res[i] = _blackGreeksImpl(types[i], k[i], f[i], t[i], v[i], r[i], displacement)
+    return out
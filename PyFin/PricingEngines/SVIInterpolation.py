@@ -9,40 +9,32 @@ import numpy as np
 from scipy.optimize import least_squares
 from PyFin.PricingEngines.SVIInterpolationImpl import sviVolatility
 from PyFin.PricingEngines.SVIInterpolationImpl import sviVolatilities
+from PyFin.PricingEngines.SVIInterpolationImpl import sviVolatilityGrid
 from PyFin.PricingEngines.SVIInterpolationImpl import _sviCalibrationIteration
+from PyFin.PricingEngines.SVIInterpolationImpl import _sviCalibrationJacobian
 from PyFin.PricingEngines.SVIInterpolationImpl import _parametersCheck
+from PyFin.PricingEngines.SVIInterpolationImpl import sviVolatilityJacobian
+from PyFin.PricingEngines.SurfaceCalibration import calibrateSlices
 
 
-def sviCalibration(strikes,
-                   volatilites,
-                   forward,
-                   expiryTime,
-                   initialA,
-                   initialB,
-                   initialSigma,
-                   initialRho,
-                   initialM,
-                   isFixedA=False,
-                   isFixedB=False,
-                   isFixedSigma=False,
-                   isFixedRho=False,
-                   isFixedM=False,
-                   method='trf'):
-    x0, freeParameters, fixedParameters, bounds = _parametersCheck(initialA,
-                                                                   initialB,
-                                                                   initialSigma,
-                                                                   initialRho,
-                                                                   initialM,
-                                                                   isFixedA,
-                                                                   isFixedB,
-                                                                   isFixedSigma,
-                                                                   isFixedRho,
-                                                                   isFixedM)
+_PARAMETERS = ['a', 'b', 'sigma', 'rho', 'm']
+
+
+def _calibrateSvi(strikes,
+                  volatilites,
+                  forward,
+                  expiryTime,
+                  initialParameters,
+                  isFixed,
+                  method,
+                  analyticJacobian):
+    x0, freeParameters, fixedParameters, bounds = _parametersCheck(*(list(initialParameters) + list(isFixed)))
 
     if method != 'lm':
         x = least_squares(_sviCalibrationIteration,
                           x0,
                           method=method,
+                          jac=_sviCalibrationJacobian if analyticJacobian else '2-point',
                           bounds=bounds,
                           ftol=1e-10,
                           gtol=1e-10,
@@ -52,24 +44,82 @@ def sviCalibration(strikes,
         x = least_squares(_sviCalibrationIteration,
                           x0,
                           method=method,
+                          jac=_sviCalibrationJacobian if analyticJacobian else '2-point',
                           ftol=1e-10,
                           gtol=1e-10,
                           xtol=1e-10,
                           args=(freeParameters, strikes, volatilites, forward, expiryTime, fixedParameters))
 
-    parameters = ['a', 'b', 'sigma', 'rho', 'm']
     calibratedParameters = dict(zip(freeParameters, x.x))
 
     res = []
-    for name in parameters:
+    for name in _PARAMETERS:
         try:
             res.append(calibratedParameters[name])
         except KeyError:
             res.append(fixedParameters[name])
 
-    return np.array(res), x.status, x.message
+    return x, np.array(res)
+
+
+def sviCalibration(strikes,
+                   volatilites,
+                   forward,
+                   expiryTime,
+                   initialA,
+                   initialB,
+                   initialSigma,
+                   initialRho,
+                   initialM,
+                   isFixedA=False,
+                   isFixedB=False,
+                   isFixedSigma=False,
+                   isFixedRho=False,
+                   isFixedM=False,
+                   method='trf',
+                   analyticJacobian=False):
+    x, parameters = _calibrateSvi(strikes,
+                                  volatilites,
+                                  forward,
+                                  expiryTime,
+                                  [initialA, initialB, initialSigma, initialRho, initialM],
+                                  [isFixedA, isFixedB, isFixedSigma, isFixedRho, isFixedM],
+                                  method,
+                                  analyticJacobian)
+    return parameters, x.status, x.message
+
+
+def sviSurfaceCalibration(slices,
+                          initialA,
+                          initialB,
+                          initialSigma,
+                          initialRho,
+                          initialM,
+                          isFixedA=False,
+                          isFixedB=False,
+                          isFixedSigma=False,
+                          isFixedRho=False,
+                          isFixedM=False,
+                          method='trf',
+                          warmStart=True,
+                          n_jobs=1):
+    u"""
+    SVI calibration of many (expiryTime, strikes, volatilities, forward)
+    slices, see calibrateSlices.
+    """
+    return calibrateSlices(_calibrateSvi,
+                           _PARAMETERS,
+                           slices,
+                           [initialA, initialB, initialSigma, initialRho, initialM],
+                           [isFixedA, isFixedB, isFixedSigma, isFixedRho, isFixedM],
+                           method,
+                           warmStart,
+                           n_jobs)
 
 
 __all__ = ['sviVolatility',
            'sviVolatilities',
-           'sviCalibration']
\ No newline at end of file
+           'sviVolatilityGrid',
+           'sviVolatilityJacobian',
+           'sviCalibration',
+           'sviSurfaceCalibration']
\ No newline at end of file
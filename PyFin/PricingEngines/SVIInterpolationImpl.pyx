@@ -6,43 +6,149 @@ Created on 2017-1-8
 """
 
 cimport cython
+from cython.parallel cimport prange
 from libc.math cimport sqrt
 from libc.math cimport log
+from libc.stdlib cimport malloc
+from libc.stdlib cimport free
 import numpy as np
 cimport numpy as np
+from PyFin.PricingEngines.SabrFormulaImpl import _scenarios
+from PyFin.PricingEngines.SabrFormulaImpl import _strikeGrid
+
+cdef struct _SviTerms:
+    double a
+    double b
+    double sigma2
+    double rho
+    double m
+    double expiry
+
+
+cdef inline void _sviTerms(double expiry,
+                           double a,
+                           double b,
+                           double sigma,
+                           double rho,
+                           double m,
+                           _SviTerms* terms) nogil:
+    terms.a = a
+    terms.b = b
+    terms.sigma2 = sigma * sigma
+    terms.rho = rho
+    terms.m = m
+    terms.expiry = expiry
+
+
+@cython.cdivision(True)
+cdef inline double _sviKernel(double logMoneyness, const _SviTerms* terms) nogil:
+    cdef double k = logMoneyness - terms.m
+    cdef double totalVariance = terms.a + terms.b * (terms.rho * k + sqrt(k * k + terms.sigma2))
+    return sqrt(totalVariance / terms.expiry)
+
 
 @cython.cdivision(True)
 cpdef double sviVolatility(double strike,
-                               double forward,
-                               double expiry,
-                               double a,
-                               double b,
-                               double sigma,
-                               double rho,
-                               double m) nogil:
-    k = log(strike / forward)
-    totalVairance = a + b * (rho * (k - m) + sqrt((k - m) * (k - m) + sigma * sigma))
-    return sqrt(totalVairance / expiry)
+                           double forward,
+                           double expiry,
+                           double a,
+                           double b,
+                           double sigma,
+                           double rho,
+                           double m) nogil:
+    cdef _SviTerms terms
+    _sviTerms(expiry, a, b, sigma, rho, m, &terms)
+    return _sviKernel(log(strike / forward), &terms)
+
 
+@cython.cdivision(True)
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cpdef np.ndarray[double, ndim=1]  sviVolatilities(double[:] strikes,
-                                     double forward,
-                                     double expiry,
-                                     double a,
-                                     double b,
-                                     double sigma,
-                                     double rho,
-                                     double m):
-    cdef int i
-    cdef size_t length = len(strikes)
+cpdef np.ndarray[double, ndim=1] sviVolatilities(double[:] strikes,
+                                    double forward,
+                                    double expiry,
+                                    double a,
+                                    double b,
+                                    double sigma,
+                                    double rho,
+                                    double m,
+                                    int num_threads=1):
+    cdef Py_ssize_t i
+    cdef Py_ssize_t length = strikes.shape[0]
     cdef np.ndarray[double, ndim=1] res = np.empty(length, np.float64)
+    cdef double[::1] view = res
+    cdef _SviTerms terms
+    cdef int threads = num_threads
 
-    for i in range(length):
-        res[i] = sviVolatility(strikes[i], forward, expiry, a, b, sigma, rho, m)
+    _sviTerms(expiry, a, b, sigma, rho, m, &terms)
+    for i in prange(length, nogil=True, num_threads=threads, schedule='static'):
+        view[i] = _sviKernel(log(strikes[i] / forward), &terms)
     return res
 
 
+@cython.cdivision(True)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def sviVolatilityGrid(strikes,
+                      forwards,
+                      expiries,
+                      a,
+                      b,
+                      sigmas,
+                      rhos,
+                      ms,
+                      int num_threads=1):
+    u"""
+    SVI volatilities of a strike grid under many scenarios, see
+    sabrVolatilityGrid.
+    """
+    cdef const double[:] f
+    cdef const double[:] t
+    cdef const double[:] pa
+    cdef const double[:] pb
+    cdef const double[:] ps
+    cdef const double[:] pr
+    cdef const double[:] pm
+    cdef const double[:, ::1] k
+    cdef double[:, ::1] logMoneyness
+    cdef double[:, ::1] res
+    cdef _SviTerms* terms
+    cdef Py_ssize_t n
+    cdef Py_ssize_t cols
+    cdef Py_ssize_t rows
+    cdef Py_ssize_t i
+    cdef Py_ssize_t idx
+
+    forwards, expiries, a, b, sigmas, rhos, ms = _scenarios(strikes, forwards, expiries, a, b, sigmas, rhos, ms)
+    n = forwards.shape[0]
+    strikes, forwards = _strikeGrid(strikes, forwards, n)
+    f, t, pa, pb, ps, pr, pm, k = forwards, expiries, a, b, sigmas, rhos, ms, strikes
+    rows = k.shape[0]
+    cols = k.shape[1]
+
+    out = np.empty((n, cols), dtype=float)
+    res = out
+    logMoneyness = np.empty((rows, cols), dtype=float)
+    if n == 0 or cols == 0:
+        return out
+
+    terms = <_SviTerms*> malloc(n * sizeof(_SviTerms))
+    if terms == NULL:
+        raise MemoryError()
+    try:
+        with nogil:
+            for i in range(n):
+                _sviTerms(t[i], pa[i], pb[i], ps[i], pr[i], pm[i], &terms[i])
+            for idx in prange(rows * cols, num_threads=num_threads, schedule='static'):
+                logMoneyness[idx // cols, idx % cols] = log(k[idx // cols, idx % cols] / f[idx // cols])
+            for idx in prange(n * cols, num_threads=num_threads, schedule='static'):
+                res[idx // cols, idx % cols] = _sviKernel(logMoneyness[idx // cols if rows > 1 else 0, idx % cols],
+                                                          &terms[idx // cols])
+    finally:
+        free(terms)
+    return out
+
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 cpdef np.ndarray[double, ndim=1] _sviCalibrationIteration(double[:] parameters,
@@ -64,6 +170,66 @@ cpdef np.ndarray[double, ndim=1] _sviCalibrationIteration(double[:] parameters,
                                         **argsDict)
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def sviVolatilityJacobian(double[:] strikes,
+                          double forward,
+                          double expiry,
+                          double a,
+                          double b,
+                          double sigma,
+                          double rho,
+                          double m):
+    u"""
+    Derivatives of sviVolatilities with respect to a, b, sigma, rho and m,
+    one row per strike.
+    """
+    cdef Py_ssize_t i
+    cdef Py_ssize_t length = strikes.shape[0]
+    cdef np.ndarray[double, ndim=2] res = np.empty((length, 5), np.float64)
+    cdef double[:, ::1] view = res
+    cdef double k
+    cdef double root
+    cdef double vol
+    cdef double scale
+
+    for i in range(length):
+        k = log(strikes[i] / forward) - m
+        root = sqrt(k * k + sigma * sigma)
+        vol = sqrt((a + b * (rho * k + root)) / expiry)
+        # d vol = d totalVariance / (2 * expiry * vol)
+        scale = 0.5 / (expiry * vol)
+        view[i, 0] = scale
+        view[i, 1] = scale * (rho * k + root)
+        view[i, 2] = scale * b * sigma / root
+        view[i, 3] = scale * b * k
+        view[i, 4] = -scale * b * (rho + k / root)
+    return res
+
+
+_SVI_PARAMETERS = {'a': 0, 'b': 1, 'sigma': 2, 'rho': 3, 'm': 4}
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef np.ndarray[double, ndim=2] _sviCalibrationJacobian(double[:] parameters,
+                            list parametetsNames,
+                            double[:] strikes,
+                            double[:] targetVols,
+                            double forward,
+                            double expiryTime,
+                            dict argsDict):
+
+    cdef int i
+    cdef str name
+
+    for i, name in enumerate(parametetsNames):
+        argsDict[name] = parameters[i]
+    jacobian = sviVolatilityJacobian(strikes, forward, expiryTime, **argsDict)
+    return -jacobian[:, [_SVI_PARAMETERS[name] for name in parametetsNames]]
+
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 cpdef _parametersCheck(double initialA,
@@ -117,7 +283,7 @@ cpdef _parametersCheck(double initialA,
         fixedParameters['m'] = initialM
     else:
         freeParameters.append('m')
-        x0.append(initialRho)
+        x0.append(initialM)
         bounds[0].append(-np.inf)
         bounds[1].append(np.inf)
 
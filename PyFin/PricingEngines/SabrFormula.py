@@ -9,37 +9,32 @@ import numpy as np
 from scipy.optimize import least_squares
 from PyFin.PricingEngines.SabrFormulaImpl import sabrVolatility
 from PyFin.PricingEngines.SabrFormulaImpl import sabrVolatilities
+from PyFin.PricingEngines.SabrFormulaImpl import sabrVolatilityGrid
 from PyFin.PricingEngines.SabrFormulaImpl import _sabrCalibrationIteration
+from PyFin.PricingEngines.SabrFormulaImpl import _sabrCalibrationJacobian
 from PyFin.PricingEngines.SabrFormulaImpl import _parametersCheck
+from PyFin.PricingEngines.SabrFormulaImpl import sabrVolatilityJacobian
+from PyFin.PricingEngines.SurfaceCalibration import calibrateSlices
 
 
-def sabrCalibration(strikes,
-                    volatilites,
-                    forward,
-                    expiryTime,
-                    intialAlpha,
-                    initialBeta,
-                    initialNu,
-                    initialRho,
-                    isFixedAlpha=False,
-                    isFixedBeta=False,
-                    isFixedNu=False,
-                    isFixedRho=False,
-                    method='trf'):
+_PARAMETERS = ['alpha', 'beta', 'nu', 'rho']
 
-    x0, freeParameters, fixedParameters, bounds = _parametersCheck(intialAlpha,
-                                                                   initialBeta,
-                                                                   initialNu,
-                                                                   initialRho,
-                                                                   isFixedAlpha,
-                                                                   isFixedBeta,
-                                                                   isFixedNu,
-                                                                   isFixedRho)
+
+def _calibrateSabr(strikes,
+                   volatilites,
+                   forward,
+                   expiryTime,
+                   initialParameters,
+                   isFixed,
+                   method,
+                   analyticJacobian):
+    x0, freeParameters, fixedParameters, bounds = _parametersCheck(*(list(initialParameters) + list(isFixed)))
 
     if method != 'lm':
         x = least_squares(_sabrCalibrationIteration,
                           x0,
                           method=method,
+                          jac=_sabrCalibrationJacobian if analyticJacobian else '2-point',
                           bounds=bounds,
                           ftol=1e-10,
                           gtol=1e-10,
@@ -49,24 +44,78 @@ def sabrCalibration(strikes,
         x = least_squares(_sabrCalibrationIteration,
                           x0,
                           method=method,
+                          jac=_sabrCalibrationJacobian if analyticJacobian else '2-point',
                           ftol=1e-10,
                           gtol=1e-10,
                           xtol=1e-10,
                           args=(freeParameters, strikes, volatilites, forward, expiryTime, fixedParameters))
 
-    parameters = ['alpha', 'beta', 'nu', 'rho']
     calibratedParameters = dict(zip(freeParameters, x.x))
 
     res = []
-    for name in parameters:
+    for name in _PARAMETERS:
         try:
             res.append(calibratedParameters[name])
         except KeyError:
             res.append(fixedParameters[name])
 
-    return np.array(res), x.status, x.message
+    return x, np.array(res)
+
+
+def sabrCalibration(strikes,
+                    volatilites,
+                    forward,
+                    expiryTime,
+                    intialAlpha,
+                    initialBeta,
+                    initialNu,
+                    initialRho,
+                    isFixedAlpha=False,
+                    isFixedBeta=False,
+                    isFixedNu=False,
+                    isFixedRho=False,
+                    method='trf',
+                    analyticJacobian=False):
+    x, parameters = _calibrateSabr(strikes,
+                                   volatilites,
+                                   forward,
+                                   expiryTime,
+                                   [intialAlpha, initialBeta, initialNu, initialRho],
+                                   [isFixedAlpha, isFixedBeta, isFixedNu, isFixedRho],
+                                   method,
+                                   analyticJacobian)
+    return parameters, x.status, x.message
+
+
+def sabrSurfaceCalibration(slices,
+                           intialAlpha,
+                           initialBeta,
+                           initialNu,
+                           initialRho,
+                           isFixedAlpha=False,
+                           isFixedBeta=False,
+                           isFixedNu=False,
+                           isFixedRho=False,
+                           method='trf',
+                           warmStart=True,
+                           n_jobs=1):
+    u"""
+    SABR calibration of many (expiryTime, strikes, volatilities, forward)
+    slices, see calibrateSlices.
+    """
+    return calibrateSlices(_calibrateSabr,
+                           _PARAMETERS,
+                           slices,
+                           [intialAlpha, initialBeta, initialNu, initialRho],
+                           [isFixedAlpha, isFixedBeta, isFixedNu, isFixedRho],
+                           method,
+                           warmStart,
+                           n_jobs)
 
 
 __all__ = ['sabrVolatility',
            'sabrVolatilities',
-           'sabrCalibration']
\ No newline at end of file
+           'sabrVolatilityGrid',
+           'sabrVolatilityJacobian',
+           'sabrCalibration',
+           'sabrSurfaceCalibration']
\ No newline at end of file
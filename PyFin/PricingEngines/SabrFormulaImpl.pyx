@@ -6,16 +6,84 @@ Created on 2017-1-6
 """
 
 cimport cython
+from cython.parallel cimport prange
 from libc.math cimport sqrt
 from libc.math cimport log
+from libc.math cimport exp
 from libc.math cimport fabs
+from libc.stdlib cimport malloc
+from libc.stdlib cimport free
 import numpy as np
 cimport numpy as np
 from PyFin.Math.MathConstants cimport QL_EPSILON
+from PyFin.Utilities.Asserts cimport require
 
 cdef double QL_EPSILON = QL_EPSILON
 
+cdef struct _SabrTerms:
+    # the parts of the Hagan formula that only depend on (expiry, alpha, beta, nu, rho)
+    double alpha
+    double rho
+    double oneMinusBeta
+    double oneMinusBeta2
+    double nuOverAlpha
+    double logOneMinusRho
+    double expiryTime
+    double c1
+    double c2
+    double c3
+
+
+@cython.cdivision(True)
+cdef inline void _sabrTerms(double expiryTime,
+                            double alpha,
+                            double beta,
+                            double nu,
+                            double rho,
+                            _SabrTerms* terms) nogil:
+    terms.alpha = alpha
+    terms.rho = rho
+    terms.oneMinusBeta = 1.0 - beta
+    terms.oneMinusBeta2 = terms.oneMinusBeta * terms.oneMinusBeta
+    terms.nuOverAlpha = nu / alpha
+    terms.logOneMinusRho = log(1.0 - rho)
+    terms.expiryTime = expiryTime
+    terms.c1 = terms.oneMinusBeta2 * alpha * alpha / 24.0
+    terms.c2 = 0.25 * rho * beta * nu * alpha
+    terms.c3 = (2.0 - 3.0 * rho * rho) * (nu * nu / 24.0)
+
+
+@cython.cdivision(True)
+cdef inline double _sabrLogMoneyness(double strike, double forward) nogil:
+    # with log(forward * strike), the part that only depends on (strike, forward);
+    # returned by value so the local it is assigned to in a prange is thread private
+    cdef double epsilon
+    if not fabs(forward - strike) < 1e-10:
+        return log(forward / strike)
+    epsilon = (forward - strike) / strike
+    return epsilon * (1. - .5 * epsilon)
+
+
 @cython.cdivision(True)
+cdef inline double _sabrKernel(double logM, double logFK, const _SabrTerms* terms) nogil:
+    cdef double A = exp(terms.oneMinusBeta * logFK)
+    cdef double sqrtA = sqrt(A)
+    cdef double rho = terms.rho
+    cdef double z = terms.nuOverAlpha * sqrtA * logM
+    cdef double B = 1.0 - (2.0 * rho - z) * z
+    cdef double C = terms.oneMinusBeta2 * logM * logM
+    cdef double xx = log(sqrt(B) + z - rho) - terms.logOneMinusRho
+    cdef double D = sqrtA * (1.0 + C / 24.0 + C * C / 1920.0)
+    cdef double d = 1.0 + terms.expiryTime * (terms.c1 / A + terms.c2 / sqrtA + terms.c3)
+    cdef double multiplier
+
+    if fabs(z * z) > QL_EPSILON * 10:
+        multiplier = z / xx
+    else:
+        multiplier = 1.0 - 0.5 * rho * z - (3.0 * rho * rho - 2.0) * z * z / 12.0
+    return (terms.alpha / D) * multiplier * d
+
+
 cpdef double sabrVolatility(double strike,
                             double forward,
                             double expiryTime,
@@ -23,19 +91,193 @@ cpdef double sabrVolatility(double strike,
                             double beta,
                             double nu,
                             double rho) nogil:
+    cdef _SabrTerms terms
+    _sabrTerms(expiryTime, alpha, beta, nu, rho, &terms)
+    return _sabrKernel(_sabrLogMoneyness(strike, forward), log(forward * strike), &terms)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef np.ndarray[double, ndim=1] sabrVolatilities(double[:] strikes,
+                     double forward,
+                     double expiry,
+                     double alpha,
+                     double beta,
+                     double nu,
+                     double rho,
+                     int num_threads=1):
+    cdef Py_ssize_t i
+    cdef Py_ssize_t length = strikes.shape[0]
+    cdef np.ndarray[double, ndim=1] res = np.empty(length, np.float64)
+    cdef double[::1] view = res
+    cdef _SabrTerms terms
+    cdef int threads = num_threads
+    cdef double logM
+    cdef double logFK
+
+    _sabrTerms(expiry, alpha, beta, nu, rho, &terms)
+    for i in prange(length, nogil=True, num_threads=threads, schedule='static'):
+        logM = _sabrLogMoneyness(strikes[i], forward)
+        logFK = log(forward * strikes[i])
+        view[i] = _sabrKernel(logM, logFK, &terms)
+    return res
+
+
+def _strikeGrid(strikes, forwards, Py_ssize_t n):
+    u"""
+    (n, m) strikes, or (1, m) when all the scenarios share the strikes and the
+    forward so the strike terms are computed only once.
+    """
+    strikes = np.asarray(strikes, dtype=float)
+    require(strikes.ndim in (1, 2), ValueError, "strikes should be a 1-d or a 2-d array")
+    if strikes.ndim == 1:
+        if n and (forwards == forwards[0]).all():
+            return np.ascontiguousarray(strikes[None, :]), forwards[:1]
+        return np.ascontiguousarray(np.broadcast_to(strikes, (n, strikes.shape[0]))), forwards
+    require(strikes.shape[0] == n, ValueError, "strikes should have one row per scenario")
+    return np.ascontiguousarray(strikes), forwards
+
+
+def _scenarios(strikes, *values):
+    n = np.shape(strikes)[0] if np.ndim(strikes) == 2 else 1
+    arrays = np.broadcast_arrays(np.empty(n), *[np.asarray(v, dtype=float) for v in values])[1:]
+    require(arrays[0].ndim == 1, ValueError, "scenario parameters should be scalars or 1-d arrays")
+    return [np.ascontiguousarray(a) for a in arrays]
+
+
+@cython.cdivision(True)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def sabrVolatilityGrid(strikes,
+                       forwards,
+                       expiryTimes,
+                       alphas,
+                       betas,
+                       nus,
+                       rhos,
+                       int num_threads=1):
+    u"""
+    SABR volatilities of a strike grid under many scenarios.
+
+    :param strikes: 1-d array of strikes shared by every scenario, or a 2-d
+                    array with one row of strikes per scenario
+    :param forwards, expiryTimes, alphas, betas, nus, rhos: scalars or 1-d
+                    arrays with one value per scenario
+    :return: 2-d array of volatilities, one row per scenario
+    """
+    cdef const double[:] f
+    cdef const double[:] t
+    cdef const double[:] a
+    cdef const double[:] b
+    cdef const double[:] v
+    cdef const double[:] r
+    cdef const double[:, ::1] k
+    cdef double[:, ::1] logM
+    cdef double[:, ::1] logFK
+    cdef double[:, ::1] res
+    cdef _SabrTerms* terms
+    cdef Py_ssize_t n
+    cdef Py_ssize_t m
+    cdef Py_ssize_t rows
+    cdef Py_ssize_t i
+    cdef Py_ssize_t j
+    cdef Py_ssize_t idx
+    cdef Py_ssize_t row
+
+    forwards, expiryTimes, alphas, betas, nus, rhos = _scenarios(strikes, forwards, expiryTimes, alphas, betas, nus, rhos)
+    n = forwards.shape[0]
+    strikes, forwards = _strikeGrid(strikes, forwards, n)
+    f, t, a, b, v, r, k = forwards, expiryTimes, alphas, betas, nus, rhos, strikes
+    rows = k.shape[0]
+    m = k.shape[1]
+
+    out = np.empty((n, m), dtype=float)
+    res = out
+    logM = np.empty((rows, m), dtype=float)
+    logFK = np.empty((rows, m), dtype=float)
+    if n == 0 or m == 0:
+        return out
+
+    terms = <_SabrTerms*> malloc(n * sizeof(_SabrTerms))
+    if terms == NULL:
+        raise MemoryError()
+    try:
+        with nogil:
+            for i in range(n):
+                _sabrTerms(t[i], a[i], b[i], v[i], r[i], &terms[i])
+            for idx in prange(rows * m, num_threads=num_threads, schedule='static'):
+                logM[idx // m, idx % m] = _sabrLogMoneyness(k[idx // m, idx % m], f[idx // m])
+                logFK[idx // m, idx % m] = log(f[idx // m] * k[idx // m, idx % m])
+            for idx in prange(n * m, num_threads=num_threads, schedule='static'):
+                i = idx // m
+                j = idx % m
+                row = i if rows > 1 else 0
+                res[i, j] = _sabrKernel(logM[row, j], logFK[row, j], &terms[i])
+    finally:
+        free(terms)
+    return out
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef np.ndarray[double, ndim=1] _sabrCalibrationIteration(double[:] parameters,
+                              list parametetsNames,
+                              double[:] strikes,
+                              double[:] targetVols,
+                              double forward,
+                              double expiryTime,
+                              dict argDict):
+    cdef int i
+    cdef str name
+    for i, name in enumerate(parametetsNames):
+        argDict[name] = parameters[i]
+    return targetVols - sabrVolatilities(strikes,
+                                         forward,
+                                         expiryTime,
+                                         **argDict)
+
+
+@cython.cdivision(True)
+cdef double _sabrVolatilityGradient(double strike,
+                                    double forward,
+                                    double expiryTime,
+                                    double alpha,
+                                    double beta,
+                                    double nu,
+                                    double rho,
+                                    double* grad) nogil:
+    # sabrVolatility with its derivatives with respect to (alpha, beta, nu, rho)
+    # carried along every intermediate quantity
     cdef double oneMinusBeta = 1.0 - beta
+    cdef double logFK = log(forward * strike)
     cdef double A = (forward * strike) ** oneMinusBeta
     cdef double sqrtA = sqrt(A)
+    cdef double dA_beta = -A * logFK
+    cdef double dSqrtA_beta = 0.5 * dA_beta / sqrtA
 
     cdef double logM
     cdef double epsilon
     cdef double z
     cdef double B
     cdef double C
+    cdef double sqrtB
+    cdef double N
     cdef double xx
+    cdef double series
     cdef double D
     cdef double d
     cdef double multiplier
+    cdef double vol
+    cdef double dz[4]
+    cdef double dB[4]
+    cdef double dxx[4]
+    cdef double dD[4]
+    cdef double dd[4]
+    cdef double dm[4]
+    cdef double dN
+    cdef double dRho
+    cdef double dAlpha
+    cdef int i
 
     if not fabs(forward - strike) < 1e-10:
         logM = log(forward / strike)
@@ -43,57 +285,103 @@ cpdef double sabrVolatility(double strike,
         epsilon = (forward - strike) / strike
         logM = epsilon * (1. - .5 * epsilon)
     z = (nu / alpha) * sqrtA * logM
+    dz[0] = -z / alpha
+    dz[1] = (nu / alpha) * dSqrtA_beta * logM
+    dz[2] = sqrtA * logM / alpha
+    dz[3] = 0.0
+
     B = 1.0 - (2.0 * rho - z) * z
     C = oneMinusBeta * oneMinusBeta * logM * logM
-    xx = log((sqrt(B) + z - rho) / (1.0 - rho))
-    D = sqrtA * (1.0 + C / 24.0 + C * C / 1920.0)
+    sqrtB = sqrt(B)
+    N = sqrtB + z - rho
+    xx = log(N / (1.0 - rho))
+    series = 1.0 + C / 24.0 + C * C / 1920.0
+    D = sqrtA * series
     d = 1.0 + expiryTime * \
               (oneMinusBeta * oneMinusBeta * alpha * alpha / (24.0 * A)
                + 0.25 * rho * beta * nu * alpha / sqrtA
                + (2.0 - 3.0 * rho * rho) * (nu * nu / 24.0))
 
+    for i in range(4):
+        dRho = 1.0 if i == 3 else 0.0
+        dB[i] = -2.0 * z * dRho + 2.0 * (z - rho) * dz[i]
+        dN = 0.5 * dB[i] / sqrtB + dz[i] - dRho
+        dxx[i] = dN / N + dRho / (1.0 - rho)
+        dD[i] = 0.0
+
+    dD[1] = dSqrtA_beta * series \
+            + sqrtA * (1.0 / 24.0 + C / 960.0) * (-2.0 * oneMinusBeta * logM * logM)
+
+    dd[0] = expiryTime * (oneMinusBeta * oneMinusBeta * alpha / (12.0 * A)
+                          + 0.25 * rho * beta * nu / sqrtA)
+    dd[1] = expiryTime * (-oneMinusBeta * alpha * alpha / (12.0 * A)
+                          - oneMinusBeta * oneMinusBeta * alpha * alpha * dA_beta / (24.0 * A * A)
+                          + 0.25 * rho * nu * alpha / sqrtA
+                          - 0.25 * rho * beta * nu * alpha * dSqrtA_beta / A)
+    dd[2] = expiryTime * (0.25 * rho * beta * alpha / sqrtA
+                          + (2.0 - 3.0 * rho * rho) * nu / 12.0)
+    dd[3] = expiryTime * (0.25 * beta * nu * alpha / sqrtA
+                          - 0.25 * rho * nu * nu)
+
     if fabs(z * z) > QL_EPSILON * 10:
         multiplier = z / xx
+        for i in range(4):
+            dm[i] = dz[i] / xx - z * dxx[i] / (xx * xx)
     else:
         multiplier = 1.0 - 0.5 * rho * z - (3.0 * rho * rho - 2.0) * z * z / 12.0
-    return (alpha / D) * multiplier * d
+        for i in range(4):
+            dRho = 1.0 if i == 3 else 0.0
+            dm[i] = -0.5 * (dRho * z + rho * dz[i]) \
+                    - (6.0 * rho * dRho * z * z + 2.0 * (3.0 * rho * rho - 2.0) * z * dz[i]) / 12.0
+
+    vol = (alpha / D) * multiplier * d
+    for i in range(4):
+        dAlpha = 1.0 if i == 0 else 0.0
+        grad[i] = (dAlpha * multiplier * d + alpha * (dm[i] * d + multiplier * dd[i])) / D - vol * dD[i] / D
+    return vol
 
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cpdef np.ndarray[double, ndim=1] sabrVolatilities(double[:] strikes,
-                     double forward,
-                     double expiry,
-                     double alpha,
-                     double beta,
-                     double nu,
-                     double rho):
-    cdef int i
-    cdef size_t length = len(strikes)
-    cdef np.ndarray[double, ndim=1] res = np.empty(length, np.float64)
+def sabrVolatilityJacobian(double[:] strikes,
+                           double forward,
+                           double expiryTime,
+                           double alpha,
+                           double beta,
+                           double nu,
+                           double rho):
+    u"""
+    Derivatives of sabrVolatilities with respect to alpha, beta, nu and rho,
+    one row per strike.
+    """
+    cdef Py_ssize_t i
+    cdef Py_ssize_t length = strikes.shape[0]
+    cdef np.ndarray[double, ndim=2] res = np.empty((length, 4), np.float64)
+    cdef double[:, ::1] view = res
 
     for i in range(length):
-        res[i] = sabrVolatility(strikes[i], forward, expiry, alpha, beta, nu, rho)
+        _sabrVolatilityGradient(strikes[i], forward, expiryTime, alpha, beta, nu, rho, &view[i, 0])
     return res
 
 
+_SABR_PARAMETERS = {'alpha': 0, 'beta': 1, 'nu': 2, 'rho': 3}
+
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cpdef np.ndarray[double, ndim=1] _sabrCalibrationIteration(double[:] parameters,
-                              list parametetsNames,
-                              double[:] strikes,
-                              double[:] targetVols,
-                              double forward,
-                              double expiryTime,
-                              dict argDict):
+cpdef np.ndarray[double, ndim=2] _sabrCalibrationJacobian(double[:] parameters,
+                             list parametetsNames,
+                             double[:] strikes,
+                             double[:] targetVols,
+                             double forward,
+                             double expiryTime,
+                             dict argDict):
     cdef int i
     cdef str name
     for i, name in enumerate(parametetsNames):
         argDict[name] = parameters[i]
-    return targetVols - sabrVolatilities(strikes,
-                                         forward,
-                                         expiryTime,
-                                         **argDict)
+    jacobian = sabrVolatilityJacobian(strikes, forward, expiryTime, **argDict)
+    return -jacobian[:, [_SABR_PARAMETERS[name] for name in parametetsNames]]
 
 
 @cython.boundscheck(False)
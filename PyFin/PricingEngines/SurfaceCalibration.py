@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+u"""
+Created on 2026-10-18
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from PyFin.Utilities.Tools import resolve_n_jobs
+from PyFin.Utilities.Asserts import require
+
+_DIAGNOSTICS = ['expiry', 'status', 'message', 'nfev', 'njev', 'cost', 'rmse', 'elapsed']
+
+
+def _calibrateChunk(calibrator, slices, initialParameters, isFixed, method, warmStart):
+    parameters = initialParameters
+    results = []
+    for expiry, strikes, volatilities, forward in slices:
+        start = time.perf_counter()
+        x, calibrated = calibrator(strikes, volatilities, forward, expiry, parameters, isFixed, method, True)
+        elapsed = time.perf_counter() - start
+        results.append((calibrated,
+                        (expiry,
+                         x.status,
+                         x.message,
+                         x.nfev,
+                         x.njev,
+                         x.cost,
+                         np.sqrt(np.mean(x.fun * x.fun)),
+                         elapsed)))
+        if warmStart and x.success:
+            parameters = list(calibrated)
+    return results
+
+
+def calibrateSlices(calibrator,
+                    parameterNames,
+                    slices,
+                    initialParameters,
+                    isFixed,
+                    method='trf',
+                    warmStart=True,
+                    n_jobs=1):
+    u"""
+    Calibrate every (expiry, strikes, volatilities, forward) slice of a
+    surface with ``calibrator``, using the analytic jacobian of the model.
+
+    The slices are sorted by expiry and cut into n_jobs contiguous chunks,
+    each one calibrated in its own process. Inside a chunk a slice starts
+    from the solution of the previous expiry when ``warmStart`` is set; the
+    first slice of every chunk starts from ``initialParameters``.
+
+    :return: (parameters, diagnostics) where parameters is a DataFrame with
+             one row of calibrated parameters per slice and diagnostics holds
+             the optimizer status, the number of function and jacobian
+             evaluations, the final cost, the rmse of the fit and the time
+             spent (in seconds) on every slice, both in the input order
+    """
+    slices = [(float(expiry),
+               np.asarray(strikes, dtype=float),
+               np.asarray(volatilities, dtype=float),
+               float(forward)) for expiry, strikes, volatilities, forward in slices]
+    for _, strikes, volatilities, _ in slices:
+        require(len(strikes) == len(volatilities),
+                ValueError,
+                "strikes and volatilities of a slice should have the same length")
+
+    order = np.argsort([s[0] for s in slices], kind='stable')
+    n_jobs = min(resolve_n_jobs(n_jobs), max(len(slices), 1))
+    chunks = [c for c in np.array_split(order, n_jobs) if len(c)]
+
+    args = (initialParameters, isFixed, method, warmStart)
+    if n_jobs == 1:
+        results = [_calibrateChunk(calibrator, [slices[i] for i in c], *args) for c in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [executor.submit(_calibrateChunk, calibrator, [slices[i] for i in c], *args) for c in chunks]
+            results = [f.result() for f in futures]
+
+    positions = np.concatenate(chunks) if chunks else np.array([], dtype=int)
+    rows = [r for chunk in results for r in chunk]
+    rows = [rows[i] for i in np.argsort(positions, kind='stable')]
+
+    parameters = pd.DataFrame([r[0] for r in rows], columns=parameterNames)
+    diagnostics = pd.DataFrame([r[1] for r in rows], columns=_DIAGNOSTICS)
+    return parameters, diagnostics
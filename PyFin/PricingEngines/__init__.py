@@ -11,12 +11,27 @@ from PyFin.PricingEngines.BlackFormula import blackFormula
 from PyFin.PricingEngines.BlackFormula import blackFormula2
 from PyFin.PricingEngines.BlackFormula import blackFormulaImpliedStdDev
 from PyFin.PricingEngines.BlackFormula import blackFormulaImpliedVol
+from PyFin.PricingEngines.BlackFormula import bachelierFormulaArray
+from PyFin.PricingEngines.BlackFormula import bachelierFormulaImpliedVolArray
+from PyFin.PricingEngines.BlackFormula import blackFormulaArray
+from PyFin.PricingEngines.BlackFormula import blackFormula2Array
+from PyFin.PricingEngines.BlackFormula import blackFormulaImpliedStdDevArray
+from PyFin.PricingEngines.BlackFormula import blackFormulaImpliedVolArray
+from PyFin.PricingEngines.BlackFormula import ImpliedVolStatus
+from PyFin.PricingEngines.BlackFormula import blackGreeks
+from PyFin.PricingEngines.BlackFormula import blackGreeksArray
 from PyFin.PricingEngines.SabrFormula import sabrVolatility
 from PyFin.PricingEngines.SabrFormula import sabrVolatilities
+from PyFin.PricingEngines.SabrFormula import sabrVolatilityGrid
+from PyFin.PricingEngines.SabrFormula import sabrVolatilityJacobian
 from PyFin.PricingEngines.SabrFormula import sabrCalibration
+from PyFin.PricingEngines.SabrFormula import sabrSurfaceCalibration
 from PyFin.PricingEngines.SVIInterpolation import sviVolatility
 from PyFin.PricingEngines.SVIInterpolation import sviVolatilities
+from PyFin.PricingEngines.SVIInterpolation import sviVolatilityGrid
+from PyFin.PricingEngines.SVIInterpolation import sviVolatilityJacobian
 from PyFin.PricingEngines.SVIInterpolation import sviCalibration
+from PyFin.PricingEngines.SVIInterpolation import sviSurfaceCalibration
 
 
 __all__ = ['bachelierFormula',
@@ -25,9 +40,24 @@ __all__ = ['bachelierFormula',
            'blackFormula2',
            'blackFormulaImpliedStdDev',
            'blackFormulaImpliedVol',
+           'bachelierFormulaArray',
+           'bachelierFormulaImpliedVolArray',
+           'blackFormulaArray',
+           'blackFormula2Array',
+           'blackFormulaImpliedStdDevArray',
+           'blackFormulaImpliedVolArray',
+           'ImpliedVolStatus',
+           'blackGreeks',
+           'blackGreeksArray',
            'sabrVolatility',
            'sabrVolatilities',
+           'sabrVolatilityGrid',
+           'sabrVolatilityJacobian',
            'sabrCalibration',
+           'sabrSurfaceCalibration',
            'sviVolatility',
            'sviVolatilities',
-           'sviCalibration']
+           'sviVolatilityGrid',
+           'sviVolatilityJacobian',
+           'sviCalibration',
+           'sviSurfaceCalibration']
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+u"""
+Created on 2026-10-18
+"""
+
+import os
+import mmap
+import pickle
+import struct
+import zlib
+from PyFin.Utilities.Asserts import require
+
+SNAPSHOT_MAGIC = b'PYFINSNP'
+SNAPSHOT_VERSION = 2
+
+# magic, format version, pickle protocol, payload length, crc32 of the payload
+# and of the raw buffers
+_HEADER = struct.Struct('<8sHHQI')
+# number of raw buffers, then (offset, length) of each one
+_COUNT = struct.Struct('<Q')
+_ENTRY = struct.Struct('<QQ')
+# raw buffers start on cache line boundaries
+_ALIGNMENT = 64
+_PROTOCOL = 5
+
+
+def _aligned(offset):
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def save_snapshot(obj, path):
+    u"""
+    Write the full state of ``obj`` (an accumulator, a security value holder
+    or any container of them) into one contiguous file at ``path``.
+
+    The object graph is pickled with protocol 5 and every contiguous array in
+    it (the ring buffers, running sums and sorted values of the accumulators,
+    the columns of the panel accumulators) is taken out of band. The file is
+    a fixed size header, a table of the raw buffers, the pickle payload and
+    then the raw buffers themselves, each one aligned on 64 bytes. It is
+    written next to ``path`` first and moved into place, so a crash during the
+    dump never leaves a truncated snapshot behind.
+
+    :param obj: object to checkpoint
+    :param path: target file
+    :return: number of bytes written
+    """
+    buffers = []
+    payload = pickle.dumps(obj, protocol=_PROTOCOL, buffer_callback=buffers.append)
+    raws = [b.raw() for b in buffers]
+
+    checksum = zlib.crc32(payload)
+    entries = []
+    offset = _HEADER.size + _COUNT.size + _ENTRY.size * len(raws) + len(payload)
+    for raw in raws:
+        checksum = zlib.crc32(raw, checksum)
+        offset = _aligned(offset)
+        entries.append((offset, raw.nbytes))
+        offset += raw.nbytes
+
+    header = _HEADER.pack(SNAPSHOT_MAGIC,
+                          SNAPSHOT_VERSION,
+                          _PROTOCOL,
+                          len(payload),
+                          checksum & 0xffffffff)
+
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            f.write(_COUNT.pack(len(raws)))
+            for entry in entries:
+                f.write(_ENTRY.pack(*entry))
+            f.write(payload)
+            for (start, _), raw in zip(entries, raws):
+                f.write(b'\0' * (start - f.tell()))
+                f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return offset
+
+
+def _restore(buffer, path, verify):
+    require(len(buffer) >= _HEADER.size, ValueError, "{0} is not a snapshot file".format(path))
+    magic, version, protocol, length, checksum = _HEADER.unpack_from(buffer)
+    require(magic == SNAPSHOT_MAGIC, ValueError, "{0} is not a snapshot file".format(path))
+    require(version <= SNAPSHOT_VERSION,
+            ValueError,
+            "snapshot version {0} is newer than the supported version {1}".format(version, SNAPSHOT_VERSION))
+
+    offset = _HEADER.size
+    entries = []
+    if version >= 2:
+        require(len(buffer) >= offset + _COUNT.size, ValueError, "{0} is truncated".format(path))
+        count, = _COUNT.unpack_from(buffer, offset)
+        offset += _COUNT.size
+        require(len(buffer) >= offset + _ENTRY.size * count, ValueError, "{0} is truncated".format(path))
+        entries = [_ENTRY.unpack_from(buffer, offset + _ENTRY.size * i) for i in range(count)]
+        offset += _ENTRY.size * count
+    end = entries[-1][0] + entries[-1][1] if entries else offset + length
+    require(len(buffer) == end, ValueError, "{0} is truncated".format(path))
+
+    view = memoryview(buffer)
+    payload = view[offset:offset + length]
+    # the arrays restored from out of band buffers are views of ``buffer``
+    raws = [view[start:start + size] for start, size in entries]
+    try:
+        if verify:
+            crc = zlib.crc32(payload)
+            for raw in raws:
+                crc = zlib.crc32(raw, crc)
+            require(crc & 0xffffffff == checksum, ValueError, "{0} is corrupted".format(path))
+        return pickle.loads(payload, buffers=raws)
+    finally:
+        payload.release()
+
+
+def load_snapshot(path, use_mmap=True, verify=True):
+    u"""
+    Restore an object written by ``save_snapshot``.
+
+    With ``use_mmap`` the file is mapped copy on write and the restored
+    arrays are views of the mapped pages: they are not copied, without
+    ``verify`` not even read before they are used, and the file itself is
+    never modified. Otherwise the file is read into one writable buffer the
+    arrays point into.
+
+    :param path: snapshot file
+    :param use_mmap: map the file into memory instead of reading it into a
+                     buffer first
+    :param verify: check the payload and buffers checksum before unpickling
+    :return: the restored object
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if not use_mmap:
+            buffer = bytearray(size)
+            f.readinto(buffer)
+            return _restore(buffer, path, verify)
+        require(size > 0, ValueError, "{0} is not a snapshot file".format(path))
+        # the mapping stays open as long as restored arrays refer to it
+        return _restore(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY), path, verify)
@@ -5,6 +5,7 @@ Created on 2017-1-22
 @author: cheng.li
 """
 
+import os
 cimport cython
 import numpy as np
 cimport numpy as np
@@ -48,4 +49,36 @@ cpdef to_dict(total_index, list total_category, double[:, :] matrix_values, list
         current_dict[total_category[j]] = {columns[k]: matrix_values[j, k] for k in range(column_length)}
     splited_values[index_diff_length] = current_dict
 
-    return splited_category, splited_values
\ No newline at end of file
+    return splited_category, splited_values
+
+
+cpdef np.ndarray index_boundaries(total_index):
+
+    cdef np.ndarray index_values = np.asarray(total_index)
+    cdef size_t n = len(index_values)
+
+    if n == 0:
+        return np.zeros(1, dtype=np.int64)
+
+    return np.concatenate([[0],
+                           np.where(index_values[1:] != index_values[:-1])[0] + 1,
+                           [n]]).astype(np.int64)
+
+
+cpdef dict to_columns(np.ndarray matrix_values, list columns):
+
+    cdef int k
+    cdef np.ndarray transposed = np.array(matrix_values.T, dtype=float, order="C")
+    return {columns[k]: transposed[k] for k in range(len(columns))}
+
+
+def resolve_n_jobs(n_jobs):
+    u"""
+    Number of worker processes for ``n_jobs``: None or 0 means 1 and negative
+    values count back from the number of cpus, as in joblib.
+    """
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    elif n_jobs < 0:
+        return max(os.cpu_count() + 1 + n_jobs, 1)
+    return n_jobs
@@ -10,11 +10,15 @@ from PyFin.Utilities.Asserts import require
 from PyFin.Utilities.Asserts import ensureRaise
 from PyFin.Utilities.Asserts import warning
 from PyFin.Utilities.Asserts import isClose
+from PyFin.Utilities.Snapshot import save_snapshot
+from PyFin.Utilities.Snapshot import load_snapshot
 
 __all__ = ['require',
            'ensureRaise',
            'warning',
-           'isClose']
+           'isClose',
+           'save_snapshot',
+           'load_snapshot']
 
 
 def print_timing(func):
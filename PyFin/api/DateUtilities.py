@@ -5,6 +5,7 @@ Created on 2015-7-13
 @author: cheng.li
 """
 
+from functools import lru_cache
 from PyFin.DateUtilities import Date
 from PyFin.DateUtilities import Calendar
 from PyFin.DateUtilities import Period
@@ -15,9 +16,54 @@ from PyFin.Enums import TimeUnits
 from PyFin.DateUtilities import check_date
 from PyFin.DateUtilities import check_period
 
+DATE_CACHE_SIZE = 65536
+
+# calendars hold no mutable state, one instance per holiday center is enough
+_calendars = {}
+
+
+def getCalendar(holidayCenter):
+    u"""
+    Shared Calendar instance of a holiday center.
+    """
+    key = holidayCenter.lower()
+    try:
+        return _calendars[key]
+    except KeyError:
+        cal = Calendar(key)
+        _calendars[key] = cal
+        return cal
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _adjustDate(holidayCenter, serialNumber, convention):
+    cal = getCalendar(holidayCenter)
+    return cal.adjustDate(Date(serialNumber=serialNumber), convention).toDateTime()
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _advanceDate(holidayCenter, serialNumber, length, units, convention):
+    cal = getCalendar(holidayCenter)
+    period = Period(length=length, units=units)
+    return cal.advanceDate(Date(serialNumber=serialNumber), period, convention).toDateTime()
+
+
+def dateCacheInfo():
+    u"""
+    Hit/miss statistics of the adjusted date caches used by
+    adjustDateByCalendar and advanceDateByCalendar.
+    """
+    return {'adjustDateByCalendar': _adjustDate.cache_info(),
+            'advanceDateByCalendar': _advanceDate.cache_info()}
+
+
+def clearDateCache():
+    _adjustDate.cache_clear()
+    _advanceDate.cache_clear()
+
 
 def isBizDay(holidayCenter, ref):
-    cal = Calendar(holidayCenter)
+    cal = getCalendar(holidayCenter)
     ref = check_date(ref)
     return cal.isBizDay(ref)
 
@@ -30,14 +76,14 @@ def datesList(fromDate, toDate):
 
 
 def bizDatesList(holidayCenter, fromDate, toDate):
-    cal = Calendar(holidayCenter)
+    cal = getCalendar(holidayCenter)
     fromDate = check_date(fromDate)
     toDate = check_date(toDate)
     return [d.toDateTime() for d in cal.bizDatesList(fromDate, toDate)]
 
 
 def holDatesList(holidayCenter, fromDate, toDate, includeWeekend=True):
-    cal = Calendar(holidayCenter)
+    cal = getCalendar(holidayCenter)
     fromDate = check_date(fromDate)
     toDate = check_date(toDate)
     return [d.toDateTime() for d in cal.holDatesList(fromDate, toDate, includeWeekend)]
@@ -49,16 +95,14 @@ def advanceDate(referenceDate, period):
 
 
 def adjustDateByCalendar(holidayCenter, referenceDate, convention=BizDayConventions.Following):
-    cal = Calendar(holidayCenter)
     refer = check_date(referenceDate)
-    return cal.adjustDate(refer, convention).toDateTime()
+    return _adjustDate(holidayCenter.lower(), refer.serialNumber, int(convention))
 
 
 def advanceDateByCalendar(holidayCenter, referenceDate, period, convention=BizDayConventions.Following):
-    cal = Calendar(holidayCenter)
     refer = check_date(referenceDate)
     period = check_period(period)
-    return cal.advanceDate(refer, period, convention).toDateTime()
+    return _advanceDate(holidayCenter.lower(), refer.serialNumber, period.length(), period.units(), int(convention))
 
 
 def nthWeekDay(nth, dayOfWeek, month, year):
@@ -73,7 +117,7 @@ def makeSchedule(firstDate,
                  dateRule=BizDayConventions.Following,
                  dateGenerationRule=DateGeneration.Forward):
 
-    cal = Calendar(calendar)
+    cal = getCalendar(calendar)
     firstDate = check_date(firstDate)
     endDate = check_date(endDate)
     tenor = check_period(tenor)
@@ -16,9 +16,14 @@ from PyFin.api.DateUtilities import adjustDateByCalendar
 from PyFin.api.DateUtilities import advanceDateByCalendar
 from PyFin.api.DateUtilities import nthWeekDay
 from PyFin.api.DateUtilities import makeSchedule
+from PyFin.api.DateUtilities import getCalendar
+from PyFin.api.DateUtilities import dateCacheInfo
+from PyFin.api.DateUtilities import clearDateCache
 
 from PyFin.Analysis import transform
+from PyFin.Analysis import transform_stream
 from PyFin.Analysis.SeriesValues import SeriesValues
+from PyFin.Analysis.SeriesValues import Universe
 from PyFin.api.Analysis import SIGN
 from PyFin.api.Analysis import AVG
 from PyFin.api.Analysis import EMA
@@ -96,9 +101,14 @@ __all__ = ["datesList",
            "advanceDateByCalendar",
            "nthWeekDay",
            "makeSchedule",
+           "getCalendar",
+           "dateCacheInfo",
+           "clearDateCache",
            "transform",
+           "transform_stream",
            "SIGN",
            "SeriesValues",
+           "Universe",
            "AVG",
            "EMA",
            "MACD",
@@ -10,6 +10,7 @@ from PyFin.tests.Analysis.testSecurityValueHolders import TestSecurityValueHolde
 from PyFin.tests.Analysis.testCrossSectionValueHolders import TestCrossSectionValueHolder
 from PyFin.tests.Analysis.testSecurityValues import TestSecurityValues
 from PyFin.tests.Analysis.testTransformer import TestTransformer
+from PyFin.tests.Analysis.testExpressionGraph import TestExpressionGraph
 from PyFin.tests.Analysis import TechnicalAnalysis
 
 __all__ = ['TestDataProviders',
@@ -17,4 +18,5 @@ __all__ = ['TestDataProviders',
            'TestCrossSectionValueHolder',
            'TestSecurityValues',
            'TestTransformer',
+           'TestExpressionGraph',
            'TestTechnicalAnalysis']
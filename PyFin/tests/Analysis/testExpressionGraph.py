@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+u"""
+Created on 2026-10-18
+"""
+
+import unittest
+import copy
+import numpy as np
+import pandas as pd
+from PyFin.Analysis.SecurityValueHolders import SecurityLatestValueHolder
+from PyFin.Analysis.SecurityValueHolders import SecurityCurrentValueHolder
+from PyFin.Analysis.CrossSectionValueHolders import CSRankedSecurityValueHolder
+from PyFin.Analysis.TechnicalAnalysis import SecurityMovingAverage
+from PyFin.Analysis.TechnicalAnalysis import SecurityMovingStandardDeviation
+from PyFin.Analysis.ExpressionGraph import ExpressionGraph
+from PyFin.Analysis.ExpressionGraph import SecuritySharedValueHolder
+from PyFin.Analysis.ExpressionGraph import SecurityFusedValueHolder
+from PyFin.Analysis.ExpressionGraph import fuse
+from PyFin.Analysis.SecurityValueHolders import SecurityIIFValueHolder
+from PyFin.Analysis.transformer import transform
+
+
+class TestExpressionGraph(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(0)
+        n = 5
+        m = 40
+        self.data = pd.DataFrame({'code': np.tile(np.arange(n), m),
+                                  'x': np.random.randn(n * m),
+                                  'y': np.random.randn(n * m)},
+                                 index=np.repeat(np.arange(m), n))
+
+    def testDeduplicatedNodes(self):
+        ma = SecurityMovingAverage(10, 'x')
+        expressions = [ma / ma.shift(1), ma + SecurityMovingStandardDeviation(10, 'y')]
+
+        graph = ExpressionGraph(expressions)
+
+        # x, ma, shift, div, y, mstd, add
+        self.assertEqual(len(graph), 7)
+        # the two extra copies of ma and the 'x' below each of them
+        self.assertEqual(graph.deduplicated, 4)
+        self.assertEqual(len(graph.outputs), 2)
+
+    def testStructurallyDifferentNodesAreKeptApart(self):
+        a = SecurityLatestValueHolder('x')
+        b = SecurityLatestValueHolder('y')
+        expressions = [(a + b) * 2., a + b * 2.]
+        self.assertEqual(str(expressions[0]), str(expressions[1]))
+
+        graph = ExpressionGraph(expressions)
+        self.assertIsNot(graph.outputs[0], graph.outputs[1])
+
+        graph = ExpressionGraph([SecurityLatestValueHolder('x'), SecurityCurrentValueHolder('x')])
+        self.assertEqual(graph.deduplicated, 0)
+
+    def testSharedNodesArePushedOnce(self):
+        ma = SecurityMovingAverage(3, 'x')
+        expressions = [ma + ma, ma * 2.]
+        graph = ExpressionGraph(expressions)
+
+        shared = graph.outputs[0]._left
+        self.assertTrue(isinstance(shared, SecuritySharedValueHolder))
+
+        data = [{'a': {'x': 1.}, 'b': {'x': 2.}},
+                {'a': {'x': 3.}, 'b': {'x': 4.}}]
+        for d in data:
+            graph.push(copy.deepcopy(d))
+            for e in expressions:
+                e.push(copy.deepcopy(d))
+
+        for e, output in zip(expressions, graph.outputs):
+            np.testing.assert_array_almost_equal(output.value.values, e.value.values)
+        self.assertAlmostEqual(shared.value_by_name('a'), 2.)
+
+    def testOriginalExpressionsAreNotModified(self):
+        ma = SecurityMovingAverage(3, 'x')
+        expression = ma + ma
+        ExpressionGraph([expression])
+        self.assertFalse(isinstance(expression._left, SecuritySharedValueHolder))
+        self.assertFalse(isinstance(expression._right, SecuritySharedValueHolder))
+
+    def testGraphOverGivenExpressions(self):
+        expressions = [SecurityMovingAverage(3, 'x') + SecurityMovingAverage(3, 'x') * 2.,
+                       SecurityMovingAverage(3, 'x') - 1.]
+        left = expressions[0]._left
+        graph = ExpressionGraph(expressions, copy_expressions=False, fuse_operators=True)
+        self.assertEqual(sum(isinstance(node, SecurityMovingAverage) for node in graph.nodes), 1)
+
+        data = {'a': {'x': 1.}, 'b': {'x': 2.}}
+        graph.push(copy.deepcopy(data))
+        graph.release()
+        self.assertIs(expressions[0]._left, left)
+        self.assertTrue(isinstance(expressions[0]._right._left, SecurityMovingAverage))
+        self.assertTrue(isinstance(expressions[1]._left, SecurityMovingAverage))
+        self.assertAlmostEqual(expressions[0].value_by_name('b'), 6.)
+        self.assertAlmostEqual(expressions[1].value_by_name('b'), 1.)
+
+        # every holder is pushed once again when pushed on its own
+        data = {'a': {'x': 4.}, 'b': {'x': 2.}}
+        for e in expressions:
+            e.push(copy.deepcopy(data))
+        self.assertAlmostEqual(expressions[0].value_by_name('a'), 7.5)
+        self.assertAlmostEqual(expressions[1].value_by_name('a'), 1.5)
+
+    def testTransformWithSharedExpressions(self):
+        ma = SecurityMovingAverage(5, 'x')
+        expressions = [ma / ma.shift(1),
+                       ma - SecurityMovingStandardDeviation(5, 'y'),
+                       CSRankedSecurityValueHolder(ma),
+                       ma,
+                       'y']
+        cols = ['f1', 'f2', 'f3', 'f4', 'y']
+
+        calculated = transform(self.data.copy(), copy.deepcopy(expressions), cols, category_field='code')
+        expected = transform(self.data.copy(), copy.deepcopy(expressions), cols, category_field='code', batch=False)
+
+        np.testing.assert_array_almost_equal(calculated[cols].values, expected[cols].values)
+
+    def testFusedOperatorHolders(self):
+        x = SecurityCurrentValueHolder('x')
+        y = SecurityCurrentValueHolder('y')
+        expressions = [(SecurityMovingAverage(3, 'x') - SecurityMovingAverage(5, 'x')) / y * 2. + 1.,
+                       1. - SecurityIIFValueHolder(x > 0., x / y, -y) + (x <= y),
+                       SecurityMovingAverage(3, x * y + x) - y * 2.]
+        names = ['a', 'b', 'c']
+
+        for expression in expressions:
+            fused = fuse(expression)
+            self.assertTrue(isinstance(fused, SecurityFusedValueHolder))
+            self.assertEqual(str(fused), str(expression))
+
+            for i in range(10):
+                data = {name: {'x': np.random.randn(), 'y': 0. if i == 3 else np.random.randn()} for name in names}
+                expression.push(copy.deepcopy(data))
+                fused.push(copy.deepcopy(data))
+                np.testing.assert_array_equal(fused.value_by_names(names).values,
+                                              expression.value_by_names(names).values)
+                for name in names:
+                    try:
+                        expected = expression.value_by_name(name)
+                    except ZeroDivisionError:
+                        self.assertRaises(ZeroDivisionError, fused.value_by_name, name)
+                    else:
+                        np.testing.assert_array_equal(fused.value_by_name(name), expected)
+                np.testing.assert_array_equal(fused.value_all().values, expression.value_all().values)
+                self.assertEqual(fused.isFull, expression.isFull)
+
+        # the moving average keeps its place and its argument is fused below it
+        fused = fuse(expressions[2])
+        self.assertTrue(isinstance(fused._leaves[0]._compHolder, SecurityFusedValueHolder))
+
+    def testGraphWithFusedOperators(self):
+        ma = SecurityMovingAverage(5, 'x')
+        expressions = [(ma - SecurityMovingStandardDeviation(5, 'y')) * 2. + ma,
+                       ma / ma.shift(1) - 1.]
+
+        graph = ExpressionGraph(expressions, fuse_operators=True)
+        # x, ma, y, mstd, fused, shift, fused
+        self.assertEqual(len(graph), 7)
+        self.assertTrue(all(isinstance(o, SecurityFusedValueHolder) for o in graph.outputs))
+
+        calculated = transform(self.data.copy(), copy.deepcopy(expressions), ['f1', 'f2'], category_field='code')
+        expected = [e.transform(self.data.copy(), category_field='code') for e in copy.deepcopy(expressions)]
+        for col, e in zip(['f1', 'f2'], expected):
+            np.testing.assert_array_almost_equal(calculated[col].dropna().values, e['transformed'].values)
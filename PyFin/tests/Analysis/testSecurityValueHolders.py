@@ -25,6 +25,13 @@ from PyFin.Analysis.TechnicalAnalysis import SecurityMovingAverage
 from PyFin.Analysis.TechnicalAnalysis import SecurityMovingMax
 from PyFin.Analysis.TechnicalAnalysis import SecurityMovingMin
 from PyFin.Analysis.TechnicalAnalysis import SecurityMovingSum
+from PyFin.Analysis.TechnicalAnalysis import SecurityTimeMovingAverage
+from PyFin.Analysis.TechnicalAnalysis import SecurityMovingCorrelation
+from PyFin.Analysis.TechnicalAnalysis import SecuritySignValueHolder
+from PyFin.Analysis.CrossSectionValueHolders import CSRankedSecurityValueHolder
+from PyFin.Analysis.CrossSectionValueHolders import CSZScoreSecurityValueHolder
+from PyFin.Math.Accumulators import MovingMax
+from PyFin.Math.Accumulators import PanelMovingMax
 
 
 class TestSecurityValueHolders(unittest.TestCase):
@@ -1067,6 +1074,160 @@ class TestSecurityValueHolders(unittest.TestCase):
         np.testing.assert_array_almost_equal(calculated['new_factor'].values[1:],
                                              expected['close'].values[1:])
 
+    def testTransformBatchMatchesRowWise(self):
+        np.random.seed(0)
+        n = 5
+        m = 30
+        test_df = pd.DataFrame({'code': np.tile(np.arange(n), m),
+                                'b': np.random.randn(n * m),
+                                'c': np.random.randn(n * m)},
+                               index=np.repeat(np.arange(m), n))
+        test_df.loc[test_df.index[::7], 'b'] = np.nan
+
+        expressions = [SecurityMovingAverage(5, 'b') - SecurityMovingMax(3, 'c'),
+                       SecurityLatestValueHolder('b')[SecurityLatestValueHolder('c') > 0.],
+                       SecurityIIFValueHolder(SecurityLatestValueHolder('c') > 0., 'b', 'c'),
+                       SecurityDeltaValueHolder(2, 'b')]
+
+        for expression in expressions:
+            expected = copy.deepcopy(expression).transform(test_df.copy(), name='f', category_field='code', batch=False)
+            calculated = copy.deepcopy(expression).transform(test_df.copy(), name='f', category_field='code')
+            np.testing.assert_array_almost_equal(calculated['f'], expected['f'])
+            np.testing.assert_array_equal(calculated.index, expected.index)
+
+            expected = copy.deepcopy(expression).transform(test_df.copy(), name='f', batch=False)
+            calculated = copy.deepcopy(expression).transform(test_df.copy(), name='f')
+            np.testing.assert_array_almost_equal(calculated['f'], expected['f'])
+
+    def testPushColumnsMixedWithPush(self):
+        np.random.seed(0)
+        names = ['a', 'b', 'c']
+        xs = np.random.randn(8, 3)
+        ys = np.random.randn(8, 3)
+
+        for expression in [SecurityMovingAverage(3, 'x'),
+                           SecurityMovingCorrelation(4, 'x', 'y'),
+                           SecuritySignValueHolder('x')]:
+            expected = copy.deepcopy(expression)
+            calculated = copy.deepcopy(expression)
+            for i in range(len(xs)):
+                expected.push({name: {'x': xs[i, j], 'y': ys[i, j]} for j, name in enumerate(names)})
+                if i % 3 == 1:
+                    calculated.push({name: {'x': xs[i, j], 'y': ys[i, j]} for j, name in enumerate(names)})
+                else:
+                    # a symbol may come in later
+                    k = 2 if i == 0 else 3
+                    calculated.push_columns(names[:k], {'x': xs[i, :k], 'y': ys[i, :k]})
+                    if i == 0:
+                        calculated.push({'c': {'x': xs[i, 2], 'y': ys[i, 2]}})
+                if i == 4:
+                    calculated = pickle.loads(pickle.dumps(calculated))
+                np.testing.assert_array_almost_equal(calculated.value_by_names(names).values,
+                                                     expected.value_by_names(names).values)
+
+    def testHolderWithPanelVariant(self):
+        np.random.seed(0)
+        names = ['a', 'b', 'c']
+        xs = np.random.randn(10, 3)
+        xs[xs < -1.] = np.nan
+
+        expression = SecurityMovingMax(3, 'x')
+        self.assertIsInstance(expression.holders, PanelMovingMax)
+        self.assertIsInstance(SecurityTimeMovingAverage(3, 'x').holders, dict)
+
+        singles = {name: MovingMax(3, 'x') for name in names}
+        for i in range(len(xs)):
+            # 'c' only comes in at the third snapshot
+            k = 2 if i < 2 else 3
+            data = {name: {'x': xs[i, j]} for j, name in enumerate(names[:k])}
+            if i % 2:
+                expression.push(data)
+            else:
+                expression.push_columns(names[:k], {'x': xs[i, :k]})
+            for name in data:
+                singles[name].push(data[name])
+
+            self.assertEqual(sorted(expression.symbolList), names[:k])
+            np.testing.assert_array_almost_equal(expression.value_all().values,
+                                                 [singles[name].result() for name in names[:k]])
+            for name in names[:k]:
+                np.testing.assert_almost_equal(expression.value_by_name(name), singles[name].result())
+                self.assertEqual(expression.isFullByName(name), singles[name].isFull())
+
+    def testTransformBatchWithTimeBasedHolder(self):
+        test_df = pd.DataFrame({'code': [1, 2, 1, 2, 1, 2, 1, 2],
+                                'stamp': [1., 1., 2., 2., 4., 4., 7., 7.],
+                                'x': [1., 2., 3., 4., 5., 6., 7., 8.]},
+                               index=[1, 1, 2, 2, 3, 3, 4, 4])
+
+        expression = SecurityTimeMovingAverage(3, 'x')
+        expected = copy.deepcopy(expression).transform(test_df.copy(), name='f', category_field='code', batch=False)
+        calculated = copy.deepcopy(expression).transform(test_df.copy(), name='f', category_field='code')
+        np.testing.assert_array_almost_equal(calculated['f'], expected['f'])
+
+    def testTransformBatchWithDuplicatedCategory(self):
+        test_df = pd.DataFrame({'code': [1, 1, 2],
+                                'b': [4., 5., 6.]},
+                               index=[1, 1, 2])
+
+        with self.assertRaises(ValueError):
+            SecurityMovingAverage(2, 'b').transform(test_df, category_field='code')
+
+    def testTransformWithMultipleJobs(self):
+        np.random.seed(0)
+        n = 6
+        m = 20
+        test_df = pd.DataFrame({'code': np.tile(np.arange(n), m),
+                                'b': np.random.randn(n * m)},
+                               index=np.repeat(np.arange(m), n))
+
+        expression = SecurityMovingAverage(5, 'b') - SecurityMovingMax(3, 'b')
+        expected = copy.deepcopy(expression).transform(test_df.copy(), name='f', category_field='code')
+        calculated = copy.deepcopy(expression).transform(test_df.copy(), name='f', category_field='code', n_jobs=2)
+        pd.testing.assert_frame_equal(calculated, expected)
+
+    def testTransformWithMultipleJobsLeavesHolderUnchanged(self):
+        np.random.seed(0)
+        n = 6
+        m = 20
+        test_df = pd.DataFrame({'code': np.tile(np.arange(n), m),
+                                'b': np.random.randn(n * m)},
+                               index=np.repeat(np.arange(m), n))
+        first, second = test_df.iloc[:10 * n], test_df.iloc[10 * n:]
+
+        serial = SecurityMovingAverage(5, 'b')
+        serial.transform(first.copy(), name='f', category_field='code')
+        self.assertEqual(serial.symbolList, list(range(n)))
+
+        parallel = SecurityMovingAverage(5, 'b')
+        parallel.transform(first.copy(), name='f', category_field='code', n_jobs=2)
+        self.assertEqual(parallel.symbolList, [])
+
+        # the workers start from the state of the holder
+        expected = copy.deepcopy(serial).transform(second.copy(), name='f', category_field='code')
+        calculated = serial.transform(second.copy(), name='f', category_field='code', n_jobs=2)
+        pd.testing.assert_frame_equal(calculated, expected)
+        np.testing.assert_array_almost_equal(serial.value_all().values,
+                                             first.groupby('code')['b'].apply(lambda x: x.iloc[-5:].mean()).values)
+
+    def testTransformWithMultipleJobsAndCrossSection(self):
+        np.random.seed(0)
+        n = 6
+        m = 20
+        test_df = pd.DataFrame({'code': np.tile(np.arange(n), m),
+                                'b': np.random.randn(n * m),
+                                'g': np.tile(np.arange(n) % 2, m).astype(float)},
+                               index=np.repeat(np.arange(m), n))
+        test_df = test_df.iloc[[i for i in range(len(test_df)) if i % 7 != 2]]
+
+        ranked = CSRankedSecurityValueHolder(SecurityMovingAverage(3, 'b'))
+        expression = CSZScoreSecurityValueHolder(ranked + SecurityMovingSum(2, ranked), groups='g')
+        expected = copy.deepcopy(expression).transform(test_df.copy(), name='f', category_field='code')
+        calculated = expression.transform(test_df.copy(), name='f', category_field='code', n_jobs=2)
+        pd.testing.assert_frame_equal(calculated, expected)
+        # the sharded transform works on copies of the expression
+        self.assertEqual(expression.symbolList, [])
+
     def testSecurityCurrentValueHolder(self):
         current = SecurityCurrentValueHolder('x')
 
@@ -1178,3 +1339,46 @@ class TestSecurityValueHolders(unittest.TestCase):
     def testSecurityOrOperatorValueHolderStr(self):
         holder = SecurityLatestValueHolder('x') | SecurityLatestValueHolder('y')
         self.assertEqual(str(holder), "''\\text{x}'' | ''\\text{y}''")
+
+    def testSecurityValueHoldersShareUniverse(self):
+        left = SecurityMovingAverage(2, 'x')
+        right = SecurityLatestValueHolder('x')
+
+        left.push({'aapl': {'x': 1.}, 'ibm': {'x': 2.}})
+        right.push({'ibm': {'x': 3.}, 'msft': {'x': 4.}})
+        first = left.value_all()
+        self.assertFalse(first.universe is right.value_all().universe)
+
+        # sorted symbols and their codes are reused until new symbols come in
+        left.push({'aapl': {'x': 3.}, 'ibm': {'x': 4.}})
+        self.assertTrue(left.value_all().codes is first.codes)
+
+        calculated = left.value_all() + right.value_all()
+        self.assertEqual(calculated.index(), ['aapl', 'ibm'])
+        np.testing.assert_array_equal(calculated.values, [np.nan, 6.])
+
+        calculated = (left + right).value_by_names(['msft', 'ibm'])
+        np.testing.assert_array_equal(calculated.values, [np.nan, 6.])
+
+        # the holders of an expression share one universe
+        combined = left + right
+        combined.push({'aapl': {'x': 1.}, 'ibm': {'x': 2.}})
+        self.assertTrue(combined._left.value_all().universe is combined._right.value_all().universe)
+        self.assertTrue(combined.value_all().universe is combined._left.value_all().universe)
+        self.assertFalse(combined.value_all().universe is (left + right).value_all().universe)
+
+    def testSecurityValuesOfRestoredHolders(self):
+        left = SecurityMovingAverage(2, 'x')
+        right = SecurityLatestValueHolder('x')
+        left.push({'aapl': {'x': 1.}, 'ibm': {'x': 2.}})
+        right.push({'msft': {'x': 4.}, 'ibm': {'x': 3.}})
+
+        restored = pickle.loads(pickle.dumps(right.value_all()))
+        calculated = left.value_all() + restored
+        self.assertEqual(calculated.index(), ['aapl', 'ibm'])
+        np.testing.assert_array_equal(calculated.values, [np.nan, 5.])
+
+        # a pickled expression keeps a single universe for its holders
+        combined = pickle.loads(pickle.dumps(left + right))
+        self.assertTrue(combined._left.value_all().universe is combined._right.value_all().universe)
+        np.testing.assert_array_equal(combined.value_all().values, [np.nan, 5.])
@@ -13,6 +13,7 @@ import os
 import numpy as np
 import pandas as pd
 from PyFin.Analysis.SeriesValues import SeriesValues
+from PyFin.Analysis.SeriesValues import Universe
 
 
 class TestSecurityValues(unittest.TestCase):
@@ -250,3 +251,56 @@ class TestSecurityValues(unittest.TestCase):
             self.assertEqual(test.name_mapping, pickled.name_mapping)
 
         os.unlink(f.name)
+
+    def testUniverseCodes(self):
+        universe = Universe(['b', 'a'])
+        np.testing.assert_array_equal(universe.encode(['a', 'c', 'b', 'c']), [1, 2, 0, 2])
+        self.assertEqual(universe.symbols, ['b', 'a', 'c'])
+        self.assertEqual(universe.decode([2, 0]), ['c', 'b'])
+        self.assertTrue('c' in universe)
+        self.assertFalse('d' in universe)
+
+        pickled = pickle.loads(pickle.dumps(universe))
+        self.assertEqual(pickled.symbols, universe.symbols)
+        self.assertEqual(pickled.code('a'), 1)
+
+    def testSecurityValuesWithUniverse(self):
+        universe = Universe()
+        test = SeriesValues(np.array([1., 2., 3.]), ['c', 'b', 'a'], universe)
+        self.assertTrue(test.universe is universe)
+        self.assertEqual(test.index(), ['c', 'b', 'a'])
+        self.assertEqual(test.name_mapping, {'c': 0, 'b': 1, 'a': 2})
+        self.assertEqual(test['a'], 3.)
+        self.assertTrue('b' in test)
+        self.assertEqual(test.to_dict(), {'a': 3., 'b': 2., 'c': 1.})
+
+        selected = test[['a', 'd', 'c']]
+        self.assertTrue(selected.universe is universe)
+        self.assertEqual(selected.index(), ['a', 'd', 'c'])
+        np.testing.assert_array_equal(selected.values, [3., np.nan, 1.])
+
+        masked = test.mask(test.values > 1.)
+        self.assertEqual(masked.to_dict(), {'a': 3., 'b': 2.})
+
+        pickled = pickle.loads(pickle.dumps(test))
+        self.assertEqual(pickled.to_dict(), test.to_dict())
+
+    def testSecurityValuesAlignByUniverse(self):
+        universe = Universe()
+        left = SeriesValues(np.array([1., 2., 3.]), ['a', 'b', 'c'], universe)
+        right = SeriesValues(np.array([30., 10., 40.]), ['c', 'a', 'd'], universe)
+
+        calculated = left + right
+        self.assertTrue(calculated.codes is left.codes)
+        np.testing.assert_array_equal(calculated.values, [11., np.nan, 33.])
+        np.testing.assert_array_equal((right / left).values, [10., 10., np.nan])
+        np.testing.assert_array_equal((left < right).values, [1., 0., 1.])
+
+        # series of the same universe with identical codes are not realigned
+        same = SeriesValues(np.array([4., 5., 6.]), ['a', 'b', 'c'], universe)
+        np.testing.assert_array_equal((left * same).values, [4., 10., 18.])
+
+        # series without a universe keep the positional semantic
+        plain = SeriesValues(np.array([4., 5., 6.]), ['c', 'b', 'a'])
+        np.testing.assert_array_equal((left + plain).values, [5., 7., 9.])
+        self.assertEqual((plain + left).name_mapping, plain.name_mapping)
@@ -5,14 +5,31 @@ Created on 2016-12-21
 @author: cheng.li
 """
 
+import os
+import shutil
+import tempfile
 import unittest
+import warnings
 import numpy as np
 import pandas as pd
 from PyFin.Analysis.SecurityValueHolders import SecurityLatestValueHolder
 from PyFin.Analysis.TechnicalAnalysis.StatefulTechnicalAnalysers import SecurityMovingAverage
 from PyFin.Analysis.TechnicalAnalysis.StatefulTechnicalAnalysers import SecurityMovingMax
 from PyFin.Analysis.TechnicalAnalysis.StatefulTechnicalAnalysers import SecurityMovingMin
+from PyFin.Analysis.CrossSectionValueHolders import CSRankedSecurityValueHolder
+from PyFin.Analysis.CrossSectionValueHolders import CSResidueSecurityValueHolder
 from PyFin.Analysis.transformer import transform
+from PyFin.Analysis.transformer import transform_stream
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+try:
+    import tables
+except ImportError:
+    tables = None
 
 
 class TestTransformer(unittest.TestCase):
@@ -158,3 +175,173 @@ class TestTransformer(unittest.TestCase):
                                category_field='code')
         expected = [0., 1., 1., 1., 1., 1., 0.]
         np.testing.assert_array_almost_equal(expected, calculated['filter'])
+
+    def test_transformer_batch_matches_row_wise(self):
+        np.random.seed(0)
+        n = 6
+        m = 20
+        test_df = pd.DataFrame({'code': np.tile(np.arange(n), m),
+                                'b': np.random.randn(n * m),
+                                'c': np.random.randn(n * m),
+                                'ind': np.tile([1, 1, 2, 2, 3, 3], m)},
+                               index=np.repeat(np.arange(m), n))
+
+        def build():
+            return [SecurityMovingMax(3, 'b') + SecurityMovingMin(4, 'c'),
+                    CSRankedSecurityValueHolder(SecurityMovingAverage(2, 'b'), groups='ind'),
+                    CSResidueSecurityValueHolder('b', 'c'),
+                    SecurityLatestValueHolder('b')[SecurityLatestValueHolder('c') > 0.],
+                    'c']
+
+        cols = ['f1', 'f2', 'f3', 'f4', 'c']
+        expected = transform(test_df.copy(), build(), cols=cols, category_field='code', batch=False)
+        calculated = transform(test_df.copy(), build(), cols=cols, category_field='code')
+        np.testing.assert_array_almost_equal(calculated[cols].values, expected[cols].values)
+        np.testing.assert_array_equal(calculated.index, expected.index)
+
+        expected = transform(test_df.copy(), build()[:1], cols=cols[:1], batch=False)
+        calculated = transform(test_df.copy(), build()[:1], cols=cols[:1])
+        np.testing.assert_array_almost_equal(calculated['f1'], expected['f1'])
+
+    def test_transformer_with_multiple_jobs(self):
+        np.random.seed(0)
+        n = 7
+        m = 30
+        test_df = pd.DataFrame({'code': np.tile(np.arange(n), m),
+                                'b': np.random.randn(n * m),
+                                'c': np.random.randn(n * m)},
+                               index=np.repeat(np.arange(m), n))
+        test_df.loc[test_df.index[::5], 'b'] = np.nan
+
+        expressions = [SecurityMovingMax(3, 'b') + SecurityMovingMin(4, 'c'),
+                       SecurityMovingAverage(5, 'b'),
+                       'c']
+        cols = ['f1', 'f2', 'c']
+
+        expected = transform(test_df.copy(), expressions, cols=cols, category_field='code')
+        calculated = transform(test_df.copy(), expressions, cols=cols, category_field='code', n_jobs=3)
+        pd.testing.assert_frame_equal(calculated, expected)
+
+    def test_transformer_with_multiple_jobs_and_cross_section(self):
+        np.random.seed(0)
+        n = 7
+        m = 30
+        test_df = pd.DataFrame({'code': np.tile(np.arange(n), m),
+                                'b': np.random.randn(n * m),
+                                'c': np.random.randn(n * m)},
+                               index=np.repeat(np.arange(m), n))
+        test_df.loc[test_df.index[::5], 'b'] = np.nan
+        # some symbols are missing from some snapshots
+        test_df = test_df.iloc[[i for i in range(len(test_df)) if i % 11 != 3]]
+
+        # stateful nodes above a cross-sectional node and one cross-sectional
+        # node below another
+        expressions = [CSRankedSecurityValueHolder(SecurityLatestValueHolder('b')),
+                       SecurityMovingAverage(3, CSRankedSecurityValueHolder(SecurityMovingMax(4, 'b'))),
+                       CSRankedSecurityValueHolder(SecurityMovingMin(3, CSResidueSecurityValueHolder('b', 'c'))),
+                       'c']
+        cols = ['f1', 'f2', 'f3', 'c']
+
+        expected = transform(test_df.copy(), expressions, cols=cols, category_field='code')
+        for batch in (True, False):
+            with warnings.catch_warnings(record=True) as w:
+                warnings.simplefilter('always')
+                calculated = transform(test_df.copy(),
+                                       expressions,
+                                       cols=cols,
+                                       category_field='code',
+                                       batch=batch,
+                                       n_jobs=3)
+            self.assertFalse(any('transformed serially' in str(warning.message) for warning in w))
+            pd.testing.assert_frame_equal(calculated, expected)
+
+    def test_transformer_carries_state_between_calls(self):
+        np.random.seed(0)
+        n = 5
+        m = 30
+        test_df = pd.DataFrame({'code': np.tile(np.arange(n), m),
+                                'b': np.random.randn(n * m),
+                                'c': np.random.randn(n * m)},
+                               index=np.repeat(np.arange(m), n))
+
+        def build():
+            # fused operators, and equal sub-expressions written out twice
+            return [SecurityMovingMax(3, 'b') + SecurityMovingMin(4, 'c') * 2.,
+                    SecurityMovingAverage(5, SecurityMovingMax(3, 'b') - 1.),
+                    CSRankedSecurityValueHolder(SecurityMovingAverage(5, 'b')),
+                    'c']
+
+        cols = ['f1', 'f2', 'f3', 'c']
+        split = 17 * n
+        for batch in (True, False):
+            expected = transform(test_df.copy(), build(), cols=cols, category_field='code', batch=batch)
+
+            expressions = build()
+            first = transform(test_df.iloc[:split].copy(), expressions, cols=cols, category_field='code', batch=batch)
+            second = transform(test_df.iloc[split:].copy(), expressions, cols=cols, category_field='code', batch=batch)
+            pd.testing.assert_frame_equal(pd.concat([first, second]), expected)
+
+            # the holders can still be pushed on their own
+            names = list(range(n))
+            expressions[0].push({name: {'b': 1., 'c': 1.} for name in names})
+            reference = build()[0]
+            reference.transform(test_df.copy(), category_field='code')
+            reference.push({name: {'b': 1., 'c': 1.} for name in names})
+            np.testing.assert_array_equal(expressions[0].value_by_names(names).values,
+                                          reference.value_by_names(names).values)
+
+    def _stream_data(self):
+        np.random.seed(0)
+        n = 5
+        m = 40
+        return pd.DataFrame({'code': np.tile(np.arange(n), m),
+                             'b': np.random.randn(n * m),
+                             'c': np.random.randn(n * m)},
+                            index=np.repeat(np.arange(m), n))
+
+    def _stream_expressions(self):
+        return [SecurityMovingMax(3, 'b') + SecurityMovingMin(4, 'c'),
+                CSRankedSecurityValueHolder(SecurityMovingAverage(5, 'b')),
+                'c']
+
+    def test_transform_stream_with_chunks(self):
+        test_df = self._stream_data()
+        cols = ['f1', 'f2', 'c']
+        expected = transform(test_df.copy(), self._stream_expressions(), cols=cols, category_field='code')
+
+        # chunk sizes are not multiples of the number of codes, so snapshots are split across chunks
+        chunks = [test_df.iloc[i:i + 13] for i in range(0, len(test_df), 13)]
+        results = list(transform_stream(iter(chunks), self._stream_expressions(), cols, category_field='code'))
+        self.assertTrue(len(results) > 1)
+        pd.testing.assert_frame_equal(pd.concat(results), expected)
+
+        expected = transform(test_df.copy(), self._stream_expressions()[:1], cols=cols[:1])
+        results = list(transform_stream(chunks, self._stream_expressions()[:1], cols[:1]))
+        self.assertEqual(len(results), len(chunks))
+        pd.testing.assert_frame_equal(pd.concat(results), expected)
+
+    def _transform_stream_files(self, write, suffix, **kwargs):
+        test_df = self._stream_data()
+        cols = ['f1', 'f2', 'c']
+        expected = transform(test_df.copy(), self._stream_expressions(), cols=cols, category_field='code')
+
+        folder = tempfile.mkdtemp()
+        try:
+            for i, start in enumerate(range(0, len(test_df), 60)):
+                write(test_df.iloc[start:start + 60], os.path.join(folder, 'part{0:03d}{1}'.format(i, suffix)))
+
+            results = transform_stream(folder, self._stream_expressions(), cols, category_field='code', **kwargs)
+            pd.testing.assert_frame_equal(pd.concat(results), expected)
+
+            results = transform_stream(folder, self._stream_expressions(), cols, category_field='code', chunksize=17, **kwargs)
+            pd.testing.assert_frame_equal(pd.concat(results), expected)
+        finally:
+            shutil.rmtree(folder)
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_transform_stream_with_parquet_files(self):
+        self._transform_stream_files(lambda df, path: df.to_parquet(path), '.parquet')
+
+    @unittest.skipIf(tables is None, "tables is not installed")
+    def test_transform_stream_with_hdf_files(self):
+        self._transform_stream_files(lambda df, path: df.to_hdf(path, key='data', format='table'), '.h5', key='data')
@@ -6,8 +6,10 @@ Created on 2017-6-8
 """
 
 from PyFin.tests.CashFlows.testCashFlow import TestCashFlow
+from PyFin.tests.CashFlows.testCashFlows import TestCashFlows
 from PyFin.tests.CashFlows.testInterestRate import TestInterestRate
 
 
 __all__ = ['TestCashFlow',
+           'TestCashFlows',
            'TestInterestRate']
\ No newline at end of file
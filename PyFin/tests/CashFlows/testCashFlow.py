@@ -6,8 +6,18 @@ Created on 2017-6-8
 """
 
 import unittest
+import numpy as np
 from PyFin.DateUtilities.Date import Date
+from PyFin.DateUtilities.Period import Period
+from PyFin.DateUtilities.Calendar import Calendar
+from PyFin.DateUtilities.Schedule import Schedule
+from PyFin.DateUtilities.DayCounter import DayCounter
+from PyFin.Enums.Compoundings import Compounding
+from PyFin.Enums.Frequencies import Frequency
 from PyFin.CashFlows.CashFlow import SimpleCashFlow
+from PyFin.CashFlows.InterestRate import InterestRate
+from PyFin.CashFlows.FixedRateCoupon import FixedRateCoupon
+from PyFin.CashFlows.FixedRateCoupon import FixedRateLeg
 
 
 class TestCashFlow(unittest.TestCase):
@@ -46,6 +56,34 @@ class TestCashFlow(unittest.TestCase):
         self.assertTrue(cf1.hasOccurred(ref_date))
         self.assertFalse(cf1.hasOccurred(ref_date, include_ref_date=True))
 
+    def testFixedRateCouponAccruedAmountArray(self):
+        rate = InterestRate(0.05, DayCounter('Actual/Actual (ISMA)'), Compounding.Compounded, Frequency.Annual)
+        start = Date(2017, 1, 15)
+        end = Date(2017, 7, 15)
+        dates = np.arange(start.serialNumber - 10, end.serialNumber + 10)
+
+        for exCouponDate in [None, Date(2017, 7, 5)]:
+            coupon = FixedRateCoupon(end, 100., rate, start, end, exCouponDate=exCouponDate)
+            calculated = coupon.accruedAmountArray(dates)
+            expected = [coupon.accruedAmount(Date(serialNumber=int(d))) for d in dates]
+            np.testing.assert_array_almost_equal(calculated, expected, 12)
+
+    def testFixedRateLegAccrualPeriods(self):
+        schedule = Schedule(Date(2015, 1, 15), Date(2018, 1, 15), Period('6m'), Calendar('China.IB'))
+        dayCounter = DayCounter('Actual/Actual (ISMA)')
+        leg = FixedRateLeg(schedule) \
+            .withNotionals([100.]) \
+            .withCouponRate(0.05, dayCounter, Compounding.Simple, Frequency.Annual) \
+            .toLeg()
+
+        self.assertEqual(len(leg), schedule.size() - 1)
+        for coupon in leg:
+            self.assertAlmostEqual(coupon.accrualPeriod(),
+                                   dayCounter.yearFraction(coupon.accrualStartDate_,
+                                                           coupon.accrualEndDate_,
+                                                           coupon.refPeriodStart_,
+                                                           coupon.refPeriodEnd_))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
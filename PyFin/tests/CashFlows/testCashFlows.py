@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+u"""
+Created on 2026-10-18
+"""
+
+import unittest
+import numpy as np
+from PyFin.DateUtilities.Date import Date
+from PyFin.DateUtilities.Period import Period
+from PyFin.DateUtilities.Calendar import Calendar
+from PyFin.DateUtilities.Schedule import Schedule
+from PyFin.DateUtilities.DayCounter import DayCounter
+from PyFin.Enums.Compoundings import Compounding
+from PyFin.Enums.Frequencies import Frequency
+from PyFin.Enums.Durations import Duration
+from PyFin.CashFlows.CashFlow import Redemption
+from PyFin.CashFlows.InterestRate import InterestRate
+from PyFin.CashFlows.FixedRateCoupon import FixedRateLeg
+from PyFin.CashFlows.ColumnarLeg import ColumnarLeg
+from PyFin.CashFlows.CashFlows import CashFlows
+from PyFin.CashFlows.CashFlows import IrrFinder
+
+
+class TestCashFlows(unittest.TestCase):
+
+    def setUp(self):
+        self.dayCounter = DayCounter('Actual/Actual (ISMA)')
+        self.legs = []
+        for k in range(20):
+            schedule = Schedule(Date(2015, 1, 15) + 10 * k,
+                                Date(2025, 1, 15) + 13 * k,
+                                Period('6m'),
+                                Calendar('China.IB'))
+            leg = FixedRateLeg(schedule) \
+                .withNotionals([100.]) \
+                .withCouponRate(0.03 + 0.001 * k, self.dayCounter, Compounding.Compounded, Frequency.Semiannual) \
+                .toLeg()
+            self.legs.append(leg + [Redemption(100., schedule[schedule.size() - 1])])
+        self.columns = ColumnarLeg.fromLegs(self.legs)
+        self.settlement = Date(2018, 3, 1)
+        self.yields = np.linspace(0.02, 0.06, len(self.legs))
+
+    def _scalarNpv(self, leg, y, comp):
+        rate = InterestRate(y, self.dayCounter, comp, Frequency.Semiannual)
+        npv = 0.
+        lastDate = self.settlement
+        t = 0.
+        for cf in leg:
+            if cf.date() <= self.settlement:
+                continue
+            t += self.dayCounter.yearFraction(lastDate,
+                                              cf.date(),
+                                              getattr(cf, 'refPeriodStart_', None),
+                                              getattr(cf, 'refPeriodEnd_', None))
+            lastDate = cf.date()
+            npv += cf.amount() * rate.discountFactorImpl(t)
+        return npv
+
+    def _npv(self, y, comp=Compounding.Compounded):
+        return CashFlows.npv(self.columns, y, self.dayCounter, comp, Frequency.Semiannual,
+                             settlementDates=self.settlement)
+
+    def testColumnarLeg(self):
+        self.assertEqual(self.columns.size(), len(self.legs))
+        self.assertEqual(len(self.columns), sum(len(leg) for leg in self.legs))
+
+        for i, leg in enumerate(self.legs):
+            rows = slice(self.columns.offsets[i], self.columns.offsets[i + 1])
+            np.testing.assert_array_equal(self.columns.paymentDates[rows], [cf.date().serialNumber for cf in leg])
+            np.testing.assert_array_almost_equal(self.columns.amounts[rows], [cf.amount() for cf in leg], 12)
+            np.testing.assert_array_almost_equal(self.columns.accrualPeriods[rows][:-1],
+                                                 [cf.accrualPeriod() for cf in leg[:-1]],
+                                                 12)
+
+        schedule = Schedule(Date(2015, 1, 15), Date(2020, 1, 15), Period('1y'), Calendar('China.IB'))
+        columns = FixedRateLeg(schedule) \
+            .withNotionals([100.]) \
+            .withCouponRate(0.03, self.dayCounter, Compounding.Simple, Frequency.Annual) \
+            .toColumnarLeg()
+        self.assertEqual(columns.size(), 1)
+        self.assertEqual(len(columns), 5)
+        np.testing.assert_array_almost_equal(columns.accrualPeriods, 1.)
+
+    def testNpv(self):
+        for comp in [Compounding.Simple,
+                     Compounding.Compounded,
+                     Compounding.Continuous,
+                     Compounding.SimpleThenCompounded,
+                     Compounding.CompoundedThenSimple]:
+            calculated = self._npv(self.yields, comp)
+            expected = [self._scalarNpv(leg, y, comp) for leg, y in zip(self.legs, self.yields)]
+            np.testing.assert_array_almost_equal(calculated, expected, 10)
+
+    def testAccruedAmount(self):
+        calculated = CashFlows.accruedAmount(self.columns, self.settlement)
+        expected = [sum(cf.accruedAmount(self.settlement) for cf in leg[:-1] if cf.date() > self.settlement)
+                    for leg in self.legs]
+        np.testing.assert_array_almost_equal(calculated, expected, 12)
+
+        paymentDate = self.legs[0][6].date()
+        calculated = CashFlows.accruedAmount(self.columns, paymentDate)
+        self.assertAlmostEqual(calculated[0], 0.)
+
+    def testSensitivities(self):
+        npv = self._npv(self.yields)
+        h = 1e-5
+        up = self._npv(self.yields + h)
+        down = self._npv(self.yields - h)
+
+        duration = CashFlows.duration(self.columns, self.yields, self.dayCounter, Compounding.Compounded,
+                                      Frequency.Semiannual, settlementDates=self.settlement)
+        np.testing.assert_array_almost_equal(duration, (down - up) / (2. * h) / npv, 6)
+
+        macaulay = CashFlows.duration(self.columns, self.yields, self.dayCounter, Compounding.Compounded,
+                                      Frequency.Semiannual, Duration.Macaulay, settlementDates=self.settlement)
+        np.testing.assert_array_almost_equal(macaulay, duration * (1. + self.yields / 2.))
+
+        convexity = CashFlows.convexity(self.columns, self.yields, self.dayCounter, Compounding.Compounded,
+                                        Frequency.Semiannual, settlementDates=self.settlement)
+        np.testing.assert_array_almost_equal(convexity / 100., (up + down - 2. * npv) / h / h / npv / 100., 3)
+
+        bps = CashFlows.bps(self.columns, self.yields, self.dayCounter, Compounding.Compounded,
+                            Frequency.Semiannual, settlementDates=self.settlement)
+        self.assertTrue((bps > 0.).all())
+
+        with self.assertRaises(ValueError):
+            CashFlows.duration(self.columns, self.yields, self.dayCounter, Compounding.Simple,
+                               Frequency.Semiannual, Duration.Macaulay, settlementDates=self.settlement)
+
+    def testYieldRate(self):
+        for comp in [Compounding.Simple, Compounding.Compounded, Compounding.Continuous]:
+            npv = self._npv(self.yields, comp)
+            calculated = CashFlows.yieldRate(self.columns, npv, self.dayCounter, comp, Frequency.Semiannual,
+                                             settlementDates=self.settlement)
+            np.testing.assert_array_almost_equal(calculated, self.yields, 8)
+
+        calculated = CashFlows.yieldRate(self.columns, -100., self.dayCounter, Compounding.Compounded,
+                                         Frequency.Semiannual, settlementDates=self.settlement)
+        self.assertTrue(np.isnan(calculated).all())
+
+    def testYieldRateWithoutRemainingFlows(self):
+        settlements = np.full(len(self.legs), self.settlement.serialNumber, dtype=np.int64)
+        settlements[::3] = (Date(2026, 1, 1)).serialNumber
+        npv = CashFlows.npv(self.columns, self.yields, self.dayCounter, Compounding.Compounded,
+                            Frequency.Semiannual, settlementDates=settlements)
+        self.assertTrue((npv[::3] == 0.).all())
+
+        calculated = CashFlows.yieldRate(self.columns, npv, self.dayCounter, Compounding.Compounded,
+                                         Frequency.Semiannual, settlementDates=settlements)
+        expired = np.zeros(len(self.legs), dtype=bool)
+        expired[::3] = True
+        self.assertTrue(np.isnan(calculated[expired]).all())
+        np.testing.assert_array_almost_equal(calculated[~expired], self.yields[~expired], 8)
+
+    def testIrrFinder(self):
+        leg = self.legs[3]
+        npv = self._scalarNpv(leg, 0.035, Compounding.Compounded)
+        finder = IrrFinder(leg, npv, self.dayCounter, Compounding.Compounded, Frequency.Semiannual,
+                           False, self.settlement)
+        self.assertAlmostEqual(finder(0.035), 0.)
+        self.assertTrue(finder(0.04) > 0.)
+        self.assertTrue(finder.derivative(0.035) < 0.)
+        # the columns are built once for the whole search
+        columns = finder._columns
+        self.assertIsInstance(columns, ColumnarLeg)
+        finder(0.04)
+        finder.derivative(0.04)
+        self.assertIs(finder._columns, columns)
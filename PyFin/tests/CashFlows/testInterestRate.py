@@ -6,6 +6,7 @@ Created on 2017-6-11
 """
 
 import unittest
+import numpy as np
 from PyFin.Enums.Frequencies import Frequency
 from PyFin.Enums.Compoundings import Compounding
 from PyFin.CashFlows.InterestRate import InterestRate
@@ -133,6 +134,18 @@ class TestInterestRate(unittest.TestCase):
                                    d1, d2)
             self.assertAlmostEqual(r3.r_, case.expected, case.precision)
 
+    def testCompoundFactorArray(self):
+        d1 = Date(2017, 6, 11)
+        offsets = np.arange(0, 1500, 7)
+        d2 = d1.serialNumber + offsets
+
+        for case in self.cases:
+            ir = InterestRate(case.r, DayCounter('Actual/365 (Fixed)'), case.comp, case.freq)
+            calculated = ir.compoundFactorArray(d1.serialNumber, d2)
+            expected = [ir.compoundFactor(d1, d1 + int(offset)) for offset in offsets]
+            np.testing.assert_array_almost_equal(calculated, expected, 12)
+            np.testing.assert_array_almost_equal(ir.discountFactorArray(d1.serialNumber, d2) * calculated, 1., 12)
+
 
 if __name__ == '__main__':
     unittest.main()
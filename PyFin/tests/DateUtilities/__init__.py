@@ -7,6 +7,7 @@ Created on 2015-7-13
 
 from PyFin.tests.DateUtilities.testCalendar import TestCalendar
 from PyFin.tests.DateUtilities.testDate import TestDate
+from PyFin.tests.DateUtilities.testDateArrays import TestDateArrays
 from PyFin.tests.DateUtilities.testPeriod import TestPeriod
 from PyFin.tests.DateUtilities.testSchedule import TestSchedule
 from PyFin.tests.DateUtilities.testDayCounter import TestDayCounter
@@ -14,6 +15,7 @@ from PyFin.tests.DateUtilities.testDayCounter import TestDayCounter
 
 __all__ = ["TestCalendar",
            "TestDate",
+           "TestDateArrays",
            "TestPeriod",
            "TestSchedule",
            "TestDayCounter"]
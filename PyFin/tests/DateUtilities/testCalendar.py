@@ -10,6 +10,7 @@ import copy
 import tempfile
 import os
 import pickle
+import numpy as np
 from PyFin.DateUtilities import Date
 from PyFin.DateUtilities import Calendar
 from PyFin.DateUtilities import Period
@@ -376,3 +377,54 @@ class TestCalendar(unittest.TestCase):
             self.assertEqual(sseCal, pickledCal)
 
         os.unlink(f.name)
+
+    def testBizDayIndexMatchesDayByDay(self):
+        ibCal = Calendar('China.IB')
+        fromDate = Date(2004, 12, 20)
+        toDate = Date(2006, 2, 10)
+
+        expected = []
+        d = fromDate
+        while d <= toDate:
+            if ibCal._impl.isBizDay(d):
+                expected.append(d)
+            d += 1
+
+        self.assertEqual(ibCal.bizDatesList(fromDate, toDate), expected)
+        self.assertEqual(ibCal.bizDaysBetween(fromDate, toDate, True, True), len(expected))
+        self.assertEqual(ibCal.bizDaysBetween(toDate, fromDate, True, True), len(expected))
+        self.assertEqual(len(ibCal.holDatesList(fromDate, toDate)) + len(expected), toDate - fromDate + 1)
+
+        for i in range(1, len(expected) - 5):
+            self.assertEqual(ibCal.advanceDate(expected[i], Period('5B')), expected[i + 5])
+            self.assertEqual(ibCal.advanceDate(expected[i], Period('-1B')), expected[i - 1])
+            self.assertEqual(ibCal.advanceDate(expected[i] - 1, Period('1B')), expected[i])
+
+    def testBizDayIndexAtTheBoundaries(self):
+        sseCal = Calendar('China.SSE')
+        lastDate = Date.maxDate()
+        firstDate = Date.minDate()
+
+        self.assertEqual(sseCal.bizDaysBetween(lastDate - 10, lastDate, True, True),
+                         len(sseCal.bizDatesList(lastDate - 10, lastDate)))
+        self.assertEqual(sseCal.bizDatesList(lastDate, lastDate - 1), [])
+        self.assertEqual(sseCal.advanceDate(firstDate + 10, Period('-3B')), Date(1901, 1, 8))
+        self.assertEqual(sseCal.advanceDate(lastDate - 10, Period('3B')), Date(2199, 12, 25))
+
+    def testIsBizDayArray(self):
+        fromDate = Date(2016, 9, 1)
+        toDate = Date(2016, 10, 31)
+        serials = np.arange(fromDate.serialNumber, toDate.serialNumber + 1)
+
+        for holCenter in ['China.SSE', 'China.IB', 'Target', 'Null']:
+            cal = Calendar(holCenter)
+            expected = [cal.isBizDay(Date(serialNumber=int(s))) for s in serials]
+            np.testing.assert_array_equal(cal.isBizDayArray(serials), expected)
+            self.assertEqual(cal.isBizDayArray(serials.reshape(-1, 1)).shape, (len(serials), 1))
+
+        sseCal = Calendar('China.SSE')
+        self.assertFalse(sseCal.isBizDayArray([Date(2016, 10, 3).serialNumber])[0])
+        self.assertTrue(Calendar('China.IB').isBizDayArray([Date(2016, 10, 8).serialNumber])[0])
+
+        with self.assertRaises(ValueError):
+            sseCal.isBizDayArray([Date.maxDate().serialNumber + 1])
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+u"""
+Created on 2026-10-18
+"""
+
+import unittest
+import datetime as dt
+import numpy as np
+from PyFin.DateUtilities import Calendar
+from PyFin.DateUtilities import Date
+from PyFin.DateUtilities import Period
+from PyFin.DateUtilities import splitSerialNumbers
+from PyFin.DateUtilities import makeSerialNumbers
+from PyFin.DateUtilities import weekdayArray
+from PyFin.DateUtilities import endOfMonthArray
+from PyFin.DateUtilities import advanceArray
+from PyFin.DateUtilities import adjustDateArray
+from PyFin.DateUtilities import advanceDateArray
+from PyFin.DateUtilities import toDatetime64
+from PyFin.DateUtilities import fromDatetime64
+from PyFin.Enums import BizDayConventions
+
+
+class TestDateArrays(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(0)
+        self.serials = np.random.randint(Date.minDate().serialNumber,
+                                         Date.maxDate().serialNumber + 1,
+                                         2000).astype(np.int32)
+        self.tradeDates = np.random.randint(Date(2000, 1, 1).serialNumber,
+                                            Date(2030, 12, 31).serialNumber,
+                                            300).astype(np.int32)
+        self.dates = [Date(serialNumber=int(s)) for s in self.serials]
+
+    def testSplitAndMakeSerialNumbers(self):
+        years, months, days = splitSerialNumbers(self.serials)
+        self.assertEqual(years.dtype, np.int32)
+        np.testing.assert_array_equal(years, [d.year() for d in self.dates])
+        np.testing.assert_array_equal(months, [d.month() for d in self.dates])
+        np.testing.assert_array_equal(days, [d.dayOfMonth() for d in self.dates])
+        np.testing.assert_array_equal(makeSerialNumbers(years, months, days), self.serials)
+
+        serials = makeSerialNumbers(2016, [1, 2, 3], [31, 29, 1])
+        np.testing.assert_array_equal(serials, [Date(2016, 1, 31).serialNumber,
+                                                Date(2016, 2, 29).serialNumber,
+                                                Date(2016, 3, 1).serialNumber])
+
+        with self.assertRaises(ValueError):
+            makeSerialNumbers(2015, 2, 29)
+        with self.assertRaises(ValueError):
+            makeSerialNumbers(1900, 12, 31)
+
+    def testWeekdayAndEndOfMonth(self):
+        np.testing.assert_array_equal(weekdayArray(self.serials), [d.weekday() for d in self.dates])
+        np.testing.assert_array_equal(endOfMonthArray(self.serials),
+                                      [Date.endOfMonth(d).serialNumber for d in self.dates])
+
+        serials = self.serials.reshape(40, 50)
+        self.assertEqual(weekdayArray(serials).shape, (40, 50))
+
+    def testDatetime64Conversion(self):
+        converted = toDatetime64(self.serials)
+        self.assertEqual(converted.dtype, np.dtype('datetime64[D]'))
+        self.assertEqual(list(converted.astype(object)), [d.toDateTime().date() for d in self.dates])
+        np.testing.assert_array_equal(fromDatetime64(converted), self.serials)
+        np.testing.assert_array_equal(fromDatetime64(converted.astype('datetime64[ns]') + np.timedelta64(13, 'h')),
+                                      self.serials)
+
+        self.assertEqual(fromDatetime64(np.datetime64('1970-01-01'))[()], Date(1970, 1, 1).serialNumber)
+
+        with self.assertRaises(ValueError):
+            fromDatetime64(np.array(['2016-01-01', 'NaT'], dtype='datetime64[D]'))
+        with self.assertRaises(ValueError):
+            fromDatetime64(np.array(['1800-01-01'], dtype='datetime64[D]'))
+
+    def testAdvanceArray(self):
+        for period in ['3d', '-2w', '1m', '-7m', '2y', '-1y', '3b']:
+            calculated = advanceArray(self.tradeDates, period)
+            expected = [(Date(serialNumber=int(s)) + Period(period)).serialNumber for s in self.tradeDates]
+            np.testing.assert_array_equal(calculated, expected)
+
+        np.testing.assert_array_equal(advanceArray([Date(2016, 1, 31).serialNumber], Period('1m')),
+                                      [Date(2016, 2, 29).serialNumber])
+
+        with self.assertRaises(ValueError):
+            advanceArray([Date(2199, 6, 1).serialNumber], '1y')
+
+    def testAdjustDateArray(self):
+        conventions = [BizDayConventions.Following,
+                       BizDayConventions.ModifiedFollowing,
+                       BizDayConventions.Preceding,
+                       BizDayConventions.ModifiedPreceding,
+                       BizDayConventions.Unadjusted,
+                       BizDayConventions.HalfMonthModifiedFollowing,
+                       BizDayConventions.Nearest]
+
+        for holCenter in ['China.SSE', 'Target']:
+            cal = Calendar(holCenter)
+            for c in conventions:
+                calculated = adjustDateArray(cal, self.tradeDates, c)
+                expected = [cal.adjustDate(Date(serialNumber=int(s)), c).serialNumber for s in self.tradeDates]
+                np.testing.assert_array_equal(calculated, expected)
+
+        with self.assertRaises(ValueError):
+            adjustDateArray(Calendar('China.SSE'), self.tradeDates, 10)
+
+    def testAdvanceDateArray(self):
+        cal = Calendar('China.SSE')
+        for period in ['0d', '5d', '-1w', '1m', '-3m', '1y', '4b', '-2b']:
+            for c in [BizDayConventions.Following, BizDayConventions.ModifiedFollowing, BizDayConventions.Preceding]:
+                for endOfMonth in [False, True]:
+                    calculated = advanceDateArray(cal, self.tradeDates, period, c, endOfMonth)
+                    expected = [cal.advanceDate(Date(serialNumber=int(s)), Period(period), c, endOfMonth).serialNumber
+                                for s in self.tradeDates]
+                    np.testing.assert_array_equal(calculated, expected)
+
+    def testOutOfBoundSerialNumbers(self):
+        with self.assertRaises(ValueError):
+            weekdayArray([Date.minDate().serialNumber - 1])
+        with self.assertRaises(ValueError):
+            splitSerialNumbers([Date.maxDate().serialNumber + 1])
+        with self.assertRaises(ValueError):
+            advanceDateArray(Calendar('China.SSE'), [Date.maxDate().serialNumber], '1b')
+
+    def testEmptyInputs(self):
+        empty = np.array([], dtype=np.int32)
+        self.assertEqual(len(adjustDateArray(Calendar('NullCalendar'), empty)), 0)
+        self.assertEqual(len(toDatetime64(empty)), 0)
+        self.assertEqual(len(splitSerialNumbers(empty)[0]), 0)
+        self.assertEqual(toDatetime64([Date(2016, 3, 1).serialNumber])[0], np.datetime64(dt.date(2016, 3, 1)))
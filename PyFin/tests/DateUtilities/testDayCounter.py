@@ -6,6 +6,7 @@ Created on 2017-6-12
 """
 
 import unittest
+import numpy as np
 from PyFin.DateUtilities.Date import Date
 from PyFin.DateUtilities.Period import Period
 from PyFin.DateUtilities.Calendar import Calendar
@@ -52,6 +53,43 @@ class TestDayCounter(unittest.TestCase):
             calculated = dayCounter.yearFraction(d1, d2, rd1, rd2)
             self.assertAlmostEqual(case.result, calculated)
 
+        dayCounter = DayCounter('Actual/Actual (ISMA)')
+        calculated = dayCounter.yearFractionArray([case.start.serialNumber for case in cases],
+                                                  [case.end.serialNumber for case in cases],
+                                                  [case.refStart.serialNumber for case in cases],
+                                                  [case.refEnd.serialNumber for case in cases])
+        np.testing.assert_array_almost_equal(calculated, [case.result for case in cases])
+
+    def testYearFractionArray(self):
+        np.random.seed(0)
+        n = 500
+        d1 = np.random.randint(Date(1990, 1, 1).serialNumber, Date(2040, 1, 1).serialNumber, n)
+        d2 = d1 + np.random.randint(-400, 3000, n)
+        refStart = d1 - np.random.randint(0, 100, n)
+        refEnd = refStart + np.random.choice([91, 182, 365], n)
+        refStart[::7] = 0
+        refEnd[::5] = 0
+
+        def toDate(serial):
+            return Date(serialNumber=int(serial)) if serial else None
+
+        for name in ['Actual/360', 'Actual/365 (Fixed)', 'Actual/365 (NL)', 'Actual/Actual (ISMA)']:
+            dayCounter = DayCounter(name)
+            calculated = dayCounter.yearFractionArray(d1, d2, refStart, refEnd)
+            expected = [dayCounter.yearFraction(toDate(x), toDate(y), toDate(z), toDate(w))
+                        for x, y, z, w in zip(d1, d2, refStart, refEnd)]
+            np.testing.assert_array_almost_equal(calculated, expected, 12)
+
+            calculated = dayCounter.dayCountArray(d1, d2)
+            expected = [dayCounter.dayCount(toDate(x), toDate(y)) for x, y in zip(d1, d2)]
+            np.testing.assert_array_equal(calculated, expected)
+
+        dayCounter = DayCounter('Actual/Actual (ISMA)')
+        np.testing.assert_array_almost_equal(dayCounter.yearFractionArray(d1, d2),
+                                             [dayCounter.yearFraction(toDate(x), toDate(y))
+                                              for x, y in zip(d1, d2)],
+                                             12)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
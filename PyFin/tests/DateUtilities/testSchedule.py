@@ -10,12 +10,15 @@ import copy
 import tempfile
 import pickle
 import os
+import numpy as np
 from PyFin.DateUtilities import Date
 from PyFin.DateUtilities import Schedule
 from PyFin.DateUtilities import Period
 from PyFin.DateUtilities import Calendar
+from PyFin.DateUtilities import scheduleArrays
 from PyFin.Enums import TimeUnits
 from PyFin.Enums import BizDayConventions
+from PyFin.Enums import DateGeneration
 
 
 class TestSchedule(unittest.TestCase):
@@ -100,3 +103,70 @@ class TestSchedule(unittest.TestCase):
             self.assertEqual(sch, pickled_sch)
 
         os.unlink(f.name)
+
+    def testZeroRuleSchedule(self):
+        s = Schedule(Date(2012, 1, 17), Date(2013, 1, 1), Period('0d'), Calendar('China.SSE'))
+        self.checkDates(s, [Date(2012, 1, 17), Date(2013, 1, 4)])
+        self.assertTrue(s.isRegular(1))
+
+    def testScheduleArrays(self):
+        np.random.seed(0)
+        n = 300
+        effectiveDates = np.random.randint(Date(2000, 1, 1).serialNumber, Date(2020, 1, 1).serialNumber, n)
+        effectiveDates[::5] = [Date.endOfMonth(Date(serialNumber=int(d))).serialNumber for d in effectiveDates[::5]]
+        terminationDates = effectiveDates + np.random.randint(30, 3000, n)
+        tenors = [['1m', '3m', '6m', '1y', '2w', '10d', '0d'][i % 7] for i in range(n)]
+        calendars = [['China.SSE', 'Target', 'NullCalendar'][i % 3] for i in range(n)]
+        conventions = np.random.randint(BizDayConventions.Following, BizDayConventions.Nearest + 1, n)
+        terminationConventions = np.random.randint(BizDayConventions.Following, BizDayConventions.Nearest + 1, n)
+        rules = np.random.choice([DateGeneration.Zero, DateGeneration.Backward, DateGeneration.Forward], n)
+        endOfMonth = np.random.rand(n) < 0.5
+        firstDates = np.where(np.random.rand(n) < 0.2, effectiveDates + 10, 0)
+        firstDates[(rules == DateGeneration.Zero) | (np.array(tenors) == '0d')] = 0
+
+        offsets, dates, isRegular = scheduleArrays(effectiveDates,
+                                                   terminationDates,
+                                                   tenors,
+                                                   calendars,
+                                                   conventions,
+                                                   terminationConventions,
+                                                   rules,
+                                                   endOfMonth,
+                                                   firstDates=firstDates)
+        self.assertEqual(len(offsets), n + 1)
+
+        for i in range(n):
+            s = Schedule(Date(serialNumber=int(effectiveDates[i])),
+                         Date(serialNumber=int(terminationDates[i])),
+                         Period(tenors[i]),
+                         Calendar(calendars[i]),
+                         int(conventions[i]),
+                         int(terminationConventions[i]),
+                         int(rules[i]),
+                         bool(endOfMonth[i]),
+                         Date(serialNumber=int(firstDates[i])) if firstDates[i] else None)
+            start = offsets[i]
+            self.assertEqual(offsets[i + 1] - start, s.size())
+            for j in range(s.size()):
+                self.assertEqual(dates[start + j], s[j].serialNumber)
+            for j in range(1, s.size()):
+                self.assertEqual(isRegular[start + j], s.isRegular(j))
+
+    def testScheduleArraysWithSharedParameters(self):
+        effectiveDates = [Date(2013, 3, 31).serialNumber, Date(2014, 1, 31).serialNumber]
+        offsets, dates, _ = scheduleArrays(effectiveDates,
+                                           Date(2015, 6, 30).serialNumber,
+                                           Period('1y'),
+                                           Calendar('NullCalendar'))
+        np.testing.assert_array_equal(offsets, [0, 4, 7])
+        np.testing.assert_array_equal(dates[:4], [Date(2013, 3, 31).serialNumber,
+                                                  Date(2014, 3, 31).serialNumber,
+                                                  Date(2015, 3, 31).serialNumber,
+                                                  Date(2015, 6, 30).serialNumber])
+
+        with self.assertRaises(ValueError):
+            scheduleArrays(effectiveDates, Date(2013, 6, 30).serialNumber, '1m', 'China.SSE')
+        with self.assertRaises(ValueError):
+            scheduleArrays(effectiveDates, Date(2015, 6, 30).serialNumber, '1m', ['China.SSE'] * 3)
+        with self.assertRaises(ValueError):
+            scheduleArrays(effectiveDates, Date(2015, 6, 30).serialNumber, '1m', 'China.SSE', convention=10)
@@ -10,9 +10,13 @@ from PyFin.tests.Math.Accumulators.testAccumulatorsArithmetic import TestAccumul
 from PyFin.tests.Math.Accumulators.testStatelessAccumulators import TestStatelessAccumulators
 from PyFin.tests.Math.Accumulators.testStatefulAccumulators import TestStatefulAccumulators
 from PyFin.tests.Math.Accumulators.testPerformancers import TestPerformancers
+from PyFin.tests.Math.Accumulators.testPanelAccumulators import TestPanelAccumulators
+from PyFin.tests.Math.Accumulators.testFusedAccumulators import TestFusedAccumulators
 
 __all__ = ['TestAccumulatorImpl',
            'TestAccumulatorsArithmetic',
            'TestStatelessAccumulators',
            'TestStatefulAccumulators',
-           'TestPerformancers']
+           'TestPerformancers',
+           'TestPanelAccumulators',
+           'TestFusedAccumulators']
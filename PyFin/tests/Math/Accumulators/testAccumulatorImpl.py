@@ -10,12 +10,15 @@ import copy
 import tempfile
 import pickle
 import os
+import bisect
 from collections import deque
 import numpy as np
 from PyFin.Math.Accumulators.impl import (
     Deque,
     DiffDeque,
-    UniqueDiffDeque
+    UniqueDiffDeque,
+    SkipList,
+    MonotonicDeque
 )
 
 
@@ -99,6 +102,45 @@ class TestAccumulatorImpl(unittest.TestCase):
         deque.dumps(values, stamps)
         self.assertEqual(deque.sum(), 0)
 
+    def testDiffDequeRingBuffer(self):
+        np.random.seed(0)
+        values = np.random.randint(-10, 10, 2000).astype(float)
+        stamps = np.cumsum(np.random.randint(0, 3, 2000))
+
+        for closed in ["left", "right", "both", "neither"]:
+            window = 40
+            diff_deque = DiffDeque(window, closed=closed)
+            benchmark = deque()
+            last = None
+            for i, (v, s) in enumerate(zip(values, stamps)):
+                popped = []
+                while benchmark and ((s - benchmark[0][1] > window) if closed in ("left", "both")
+                                     else (s - benchmark[0][1] >= window)):
+                    popped.append(benchmark.popleft()[0])
+                if closed in ("right", "both"):
+                    benchmark.append((v, s))
+                elif last is not None and ((closed == "neither" and s - last[1] < window)
+                                           or (closed == "left" and s - last[1] <= window)):
+                    benchmark.append(last)
+                last = v, s
+
+                self.assertEqual(diff_deque.dumps([v], [s]), len(popped))
+                self.assertEqual(diff_deque.popped_count, len(popped))
+                self.assertEqual(diff_deque.popped_sum, sum(popped))
+                self.assertEqual(diff_deque.popped_sum_square, sum(p * p for p in popped))
+                self.assertEqual(diff_deque.size(), len(benchmark))
+                self.assertEqual(diff_deque.sum(), sum(b[0] for b in benchmark))
+                if benchmark:
+                    self.assertEqual(diff_deque[0], benchmark[0][0])
+                    self.assertEqual(diff_deque.back(), benchmark[-1][0])
+
+                if i % 500 == 499:
+                    diff_deque = pickle.loads(pickle.dumps(diff_deque))
+
+    def testDiffDequeWithWrongClosed(self):
+        with self.assertRaises(ValueError):
+            DiffDeque(10, closed="middle")
+
     def testUniqueDiffDequeDeepCopy(self):
         benchmark_deque = UniqueDiffDeque(5, closed="left")
         copied_deque = copy.deepcopy(benchmark_deque)
@@ -139,6 +181,185 @@ class TestAccumulatorImpl(unittest.TestCase):
         deque.dumps(values, stamps)
         self.assertEqual(deque.sum(), 5)
 
-
-
-
+    def testDiffDequePickle(self):
+        for closed in ["left", "right", "both", "neither"]:
+            deque = DiffDeque(10, closed=closed)
+            deque.dumps([1, 2, 3, 4], [1, 7, 9, 16])
+            pickled = pickle.loads(pickle.dumps(deque))
+
+            self.assertEqual(pickled.close(), deque.close())
+            self.assertEqual(pickled.size(), deque.size())
+            self.assertEqual(pickled.sum(), deque.sum())
+
+            deque.dumps([5, 6], [18, 26])
+            pickled.dumps([5, 6], [18, 26])
+            self.assertEqual(pickled.size(), deque.size())
+            self.assertEqual(pickled.sum(), deque.sum())
+
+    def testUniqueDiffDequePickle(self):
+        for closed in ["left", "right", "both", "neither"]:
+            deque = UniqueDiffDeque(10, closed=closed)
+            deque.dumps([2, 2, 5, 5], [1, 7, 16, 20])
+            pickled = pickle.loads(pickle.dumps(deque))
+
+            self.assertEqual(pickled.size(), deque.size())
+            self.assertEqual(pickled.sum(), deque.sum())
+
+            deque.dumps([5, 7], [22, 26])
+            pickled.dumps([5, 7], [22, 26])
+            self.assertEqual(pickled.size(), deque.size())
+            self.assertEqual(pickled.sum(), deque.sum())
+
+    def testUniqueDiffDequeIndex(self):
+        np.random.seed(0)
+        values = np.random.randint(0, 30, 3000).astype(float)
+        stamps = np.cumsum(np.random.randint(0, 3, 3000))
+
+        for closed in ["left", "right", "both", "neither"]:
+            window = 50
+            unique_deque = UniqueDiffDeque(window, closed=closed)
+            benchmark = {}
+            last = None
+            for i, (v, s) in enumerate(zip(values, stamps)):
+                popped = 0
+                while benchmark:
+                    first = next(iter(benchmark))
+                    age = s - benchmark[first]
+                    if (age > window) if closed in ("left", "both") else (age >= window):
+                        del benchmark[first]
+                        popped += 1
+                    else:
+                        break
+                if closed in ("right", "both"):
+                    benchmark.pop(v, None)
+                    benchmark[v] = s
+                elif last is not None and ((closed == "neither" and s - last[1] < window)
+                                           or (closed == "left" and s - last[1] <= window)):
+                    benchmark.pop(last[0], None)
+                    benchmark[last[0]] = last[1]
+                last = v, s
+
+                self.assertEqual(unique_deque.dumps([v], [s]), popped)
+                self.assertEqual(unique_deque.size(), len(benchmark))
+                self.assertAlmostEqual(unique_deque.sum(), sum(benchmark))
+                ordered = list(benchmark)
+                if i % 50 == 0:
+                    self.assertEqual([unique_deque[j] for j in range(len(ordered))], ordered)
+                    for j, value in enumerate(ordered):
+                        self.assertEqual(unique_deque.idx(value), j)
+                    self.assertEqual(unique_deque.idx(-1.), np.iinfo(np.uintp).max)
+
+                if i % 700 == 699:
+                    unique_deque = pickle.loads(pickle.dumps(unique_deque))
+
+    def testSkipList(self):
+        np.random.seed(0)
+        capacity = 50
+        skip_list = SkipList(capacity)
+        benchmark = []
+
+        for _ in range(5000):
+            if len(benchmark) < capacity and (not benchmark or np.random.rand() < 0.6):
+                value = float(np.random.randint(0, 20))
+                self.assertEqual(skip_list.add(value), bisect.bisect_left(benchmark, value))
+                bisect.insort_left(benchmark, value)
+            else:
+                value = benchmark[np.random.randint(len(benchmark))]
+                skip_list.discard(value)
+                benchmark.remove(value)
+
+            self.assertEqual(len(skip_list), len(benchmark))
+            self.assertEqual(skip_list.tolist(), benchmark)
+            if benchmark:
+                self.assertEqual(skip_list[0], benchmark[0])
+                self.assertEqual(skip_list[len(benchmark) - 1], benchmark[-1])
+
+        with self.assertRaises(KeyError):
+            skip_list.discard(100.)
+
+        with self.assertRaises(IndexError):
+            skip_list[len(benchmark)]
+
+    def testSkipListFull(self):
+        skip_list = SkipList(2)
+        skip_list.add(1.)
+        skip_list.add(2.)
+
+        with self.assertRaises(IndexError):
+            skip_list.add(3.)
+
+    def testSkipListPickle(self):
+        skip_list = SkipList(10)
+        for value in [3., 1., 2., 2., 5.]:
+            skip_list.add(value)
+
+        pickled = pickle.loads(pickle.dumps(skip_list))
+        copied = copy.deepcopy(skip_list)
+        self.assertEqual(pickled.tolist(), [1., 2., 2., 3., 5.])
+        self.assertEqual(copied.tolist(), [1., 2., 2., 3., 5.])
+
+    def testMonotonicDeque(self):
+        np.random.seed(0)
+        window = 7
+        maxer = MonotonicDeque(window, True)
+        minimer = MonotonicDeque(window, False)
+        con = deque(maxlen=window)
+
+        self.assertTrue(np.isnan(maxer.value))
+        for i, value in enumerate(np.random.randint(0, 4, 500).astype(float)):
+            con.append(value)
+            maxer.push(value)
+            minimer.push(value)
+
+            values = list(con)
+            self.assertEqual(maxer.value, max(values))
+            self.assertEqual(minimer.value, min(values))
+
+            # among ties the one stored first in a ring buffer of window slots wins
+            stamps = range(i - len(values) + 1, i + 1)
+            max_stamps = [s for s, v in zip(stamps, values) if v == max(values)]
+            min_stamps = [s for s, v in zip(stamps, values) if v == min(values)]
+            self.assertEqual(maxer.age, i - min(max_stamps, key=lambda s: s % window))
+            self.assertEqual(minimer.age, i - min(min_stamps, key=lambda s: s % window))
+
+    def testMonotonicDequePickle(self):
+        maxer = MonotonicDeque(3, True)
+        for value in [1., 3., 2.]:
+            maxer.push(value)
+
+        pickled = pickle.loads(pickle.dumps(maxer))
+        for value in [0., 0., 0.5]:
+            maxer.push(value)
+            pickled.push(value)
+            self.assertEqual(maxer.value, pickled.value)
+            self.assertEqual(maxer.age, pickled.age)
+
+    def testPickleWithOutOfBandBuffers(self):
+        deque = Deque(3)
+        diff_deque = DiffDeque(10)
+        skip_list = SkipList(10)
+        maxer = MonotonicDeque(3, True)
+        for i, value in enumerate([3., 1., 2., 2., 5.]):
+            deque.dumps([value])
+            diff_deque.dumps([value], [2 * i])
+            skip_list.add(value)
+            maxer.push(value)
+        objects = [deque, diff_deque, skip_list, maxer]
+
+        for protocol in [2, 5]:
+            buffers = []
+            content = pickle.dumps(objects, protocol=protocol, buffer_callback=buffers.append if protocol >= 5 else None)
+            self.assertEqual(len(buffers), 6 if protocol >= 5 else 0)
+            pickled = pickle.loads(content, buffers=[bytearray(b.raw()) for b in buffers])
+
+            self.assertEqual(pickled[0], deque)
+            self.assertEqual(pickled[0].sum(), deque.sum())
+            self.assertEqual(pickled[1].size(), diff_deque.size())
+            self.assertEqual(pickled[1].sum(), diff_deque.sum())
+            self.assertEqual(pickled[2].tolist(), [1., 2., 2., 3., 5.])
+            expected = copy.deepcopy(maxer)
+            for value in [0., 0., 0.5]:
+                pickled[3].push(value)
+                expected.push(value)
+                self.assertEqual(pickled[3].value, expected.value)
+                self.assertEqual(pickled[3].age, expected.age)
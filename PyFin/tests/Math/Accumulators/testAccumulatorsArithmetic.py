@@ -35,6 +35,13 @@ from PyFin.Math.Accumulators.StatefulAccumulators import MovingAverage
 from PyFin.Math.Accumulators.StatefulAccumulators import MovingVariance
 from PyFin.Math.Accumulators.StatefulAccumulators import MovingMax
 from PyFin.Math.Accumulators.StatefulAccumulators import MovingCorrelation
+from PyFin.Math.Accumulators.StatefulAccumulators import MovingRSI
+from PyFin.Math.Accumulators.StatefulAccumulators import MovingResidue
+from PyFin.Math.Accumulators.StatefulAccumulators import MACD
+from PyFin.Math.Accumulators.StatefulAccumulators import Delta
+from PyFin.Math.Accumulators.StatefulAccumulators import TimeMovingSum
+from PyFin.Math.Accumulators.StatefulAccumulators import TimeMovingCountUnique
+from PyFin.Math.Accumulators.StatelessAccumulators import Maximum
 from PyFin.Math.Accumulators.StatelessAccumulators import Sum
 from PyFin.Math.Accumulators.StatelessAccumulators import Average
 from PyFin.Math.Accumulators.StatelessAccumulators import Min
@@ -713,6 +720,49 @@ class TestAccumulatorsArithmetic(unittest.TestCase):
         self.assertEqual(res.name, 'my_factor')
         np.testing.assert_array_almost_equal(res, expected)
 
+    def testAccumulatorTransformMatchesPush(self):
+        n = 500
+        df = pd.DataFrame({'close': self.sampleClose[:n],
+                           'open': self.sampleOpen[:n],
+                           'rf': np.where(self.sampleRf[:n] > 1., np.nan, self.sampleRf[:n]),
+                           'stamp': np.cumsum(np.random.randint(0, 3, n)),
+                           'code': ['a'] * n})
+
+        def expressions():
+            return [IIF(Latest('rf') > 0, 'close', Exp('open')),
+                    MovingAverage(5, 'close') >> MovingMax(3, 'x'),
+                    MACD(5, 10, 'close') + MovingRSI(6, 'open'),
+                    MovingCorrelation(10, 'close', Delta(2, 'open')),
+                    MovingResidue(10, 'close', 'open') * Maximum('close', 'missing'),
+                    TimeMovingSum(5, Sum('close')),
+                    TimeMovingCountUnique(7, Round('open'))]
+
+        for bound, dict_pushed in zip(expressions(), expressions()):
+            calculated = bound.transform(df)
+            expected = []
+            for row in df.to_dict('records'):
+                dict_pushed.push(row)
+                expected.append(dict_pushed.result())
+            np.testing.assert_array_equal(calculated.values, expected)
+
+            # the binding is released, the tree goes back to dicts and pickles
+            self.assertEqual(pickle.loads(pickle.dumps(bound)).value, bound.value)
+            bound.push({'close': 1., 'open': 2., 'rf': 1., 'stamp': 10000})
+            dict_pushed.push({'close': 1., 'open': 2., 'rf': 1., 'stamp': 10000})
+            np.testing.assert_array_equal(bound.value, dict_pushed.value)
+
+    def testAccumulatorPushRows(self):
+        values = np.ascontiguousarray(np.column_stack([self.sampleOpen[:20], self.sampleClose[:20]]))
+        ma = MovingAverage(3, 'close')
+        res = ma.push_rows(values, ['open', 'close'])
+        np.testing.assert_array_almost_equal(res[2:], pd.Series(self.sampleClose[:20]).rolling(3).mean()[2:])
+
+        with self.assertRaises(ValueError):
+            ma.push_rows(values, ['close'])
+
+        with self.assertRaises(KeyError):
+            TimeMovingSum(5, 'close').push_rows(values, ['open', 'close'])
+
     def testIIFAccumulator(self):
         iif = IIF(Latest('rf') > 0, 'close', 'open')
 
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+u"""
+Created on 2026-10-18
+"""
+
+import unittest
+import copy
+import pickle
+import numpy as np
+import pandas as pd
+from PyFin.Math.Accumulators.IAccumulators import Exp
+from PyFin.Math.Accumulators.IAccumulators import Pow
+from PyFin.Math.Accumulators.IAccumulators import Abs
+from PyFin.Math.Accumulators.IAccumulators import NormInv
+from PyFin.Math.Accumulators.IAccumulators import IIF
+from PyFin.Math.Accumulators.IAccumulators import Latest
+from PyFin.Math.Accumulators.IAccumulators import Current
+from PyFin.Math.Accumulators.StatefulAccumulators import MovingAverage
+from PyFin.Math.Accumulators.StatefulAccumulators import MovingStandardDeviation
+from PyFin.Math.Accumulators.FusedAccumulators import FusedValueHolder
+from PyFin.Math.Accumulators.FusedAccumulators import fuse
+
+
+class TestFusedAccumulators(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(0)
+        self.x = np.random.randn(1000)
+        self.y = np.random.randn(1000)
+
+    @staticmethod
+    def _expressions():
+        return [(MovingAverage(5, 'x') - MovingAverage(20, 'x')) / MovingStandardDeviation(20, 'x') * 2. + 1.,
+                IIF(Latest('y') > 0., Exp('x'), -Pow('y', 2)) + (Current('x') <= Current('y')),
+                NormInv(Abs('x') / (Abs('x') + 1.)) - 3.]
+
+    def testFusedResultsMatchTree(self):
+        for expression in self._expressions():
+            fused = fuse(expression)
+            self.assertTrue(isinstance(fused, FusedValueHolder))
+            self.assertEqual(str(fused), str(expression))
+            self.assertEqual(fused.window, expression.window)
+            self.assertEqual(sorted(fused.dependency), sorted(expression.dependency))
+
+            for x, y in zip(self.x, self.y):
+                data = {'x': x, 'y': y}
+                expression.push(data)
+                fused.push(data)
+                np.testing.assert_array_equal(fused.result(), expression.result())
+                self.assertEqual(fused.isFull(), expression.isFull())
+
+    def testFusedTransform(self):
+        data = pd.DataFrame({'x': self.x, 'y': self.y})
+        for expression in self._expressions():
+            np.testing.assert_array_equal(fuse(expression).transform(data).values,
+                                          expression.transform(data).values)
+
+    def testFusedPickleAndCopy(self):
+        fused = fuse(self._expressions()[0])
+        for x in self.x[:30]:
+            fused.push({'x': x})
+
+        restored = [pickle.loads(pickle.dumps(fused)), copy.deepcopy(fused)]
+        for x in self.x[30:60]:
+            fused.push({'x': x})
+            for r in restored:
+                r.push({'x': x})
+                self.assertEqual(r.result(), fused.result())
+
+    def testFuseKeepsSmallOrStatefulExpressions(self):
+        ma = MovingAverage(5, 'x')
+        self.assertFalse(isinstance(fuse(ma), FusedValueHolder))
+        self.assertFalse(isinstance(fuse(ma + 1.), FusedValueHolder))
+
+        # the input expression is not consumed by the fused node
+        expression = ma * 2. + 1.
+        fused = fuse(expression)
+        fused.push({'x': 1.})
+        self.assertEqual(fused.result(), 3.)
+        self.assertTrue(np.isnan(expression.result()))
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+u"""
+Created on 2026-10-18
+"""
+
+import unittest
+import copy
+import pickle
+import numpy as np
+from PyFin.Math.Accumulators import MovingSum
+from PyFin.Math.Accumulators import MovingAverage
+from PyFin.Math.Accumulators import MovingVariance
+from PyFin.Math.Accumulators import MovingStandardDeviation
+from PyFin.Math.Accumulators import MovingMax
+from PyFin.Math.Accumulators import MovingMin
+from PyFin.Math.Accumulators import MovingCorrelation
+from PyFin.Math.Accumulators import PanelMovingSum
+from PyFin.Math.Accumulators import PanelMovingAverage
+from PyFin.Math.Accumulators import PanelMovingVariance
+from PyFin.Math.Accumulators import PanelMovingStandardDeviation
+from PyFin.Math.Accumulators import PanelMovingMax
+from PyFin.Math.Accumulators import PanelMovingMin
+from PyFin.Math.Accumulators import PanelMovingCorrelation
+
+
+class TestPanelAccumulators(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(0)
+        self.n = 7
+        self.m = 200
+        self.x = np.random.randn(self.m, self.n)
+        self.y = np.random.randn(self.m, self.n)
+        self.x[np.random.rand(self.m, self.n) < 0.1] = np.nan
+        self.y[np.random.rand(self.m, self.n) < 0.1] = np.nan
+
+    def _compare_with_single(self, panel, single, window, **kwargs):
+        mv = panel(window, self.n, **kwargs)
+        singles = [single(window, 'x', **kwargs) for _ in range(self.n)]
+
+        for row in self.x:
+            mv.push(row)
+            for j, s in enumerate(singles):
+                s.push(dict(x=row[j]))
+
+            expected = np.array([s.result() for s in singles])
+            np.testing.assert_array_almost_equal(mv.result(), expected)
+            np.testing.assert_array_equal(mv.size(), [s.size() for s in singles])
+
+    def testPanelMovingSum(self):
+        self._compare_with_single(PanelMovingSum, MovingSum, 10)
+
+    def testPanelMovingAverage(self):
+        self._compare_with_single(PanelMovingAverage, MovingAverage, 10)
+
+    def testPanelMovingVariance(self):
+        self._compare_with_single(PanelMovingVariance, MovingVariance, 10)
+        self._compare_with_single(PanelMovingVariance, MovingVariance, 10, isPopulation=True)
+
+    def testPanelMovingStandardDeviation(self):
+        self._compare_with_single(PanelMovingStandardDeviation, MovingStandardDeviation, 10)
+        self._compare_with_single(PanelMovingStandardDeviation, MovingStandardDeviation, 1, isPopulation=True)
+
+    def testPanelMovingMax(self):
+        self._compare_with_single(PanelMovingMax, MovingMax, 5)
+        self._compare_with_single(PanelMovingMax, MovingMax, 1)
+
+    def testPanelMovingMin(self):
+        self._compare_with_single(PanelMovingMin, MovingMin, 5)
+        self._compare_with_single(PanelMovingMin, MovingMin, 1)
+
+    def testPanelMovingExtremesWithTrendsAndTies(self):
+        # long monotonic runs and repeated values, where a front evicted from
+        # the window is most often the extreme
+        self.x = np.concatenate([np.arange(50.), np.arange(50.)[::-1], np.round(np.random.randn(100))])
+        self.x = np.tile(self.x[:, None], (1, self.n)) + np.arange(self.n)
+        self.x[np.random.rand(*self.x.shape) < 0.1] = np.nan
+        for window in [1, 2, 5, 20]:
+            self._compare_with_single(PanelMovingMax, MovingMax, window)
+            self._compare_with_single(PanelMovingMin, MovingMin, window)
+
+    def testPanelMovingCorrelation(self):
+        window = 10
+        mv = PanelMovingCorrelation(window, self.n)
+        singles = [MovingCorrelation(window, 'x', 'y') for _ in range(self.n)]
+
+        for x, y in zip(self.x, self.y):
+            mv.push(x, y)
+            for j, s in enumerate(singles):
+                s.push(dict(x=x[j], y=y[j]))
+
+            expected = np.array([s.result() for s in singles])
+            np.testing.assert_array_almost_equal(mv.result(), expected)
+
+    def testPanelResize(self):
+        mv = PanelMovingMax(3, 2)
+        mv.push(np.array([1., 2.]))
+        mv.resize(3)
+        np.testing.assert_array_equal(mv.result(), [1., 2., np.nan])
+
+        mv.push(np.array([0., 5., 4.]))
+        np.testing.assert_array_equal(mv.result(), [1., 5., 4.])
+        np.testing.assert_array_equal(mv.size(), [2, 2, 1])
+
+        with self.assertRaises(ValueError):
+            mv.resize(2)
+
+        with self.assertRaises(ValueError):
+            mv.push(np.array([1., 2.]))
+
+    def testPanelPickle(self):
+        mv = PanelMovingVariance(5, self.n)
+        for row in self.x[:10]:
+            mv.push(row)
+
+        pickled = pickle.loads(pickle.dumps(mv))
+        copied = copy.deepcopy(mv)
+
+        for row in self.x[10:20]:
+            mv.push(row)
+            pickled.push(row)
+            copied.push(row)
+
+        np.testing.assert_array_almost_equal(mv.result(), pickled.result())
+        np.testing.assert_array_almost_equal(mv.result(), copied.result())
@@ -10,6 +10,7 @@ import csv
 import os
 import copy
 import pickle
+import base64
 import tempfile
 import math
 import numpy as np
@@ -833,6 +834,99 @@ class TestStatefulAccumulators(unittest.TestCase):
                                                              "Min expected at:   {1:f}\n"
                                                              "Min calculated at: {2:f}".format(i, expected, calculated))
 
+    def testMovingArgMaxAndArgMinWithTies(self):
+        window = 30
+
+        mv_max = MovingArgMax(window, 'z')
+        mv_min = MovingArgMin(window, 'z')
+        total = np.random.randint(0, 5, 1000).astype(float)
+        con = deque(maxlen=window)
+        for i, value in enumerate(total):
+            value = float(value)
+            con.append(value)
+            mv_max.push(dict(z=value))
+            mv_min.push(dict(z=value))
+
+            # among ties the one stored first in a ring buffer of window slots wins
+            stamps = range(i - len(con) + 1, i + 1)
+            max_stamps = [s for s, v in zip(stamps, con) if v == max(con)]
+            min_stamps = [s for s, v in zip(stamps, con) if v == min(con)]
+            self.assertEqual(mv_max.result(), i - min(max_stamps, key=lambda s: s % window))
+            self.assertEqual(mv_min.result(), i - min(min_stamps, key=lambda s: s % window))
+
+    def testLoadPicklesOfFormerLayouts(self):
+        # [MovingArgMax(5, 'x'), MovingMin(4, 'x'), MovingQuantile(5, 'x'), TimeMovingSum('3d', 'x') + Latest('x')]
+        # pickled by a former release after 13 pushes
+        data = '''
+gAJdcQAoY1B5RmluLk1hdGguQWNjdW11bGF0b3JzLlN0YXRlZnVsQWNjdW11bGF0b3JzCl9fcHl4X3VucGlja2xlX01vdmluZ0Fy
+Z01heApxAWNQeUZpbi5NYXRoLkFjY3VtdWxhdG9ycy5TdGF0ZWZ1bEFjY3VtdWxhdG9ycwpNb3ZpbmdBcmdNYXgKcQJKdUvzBU6H
+cQNScQQoRwAAAAAAAAAAXXEFWAEAAAB4cQZhY1B5RmluLk1hdGguQWNjdW11bGF0b3JzLmltcGwKcmVidWlsZF9kZXF1ZQpxByhj
+X2NvZGVjcwplbmNvZGUKcQhYKQAAAAAAAAAAAABAAAAAAAAACEAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAw7A/cQlYBgAAAGxhdGlu
+MXEKhnELUnEMSwWISwNLBXRxDVJxDohdcQ8oRwAAAAAAAAAARwAAAAAAAAAARz/wAAAAAAAAR0AAAAAAAAAAR0AIAAAAAAAAZUsF
+Y1B5RmluLk1hdGguQWNjdW11bGF0b3JzLklBY2N1bXVsYXRvcnMKX19weXhfdW5waWNrbGVfQ3VycmVudApxEGNQeUZpbi5NYXRo
+LkFjY3VtdWxhdG9ycy5JQWNjdW11bGF0b3JzCkN1cnJlbnQKcRFKCfJUBk6HcRJScRMoRwAAAAAAAAAAXXEUaAZhiEsAdHEVYnRx
+FmJjUHlGaW4uTWF0aC5BY2N1bXVsYXRvcnMuU3RhdGVmdWxBY2N1bXVsYXRvcnMKX19weXhfdW5waWNrbGVfTW92aW5nTWluCnEX
+Y1B5RmluLk1hdGguQWNjdW11bGF0b3JzLlN0YXRlZnVsQWNjdW11bGF0b3JzCk1vdmluZ01pbgpxGEp1S/MFTodxGVJxGihHAAAA
+AAAAAABdcRtoBmFoByhoCFghAAAAAAAAAAAAAAAAAAAAAADDsD8AAAAAAAAAQAAAAAAAAAhAcRxoCoZxHVJxHksEiEsBSwR0cR9S
+cSCIXXEhKEcAAAAAAAAAAEc/8AAAAAAAAEdAAAAAAAAAAEdACAAAAAAAAGVLBGgQaBFKCfJUBk6HcSJScSMoRwAAAAAAAAAAXXEk
+aAZhiEsAdHElYnRxJmJjUHlGaW4uTWF0aC5BY2N1bXVsYXRvcnMuU3RhdGVmdWxBY2N1bXVsYXRvcnMKX19weXhfdW5waWNrbGVf
+TW92aW5nUXVhbnRpbGUKcSdjUHlGaW4uTWF0aC5BY2N1bXVsYXRvcnMuU3RhdGVmdWxBY2N1bXVsYXRvcnMKTW92aW5nUXVhbnRp
+bGUKcShKdUvzBU6HcSlScSooRwAAAAAAAAAAXXEraAZhaAcoaAhYKQAAAAAAAAAAAABAAAAAAAAACEAAAAAAAAAAAAAAAAAAAAAA
+AAAAAAAAw7A/cSxoCoZxLVJxLksFiEsDSwV0cS9ScTCIXXExKEcAAAAAAAAAAEcAAAAAAAAAAEc/8AAAAAAAAEdAAAAAAAAAAEdA
+CAAAAAAAAGVLBWgQaBFKCfJUBk6HcTJScTMoRwAAAAAAAAAAXXE0aAZhiEsAdHE1YnRxNmJjUHlGaW4uTWF0aC5BY2N1bXVsYXRv
+cnMuSUFjY3VtdWxhdG9ycwpfX3B5eF91bnBpY2tsZV9BZGRlZFZhbHVlSG9sZGVyCnE3Y1B5RmluLk1hdGguQWNjdW11bGF0b3Jz
+LklBY2N1bXVsYXRvcnMKQWRkZWRWYWx1ZUhvbGRlcgpxOEqIYcoBTodxOVJxOihdcTsoWAUAAABzdGFtcHE8aAZliGNQeUZpbi5N
+YXRoLkFjY3VtdWxhdG9ycy5TdGF0ZWZ1bEFjY3VtdWxhdG9ycwpfX3B5eF91bnBpY2tsZV9UaW1lTW92aW5nU3VtCnE9Y1B5Rmlu
+Lk1hdGguQWNjdW11bGF0b3JzLlN0YXRlZnVsQWNjdW11bGF0b3JzClRpbWVNb3ZpbmdTdW0KcT5KMn7fB06HcT9ScUAoXXFBKGg8
+aAZlY1B5RmluLk1hdGguQWNjdW11bGF0b3JzLmltcGwKcmVidWlsZF9kaWZmX2RlcXVlCnFCR0EPpAAAAAAAWAUAAAByaWdodHFD
+hnFEUnFFiEdAFAAAAAAAAEqA9AMAaBBoEUoJ8lQGTodxRlJxRyhHAAAAAAAAAABdcUhoBmGISwB0cUlidHFKYmNQeUZpbi5NYXRo
+LkFjY3VtdWxhdG9ycy5JQWNjdW11bGF0b3JzCl9fcHl4X3VucGlja2xlX0xhdGVzdApxS2NQeUZpbi5NYXRoLkFjY3VtdWxhdG9y
+cy5JQWNjdW11bGF0b3JzCkxhdGVzdApxTEoOJLoLTodxTVJxTihdcU9oBmGIRwAAAAAAAAAASwB0cVBiSoD0AwB0cVFiZS4='''
+        holders = pickle.loads(base64.b64decode(data))
+        expected = [[2.0, 0.0, 0.25, 7.0], [3.0, 0.0, 0.5, 10.0], [4.0, 0.0, 0.5, 12.0], [1.0, 1.0, 0.5, 13.0],
+                    [2.0, 0.0, 0.0, 9.0], [0.0, 0.0, 1.0, 13.0], [1.0, 0.0, 0.25, 12.0], [2.0, 0.0, 0.0, 10.0],
+                    [3.0, 0.0, 0.0, 7.0], [0.0, 0.0, 0.75, 11.0], [1.0, 0.0, 0.75, 14.0], [2.0, 0.0, 0.0, 11.0]]
+        for i, value in enumerate([1., 2., 2., 2., 0., 3., 2., 0., 0., 3., 3., 0.], 13):
+            for holder in holders:
+                holder.push(dict(x=value, stamp=i * 86400))
+            self.assertEqual([holder.result() for holder in holders], expected[i - 13])
+
+    def testPickleStatesCarryVersion(self):
+        holders = [MovingArgMax(5, 'x'), MovingMin(4, 'x'), MovingRank(5, 'x'), MovingQuantile(5, 'x'),
+                   TimeMovingSum('3d', 'x'), TimeMovingCountUnique('3d', 'x'),
+                   TimeMovingStandardDeviation('3d', 'x', True), Latest('x'), Current('x')]
+        for i, value in enumerate([1., 2., 2., 0., 3., 2., 0.]):
+            for holder in holders:
+                holder.push(dict(x=value, stamp=i * 86400))
+
+        for holder in holders:
+            version, members = holder.__reduce__()[2]
+            self.assertEqual(version, 1)
+            self.assertIn('_window', members)
+
+            copied = pickle.loads(pickle.dumps(holder))
+            for i, value in enumerate([3., 1., 0., 2.], 7):
+                holder.push(dict(x=value, stamp=i * 86400))
+                copied.push(dict(x=value, stamp=i * 86400))
+                self.assertEqual(copied.result(), holder.result())
+
+            with self.assertRaises(ValueError):
+                copied.__setstate__((version + 1, members))
+
+    def testMovingArgMaxPickle(self):
+        test = MovingArgMax(3, 'close')
+        for value in [3.0, 4.0, 2.0]:
+            test.push(dict(close=value))
+
+        pickled = pickle.loads(pickle.dumps(test))
+        copied = copy.deepcopy(test)
+        for value in [1.0, 1.5, 0.5, 5.0]:
+            test.push(dict(close=value))
+            pickled.push(dict(close=value))
+            copied.push(dict(close=value))
+            self.assertEqual(test.result(), pickled.result())
+            self.assertEqual(test.result(), copied.result())
+
     def testMovingMaxDeepcopy(self):
         test = MovingMax(3, 'close')
 
@@ -942,6 +1036,31 @@ class TestStatefulAccumulators(unittest.TestCase):
                                                                  "Quantile calculated: {2:f}".format(i, expected,
                                                                                                      calculated))
 
+    def testMovingRankWithLargeWindowAndTies(self):
+        window = 250
+
+        mr = MovingRank(window, 'z')
+        mq = MovingQuantile(window, 'z')
+        mmax = MovingMax(window, 'z')
+        mmin = MovingMin(window, 'z')
+        total = np.random.randint(0, 50, 2000).astype(float)
+        con = deque(maxlen=window)
+        for i, value in enumerate(total):
+            value = float(value)
+            con.append(value)
+            mr.push(dict(z=value))
+            mq.push(dict(z=value))
+            mmax.push(dict(z=value))
+            mmin.push(dict(z=value))
+
+            sorted_con = sorted(con)
+            expected = sorted_con.index(value)
+            self.assertEqual(mr.result(), expected)
+            if i >= 1:
+                self.assertAlmostEqual(mq.result(), expected / (len(sorted_con) - 1.), 15)
+            self.assertEqual(mmax.result(), sorted_con[-1])
+            self.assertEqual(mmin.result(), sorted_con[0])
+
     def testMovingQuantileDeepcopy(self):
         test = MovingQuantile(10, 'close')
 
@@ -969,6 +1088,11 @@ class TestStatefulAccumulators(unittest.TestCase):
             self.assertAlmostEqual(test.value, pickled.value)
         os.unlink(f.name)
 
+        for value in [1.0, 5.0, 3.0]:
+            test.push(dict(close=value))
+            pickled.push(dict(close=value))
+            self.assertAlmostEqual(test.value, pickled.value)
+
     def testMovingCount(self):
         window = 10
         mat = MovingCount(window, Latest('x'))
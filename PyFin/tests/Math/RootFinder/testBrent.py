@@ -6,8 +6,11 @@ Created on 2017-6-7
 """
 
 import unittest
+import numpy as np
 from PyFin.Math.RootFinder import Converged
 from PyFin.Math.RootFinder import BracketedBrent
+from PyFin.Math.RootFinder import BracketedBrentArray
+from PyFin.PricingEngines import blackFormulaArray
 from PyFin.Math.RootFinder import Brent
 
 
@@ -41,6 +44,78 @@ class TestBrent(unittest.TestCase):
         with self.assertRaises(ValueError):
             _ = BracketedBrent(1e-8, low, high)
 
+    def testBracketedBrentArray(self):
+        np.random.seed(0)
+        roots = np.random.uniform(-3., 3., 500)
+        powers = np.random.randint(1, 4, 500)
+
+        def func(x):
+            return np.sinh(x - roots) * powers + (x - roots) ** 3
+
+        low = roots - np.random.uniform(0.1, 2., 500)
+        high = roots + np.random.uniform(0.1, 2., 500)
+        brent = BracketedBrentArray(1e-10, (low, func(low)), (high, func(high)))
+        calculated, iterations, converged = brent.solve(func, 1e-10, 1e-10)
+
+        self.assertTrue(converged.all())
+        np.testing.assert_array_almost_equal(calculated, roots, 8)
+
+        converge = Converged(1e-10, 1e-10)
+        for i in range(0, 500, 25):
+            def scalar_func(x):
+                return np.sinh(x - roots[i]) * powers[i] + (x - roots[i]) ** 3
+
+            scalar = BracketedBrent(1e-10, (low[i], scalar_func(low[i])), (high[i], scalar_func(high[i])))
+            count = 0
+            while count < 100:
+                count += 1
+                x = scalar.nextX()
+                if converge.check_converge(scalar, scalar_func(x)):
+                    break
+            self.assertEqual(iterations[i], count)
+            self.assertEqual(calculated[i], x)
+
+    def testBracketedBrentArrayFlags(self):
+        low = np.array([0., 0., 0.]), np.array([-1., 1., -1.])
+        high = np.array([2., 2., 2.]), np.array([3., 3., 3.])
+
+        brent = BracketedBrentArray(1e-12, low, high)
+        np.testing.assert_array_equal(brent.bracketed, [True, False, True])
+
+        def func(x):
+            return np.where(np.arange(3) == 2, np.nan, x * x - 1.)
+
+        roots, iterations, converged = brent.solve(func, 1e-12, 1e-12, maxIterations=50)
+        self.assertAlmostEqual(roots[0], 1.)
+        self.assertTrue(np.isnan(roots[1:]).all())
+        np.testing.assert_array_equal(converged, [True, False, False])
+        np.testing.assert_array_equal(iterations[1:], [0, 1])
+
+        brent = BracketedBrentArray(1e-12, low, high)
+        _, iterations, converged = brent.solve(lambda x: x * x - 1., 1e-12, 1e-12, maxIterations=2)
+        np.testing.assert_array_equal(iterations, [2, 0, 2])
+        self.assertFalse(converged.any())
+
+    def testBracketedBrentArrayImpliedVols(self):
+        np.random.seed(1)
+        n = 1000
+        strikes = np.random.uniform(90., 110., n)
+        vols = np.random.uniform(0.1, 0.8, n)
+        optionTypes = np.where(np.random.rand(n) > 0.5, 1, -1).astype(np.intc)
+        prices = blackFormulaArray(optionTypes, strikes, 100., vols)
+
+        def func(x):
+            return blackFormulaArray(optionTypes, strikes, 100., x) - prices
+
+        low = np.full(n, 1e-4)
+        high = np.full(n, 3.)
+        brent = BracketedBrentArray(1e-12, (low, func(low)), (high, func(high)))
+        calculated, iterations, converged = brent.solve(func, 1e-12, 1e-10)
+
+        self.assertTrue(converged.all())
+        self.assertLess(iterations.max(), 50)
+        np.testing.assert_array_almost_equal(calculated, vols, 6)
+
     def testBrent(self):
         converge = Converged(1e-8, 1e-8)
 
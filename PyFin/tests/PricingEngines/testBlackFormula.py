@@ -7,6 +7,7 @@ Created on 2015-7-23
 
 import unittest
 import math
+import numpy as np
 from PyFin.Enums.OptionType import OptionType
 from PyFin.PricingEngines.BlackFormula import bachelierFormula
 from PyFin.PricingEngines.BlackFormula import bachelierFormulaImpliedVol
@@ -14,6 +15,15 @@ from PyFin.PricingEngines.BlackFormula import blackFormula
 from PyFin.PricingEngines.BlackFormula import blackFormula2
 from PyFin.PricingEngines.BlackFormula import blackFormulaImpliedStdDev
 from PyFin.PricingEngines.BlackFormula import blackFormulaImpliedVol
+from PyFin.PricingEngines.BlackFormula import bachelierFormulaArray
+from PyFin.PricingEngines.BlackFormula import bachelierFormulaImpliedVolArray
+from PyFin.PricingEngines.BlackFormula import blackFormulaArray
+from PyFin.PricingEngines.BlackFormula import blackFormula2Array
+from PyFin.PricingEngines.BlackFormula import blackFormulaImpliedStdDevArray
+from PyFin.PricingEngines.BlackFormula import blackFormulaImpliedVolArray
+from PyFin.PricingEngines.BlackFormula import ImpliedVolStatus
+from PyFin.PricingEngines.BlackFormula import blackGreeks
+from PyFin.PricingEngines.BlackFormula import blackGreeksArray
 
 
 class TestBlackFormula(unittest.TestCase):
@@ -97,3 +107,127 @@ class TestBlackFormula(unittest.TestCase):
             impliedBpVol = bachelierFormulaImpliedVol(OptionType.Put, strike, forward, tte, callPrem,
                                                       math.exp(-r * tte))
             self.assertAlmostEqual(impliedBpVol, bpvol, 12)
+
+    def _chain(self):
+        forward = 1.0
+        bpvol = 0.25
+        tte = 10.0
+        dList = np.array([-3.0, -2.0, -1.0, -0.5, 0.0, 0.5, 1.0, 2.0, 3.0])
+        strikes = np.tile(forward * np.exp(dList * bpvol * math.sqrt(tte)), 2)
+        optionTypes = np.repeat([OptionType.Call, OptionType.Put], len(dList))
+        return optionTypes, strikes, forward, bpvol, tte
+
+    def testBlackFormulaArray(self):
+        optionTypes, strikes, forward, bpvol, tte = self._chain()
+        stdDev = bpvol * math.sqrt(tte)
+        discount = math.exp(-0.05 * tte)
+
+        expected = [blackFormula(t, k, forward, stdDev, discount) for t, k in zip(optionTypes, strikes)]
+        calculated = blackFormulaArray(optionTypes, strikes, forward, stdDev, discount)
+        np.testing.assert_array_almost_equal(calculated, expected, 15)
+
+        out = np.empty(len(strikes))
+        calculated = blackFormulaArray(optionTypes, strikes, forward, stdDev, discount, out=out, num_threads=2)
+        self.assertIs(calculated, out)
+        np.testing.assert_array_almost_equal(out, expected, 15)
+
+        expected = [blackFormula2(t, k, forward, tte, bpvol, 0.05) for t, k in zip(optionTypes, strikes)]
+        calculated = blackFormula2Array(optionTypes, strikes, forward, tte, bpvol, 0.05)
+        np.testing.assert_array_almost_equal(calculated, expected, 15)
+
+        calculated = blackFormula2Array(optionTypes, strikes, forward, 0.0, bpvol, 0.05)
+        np.testing.assert_array_almost_equal(calculated, np.maximum((forward - strikes) * optionTypes, 0.), 15)
+
+        with self.assertRaises(ValueError):
+            blackFormulaArray(optionTypes, strikes, forward, stdDev, out=np.empty(3))
+
+    def testBlackImpliedVolArray(self):
+        optionTypes, strikes, forward, bpvol, tte = self._chain()
+        stdDev = bpvol * math.sqrt(tte)
+        discount = math.exp(-0.05 * tte)
+
+        prices = blackFormulaArray(optionTypes, strikes, forward, stdDev, discount)
+        calculated, status = blackFormulaImpliedStdDevArray(optionTypes, strikes, forward, prices, discount)
+        np.testing.assert_array_almost_equal(calculated, stdDev, 8)
+        np.testing.assert_array_equal(status, ImpliedVolStatus.Converged)
+
+        prices = blackFormula2Array(optionTypes, strikes, forward, tte, bpvol, 0.05)
+        calculated, status = blackFormulaImpliedVolArray(optionTypes, strikes, forward, tte, prices, 0.05, num_threads=2)
+        np.testing.assert_array_almost_equal(calculated, bpvol, 8)
+        np.testing.assert_array_equal(status, ImpliedVolStatus.Converged)
+
+        calculated, status = blackFormulaImpliedStdDevArray(OptionType.Call,
+                                                            [1.0, -1.0, 1.0, 1.0],
+                                                            1.0,
+                                                            [0.1, 0.1, np.nan, 0.1])
+        self.assertEqual(status[0], ImpliedVolStatus.Converged)
+        self.assertEqual(status[1], ImpliedVolStatus.Invalid)
+        self.assertEqual(status[2], ImpliedVolStatus.Invalid)
+        self.assertTrue(np.isnan(calculated[1]) and np.isnan(calculated[2]))
+
+    def testBachelierArray(self):
+        forward = 1.0
+        bpvol = 0.01
+        tte = 10.0
+        discount = math.exp(-0.03 * tte)
+        dList = np.array([-3.0, -2.0, -1.0, -0.5, 0.0, 0.5, 1.0, 2.0, 3.0])
+        strikes = np.tile(forward + dList * bpvol * math.sqrt(tte), 2)
+        optionTypes = np.repeat([OptionType.Call, OptionType.Put], len(dList))
+
+        expected = [bachelierFormula(t, k, forward, bpvol * math.sqrt(tte), discount) for t, k in zip(optionTypes, strikes)]
+        prices = bachelierFormulaArray(optionTypes, strikes, forward, bpvol * math.sqrt(tte), discount)
+        np.testing.assert_array_almost_equal(prices, expected, 15)
+
+        calculated = bachelierFormulaImpliedVolArray(optionTypes, strikes, forward, tte, prices, discount)
+        np.testing.assert_array_almost_equal(calculated, bpvol, 12)
+
+    def testBlackGreeks(self):
+        forward = 1.1
+        tte = 0.75
+        vol = 0.25
+        riskFree = 0.03
+        h = 1e-4
+
+        def price(t, k, f=forward, tau=tte, v=vol, r=riskFree):
+            return blackFormula2(t, k, f, tau, v, r)
+
+        for optionType in [OptionType.Call, OptionType.Put]:
+            for strike in [0.7, 1.0, 1.1, 1.5]:
+                greeks = blackGreeks(optionType, strike, forward, tte, vol, riskFree)
+                self.assertAlmostEqual(greeks['price'], price(optionType, strike), 15)
+
+                # bump and reprice oracle
+                up = price(optionType, strike, f=forward + h)
+                down = price(optionType, strike, f=forward - h)
+                self.assertAlmostEqual(greeks['delta'], (up - down) / (2. * h), 7)
+                self.assertAlmostEqual(greeks['gamma'], (up - 2. * greeks['price'] + down) / (h * h), 4)
+
+                up = price(optionType, strike, v=vol + h)
+                down = price(optionType, strike, v=vol - h)
+                self.assertAlmostEqual(greeks['vega'], (up - down) / (2. * h), 7)
+                self.assertAlmostEqual(greeks['volga'], (up - 2. * greeks['price'] + down) / (h * h), 4)
+
+                expected = (price(optionType, strike, tau=tte - h) - price(optionType, strike, tau=tte + h)) / (2. * h)
+                self.assertAlmostEqual(greeks['theta'], expected, 7)
+
+                expected = (price(optionType, strike, r=riskFree + h) - price(optionType, strike, r=riskFree - h)) / (2. * h)
+                self.assertAlmostEqual(greeks['rho'], expected, 7)
+
+                expected = (blackGreeks(optionType, strike, forward, tte, vol + h, riskFree)['delta']
+                            - blackGreeks(optionType, strike, forward, tte, vol - h, riskFree)['delta']) / (2. * h)
+                self.assertAlmostEqual(greeks['vanna'], expected, 6)
+
+        greeks = blackGreeks(OptionType.Call, 1.0, forward, 0.0, vol, riskFree)
+        self.assertAlmostEqual(greeks['price'], forward - 1.0, 15)
+        self.assertAlmostEqual(greeks['delta'], 1.0, 15)
+        self.assertEqual(greeks['gamma'], 0.0)
+
+    def testBlackGreeksArray(self):
+        optionTypes, strikes, forward, bpvol, tte = self._chain()
+        calculated = blackGreeksArray(optionTypes, strikes, forward, tte, bpvol, 0.05, num_threads=2)
+        self.assertEqual(len(calculated), len(strikes))
+
+        for i, (t, k) in enumerate(zip(optionTypes, strikes)):
+            expected = blackGreeks(t, k, forward, tte, bpvol, 0.05)
+            for name in calculated.dtype.names:
+                self.assertAlmostEqual(calculated[name][i], expected[name], 15)
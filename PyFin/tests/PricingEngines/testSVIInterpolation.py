@@ -8,7 +8,11 @@ Created on 2017-1-7
 import unittest
 import numpy as np
 from PyFin.PricingEngines import sviVolatilities
+from PyFin.PricingEngines import sviVolatilityGrid
 from PyFin.PricingEngines import sviCalibration
+from PyFin.PricingEngines import sviVolatilityJacobian
+from PyFin.PricingEngines import sviSurfaceCalibration
+from PyFin.PricingEngines.SVIInterpolationImpl import _parametersCheck
 
 
 class TestSVIInterpolation(unittest.TestCase):
@@ -55,6 +59,32 @@ class TestSVIInterpolation(unittest.TestCase):
         self.initialRho = 0.3060
         self.initialM = 0.3586
 
+    def testSVIVolatilityGrid(self):
+        np.random.seed(0)
+        rhos = np.random.uniform(-0.5, 0.5, 20)
+        forwards = np.random.uniform(0.035, 0.045, 20)
+
+        calculated = sviVolatilityGrid(self.strikes,
+                                       forwards,
+                                       self.expiry,
+                                       self.initialA,
+                                       self.initialB,
+                                       self.initialSigma,
+                                       rhos,
+                                       self.initialM,
+                                       num_threads=2)
+        self.assertEqual(calculated.shape, (20, len(self.strikes)))
+        for i in range(20):
+            expected = sviVolatilities(self.strikes,
+                                       forwards[i],
+                                       self.expiry,
+                                       self.initialA,
+                                       self.initialB,
+                                       self.initialSigma,
+                                       rhos[i],
+                                       self.initialM)
+            np.testing.assert_array_equal(calculated[i], expected)
+
     def testSVICalibration(self):
         expectedVolatilities = sviVolatilities(self.strikes,
                                                self.forward,
@@ -77,3 +107,63 @@ class TestSVIInterpolation(unittest.TestCase):
                                                  calibratedParameters[4])
 
         np.testing.assert_array_almost_equal(expectedVolatilities, calculatedVolatilities)
+
+    def testSVICalibrationInitialM(self):
+        x0, freeParameters, _, _ = _parametersCheck(0.01, 0.02, 0.03, -0.4, 0.05, False, False, False, False, False)
+        self.assertEqual(freeParameters, ['a', 'b', 'sigma', 'rho', 'm'])
+        np.testing.assert_array_equal(x0, [0.01, 0.02, 0.03, -0.4, 0.05])
+
+        x0, freeParameters, _, _ = _parametersCheck(0.01, 0.02, 0.03, -0.4, 0.05, True, True, True, True, False)
+        self.assertEqual(freeParameters, ['m'])
+        np.testing.assert_array_equal(x0, [0.05])
+
+        expectedVolatilities = sviVolatilities(self.strikes,
+                                               self.forward,
+                                               self.expiry,
+                                               self.initialA,
+                                               self.initialB,
+                                               self.initialSigma,
+                                               self.initialRho,
+                                               self.initialM)
+        calibrated = sviCalibration(self.strikes,
+                                    expectedVolatilities,
+                                    self.forward,
+                                    self.expiry,
+                                    self.initialA,
+                                    self.initialB,
+                                    self.initialSigma,
+                                    self.initialRho,
+                                    self.initialM,
+                                    isFixedA=True,
+                                    isFixedB=True,
+                                    isFixedSigma=True,
+                                    isFixedRho=True)[0]
+        self.assertAlmostEqual(calibrated[4], self.initialM, 10)
+
+    def testSVIVolatilityJacobian(self):
+        parameters = [self.initialA, self.initialB, self.initialSigma, self.initialRho, self.initialM]
+        calculated = sviVolatilityJacobian(self.strikes, self.forward, self.expiry, *parameters)
+        self.assertEqual(calculated.shape, (len(self.strikes), 5))
+
+        for i in range(5):
+            up = list(parameters)
+            down = list(parameters)
+            up[i] += 1e-6
+            down[i] -= 1e-6
+            expected = (sviVolatilities(self.strikes, self.forward, self.expiry, *up)
+                        - sviVolatilities(self.strikes, self.forward, self.expiry, *down)) / 2e-6
+            np.testing.assert_array_almost_equal(calculated[:, i], expected, 6)
+
+    def testSVISurfaceCalibration(self):
+        expiries = np.linspace(0.5, 3., 6)
+        expected = np.array([[0.02 * t, 0.1 + 0.02 * t, 0.4, 0.3 - 0.05 * t, 0.35] for t in expiries])
+        slices = [(t, self.strikes, sviVolatilities(self.strikes, self.forward, t, *p), self.forward)
+                  for t, p in zip(expiries, expected)]
+
+        parameters, diagnostics = sviSurfaceCalibration(slices, 0.01, 0.1, 0.3, 0.2, 0.3)
+        self.assertEqual(list(parameters.columns), ['a', 'b', 'sigma', 'rho', 'm'])
+        self.assertTrue((diagnostics.status > 0).all())
+        self.assertLess(diagnostics.rmse.max(), 1e-8)
+
+        for t, p, s in zip(expiries, parameters.values, slices):
+            np.testing.assert_array_almost_equal(sviVolatilities(self.strikes, self.forward, t, *p), s[2])
@@ -9,7 +9,10 @@ import unittest
 import numpy as np
 from PyFin.PricingEngines import sabrVolatility
 from PyFin.PricingEngines import sabrVolatilities
+from PyFin.PricingEngines import sabrVolatilityGrid
 from PyFin.PricingEngines import sabrCalibration
+from PyFin.PricingEngines import sabrVolatilityJacobian
+from PyFin.PricingEngines import sabrSurfaceCalibration
 
 
 class TestSabrFormula(unittest.TestCase):
@@ -112,6 +115,73 @@ class TestSabrFormula(unittest.TestCase):
         expectedVols = self.volatilities
         np.testing.assert_array_almost_equal(calculatedVols, expectedVols)
 
+    def testSabrVolatilitiesWithThreads(self):
+        np.random.seed(0)
+        strikes = self.forward * np.exp(np.random.uniform(-1.0, 1.0, 2000000))
+        # strikes at the money take the series branch of the log moneyness
+        strikes[::1000] = self.forward
+
+        expected = sabrVolatilities(strikes,
+                                    self.forward,
+                                    self.expiry,
+                                    self.initialAlpha,
+                                    self.initialBeta,
+                                    self.initialNu,
+                                    self.initialRho,
+                                    num_threads=1)
+        for threads in (2, 8):
+            calculated = sabrVolatilities(strikes,
+                                          self.forward,
+                                          self.expiry,
+                                          self.initialAlpha,
+                                          self.initialBeta,
+                                          self.initialNu,
+                                          self.initialRho,
+                                          num_threads=threads)
+            np.testing.assert_array_equal(calculated, expected)
+
+            calculated = sabrVolatilityGrid(strikes[:500000], self.forward, self.expiry, [self.initialAlpha] * 4,
+                                            self.initialBeta, self.initialNu, self.initialRho, num_threads=threads)
+            for row in calculated:
+                np.testing.assert_array_equal(row, expected[:500000])
+
+        for i in range(0, len(strikes), 99991):
+            self.assertEqual(expected[i], sabrVolatility(strikes[i],
+                                                         self.forward,
+                                                         self.expiry,
+                                                         self.initialAlpha,
+                                                         self.initialBeta,
+                                                         self.initialNu,
+                                                         self.initialRho))
+
+    def testSabrVolatilityGrid(self):
+        np.random.seed(0)
+        alphas = np.random.uniform(0.1, 0.5, 50)
+        nus = np.random.uniform(0.01, 0.5, 50)
+        rhos = np.random.uniform(-0.5, 0.5, 50)
+
+        calculated = sabrVolatilityGrid(self.strikes, self.forward, self.expiry, alphas, self.initialBeta, nus, rhos,
+                                        num_threads=2)
+        self.assertEqual(calculated.shape, (50, len(self.strikes)))
+        for i in range(50):
+            expected = sabrVolatilities(self.strikes, self.forward, self.expiry, alphas[i], self.initialBeta, nus[i],
+                                        rhos[i])
+            np.testing.assert_array_equal(calculated[i], expected)
+
+        strikes = np.outer(np.linspace(0.9, 1.1, 50), self.strikes)
+        forwards = np.linspace(0.035, 0.045, 50)
+        calculated = sabrVolatilityGrid(strikes, forwards, self.expiry, alphas, self.initialBeta, nus, rhos)
+        for i in range(50):
+            for j in range(len(self.strikes)):
+                expected = sabrVolatility(strikes[i, j], forwards[i], self.expiry, alphas[i], self.initialBeta,
+                                          nus[i], rhos[i])
+                self.assertEqual(calculated[i, j], expected)
+
+        with self.assertRaises(ValueError):
+            sabrVolatilityGrid(strikes, forwards[:10], self.expiry, alphas, self.initialBeta, nus, rhos)
+        self.assertEqual(sabrVolatilityGrid(self.strikes, self.forward, self.expiry, [], 0.5, 0.1, 0.1).shape,
+                         (0, len(self.strikes)))
+
     def testSabrCalibrationWithTrf(self):
         x = sabrCalibration(self.strikes, self.volatilities, self.forward, self.expiry, 0.01, 0.01, 0.01, 0.01)
         calibratedParameters = x[0]
@@ -172,3 +242,53 @@ class TestSabrFormula(unittest.TestCase):
 
         expectedVols = self.volatilities
         np.testing.assert_array_almost_equal(calculatedVols, expectedVols, 4)
+
+    def testSabrVolatilityJacobian(self):
+        parameters = [self.initialAlpha, self.initialBeta, self.initialNu, self.initialRho]
+        calculated = sabrVolatilityJacobian(self.strikes, self.forward, self.expiry, *parameters)
+        self.assertEqual(calculated.shape, (len(self.strikes), 4))
+
+        for i in range(4):
+            up = list(parameters)
+            down = list(parameters)
+            up[i] += 1e-6
+            down[i] -= 1e-6
+            expected = (sabrVolatilities(self.strikes, self.forward, self.expiry, *up)
+                        - sabrVolatilities(self.strikes, self.forward, self.expiry, *down)) / 2e-6
+            np.testing.assert_array_almost_equal(calculated[:, i], expected, 6)
+
+    def testSabrCalibrationWithAnalyticJacobian(self):
+        x = sabrCalibration(self.strikes,
+                            self.volatilities,
+                            self.forward,
+                            self.expiry,
+                            0.01,
+                            0.01,
+                            0.01,
+                            0.01,
+                            analyticJacobian=True)
+        calibratedParameters = x[0]
+
+        calculatedVols = sabrVolatilities(self.strikes,
+                                          self.forward,
+                                          self.expiry,
+                                          *calibratedParameters)
+        np.testing.assert_array_almost_equal(calculatedVols, self.volatilities, 5)
+
+    def testSabrSurfaceCalibration(self):
+        expiries = np.linspace(0.25, 5., 12)
+        expected = np.array([[0.02 + 0.01 * t, 0.6, 0.4 / np.sqrt(t), -0.3 + 0.05 * t] for t in expiries])
+        slices = [(t, self.strikes, sabrVolatilities(self.strikes, self.forward, t, *p), self.forward)
+                  for t, p in zip(expiries, expected)]
+        slices = slices[::-1]
+
+        parameters, diagnostics = sabrSurfaceCalibration(slices, 0.1, 0.6, 0.1, 0.0, isFixedBeta=True, n_jobs=2)
+        self.assertEqual(list(parameters.columns), ['alpha', 'beta', 'nu', 'rho'])
+        np.testing.assert_array_almost_equal(diagnostics.expiry, expiries[::-1])
+        np.testing.assert_array_almost_equal(parameters.values, expected[::-1], 6)
+        self.assertTrue((diagnostics.status > 0).all())
+        self.assertTrue((diagnostics.elapsed >= 0.).all())
+        self.assertLess(diagnostics.rmse.max(), 1e-8)
+
+        _, cold = sabrSurfaceCalibration(slices, 0.1, 0.6, 0.1, 0.0, isFixedBeta=True, warmStart=False)
+        self.assertLess(diagnostics.nfev.sum(), cold.nfev.sum())
@@ -5,4 +5,5 @@ Created on 2017-1-13
 @author: cheng.li
 """
 
-from PyFin.tests.Utilities.testAsserts import TestAsserts
\ No newline at end of file
+from PyFin.tests.Utilities.testAsserts import TestAsserts
+from PyFin.tests.Utilities.testSnapshot import TestSnapshot
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+u"""
+Created on 2026-10-18
+"""
+
+import os
+import copy
+import pickle
+import shutil
+import tempfile
+import unittest
+import zlib
+import numpy as np
+from PyFin.Analysis.TechnicalAnalysis import SecurityMovingAverage
+from PyFin.Analysis.TechnicalAnalysis import SecurityMovingQuantile
+from PyFin.Analysis.TechnicalAnalysis import SecurityMovingMax
+from PyFin.Analysis.TechnicalAnalysis import SecurityTimeMovingSum
+from PyFin.Analysis.TechnicalAnalysis import SecurityTimeMovingCountUnique
+from PyFin.Utilities import save_snapshot
+from PyFin.Utilities import load_snapshot
+from PyFin.Utilities.Snapshot import SNAPSHOT_MAGIC
+from PyFin.Utilities.Snapshot import SNAPSHOT_VERSION
+from PyFin.Utilities.Snapshot import _HEADER
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(0)
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, 'state.snp')
+        self.names = ['s{0}'.format(i) for i in range(20)]
+        self.close = np.random.randn(60, len(self.names))
+        self.stamps = np.cumsum(np.random.randint(1, 5, 60))
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def _data(self, i):
+        return {name: {'close': self.close[i, j], 'stamp': self.stamps[i]} for j, name in enumerate(self.names)}
+
+    def _expressions(self):
+        return [SecurityMovingAverage(10, 'close') - SecurityMovingMax(5, 'close'),
+                SecurityMovingQuantile(10, 'close'),
+                SecurityTimeMovingSum(20, 'close'),
+                SecurityTimeMovingCountUnique(20, 'close')]
+
+    def _check_restored(self, **kwargs):
+        expressions = self._expressions()
+        for i in range(30):
+            for e in expressions:
+                e.push(self._data(i))
+
+        save_snapshot(expressions, self.path)
+        restored = load_snapshot(self.path, **kwargs)
+
+        for i in range(30, 60):
+            for e, r in zip(expressions, restored):
+                e.push(self._data(i))
+                r.push(self._data(i))
+                np.testing.assert_array_almost_equal(r.value.values, e.value.values)
+
+    def testSnapshotRoundTrip(self):
+        self._check_restored()
+        self._check_restored(use_mmap=False)
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    def testSnapshotMapsArrays(self):
+        expression = SecurityMovingAverage(10, 'close')
+        for i in range(30):
+            expression.push(self._data(i))
+        save_snapshot(expression, self.path)
+        with open(self.path, 'rb') as f:
+            content = f.read()
+
+        for use_mmap in [True, False]:
+            expected = copy.deepcopy(expression)
+            restored = load_snapshot(self.path, use_mmap=use_mmap)
+            # the ring buffer is a view of the file content
+            buffer = restored.holders._buffer
+            self.assertFalse(buffer.flags.owndata)
+            self.assertTrue(buffer.flags.writeable)
+            if use_mmap:
+                self.assertEqual(buffer.ctypes.data % 64, 0)
+
+            for i in range(30, 60):
+                expected.push(self._data(i))
+                restored.push(self._data(i))
+            np.testing.assert_array_almost_equal(restored.value.values, expected.value.values)
+
+        # the mapping is copy on write
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), content)
+
+    def testSnapshotOfFormerVersion(self):
+        expressions = self._expressions()
+        for i in range(30):
+            for e in expressions:
+                e.push(self._data(i))
+
+        payload = pickle.dumps(expressions, protocol=4)
+        with open(self.path, 'wb') as f:
+            f.write(_HEADER.pack(SNAPSHOT_MAGIC, 1, 4, len(payload), zlib.crc32(payload) & 0xffffffff))
+            f.write(payload)
+
+        restored = load_snapshot(self.path)
+        for i in range(30, 60):
+            for e, r in zip(expressions, restored):
+                e.push(self._data(i))
+                r.push(self._data(i))
+                np.testing.assert_array_almost_equal(r.value.values, e.value.values)
+
+    def testSnapshotFailedWrite(self):
+        # the target is a directory, so the temporary file can't replace it
+        os.mkdir(self.path)
+        with self.assertRaises(OSError):
+            save_snapshot([1., 2.], self.path)
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    def testSnapshotHeader(self):
+        written = save_snapshot([1., 2.], self.path)
+        self.assertEqual(os.path.getsize(self.path), written)
+
+        with open(self.path, 'rb') as f:
+            content = f.read()
+        self.assertEqual(_HEADER.unpack_from(content)[1], SNAPSHOT_VERSION)
+
+    def testSnapshotWithBadFiles(self):
+        save_snapshot([1., 2.], self.path)
+        with open(self.path, 'rb') as f:
+            content = bytearray(f.read())
+
+        corrupted = bytearray(content)
+        corrupted[-2] ^= 0xff
+        with open(self.path, 'wb') as f:
+            f.write(corrupted)
+        with self.assertRaises(ValueError):
+            load_snapshot(self.path)
+
+        newer = bytearray(content)
+        newer[8:10] = (SNAPSHOT_VERSION + 1).to_bytes(2, 'little')
+        with open(self.path, 'wb') as f:
+            f.write(newer)
+        with self.assertRaises(ValueError):
+            load_snapshot(self.path)
+
+        with open(self.path, 'wb') as f:
+            f.write(b'not a snapshot')
+        with self.assertRaises(ValueError):
+            load_snapshot(self.path)
+
+        with open(self.path, 'wb') as f:
+            f.write(content[:-1])
+        with self.assertRaises(ValueError):
+            load_snapshot(self.path, use_mmap=False)
@@ -18,6 +18,9 @@ from PyFin.api.DateUtilities import holDatesList
 from PyFin.api.DateUtilities import advanceDate
 from PyFin.api.DateUtilities import advanceDateByCalendar
 from PyFin.api.DateUtilities import adjustDateByCalendar
+from PyFin.api.DateUtilities import getCalendar
+from PyFin.api.DateUtilities import dateCacheInfo
+from PyFin.api.DateUtilities import clearDateCache
 
 
 class TestDateUtilities(unittest.TestCase):
@@ -115,3 +118,36 @@ class TestDateUtilities(unittest.TestCase):
         expected = advanceDateByCalendar('China.SSE', referenceDate.toDateTime(), '1Y')
         calculated = cal.advanceDate(referenceDate, Period('1Y'))
         self.assertEqual(expected, calculated.toDateTime())
+
+    def testSharedCalendars(self):
+        cal = getCalendar('China.SSE')
+        self.assertIs(cal, getCalendar('china.sse'))
+        self.assertIsNot(cal, getCalendar('Target'))
+        self.assertEqual(cal, Calendar('China.SSE'))
+
+        with self.assertRaises(ValueError):
+            getCalendar('Not.A.Center')
+
+    def testDateCacheStatistics(self):
+        clearDateCache()
+        referenceDate = dt.datetime(2014, 10, 1)
+
+        for _ in range(3):
+            adjusted = adjustDateByCalendar('China.SSE', referenceDate, BizDayConventions.Following)
+            advanced = advanceDateByCalendar('China.SSE', referenceDate, '2B')
+        self.assertEqual(adjustDateByCalendar('china.sse', '2014-10-01'), adjusted)
+
+        info = dateCacheInfo()
+        self.assertEqual(info['adjustDateByCalendar'].misses, 1)
+        self.assertEqual(info['adjustDateByCalendar'].hits, 3)
+        self.assertEqual(info['advanceDateByCalendar'].misses, 1)
+        self.assertEqual(info['advanceDateByCalendar'].hits, 2)
+
+        self.assertEqual(adjusted, Calendar('China.SSE').adjustDate(Date(2014, 10, 1)).toDateTime())
+        self.assertEqual(advanced, Calendar('China.SSE').advanceDate(Date(2014, 10, 1), Period('2B')).toDateTime())
+
+        advanceDateByCalendar('China.SSE', referenceDate, '2B', BizDayConventions.Preceding)
+        self.assertEqual(dateCacheInfo()['advanceDateByCalendar'].misses, 2)
+
+        clearDateCache()
+        self.assertEqual(dateCacheInfo()['adjustDateByCalendar'].currsize, 0)
@@ -30,13 +30,16 @@ if __name__ == "__main__":
                               Analysis.TestCrossSectionValueHolder,
                               Analysis.TestSecurityValues,
                               Analysis.TestTransformer,
+                              Analysis.TestExpressionGraph,
                               Analysis.TechnicalAnalysis.TestStatelessTechnicalAnalysis,
                               Analysis.TechnicalAnalysis.TestStatelessTechnicalAnalysis,
                               Analysis.TechnicalAnalysis.TestStatefulTechnicalAnalysis,
                               CashFlows.TestCashFlow,
+                              CashFlows.TestCashFlows,
                               CashFlows.TestInterestRate,
                               DateUtilities.TestCalendar,
                               DateUtilities.TestDate,
+                              DateUtilities.TestDateArrays,
                               DateUtilities.TestPeriod,
                               DateUtilities.TestSchedule,
                               DateUtilities.TestDayCounter,
@@ -51,9 +54,12 @@ if __name__ == "__main__":
                               Math.Accumulators.TestStatelessAccumulators,
                               Math.Timeseries.TestNormalizers,
                               Math.Accumulators.TestPerformancers,
+                              Math.Accumulators.TestPanelAccumulators,
+                              Math.Accumulators.TestFusedAccumulators,
                               Math.Timeseries.TestTimeseries,
                               Math.RootFinder.TestBrent,
                               POpt.TestOptimizer,
-                              Utilities.TestAsserts],
+                              Utilities.TestAsserts,
+                              Utilities.TestSnapshot],
                              pyfin_logger)
     test_runner.run()
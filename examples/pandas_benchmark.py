@@ -25,6 +25,11 @@ t = MA(20, 'x') / MA(30, 'y')
 res = t.transform(df, category_field='c')
 print("Finance-Python (group ma): {0}s".format(dt.datetime.now() - start))
 
+start = dt.datetime.now()
+t = MA(20, 'x') / MA(30, 'y')
+res = t.transform(df, category_field='c', batch=False)
+print("Finance-Python (group ma, row-wise): {0}s".format(dt.datetime.now() - start))
+
 start = dt.datetime.now()
 groups = df.groupby('c')
 res = groups['x'].rolling(20).mean() / groups['y'].rolling(30).mean()
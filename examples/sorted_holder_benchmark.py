@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+u"""
+Created on 2026-10-18
+"""
+
+import datetime as dt
+import numpy as np
+import pandas as pd
+from PyFin.Math.Accumulators import (
+    MovingRank,
+    MovingQuantile,
+    MovingArgMax,
+    MovingMax
+)
+
+n = 20000
+values = np.random.randn(n)
+df = pd.DataFrame({'x': values})
+
+for window in [10, 100, 250, 1000, 5000]:
+    print(f"window: {window}")
+    for holder in [MovingRank, MovingQuantile, MovingArgMax, MovingMax]:
+        start = dt.datetime.now()
+        holder(window, 'x').transform(df)
+        print("    Finance-Python ({0}): {1}s".format(holder.__name__, dt.datetime.now() - start))
+
+    start = dt.datetime.now()
+    df['x'].rolling(window, min_periods=1).rank()
+    print("    Pandas (rolling rank): {0}s".format(dt.datetime.now() - start))
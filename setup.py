@@ -105,12 +105,15 @@ ext_modules = [
     "PyFin/Analysis/transformer.pyx",
     "PyFin/Analysis/SecurityValueHolders.pyx",
     "PyFin/Analysis/CrossSectionValueHolders.pyx",
+    "PyFin/Analysis/ExpressionGraph.pyx",
     "PyFin/Analysis/TechnicalAnalysis/StatefulTechnicalAnalysers.pyx",
     "PyFin/Analysis/TechnicalAnalysis/StatelessTechnicalAnalysers.pyx",
     "PyFin/Math/Accumulators/impl.pyx",
     "PyFin/Math/Accumulators/IAccumulators.pyx",
     "PyFin/Math/Accumulators/StatefulAccumulators.pyx",
     "PyFin/Math/Accumulators/StatelessAccumulators.pyx",
+    "PyFin/Math/Accumulators/PanelAccumulators.pyx",
+    "PyFin/Math/Accumulators/FusedAccumulators.pyx",
     "PyFin/Math/Distributions/NormalDistribution.pyx",
     "PyFin/Math/Distributions/norm.pyx",
     "PyFin/Math/ErrorFunction.pyx",
@@ -118,6 +121,7 @@ ext_modules = [
     "PyFin/Math/udfs.pyx",
     "PyFin/DateUtilities/Calendar.pyx",
     "PyFin/DateUtilities/Date.pyx",
+    "PyFin/DateUtilities/DateArrays.pyx",
     "PyFin/DateUtilities/Period.pyx",
     "PyFin/DateUtilities/Schedule.pyx",
     "PyFin/Utilities/Asserts.pyx",
@@ -134,6 +138,13 @@ ext_modules = [
     "PyFin/Enums/Weekdays.pyx"
 ]
 
+# modules with prange loops, only built against OpenMP where gcc provides it
+openmp_modules = [
+    "PyFin/PricingEngines/BlackFormula.pyx",
+    "PyFin/PricingEngines/SabrFormulaImpl.pyx",
+    "PyFin/PricingEngines/SVIInterpolationImpl.pyx"
+]
+
 
 def generate_extensions(ext_modules, line_trace=False):
 
@@ -146,9 +157,15 @@ def generate_extensions(ext_modules, line_trace=False):
         define_macros = []
 
     for pyxfile in ext_modules:
+        if pyxfile in openmp_modules and platform.system() == "Linux":
+            openmp_args = ['-fopenmp']
+        else:
+            openmp_args = []
         ext = Extension(name='.'.join(pyxfile.split('/'))[:-4],
                         sources=[pyxfile],
-                        define_macros=define_macros)
+                        define_macros=define_macros,
+                        extra_compile_args=openmp_args,
+                        extra_link_args=openmp_args)
         extensions.append(ext)
     return extensions
 